@@ -0,0 +1,436 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Defines a queue of simulations in a spool directory, from which worker processes (possibly on
+several nodes sharing a file system) claim and run the simulations.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import uuid
+from typing import Optional
+
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+
+
+class JobQueue:
+    """A queue of simulations (jobs) stored in a spool directory, requiring no external service.
+
+    A job is the solver input file of a simulation, built by `LindbladMPOSolver.build()`. The input
+    file is kept in one of the subdirectories of the spool directory, according to the state of
+    the job: "pending", "running", "done" or "failed". Each change of state is a rename of the
+    file, which is atomic on a single file system, such that a pending job is claimed by exactly
+    one worker even when many workers try to claim it concurrently.
+
+    A worker updates the modification time of the input file of its running job every heartbeat
+    interval. A running job whose input file was not updated for the stale timeout (because its
+    worker was killed, or its node failed) is returned to the pending jobs by any worker. The
+    clocks of the nodes running the workers should therefore be synchronized to well within the
+    stale timeout. Since the solver process of a killed worker may still be running, a returned
+    job is run again with a new output path, which is its output path followed by RETRY_SUFFIX
+    and a unique token, and `get_output_path()` returns the output path of its last run.
+    """
+
+    JOB_STATES = ["pending", "running", "done", "failed"]
+    """The subdirectories of the spool directory, holding the jobs in each state."""
+
+    INPUT_SUFFIX = ".input.txt"
+    """The suffix of the names of the input files of the jobs."""
+
+    ERROR_SUFFIX = ".error.txt"
+    """The suffix of the names of the files with the reason of failed jobs."""
+
+    RECLAIM_SUFFIX = ".reclaim"
+    """The suffix of the names of the input files of jobs being returned to the pending jobs, which
+    follows the input file name and a token unique to the returning worker."""
+
+    RETRY_SUFFIX = ".retry-"
+    """Appended with a unique token to the output path of a job that is returned to the pending
+    jobs, so that its next run does not write to the files of its previous run."""
+
+    def __init__(self, s_directory: str):
+        """Initialize the queue, creating the spool directory and its subdirectories if needed.
+
+        Args:
+                s_directory: The spool directory.
+        """
+        self.s_directory = s_directory
+        for s_state in JobQueue.JOB_STATES:
+            os.makedirs(os.path.join(s_directory, s_state), exist_ok=True)
+
+    def _get_job_file(self, s_state: str, s_job_id: str, s_suffix: str = "") -> str:
+        """Returns the name of the input file of a job in the given state, or with s_suffix,
+        the name of another file of the job."""
+        return os.path.join(
+            self.s_directory, s_state, s_job_id + (s_suffix or JobQueue.INPUT_SUFFIX)
+        )
+
+    def submit(
+        self,
+        parameters: dict,
+        s_job_id: Optional[str] = None,
+        s_cygwin_path: Optional[str] = None,
+        s_solver_path: Optional[str] = None,
+    ) -> str:
+        """Builds the input file of a simulation and adds it to the pending jobs.
+
+        Args:
+                parameters: The model parameters. The simulation output files are written with the
+                        path prefix `output_files_prefix`, which should be accessible by all workers.
+                s_job_id: The id of the job, which must be unique in the queue. If None, an id
+                        starting with the submission time is generated, such that jobs are claimed
+                        in the order of their submission.
+                s_cygwin_path: On Windows only, indicates the cygwin executable path.
+                s_solver_path: Indicates the solver executable path.
+        Returns:
+                The id of the job.
+        """
+        solver = LindbladMPOSolver(parameters, s_cygwin_path, s_solver_path)
+        solver.build()
+        if s_job_id is None:
+            s_job_id = f"{int(time.time() * 1e6):017d}-{uuid.uuid4().hex[:8]}"
+        for s_state in JobQueue.JOB_STATES:
+            if os.path.isfile(self._get_job_file(s_state, s_job_id)):
+                raise Exception(f"A job with the id {s_job_id} already exists.")
+        s_pending_file = self._get_job_file("pending", s_job_id)
+        # The input file is written with a temporary name, so that it is never claimed partially written
+        with open(solver.s_input_file) as file:
+            s_input = file.read()
+        with open(s_pending_file + ".tmp", "w") as file:
+            file.write(s_input)
+        os.replace(s_pending_file + ".tmp", s_pending_file)
+        return s_job_id
+
+    def get_jobs(self, s_state: str) -> list:
+        """Returns the ids of the jobs in a given state, in the order in which pending jobs are claimed.
+
+        Args:
+                s_state: One of the states in JOB_STATES.
+        Returns:
+                A sorted list of the job ids.
+        """
+        if s_state not in JobQueue.JOB_STATES:
+            raise Exception(
+                f"The job state must be one of: {', '.join(JobQueue.JOB_STATES)}."
+            )
+        n_suffix = len(JobQueue.INPUT_SUFFIX)
+        return sorted(
+            s_file[:-n_suffix]
+            for s_file in os.listdir(os.path.join(self.s_directory, s_state))
+            if s_file.endswith(JobQueue.INPUT_SUFFIX)
+        )
+
+    def status(self) -> dict:
+        """Returns a dictionary with the number of jobs in each of the JOB_STATES."""
+        return {s_state: len(self.get_jobs(s_state)) for s_state in JobQueue.JOB_STATES}
+
+    def claim(self) -> Optional[str]:
+        """Claims the first pending job, moving it to the running jobs.
+
+        Returns:
+                The id of the claimed job, or None if there are no pending jobs.
+        """
+        for s_job_id in self.get_jobs("pending"):
+            s_pending_file = self._get_job_file("pending", s_job_id)
+            try:
+                # The first heartbeat is given before the rename, so that the job is never stale
+                os.utime(s_pending_file)
+                os.rename(s_pending_file, self._get_job_file("running", s_job_id))
+            except FileNotFoundError:
+                continue  # The job was claimed by another worker
+            return s_job_id
+        return None
+
+    def heartbeat(self, s_job_id: str) -> bool:
+        """Marks a running job as alive, by updating the modification time of its input file.
+
+        Args:
+                s_job_id: The id of the running job.
+        Returns:
+                False if the job is no longer running (because it was reclaimed as stale).
+        """
+        try:
+            os.utime(self._get_job_file("running", s_job_id))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def reclaim_stale(self, f_stale_timeout: float) -> list:
+        """Returns the running jobs that had no heartbeat for a given time to the pending jobs.
+
+        Args:
+                f_stale_timeout: The time in seconds since the last heartbeat of a stale job.
+        Returns:
+                A list of the ids of the reclaimed jobs.
+        """
+        reclaimed = []
+        s_running_dir = os.path.join(self.s_directory, "running")
+        for s_file in sorted(os.listdir(s_running_dir)):
+            # A job is either running, or being returned by a worker that may have failed since
+            s_job_id = JobQueue._get_reclaimable_job_id(s_file)
+            if s_job_id is None:
+                continue
+            s_running_file = os.path.join(s_running_dir, s_file)
+            s_token = uuid.uuid4().hex[:8]
+            s_reclaim_file = (
+                self._get_job_file("running", s_job_id)
+                + f".{s_token}{JobQueue.RECLAIM_SUFFIX}"
+            )
+            try:
+                if time.time() - os.path.getmtime(s_running_file) < f_stale_timeout:
+                    continue
+                # The job is moved to a name of this worker, so that only one worker returns it,
+                # and the heartbeat is checked again, in case it was given after the first check
+                os.rename(s_running_file, s_reclaim_file)
+            except FileNotFoundError:
+                continue  # The job was completed or reclaimed by another worker
+            if time.time() - os.path.getmtime(s_reclaim_file) < f_stale_timeout:
+                os.rename(s_reclaim_file, s_running_file)
+                continue
+            # The time of the renamed file is reset, so that other workers return it only if this
+            # worker fails before returning it
+            os.utime(s_reclaim_file)
+            self._return_job(s_job_id, s_reclaim_file, s_token)
+            reclaimed.append(s_job_id)
+        return reclaimed
+
+    @staticmethod
+    def _get_reclaimable_job_id(s_file: str) -> Optional[str]:
+        """Returns the job id of a file in the running jobs directory, if it is the input file of a
+        running job or of a job being returned to the pending jobs, and None otherwise."""
+        if s_file.endswith(JobQueue.RECLAIM_SUFFIX):
+            s_file = s_file[: -len(JobQueue.RECLAIM_SUFFIX)].rpartition(".")[0]
+        if s_file.endswith(JobQueue.INPUT_SUFFIX):
+            return s_file[: -len(JobQueue.INPUT_SUFFIX)]
+        return None
+
+    def _return_job(self, s_job_id: str, s_reclaim_file: str, s_token: str):
+        """Returns a reclaimed job to the pending jobs, with a new output path."""
+        s_output_path = "lindblad"
+        s_lines = []
+        with open(s_reclaim_file) as file:
+            for s_line in file:
+                key, _, value = s_line.strip().partition(" = ")
+                if key == "output_files_prefix":
+                    s_output_path = value
+                else:
+                    s_lines.append(s_line)
+        i_retry = s_output_path.rfind(JobQueue.RETRY_SUFFIX)
+        if i_retry >= 0:
+            s_output_path = s_output_path[:i_retry]
+        s_output_path += JobQueue.RETRY_SUFFIX + s_token
+        s_lines.append(f"output_files_prefix = {s_output_path}\n")
+        s_pending_file = self._get_job_file("pending", s_job_id)
+        with open(s_pending_file + f".{s_token}.tmp", "w") as file:
+            file.write("".join(s_lines))
+        os.replace(s_pending_file + f".{s_token}.tmp", s_pending_file)
+        os.remove(s_reclaim_file)
+
+    def complete(self, s_job_id: str, s_error: str = "") -> bool:
+        """Moves a running job to the done jobs, or to the failed jobs if s_error is not empty.
+
+        Args:
+                s_job_id: The id of the running job.
+                s_error: The reason of the failure of the job, saved in a file whose name ends with
+                        ERROR_SUFFIX.
+        Returns:
+                False if the job is no longer running (because it was reclaimed as stale).
+        """
+        s_state = "failed" if s_error else "done"
+        try:
+            os.rename(
+                self._get_job_file("running", s_job_id),
+                self._get_job_file(s_state, s_job_id),
+            )
+        except FileNotFoundError:
+            return False
+        if s_error:
+            with open(
+                self._get_job_file(s_state, s_job_id, JobQueue.ERROR_SUFFIX), "w"
+            ) as file:
+                file.write(s_error + "\n")
+        return True
+
+    def retry_failed(self) -> list:
+        """Returns all failed jobs to the pending jobs.
+
+        Returns:
+                A list of the ids of the returned jobs.
+        """
+        retried = []
+        for s_job_id in self.get_jobs("failed"):
+            try:
+                os.rename(
+                    self._get_job_file("failed", s_job_id),
+                    self._get_job_file("pending", s_job_id),
+                )
+            except FileNotFoundError:
+                continue
+            s_error_file = self._get_job_file("failed", s_job_id, JobQueue.ERROR_SUFFIX)
+            if os.path.isfile(s_error_file):
+                os.remove(s_error_file)
+            retried.append(s_job_id)
+        return retried
+
+    def get_output_path(self, s_job_id: str) -> str:
+        """Returns the output path of a job (the prefix of its output files), read from its input
+        file."""
+        for s_state in JobQueue.JOB_STATES:
+            try:
+                with open(self._get_job_file(s_state, s_job_id)) as file:
+                    for s_line in file:
+                        key, _, value = s_line.strip().partition(" = ")
+                        if key == "output_files_prefix":
+                            return value
+                return "lindblad"
+            except FileNotFoundError:
+                continue
+        raise Exception(f"The job {s_job_id} was not found.")
+
+    def load_result(self, s_job_id: str, **kwargs) -> dict:
+        """Loads the result dictionaries of a done job, passing kwargs to `load_output()`."""
+        if not os.path.isfile(self._get_job_file("done", s_job_id)):
+            raise Exception(f"The job {s_job_id} is not done.")
+        return LindbladMPOSolver.load_output(self.get_output_path(s_job_id), **kwargs)
+
+    def work(
+        self,
+        s_cygwin_path: Optional[str] = None,
+        s_solver_path: Optional[str] = None,
+        f_heartbeat_interval: float = 10.0,
+        f_stale_timeout: float = 60.0,
+        f_poll_interval: Optional[float] = None,
+        n_max_jobs: Optional[int] = None,
+    ) -> int:
+        """Runs pending jobs one after another, until there are no pending and running jobs.
+
+        Before claiming each job, stale running jobs are reclaimed. While there are no pending jobs
+        but other jobs are running (whose workers may fail), the queue is checked every
+        f_poll_interval seconds. A running job that is reclaimed by another worker (after a
+        heartbeat was missed) is stopped and abandoned.
+
+        Args:
+                s_cygwin_path: On Windows only, indicates the cygwin executable path.
+                s_solver_path: Indicates the solver executable path.
+                f_heartbeat_interval: The time in seconds between heartbeats of the running job.
+                f_stale_timeout: The time in seconds without a heartbeat after which a running job
+                        is reclaimed. Should be several times larger than f_heartbeat_interval.
+                f_poll_interval: The time in seconds between checks of the queue while waiting, or
+                        None to return when there are no pending jobs (without waiting for the
+                        running jobs of other workers).
+                n_max_jobs: The maximal number of jobs to complete, or None for no limit.
+        Returns:
+                The number of jobs that were completed (done or failed) by this worker, which does
+                not count the jobs it started that were reclaimed by other workers.
+        """
+        s_cygwin_path, s_solver_path = LindbladMPOSolver.process_default_paths(
+            s_cygwin_path, s_solver_path
+        )
+        n_jobs = 0
+        while n_max_jobs is None or n_jobs < n_max_jobs:
+            for s_job_id in self.reclaim_stale(f_stale_timeout):
+                print(f"Reclaimed the stale job {s_job_id}.")
+            s_job_id = self.claim()
+            if s_job_id is None:
+                if f_poll_interval is None or not self.get_jobs("running"):
+                    break
+                time.sleep(f_poll_interval)
+                continue
+            print(f"Running the job {s_job_id}.")
+            s_error = self._run_job(
+                s_job_id, s_cygwin_path, s_solver_path, f_heartbeat_interval
+            )
+            if s_error is None or not self.complete(s_job_id, s_error):
+                print(f"The job {s_job_id} was reclaimed by another worker.")
+            else:
+                n_jobs += 1
+                print(f"The job {s_job_id} " + ("failed." if s_error else "is done."))
+        return n_jobs
+
+    def _run_job(
+        self,
+        s_job_id: str,
+        s_cygwin_path: str,
+        s_solver_path: str,
+        f_heartbeat_interval: float,
+    ) -> Optional[str]:
+        """Runs the solver for a claimed job, sending heartbeats while it runs. Returns an empty
+        string if the solver succeeded, the reason of its failure, or None if the job was
+        reclaimed by another worker (in which case the solver is stopped)."""
+        s_input_file = self._get_job_file("running", s_job_id)
+        try:
+            process = LindbladMPOSolver._start_process(
+                s_cygwin_path, s_solver_path, s_input_file
+            )
+        except OSError as error:
+            return f"The solver could not be executed: {error}"
+        while True:
+            try:
+                exit_code = process.wait(f_heartbeat_interval)
+                break
+            except subprocess.TimeoutExpired:
+                if not self.heartbeat(s_job_id):
+                    process.terminate()
+                    process.wait()
+                    return None
+        if exit_code != 0:
+            return f"There was an error executing the solver (exit code {exit_code})."
+        return ""
+
+
+def main(argv: Optional[list] = None) -> int:
+    """The entry point of the lindbladmpo-worker command, running the jobs of a spool directory."""
+    parser = argparse.ArgumentParser(
+        prog="lindbladmpo-worker",
+        description="Run the simulations of a lindbladmpo job queue spool directory.",
+    )
+    parser.add_argument("directory", help="the spool directory of the job queue")
+    parser.add_argument("--solver-path", help="the solver executable path")
+    parser.add_argument("--cygwin-path", help="the cygwin executable path (Windows)")
+    parser.add_argument(
+        "--heartbeat-interval",
+        type=float,
+        default=10.0,
+        help="seconds between heartbeats of the running job (default: 10)",
+    )
+    parser.add_argument(
+        "--stale-timeout",
+        type=float,
+        default=60.0,
+        help="seconds without a heartbeat after which a running job is reclaimed (default: 60)",
+    )
+    parser.add_argument(
+        "--wait",
+        type=float,
+        metavar="POLL_INTERVAL",
+        help="wait for the running jobs of other workers (which may be reclaimed), "
+        "checking the queue every POLL_INTERVAL seconds",
+    )
+    parser.add_argument(
+        "--max-jobs", type=int, help="the maximal number of jobs to run"
+    )
+    args = parser.parse_args(argv)
+    queue = JobQueue(args.directory)
+    n_jobs = queue.work(
+        args.cygwin_path,
+        args.solver_path,
+        args.heartbeat_interval,
+        args.stale_timeout,
+        args.wait,
+        args.max_jobs,
+    )
+    print(f"The worker ran {n_jobs} jobs. Queue status: {queue.status()}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,14 +10,36 @@
 Defines the main class of the packages, implementing the interface with the solver.
 """
 
-import collections
+import asyncio
+import bisect
+import concurrent.futures
+import contextlib
+import hashlib
+import io
+import itertools
+import json
+import mmap
+import struct
 import subprocess
+import time
+import warnings
+import zipfile
+import zlib
+from collections import deque
 import uuid
-from math import isfinite
-from typing import Dict, Optional
+from math import ceil
+from typing import Callable, Dict, Iterable, Optional
 import platform
+import shlex
+import shutil
+import tempfile
 import os
 import numpy as np
+import scipy.sparse
+
+from lindbladmpo.ParameterSchema import ParameterSchema
+from lindbladmpo.ResultRegistry import ResultRegistry
+from lindbladmpo.ResultStore import ResultStore
 
 
 class LindbladMPOSolver:
@@ -29,6 +51,173 @@ class LindbladMPOSolver:
     DEFAULT_CYGWIN_PATH = "C:/cygwin64/bin/bash.exe"
     """Default path for the cygwin executable, which is used to invoke the solver (Windows only)."""
 
+    OUTPUT_TYPES = ["obs-1q", "obs-2q", "obs-3q", "obs-cu", "global"]
+    """The types of the solver output files, in the order in which they are loaded."""
+
+    OUTPUT_TYPE_INDICES = {
+        "obs-1q": 1,
+        "obs-2q": 2,
+        "obs-3q": 3,
+        "obs-cu": 0,
+        "global": 0,
+    }
+    """The output file types, and the number of qubit index columns stored in each of them."""
+
+    DATA_FILE_CHUNK_SIZE = 1 << 25
+    """Approximate size in bytes of the line-aligned chunks in which output files are parsed."""
+
+    RESULT_CACHE_SUFFIX = ".result.npz"
+    """The ending of the file name of the cache of the results loaded from the output files."""
+
+    RESULT_CACHE_VERSION = 1
+    """The version of the format of the cache files, which are ignored if it differs."""
+
+    DATA_FILE_MIN_PART_SIZE = 1 << 22
+    """Minimal size in bytes of the parts of an output file parsed by parallel worker processes."""
+
+    DATA_FILE_PARALLEL_MIN_SIZE = 1 << 25
+    """Minimal total size in bytes of the output files to parse for using worker processes, below
+    which starting the workers and sending back their results costs more than it saves."""
+
+    BINARY_FILE_MAGIC = b"LMPOBIN1"
+    """The first bytes of an output file in the binary format, identifying the format version."""
+
+    OUTPUT_FORMATS = ["text", "binary"]
+    """The supported values of the `output_format` parameter."""
+
+    OUTPUT_STREAM_MAGIC = b"LMPOSTR1"
+    """The first bytes of the results stream written by the solver in the stream output format."""
+
+    THREAD_ENV_VARIABLES = [
+        "OMP_NUM_THREADS",
+        "OPENBLAS_NUM_THREADS",
+        "MKL_NUM_THREADS",
+        "VECLIB_MAXIMUM_THREADS",
+    ]
+    """Environment variables limiting the number of threads of the solver process libraries."""
+
+    DEFAULT_MAX_DIM_RHO = 400
+    """The default value of the solver parameter `max_dim_rho`."""
+
+    STOP_TIMEOUT = 300.0
+    """Time in seconds to wait for the solver to stop after exceeding a run limit, before killing
+    its process."""
+
+    PROGRESS_FILE_SUFFIX = ".progress.jsonl"
+    """The ending of the default file name of the progress events of the solver."""
+
+    OUTPUT_LINE_LIMIT = 1 << 24
+    """Maximal length in bytes of a line of the console output of the solver read asynchronously."""
+
+    DATA_FILE_ENDINGS = [".dat", ".dat.gz", ".bin"]
+    """The file endings of the output files in the text, compressed text and binary formats."""
+
+    CHECKPOINT_SUFFIX = ".checkpoint.txt"
+    """The ending of the file name of the last checkpoint saved by the solver."""
+
+    RESUME_INPUT_SUFFIX = ".resume.input.txt"
+    """The ending of the file name of the solver input file of a simulation resumed from a
+    checkpoint."""
+
+    PARAMETER_SCHEMA = ParameterSchema(
+        {
+            "N": (
+                "int",
+                {
+                    "type_code": 120,
+                    "range_code": 130,
+                    "n_min": 1,
+                    "s_range": " should be bigger/equal to 1 (integer)",
+                },
+            ),
+            "t_init": ("time", {"depends": ("t_final",)}),
+            ("t_final", "tau"): ("time", {}),
+            ("l_x", "l_y"): ("int", {"type_code": 160, "range_code": 170}),
+            (
+                "output_step",
+                "output_flush_step",
+                "checkpoint_step",
+                "initial_step",
+                "force_rho_hermitian_step",
+                "force_rho_hermitian_gates",
+            ): ("int", {"type_code": 180, "range_code": 190}),
+            ("h_x", "h_y", "h_z", "g_0", "g_1", "g_2", "g_3", "g_4"): (
+                "site_vector",
+                {"depends": ("N",)},
+            ),
+            ("J", "J_z"): ("coupling", {"depends": ("N",)}),
+            "apply_gates": ("gates", {}),
+            ("custom_observables", "collapse"): ("observables", {}),
+            ("init_pauli_state", "init_product_state"): ("init_state", {}),
+            (
+                "b_periodic_x",
+                "b_periodic_y",
+                "b_force_rho_trace",
+                "b_unique_id",
+                "b_quiet",
+                "b_save_final_state",
+                "b_append_output",
+                "b_log_file",
+                "b_initial_rho_compression",
+                "b_apply_gate_compression",
+            ): ("bool", {}),
+            "trotter_order": ("trotter_order", {}),
+            "max_dim_rho": ("max_dim", {}),
+            ("cut_off", "cut_off_rho"): ("float", {"code": 420}),
+            "metadata": ("metadata", {}),
+            (
+                "load_files_prefix",
+                "output_files_prefix",
+                "progress_file",
+                "propagator_cache_dir",
+                "result_registry_dir",
+            ): ("string", {}),
+            "output_format": ("choice", {"code": 426, "choices": OUTPUT_FORMATS}),
+            "output_compression": ("compression", {"depends": ("output_format",)}),
+            "1q_components": ("1q_components", {}),
+            "1q_indices": ("1q_indices", {"depends": ("N",)}),
+            "2q_components": ("2q_components", {}),
+            "3q_components": ("3q_components", {}),
+            ("2q_indices", "3q_indices", "init_graph_state", "init_cz_gates"): (
+                "index_tuples",
+                {"depends": ("N",)},
+            ),
+        }
+    )
+    """The schema of the solver parameters, used by `verify_parameters()`."""
+
+    PARAMETERS_HASH_EXCLUDED_KEYS = [
+        "output_files_prefix",
+        "unique_id",
+        "metadata",
+        "b_quiet",
+        "b_log_file",
+        "progress_file",
+        "propagator_cache_dir",
+        "output_format",
+        "output_compression",
+        "output_flush_step",
+        "checkpoint_step",
+    ]
+    """The solver input parameters that do not affect the results of a simulation (output paths,
+    ids and formats), which are excluded from its parameters hash."""
+
+    PARAMETERS_HASH_VERSION = 1
+    """The version of the canonical form of the parameters hashed by `get_parameters_hash()`."""
+
+    STATE_FILE_SUFFIXES = [".state.ops", ".state.rho", ".state.sites"]
+    """The endings of the names of the files of the final state saved by the solver."""
+
+    RESUME_DROPPED_PARAMETERS = [
+        "init_product_state",
+        "init_pauli_state",
+        "init_graph_state",
+        "init_cz_gates",
+        "collapse",
+    ]
+    """The initialization parameters, which are removed from the input file of a simulation
+    resumed from a checkpoint."""
+
     def __init__(
         self,
         parameters: Optional[dict] = None,
@@ -53,18 +242,642 @@ class LindbladMPOSolver:
         self.s_cygwin_path = s_cygwin_path
         self.s_solver_path = s_solver_path
         self.s_id_suffix = ""
+        self.s_parameters_hash = ""
         self.result = {}
+        self.error = None
+
+    def solve(
+        self,
+        progress_callback: Optional[Callable[[dict], None]] = None,
+        f_poll_interval: float = 1.0,
+        f_max_wall_time: Optional[float] = None,
+        f_max_memory_mb: Optional[float] = None,
+        f_max_trace_deviation: Optional[float] = None,
+        n_max_saturated_steps: Optional[int] = None,
+    ):
+        """Solves the simulation and loads the result dictionaries.
+
+        Limits on the run can be given, and when one of them is exceeded the solver is asked to
+        stop (by terminating its process), upon which it ends the simulation before the next time
+        step, closing the output files (and saving the final state if requested). The partial
+        results are loaded, and the reason for stopping is saved in the result dictionary with the
+        key "abort_reason". If the solver does not stop within STOP_TIMEOUT seconds, it is killed.
+
+        If the `result_registry_dir` parameter is set and an identical simulation (with the same
+        parameters hash) is registered there, the solver is not run. The output files of the
+        registered simulation are copied to the output path, and the results are loaded from them.
+        Otherwise, the output files of the simulation are registered after it completes.
+        Args:
+                progress_callback : An optional function called with each progress event of the
+                        solver while it runs. Each event is a dictionary with an "event" key holding
+                        the event name ("start", "observables", "evolve", "stop" or "end"), and the
+                        numeric fields of the event (such as "step", "t", "tr_rho" and
+                        "max_bond_dim"). The events are read from the file given by the
+                        `progress_file` parameter, or if it is not set, from the output path
+                        followed by PROGRESS_FILE_SUFFIX.
+                f_poll_interval : The time in seconds to wait between checks of the progress file
+                        and of the limits.
+                f_max_wall_time : An optional limit on the run time of the solver, in seconds.
+                f_max_memory_mb : An optional limit on the resident memory of the solver process,
+                        in megabytes (supported on Linux only).
+                f_max_trace_deviation : An optional limit on the deviation of the trace of the
+                        density matrix from 1, checked at every time step (before normalization).
+                n_max_saturated_steps : An optional limit on the number of consecutive time steps
+                        after which the maximal bond dimension of the density matrix equals
+                        `max_dim_rho`.
+        """
+        if self.s_input_file == "":
+            self.build()
+        if self._load_registered_result():
+            return
+        limits = {
+            "wall_time": f_max_wall_time,
+            "memory_mb": f_max_memory_mb,
+            "trace_deviation": f_max_trace_deviation,
+            "saturated_steps": n_max_saturated_steps,
+        }
+        s_abort_reason = None
+        if progress_callback is None and all(
+            limit is None for limit in limits.values()
+        ):
+            exit_code = LindbladMPOSolver.execute(
+                self.s_cygwin_path, self.s_solver_path, self.s_input_file
+            )
+        else:
+            exit_code, s_abort_reason = self._execute_monitored(
+                progress_callback, f_poll_interval, limits
+            )
+        if exit_code != 0 and s_abort_reason is None:
+            raise Exception("There was an error executing the solver.")
+        self.result = LindbladMPOSolver.load_output(self.s_output_path)
+        if s_abort_reason is not None:
+            self.result["abort_reason"] = s_abort_reason
+        else:
+            self._register_result()
 
-    def solve(self):
-        """Solves the simulation and loads the result dictionaries."""
+    def iter_results(self, f_poll_interval: float = 1.0):
+        """Runs the solver and yields the observables of each output time step while it runs.
+
+        The output files are followed as they are written by the solver, and each time step is
+        yielded once it was written to all output files. After the solver terminates, the result
+        dictionaries of all time steps are loaded as in `solve()`. If the iteration is stopped
+        before the solver terminates, the solver is asked to stop (by terminating its process), and
+        it is killed if it does not stop within STOP_TIMEOUT seconds.
+        Args:
+                f_poll_interval : The time in seconds to wait between checks of the output files.
+        Yields:
+                (t, result) : The time of an output step, and a dictionary with a ResultStore for
+                        each output type, holding only the observables of that time step.
+        """
         if self.s_input_file == "":
             self.build()
-        exit_code = LindbladMPOSolver.execute(
+        # Output files left from an earlier run are ignored until they are rewritten by the solver
+        f_start_time = time.time() - 1.0
+        process = LindbladMPOSolver._start_process(
             self.s_cygwin_path, self.s_solver_path, self.s_input_file
         )
+        try:
+            yield from LindbladMPOSolver.follow_output(
+                self.s_output_path,
+                lambda: process.poll() is None,
+                f_poll_interval,
+                f_start_time,
+            )
+        finally:
+            if process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(LindbladMPOSolver.STOP_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            exit_code = process.wait()
+            print(f"Solver process terminated with exit code {exit_code}.\n")
         if exit_code != 0:
             raise Exception("There was an error executing the solver.")
         self.result = LindbladMPOSolver.load_output(self.s_output_path)
+        self._register_result()
+
+    def resume(
+        self,
+        s_output_path: Optional[str] = None,
+        t_final: Optional[float] = None,
+        **kwargs,
+    ):
+        """Resumes a simulation from its last checkpoint, and loads the result dictionaries.
+
+        The simulation must have been run with a nonzero `checkpoint_step` parameter. Its observables
+        files are truncated to their sizes at the checkpoint, and the solver continues from the
+        state saved at the checkpoint, appending to the files, such that each output time step
+        appears in them exactly once. Since a checkpoint is saved also at the final time step, a
+        simulation that ended can be extended to a later final time.
+        Args:
+                s_output_path : The output path (prefix of the output files) of the simulation. If
+                        None, the output path of this instance is used.
+                t_final : An optional new final time of the simulation.
+                kwargs : Arguments passed to `solve()`, such as a progress callback and run limits.
+        """
+        if s_output_path is None:
+            s_output_path = self.s_output_path
+        if not s_output_path:
+            raise Exception(
+                "The output path of the simulation to resume must be given."
+            )
+        checkpoint = LindbladMPOSolver._read_checkpoint(s_output_path)
+        if t_final is not None and t_final < checkpoint["t"]:
+            raise Exception(
+                f"The final time {t_final} is earlier than the time of the checkpoint, "
+                f"{checkpoint['t']}."
+            )
+        for n_size, s_file in checkpoint["files"]:
+            if not os.path.isfile(s_file) or os.path.getsize(s_file) < n_size:
+                raise Exception(
+                    "The output file "
+                    + s_file
+                    + " lacks data written before the checkpoint."
+                )
+        s_input_file = LindbladMPOSolver._write_resume_input(
+            s_output_path, checkpoint, t_final
+        )
+        for n_size, s_file in checkpoint["files"]:
+            os.truncate(s_file, n_size)
+        print(f"Resuming the simulation from the checkpoint at t = {checkpoint['t']}.")
+        self.s_input_file = s_input_file
+        self.s_output_path = s_output_path
+        # A resumed simulation is neither looked up in the result registry nor registered
+        self.s_parameters_hash = ""
+        self.solve(**kwargs)
+
+    @staticmethod
+    def _read_checkpoint(s_output_path: str) -> dict:
+        """Reads the checkpoint file of a simulation, returning a dictionary with the time "t" and
+        the step index "step" of the checkpoint, the "state_prefix" of the saved state files, and
+        a list of "files" holding the size and name of each observables file."""
+        s_checkpoint_file = s_output_path + LindbladMPOSolver.CHECKPOINT_SUFFIX
+        if not os.path.isfile(s_checkpoint_file):
+            raise Exception(
+                "No checkpoint of the simulation was found (the file "
+                + s_checkpoint_file
+                + " does not exist)."
+            )
+        checkpoint = {"files": []}
+        s_directory = os.path.dirname(s_output_path)
+        with open(s_checkpoint_file) as file:
+            for s_line in file:
+                key, _, value = s_line.rstrip("\n").partition(" = ")
+                if key == "file":
+                    s_size, s_file = value.split("\t", 1)
+                    # The solver may see the path differently (for example, with cygwin)
+                    s_file = os.path.join(s_directory, os.path.basename(s_file))
+                    checkpoint["files"].append((int(s_size), s_file))
+                elif key:
+                    checkpoint[key] = value
+        checkpoint["t"] = float(checkpoint["t"])
+        checkpoint["step"] = int(checkpoint["step"])
+        return checkpoint
+
+    @staticmethod
+    def _write_resume_input(
+        s_output_path: str, checkpoint: dict, t_final: Optional[float]
+    ) -> str:
+        """Writes the input file of a simulation resumed from a checkpoint, and returns its name.
+        The parameters are copied from the last input file of the simulation, without the
+        initialization parameters and the gates applied before the checkpoint."""
+        s_resume_file = s_output_path + LindbladMPOSolver.RESUME_INPUT_SUFFIX
+        s_input_files = [
+            s_file
+            for s_file in (s_resume_file, s_output_path + ".input.txt")
+            if os.path.isfile(s_file)
+        ]
+        if not s_input_files:
+            raise Exception(
+                "The input file of the simulation " + s_output_path + " was not found."
+            )
+        # A simulation resumed earlier may have been extended, and its input file is then newer
+        s_input_file = max(s_input_files, key=os.path.getmtime)
+        t_checkpoint = checkpoint["t"]
+        overrides = {
+            "t_init": repr(t_checkpoint),
+            "initial_step": checkpoint["step"],
+            "load_files_prefix": checkpoint["state_prefix"],
+            "b_append_output": 1,
+        }
+        if t_final is not None:
+            overrides["t_final"] = t_final
+        lines = []
+        with open(s_input_file) as file:
+            for s_line in file:
+                key, _, value = s_line.strip().partition(" = ")
+                if (
+                    key in overrides
+                    or key in LindbladMPOSolver.RESUME_DROPPED_PARAMETERS
+                ):
+                    continue
+                lines.append((key, value))
+        tau = float(dict(lines).get("tau", 0.1))
+        with open(s_resume_file, "w") as file:
+            for key, value in lines:
+                if key == "apply_gates":
+                    value = LindbladMPOSolver._filter_resumed_gates(
+                        value, t_checkpoint, tau
+                    )
+                if key and value:
+                    file.write(key + " = " + value + "\n")
+            for key, value in overrides.items():
+                file.write(key + " = " + str(value) + "\n")
+        return s_resume_file
+
+    @staticmethod
+    def _filter_resumed_gates(s_gates: str, t_checkpoint: float, tau: float) -> str:
+        """Removes the gates applied before a checkpoint from the value of the `apply_gates`
+        parameter in an input file. The gates applied at the time step of the checkpoint are kept,
+        with their time set to the time of the checkpoint."""
+        gates = []
+        for s_gate in s_gates.split(","):
+            words = s_gate.split()
+            if not words or float(words[0]) < t_checkpoint - tau / 2:
+                continue
+            if float(words[0]) < t_checkpoint:
+                words[0] = repr(t_checkpoint)
+            gates.append(" ".join(words))
+        return ",".join(gates)
+
+    def _execute_monitored(
+        self,
+        progress_callback: Optional[Callable[[dict], None]],
+        f_poll_interval: float,
+        limits: dict,
+    ) -> tuple:
+        """Executes the solver, passing its progress events to the callback while it runs, and
+        asking it to stop if one of the limits is exceeded. Returns a tuple with the exit code of
+        the solver and the reason for stopping it (or None)."""
+        s_progress_file = ""
+        n_max_dim_rho = LindbladMPOSolver.DEFAULT_MAX_DIM_RHO
+        if self.parameters is not None:
+            s_progress_file = self.parameters.get("progress_file", "")
+            n_max_dim_rho = self.parameters.get("max_dim_rho", n_max_dim_rho)
+        args = {}
+        if not s_progress_file:
+            s_progress_file = (
+                self.s_output_path + LindbladMPOSolver.PROGRESS_FILE_SUFFIX
+            )
+            args["progress_file"] = s_progress_file
+        if limits["memory_mb"] is not None and not os.path.isdir("/proc"):
+            warnings.warn("The memory limit of the solver is supported only on Linux.")
+        # Events left from an earlier run must not be read before the solver truncates the file
+        if os.path.isfile(s_progress_file):
+            os.remove(s_progress_file)
+        f_start_time = time.time()
+        process = LindbladMPOSolver._start_process(
+            self.s_cygwin_path, self.s_solver_path, self.s_input_file, args=args
+        )
+        n_offset = 0
+        n_saturated_steps = 0
+        s_abort_reason = None
+        f_stop_time = None
+        while True:
+            exit_code = process.poll()
+            events, n_offset = LindbladMPOSolver._read_progress_events(
+                s_progress_file, n_offset
+            )
+            for event in events:
+                if progress_callback is not None:
+                    progress_callback(event)
+                if s_abort_reason is None:
+                    (
+                        s_abort_reason,
+                        n_saturated_steps,
+                    ) = LindbladMPOSolver._check_event_limits(
+                        event, limits, n_max_dim_rho, n_saturated_steps
+                    )
+            if exit_code is not None:
+                break
+            if s_abort_reason is None:
+                s_abort_reason = LindbladMPOSolver._check_process_limits(
+                    process, limits, f_start_time
+                )
+            if s_abort_reason is not None:
+                if f_stop_time is None:
+                    print("Stopping the solver: " + s_abort_reason)
+                    process.terminate()
+                    f_stop_time = time.time()
+                elif time.time() - f_stop_time > LindbladMPOSolver.STOP_TIMEOUT:
+                    process.kill()
+            if not events:
+                time.sleep(f_poll_interval)
+        print(f"Solver process terminated with exit code {exit_code}.\n")
+        return exit_code, s_abort_reason
+
+    @staticmethod
+    def _check_event_limits(
+        event: dict, limits: dict, n_max_dim_rho: int, n_saturated_steps: int
+    ) -> tuple:
+        """Checks the limits on the trace and the bond dimension of the density matrix against a
+        progress event, returning the reason for stopping the solver (or None), and the updated
+        number of consecutive time steps with a saturated bond dimension."""
+        f_max_deviation = limits["trace_deviation"]
+        if f_max_deviation is not None and "tr_rho" in event:
+            # A non-finite trace is written as null
+            f_trace = event["tr_rho"]
+            if f_trace is None or abs(f_trace - 1.0) > f_max_deviation:
+                return (
+                    f"The trace of rho deviated from 1 by more than {f_max_deviation} "
+                    f"(Tr(rho) = {f_trace}) at t = {event.get('t')}.",
+                    n_saturated_steps,
+                )
+        n_max_steps = limits["saturated_steps"]
+        if n_max_steps is not None and event["event"] == "evolve":
+            if 0 < n_max_dim_rho <= event.get("max_bond_dim", 0):
+                n_saturated_steps += 1
+            else:
+                n_saturated_steps = 0
+            if n_saturated_steps >= n_max_steps:
+                return (
+                    f"The bond dimension of rho reached max_dim_rho = {n_max_dim_rho} for "
+                    f"{n_saturated_steps} consecutive time steps, at t = {event.get('t')}.",
+                    n_saturated_steps,
+                )
+        return None, n_saturated_steps
+
+    @staticmethod
+    def _check_process_limits(
+        process: subprocess.Popen, limits: dict, f_start_time: float
+    ) -> Optional[str]:
+        """Checks the limits on the wall time and memory of the solver process, returning the
+        reason for stopping the solver, or None."""
+        f_max_wall_time = limits["wall_time"]
+        if f_max_wall_time is not None and time.time() - f_start_time > f_max_wall_time:
+            return f"The wall time limit of {f_max_wall_time} s was exceeded."
+        f_max_memory_mb = limits["memory_mb"]
+        if f_max_memory_mb is not None:
+            n_rss = LindbladMPOSolver._get_process_rss(process.pid)
+            if n_rss is not None and n_rss > f_max_memory_mb * (1 << 20):
+                return (
+                    f"The memory limit of {f_max_memory_mb} MB was exceeded "
+                    f"(resident memory {n_rss / (1 << 20):.1f} MB)."
+                )
+        return None
+
+    @staticmethod
+    def _get_process_rss(n_pid: int) -> Optional[int]:
+        """Returns the resident memory size in bytes of a process, or None if it is unknown."""
+        try:
+            with open(f"/proc/{n_pid}/status") as file:
+                for line in file:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+
+    @staticmethod
+    def _read_progress_events(s_progress_file: str, n_offset: int) -> tuple:
+        """Reads the events written as complete lines to a progress file after the byte offset
+        n_offset, returning a list of the events and the offset following the last complete line."""
+        if not os.path.isfile(s_progress_file):
+            return [], n_offset
+        with open(s_progress_file, "rb") as file:
+            file.seek(n_offset)
+            s_data = file.read()
+        i_end = s_data.rfind(b"\n") + 1
+        events = [
+            json.loads(line) for line in s_data[:i_end].splitlines() if line.strip()
+        ]
+        return events, n_offset + i_end
+
+    def solve_stream(self, b_log_file: bool = False):
+        """Solves the simulation without input and output files, and loads the result dictionaries.
+
+        The parameters are piped to the standard input of the solver, which writes the observables
+        to its standard output in the stream output format (overriding the `output_format` and
+        `output_compression` parameters). The stream is decoded directly into the result
+        dictionaries, and the console output of the solver is written to the standard error.
+        Args:
+                b_log_file : Whether the solver writes its log file.
+        """
+        s_input = self._build_input()
+        # The last value of a parameter in the input overrides earlier ones
+        s_input += "output_format = stream\noutput_compression = 0\n"
+        s_input += "b_log_file = " + str(int(b_log_file)) + "\n"
+        process = LindbladMPOSolver._start_process(
+            self.s_cygwin_path, self.s_solver_path, "", b_stdin=True
+        )
+        s_stream, _ = process.communicate(s_input.encode())
+        exit_code = process.returncode
+        print(f"Solver process terminated with exit code {exit_code}.\n")
+        if exit_code != 0:
+            raise Exception("There was an error executing the solver.")
+        self.result = LindbladMPOSolver.decode_output_stream(s_stream)
+
+    async def solve_async(self, on_output: Optional[Callable[[str], None]] = None):
+        """Solves the simulation without blocking the event loop, and loads the result dictionaries
+        in a thread pool. If the task is cancelled, the solver process is killed.
+        Args:
+                on_output : An optional function called with each line of the console output of the
+                        solver (its progress and log messages), without the line ending.
+        """
+        lines = self.iter_output_async()
+        try:
+            async for s_line in lines:
+                if on_output is not None:
+                    on_output(s_line)
+        finally:
+            await lines.aclose()
+
+    async def iter_output_async(self):
+        """An asynchronous generator that runs the solver and yields the lines of its console output
+        (without the line endings) as they are written. After the solver terminates, the result
+        dictionaries are loaded in a thread pool and saved in the "result" attribute as in
+        `solve()`. If the iteration is cancelled or stopped early (and the generator is closed),
+        the solver process is killed.
+        """
+        if self.s_input_file == "":
+            self.build()
+        process = await asyncio.create_subprocess_exec(
+            *LindbladMPOSolver._get_solver_command(
+                self.s_cygwin_path, self.s_solver_path, self.s_input_file
+            ),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            limit=LindbladMPOSolver.OUTPUT_LINE_LIMIT,
+        )
+        try:
+            while True:
+                s_line = await process.stdout.readline()
+                if not s_line:
+                    break
+                yield s_line.decode(errors="replace").rstrip("\r\n")
+            exit_code = await process.wait()
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+        if exit_code != 0:
+            raise Exception("There was an error executing the solver.")
+        self.result = await asyncio.get_running_loop().run_in_executor(
+            None, LindbladMPOSolver.load_output, self.s_output_path
+        )
+
+    @staticmethod
+    def follow_output(
+        s_output_path: str,
+        is_running: Optional[Callable[[], bool]] = None,
+        f_poll_interval: float = 1.0,
+        f_min_mtime: float = 0.0,
+    ):
+        """Follows the output files of a solver run, yielding the observables of each time step.
+
+        The solver ends every output time step with a blank line in the text files, and with a
+        complete block of values in the binary files, so a time step can be read once it was
+        written to all the output files of the run.
+        Args:
+                s_output_path : prefix of the output files path. To this string the corresponding file
+                        endings according to each output type will be appended.
+                is_running : A function returning whether the solver is still running. The output
+                        files are followed until it returns False. If None, only the time steps
+                        already written are yielded.
+                f_poll_interval : The time in seconds to wait between checks of the output files.
+                f_min_mtime : Output files last modified before this time (as returned by
+                        `time.time()`) are ignored, until they are rewritten.
+        Yields:
+                (t, result) : The time of an output step, and a dictionary with a ResultStore for
+                        each output type, holding only the observables of that time step.
+        """
+        tails = {}
+        for s_output_type in LindbladMPOSolver.OUTPUT_TYPES:
+            tails[s_output_type] = {
+                "n_indices": LindbladMPOSolver._get_output_type_indices(s_output_type),
+                "filename": "",
+                "offset": 0,
+                "header": None,
+                "steps": deque(),
+            }
+        while True:
+            b_running = is_running is not None and is_running()
+            n_files = LindbladMPOSolver._find_output_tails(
+                tails, s_output_path, f_min_mtime
+            )
+            for tail in tails.values():
+                if tail["filename"]:
+                    LindbladMPOSolver._read_new_steps(tail)
+            # Files created while reading may hold data of time steps that were already read
+            b_stable = (
+                LindbladMPOSolver._find_output_tails(tails, s_output_path, f_min_mtime)
+                == n_files
+            )
+            b_yielded = False
+            while b_stable:
+                step = LindbladMPOSolver._pop_output_step(tails, not b_running)
+                if step is None:
+                    break
+                b_yielded = True
+                yield step
+            if not b_running and b_stable:
+                break
+            if not b_yielded and b_stable:
+                time.sleep(f_poll_interval)
+
+    @staticmethod
+    def _find_output_tails(tails: dict, s_output_path: str, f_min_mtime: float) -> int:
+        """Assigns the output file to be followed for each output type whose file exists, and
+        returns the number of output files being followed."""
+        n_files = 0
+        for s_output_type, tail in tails.items():
+            if not tail["filename"]:
+                full_filename = LindbladMPOSolver._get_data_file_name(
+                    s_output_path, s_output_type
+                )
+                if (
+                    os.path.isfile(full_filename)
+                    and os.path.getmtime(full_filename) >= f_min_mtime
+                ):
+                    tail["filename"] = full_filename
+            if tail["filename"]:
+                n_files += 1
+        return n_files
+
+    @staticmethod
+    def _pop_output_step(tails: dict, b_flush: bool) -> Optional[tuple]:
+        """Returns the earliest time step which was read from all followed output files (or from
+        any of the files if b_flush is True), and removes it from the tails, or None."""
+        steps = [tail["steps"] for tail in tails.values() if tail["filename"]]
+        if len(steps) == 0 or not (b_flush or all(steps)):
+            return None
+        if not any(steps):
+            return None
+        t = min(step_deque[0][0] for step_deque in steps if step_deque)
+        result = {}
+        for s_output_type, tail in tails.items():
+            if tail["steps"] and tail["steps"][0][0] == t:
+                result[s_output_type] = tail["steps"].popleft()[1]
+            else:
+                result[s_output_type] = ResultStore(tail["n_indices"])
+        return t, result
+
+    @staticmethod
+    def _read_new_steps(tail: dict):
+        """Reads the time steps completely written to a followed output file since the last read,
+        and appends them (as tuples of the time and a ResultStore) to the steps of the tail."""
+        full_filename = tail["filename"]
+        n_indices = tail["n_indices"]
+        n_size = os.path.getsize(full_filename)
+        if n_size < tail["offset"]:
+            # The file was rewritten by a new solver run
+            tail["offset"] = 0
+            tail["header"] = None
+            tail["steps"].clear()
+        with open(full_filename, "rb") as file:
+            if full_filename.endswith(".bin"):
+                if tail["header"] is None:
+                    header = LindbladMPOSolver._read_binary_header(file, full_filename)
+                    if header is None:
+                        return
+                    s_byte_order, op_names, columns = header
+                    op_codes, op_names = LindbladMPOSolver._merge_op_names(
+                        columns[:, 0].astype(np.int64), op_names
+                    )
+                    q_indices = columns[:, 1:].astype(np.int64) - 1
+                    tail["header"] = (s_byte_order, op_codes, op_names, q_indices)
+                    tail["offset"] = file.tell()
+                s_byte_order, op_codes, op_names, q_indices = tail["header"]
+                n_block_size = 8 * (1 + len(op_codes))
+                n_steps = (n_size - tail["offset"]) // n_block_size
+                file.seek(tail["offset"])
+                blocks = np.frombuffer(
+                    file.read(n_steps * n_block_size), dtype=s_byte_order + "f8"
+                ).reshape(n_steps, 1 + len(op_codes))
+                tail["offset"] += n_steps * n_block_size
+                for block in blocks:
+                    store = ResultStore.from_blocks(
+                        block[0:1],
+                        block[np.newaxis, 1:],
+                        op_codes,
+                        op_names,
+                        q_indices,
+                        n_indices,
+                    )
+                    tail["steps"].append((float(block[0]), store))
+                return
+            file.seek(tail["offset"])
+            if full_filename.endswith(".gz"):
+                # Each time step is written as a separate gzip member
+                members = []
+                for n_length, s_member in LindbladMPOSolver._read_gzip_members(file):
+                    tail["offset"] += n_length
+                    members.append(s_member)
+                s_data = b"".join(members)
+            else:
+                s_data = file.read(n_size - tail["offset"])
+                # Only time steps terminated by a blank line are complete
+                i_end = s_data.rfind(b"\n\n") + 2
+                if i_end < 2:
+                    return
+                tail["offset"] += i_end
+                s_data = s_data[:i_end]
+        for s_block in s_data.split(b"\n\n"):
+            columns = LindbladMPOSolver._parse_data_chunk(s_block + b"\n", n_indices)
+            if len(columns[0]):
+                store = LindbladMPOSolver._group_data_columns(columns, n_indices)
+                tail["steps"].append((float(columns[0][0]), store))
 
     @staticmethod
     def process_default_paths(
@@ -109,6 +922,7 @@ class LindbladMPOSolver:
                 self.s_input_file: File name of solver input file,
                 self.s_output_prefix: Prefix for solver output path,
                 self.s_id_suffix: The unique id suffix (possibly empty),
+                self.s_parameters_hash: The parameters hash, see `get_parameters_hash()`,
                 All fields are initialized based on the user settings in the parameters dictionary
                 (or default values if not assigned).
 
@@ -119,6 +933,18 @@ class LindbladMPOSolver:
                 Exception: If the build encounters some validation errors, those are given in
                     the error message.
         """
+        s_input = self._build_input(parameters)
+        self.s_parameters_hash = LindbladMPOSolver._get_input_hash(s_input)
+        s_input_file = (self.s_output_path + ".input.txt").replace("\\", "/")
+        print("Creating solver input file:")
+        print(s_input_file)
+        with open(s_input_file, "w") as file:
+            file.write(s_input)
+        self.s_input_file = s_input_file
+
+    def _build_input(self, parameters: Optional[dict] = None) -> str:
+        """Validates the parameters and returns the content of the solver input file, initializing
+        the s_output_path and s_id_suffix member fields."""
         if parameters is not None:
             self.parameters = parameters
         parameters = self.parameters
@@ -141,65 +967,48 @@ class LindbladMPOSolver:
         if s_uuid != "":
             s_id_suffix = "." + s_uuid
         s_output_path += s_id_suffix
-        s_input_file = s_output_path + ".input.txt"
-
-        b_bond_indices = False
-        first_bond_indices = []
-        second_bond_indices = []
-        interactions = []
-        if "J" in parameters.keys():
-            if isinstance(parameters["J"], np.ndarray):
-                interactions.append("J")
-        if "J_z" in parameters.keys():
-            if isinstance(parameters["J_z"], np.ndarray):
-                interactions.append("J_z")
-        if len(interactions) == 2:
-            if parameters["J"].shape == parameters["J_z"].shape:
-                b_bond_indices = True
-                for i in range(parameters["J"].shape[0]):
-                    for j in range(parameters["J"].shape[1]):
-                        if parameters["J"][i, j] != 0 or parameters["J_z"][i, j] != 0:
-                            first_bond_indices.append(i + 1)
-                            second_bond_indices.append(j + 1)
-            else:
-                raise Exception("J and J_z are not of the same size.")
-        elif len(interactions) == 1:
-            b_bond_indices = True
-            for i in range(parameters[interactions[0]].shape[0]):
-                for j in range(parameters[interactions[0]].shape[1]):
-                    if parameters[interactions[0]][i, j] != 0:
-                        first_bond_indices.append(i + 1)
-                        second_bond_indices.append(j + 1)
 
-        print("Creating solver input file:")
-        s_input_file = s_input_file.replace("\\", "/")
-        print(s_input_file)
-        file = open(s_input_file, "w")
+        n_qubits = LindbladMPOSolver._get_number_of_qubits(parameters)
+        couplings = {}
+        for key in ("J", "J_z"):
+            if key in parameters:
+                coupling = LindbladMPOSolver._get_coupling_bonds(
+                    parameters[key], n_qubits
+                )
+                if coupling is not None:
+                    couplings[key] = coupling
+        # The bond indices are written after all the parameters
+        s_bond_lines = ""
+        if couplings:
+            # The bonds of J and J_z are merged (in the order of the matrix rows), and the values of
+            # each coupling are written for all bonds (with zeros where only the other is nonzero)
+            bond_keys = np.unique(
+                np.concatenate([bonds for bonds, _ in couplings.values()])
+            )
+            for key, (bonds, values) in couplings.items():
+                bond_values = np.zeros(len(bond_keys))
+                bond_values[np.searchsorted(bond_keys, bonds)] = values
+                couplings[key] = bond_values
+            s_bond_lines = (
+                "first_bond_indices = "
+                + ",".join(map(str, (bond_keys // n_qubits + 1).tolist()))
+                + "\nsecond_bond_indices = "
+                + ",".join(map(str, (bond_keys % n_qubits + 1).tolist()))
+                + "\n"
+            )
+
+        file = io.StringIO()
         for key in parameters.keys():
-            if key == "b_unique_id" or parameters[key] is None:
+            if key in ("b_unique_id", "result_registry_dir") or parameters[key] is None:
                 pass
             elif key == "output_files_prefix":
                 file.write(key + " = " + s_output_path + "\n")
-            elif (
-                (key in ("J", "J_z"))
-                and isinstance(parameters[key], np.ndarray)
-                and len(parameters[key]) > 1
-            ):
-                # check if to create bond indices arrays
-                not_first_value = False
-                file.write(key + " = ")
-                for i in range(len(first_bond_indices)):
-                    if not_first_value:
-                        file.write(",")
-                    file.write(
-                        str(
-                            parameters[key][
-                                first_bond_indices[i] - 1, second_bond_indices[i] - 1
-                            ]
-                        )
-                    )
-                    not_first_value = True
-                file.write("\n")
+            elif key in ("J", "J_z"):
+                if key in couplings:
+                    s_value = ",".join(map(str, couplings[key].tolist()))
+                else:
+                    s_value = str(np.asarray(parameters[key]).item())
+                file.write(key + " = " + s_value + "\n")
             elif (
                 key == "init_pauli_state"
                 or key == "init_product_state"
@@ -318,907 +1127,1868 @@ class LindbladMPOSolver:
                 file.write("\n")
             else:
                 file.write(key + " = " + str(parameters[key]).strip("[]") + "\n")
-        if b_bond_indices:
-            file.write(
-                "first_bond_indices = "
-                + str(first_bond_indices).strip("[]").replace(" ", "")
-                + "\n"
-            )
-            file.write(
-                "second_bond_indices = "
-                + str(second_bond_indices).strip("[]").replace(" ", "")
-                + "\n"
-            )
-        file.close()
-        self.s_input_file = s_input_file
+        file.write(s_bond_lines)
         self.s_output_path = s_output_path
         self.s_id_suffix = s_id_suffix
+        return file.getvalue()
 
     @staticmethod
-    def execute(s_cygwin_path=None, s_solver_path=None, s_input_file="") -> int:
-        """Execute the simulation solver.
+    def get_parameters_hash(parameters: dict) -> str:
+        """Returns a canonical hash of the parameters of a simulation, identifying its results.
 
-        Args:
-                s_cygwin_path : the path of the cygwin bash terminal execution
-                s_solver_path : the path of the simulator executable
-                s_input_file : input file path, if empty then the simulator is run using default values.
+        The hash is computed from the solver input file built from the parameters, excluding the
+        parameters in PARAMETERS_HASH_EXCLUDED_KEYS, which do not affect the results. The lines of
+        the input file are sorted, such that neither the order of the keys of the dictionary nor
+        the form of the couplings J and J_z (a dense or sparse matrix, or an edge list) changes the
+        hash. Parameters whose values equal the defaults of the solver change the hash if they are
+        given.
 
+        Args:
+                parameters: The model parameters.
         Returns:
-                exit code : the exit code of the solver.
+                The hash, as a hexadecimal string.
         """
-        s_cygwin_path, s_solver_path = LindbladMPOSolver.process_default_paths(
-            s_cygwin_path, s_solver_path
+        parameters = dict(parameters)
+        parameters.pop("b_unique_id", None)
+        return LindbladMPOSolver._get_input_hash(
+            LindbladMPOSolver(parameters, "", "")._build_input()
         )
-        if s_cygwin_path:
-            call_string = s_cygwin_path + ' --login -c "'
-        else:
-            call_string = ""
-        call_string += s_solver_path
-        if s_input_file:
-            call_string += " input_file '" + str(s_input_file) + "'"
-            if s_cygwin_path:
-                call_string += '"'
-        print("Executing solver with command:")
-        print("\t" + call_string + "\n")
-
-        process = subprocess.Popen(call_string, shell=True)
-        exit_code = process.wait()
-        print(f"Solver process terminated with exit code {exit_code}.\n")
-        return exit_code
 
     @staticmethod
-    def load_output(s_output_path: str):
-        """Read the three solver output files and returns a dictionary with the results.
-        Args:
-                s_output_path : prefix of the output files path. To this string the corresponding file
-                        endings according to each output type will be appended.
-        Returns:
-                result : A dictionary with three dictionaries storing the different output types.
-        """
-        result = {}
-        s_output_types = ["obs-1q", "obs-2q", "obs-3q", "obs-cu", "global"]
-        for s_output_type in s_output_types:
-            result[s_output_type] = LindbladMPOSolver._read_data_file(
-                s_output_path, s_output_type
+    def _get_input_hash(s_input: str) -> str:
+        """Returns the parameters hash of the content of a solver input file."""
+        s_lines = sorted(
+            s_line.strip()
+            for s_line in s_input.splitlines()
+            if s_line.strip()
+            and s_line.split(" = ", 1)[0].strip()
+            not in LindbladMPOSolver.PARAMETERS_HASH_EXCLUDED_KEYS
+        )
+        s_lines.insert(0, f"version = {LindbladMPOSolver.PARAMETERS_HASH_VERSION}")
+        return hashlib.sha256("\n".join(s_lines).encode()).hexdigest()
+
+    def _get_result_registry(self) -> Optional[ResultRegistry]:
+        """Returns the result registry of the simulation, or None if it is not set, or if the results
+        of the simulation depend on files that are not described by its parameters (an initial
+        state loaded from files, or output files that are appended to)."""
+        parameters = self.parameters or {}
+        s_directory = parameters.get("result_registry_dir", "")
+        if (
+            not s_directory
+            or not self.s_parameters_hash
+            or parameters.get("load_files_prefix", "")
+            or parameters.get("b_append_output", False)
+        ):
+            return None
+        return ResultRegistry(s_directory)
+
+    def _load_registered_result(self) -> bool:
+        """Loads the results of an identical registered simulation, copying its output files to the
+        output path of this simulation. Returns whether the results were loaded."""
+        registry = self._get_result_registry()
+        if registry is None:
+            return False
+        entry = registry.lookup(self.s_parameters_hash)
+        if entry is None:
+            return False
+        # The output files are reused only if they are in the format requested by the parameters
+        s_output_format, n_output_compression = self._get_output_format()
+        if (
+            entry["output_format"] != s_output_format
+            or entry["output_compression"] != n_output_compression
+        ):
+            return False
+        s_source_path = entry["output_path"]
+        if os.path.abspath(self.s_output_path) != s_source_path:
+            if not LindbladMPOSolver._copy_output_files(
+                s_source_path, self.s_output_path, entry["files"]
+            ):
+                return False
+        print(
+            "Loading the results of an identical simulation, with the output path "
+            + s_source_path
+        )
+        self.result = LindbladMPOSolver.load_output(self.s_output_path)
+        return True
+
+    def _register_result(self):
+        """Registers the output files of the completed simulation in its result registry."""
+        registry = self._get_result_registry()
+        if registry is None:
+            return
+        s_suffixes = []
+        for s_output_type in LindbladMPOSolver.OUTPUT_TYPES:
+            s_data_file = LindbladMPOSolver._get_data_file_name(
+                self.s_output_path, s_output_type
             )
-        return result
+            if os.path.isfile(s_data_file):
+                s_suffixes.append(s_data_file[len(self.s_output_path) :])
+                s_index_file = LindbladMPOSolver._get_index_file_name(s_data_file)
+                if os.path.isfile(s_index_file):
+                    s_suffixes.append(s_index_file[len(self.s_output_path) :])
+        s_endings = [LindbladMPOSolver.RESULT_CACHE_SUFFIX]
+        if self.parameters.get("b_save_final_state", False):
+            s_endings += LindbladMPOSolver.STATE_FILE_SUFFIXES
+        for s_ending in s_endings:
+            if os.path.isfile(self.s_output_path + s_ending):
+                s_suffixes.append(s_ending)
+        registry.register(
+            self.s_parameters_hash,
+            self.s_output_path,
+            s_suffixes,
+            *self._get_output_format(),
+        )
+
+    def _get_output_format(self) -> tuple:
+        """Returns the output format and compression level of the simulation's output files, as
+        given by the `output_format` and `output_compression` parameters or their defaults."""
+        parameters = self.parameters or {}
+        return (
+            str(parameters.get("output_format", "text")),
+            int(parameters.get("output_compression", 0)),
+        )
 
     @staticmethod
-    def _read_data_file(s_output_path: str, s_output_type: str) -> Dict:
-        """Reads one of the solver output files and returns a dictionary with the data.
-        Args:
-                s_output_path : prefix of the output files path. To this string the corresponding file
-                        endings according to each output type will be appended.
-                s_output_type : A string defining the observable type, one of the 1-qubit, 2-qubits,
-                        or global observables.
-        Returns:
-                result : A dictionary with the result.
-        """
-        full_filename = s_output_path + f".{s_output_type}.dat"
-        result = collections.OrderedDict()
-        if os.path.isfile(full_filename):
-            print("Loading output data file: " + full_filename)
-            file = open(full_filename, "r")
-            file.readline()
-            for line in file:
-                words = line.strip().split()
-                if not words:
-                    continue
-                LindbladMPOSolver._read_data_line(s_output_type, words, result)
-            file.close()
-        else:
-            print("Skipping non-existing file: " + full_filename)
-        return result
+    def _copy_output_files(s_source_path: str, s_output_path: str, files: dict) -> bool:
+        """Copies registered output files to another output path. The modification times of the
+        files are copied, keeping the result cache valid. Existing files at the output path are
+        only replaced by copies of the same name. Returns False, without replacing any file, if an
+        output file of another format at the output path is at least as recent as a registered
+        file of the same type (it would then be loaded instead of the copy), or if a copy differs
+        in size or content hash from its registered file (which was modified while copied)."""
+        for s_output_type in LindbladMPOSolver.OUTPUT_TYPES:
+            endings = LindbladMPOSolver.DATA_FILE_ENDINGS
+            stamps = [files.get(f".{s_output_type}{s_ending}") for s_ending in endings]
+            n_mtimes = [stamp[1] for stamp in stamps if stamp is not None]
+            for s_ending, stamp in zip(endings, stamps):
+                s_file = s_output_path + f".{s_output_type}{s_ending}"
+                if n_mtimes and stamp is None and os.path.isfile(s_file):
+                    if os.stat(s_file).st_mtime_ns >= min(n_mtimes):
+                        return False
+        # Each file is copied with a temporary name, verified by its size and content hash, and
+        # then renamed, so that the registered files are not modified by writing to their copies,
+        # even if the two paths are links to one file
+        temp_files = {}
+        try:
+            for s_suffix, (n_size, _, s_hash) in files.items():
+                s_file = s_output_path + s_suffix
+                s_temp_file = f"{s_file}.{uuid.uuid4().hex}.tmp"
+                temp_files[s_temp_file] = s_file
+                shutil.copy2(s_source_path + s_suffix, s_temp_file)
+                if (
+                    os.path.getsize(s_temp_file) != n_size
+                    or ResultRegistry.get_file_hash(s_temp_file) != s_hash
+                ):
+                    return False
+            for s_temp_file, s_file in list(temp_files.items()):
+                os.replace(s_temp_file, s_file)
+                del temp_files[s_temp_file]
+        except OSError:
+            return False
+        finally:
+            for s_temp_file in temp_files:
+                if os.path.isfile(s_temp_file):
+                    os.remove(s_temp_file)
+        return True
 
     @staticmethod
-    def _read_data_line(s_output_type: str, words: list, result: Dict):
-        t = float(words[0])
-        op = words[1]
-        val = float(words[-1])
-        if s_output_type == "obs-1q":
-            q_index1 = int(words[2]) - 1
-            # data files are storing 1-based indices because of iTensor, while we use 0-based indices
-            q_indices = (q_index1,)
-        elif s_output_type == "obs-2q":
-            q_index1 = int(words[2]) - 1
-            # data files are storing 1-based indices because of iTensor, while we use 0-based indices
-            q_index2 = int(words[3]) - 1
-            q_indices = (q_index1, q_index2)
-        elif s_output_type == "obs-3q":
-            q_index1 = int(words[2]) - 1
-            # data files are storing 1-based indices because of iTensor, while we use 0-based indices
-            q_index2 = int(words[3]) - 1
-            q_index3 = int(words[4]) - 1
-            q_indices = (q_index1, q_index2, q_index3)
-        elif s_output_type in ["obs-cu", "global"]:
-            q_indices = ()
+    def _get_coupling_bonds(value, n_qubits: int) -> Optional[tuple]:
+        """Returns the nonzero elements of a coupling matrix (J or J_z) as a tuple of two arrays,
+        holding the bonds (as the row-major indices i * n_qubits + j, sorted) and their values. The
+        coupling can be given as a square matrix (a numpy array or nested lists), a scipy.sparse
+        matrix, or an edge list of (i, j, value) tuples (with 0-based qubit indices, and the
+        values of repeated bonds summed). Returns None if the coupling is a uniform constant."""
+        if scipy.sparse.issparse(value):
+            matrix = scipy.sparse.coo_matrix(value)
+            rows, cols, values = matrix.row, matrix.col, matrix.data
+        elif ParameterSchema.is_edge_list(value):
+            edges = np.array(value, dtype=float)
+            rows = edges[:, 0].astype(int)
+            cols = edges[:, 1].astype(int)
+            values = edges[:, 2]
         else:
-            raise Exception(f"Unknown output type {s_output_type}.")
-        # The result dictionary is indexed by a tuple, first entry is a name, second entry is
-        # a tuple of qubit indices - 0 indices for the global data, 1 for 1Q observables, 2 for 2Q.
-        obs_data = result.get((op.lower(), q_indices), None)
-        # obs_data is a tuple, first entry is a list of times, second entry holds the values.
-        if obs_data is None:
-            obs_data = (list(), list())
-            result[(op.lower(), q_indices)] = obs_data
-        # TODO: optimize the list appends
-        obs_data[0].append(t)
-        obs_data[1].append(val)
+            matrix = np.asarray(value, dtype=float)
+            if matrix.ndim != 2 or matrix.size == 1:
+                return None
+            rows, cols = np.nonzero(matrix)
+            values = matrix[rows, cols]
+        bonds, i_bonds = np.unique(
+            rows.astype(np.int64) * n_qubits + cols, return_inverse=True
+        )
+        values = np.bincount(
+            i_bonds.reshape(-1), weights=values.astype(float), minlength=len(bonds)
+        )
+        b_nonzero = values != 0
+        return bonds[b_nonzero], values[b_nonzero]
 
     @staticmethod
-    # checks if the value is int (for cleaner code)
-    def _is_int(value):
-        return isinstance(value, int)
+    def _get_solver_command(
+        s_cygwin_path: str,
+        s_solver_path: str,
+        s_input_file: str,
+        b_serve: bool = False,
+        args: Optional[dict] = None,
+        b_stdin: bool = False,
+    ) -> list:
+        """Returns the arguments list of the command executing the solver, which is run directly
+        (without a shell) unless it is run using the cygwin bash. The optional args dictionary holds
+        solver parameters passed in the command line, which are overridden by the input file."""
+        command = [s_solver_path]
+        for key, value in (args or {}).items():
+            command += [key, str(value)]
+        if b_serve:
+            command.append("--serve")
+        elif b_stdin:
+            command.append("--stdin")
+        elif s_input_file:
+            command += ["input_file", str(s_input_file)]
+        if s_cygwin_path:
+            s_command = " ".join(shlex.quote(s_arg) for s_arg in command)
+            command = [s_cygwin_path, "--login", "-c", s_command]
+        return command
 
     @staticmethod
-    def is_float(value):
-        """checks if the value is a float (for cleaner code).
+    def _start_process(
+        s_cygwin_path: str,
+        s_solver_path: str,
+        s_input_file: str,
+        b_serve: bool = False,
+        env: Optional[dict] = None,
+        args: Optional[dict] = None,
+        b_stdin: bool = False,
+    ) -> subprocess.Popen:
+        """Starts the simulation solver process, and returns without waiting for it. In the serve
+        mode, the solver reads the simulations to run from its standard input, and both its
+        standard input and output are connected to pipes (in text mode). In the stdin mode, the
+        solver reads the parameters of one simulation from its standard input, and both are
+        connected to pipes in binary mode, for the results stream. If env is not None, it
+        replaces the environment variables of the process. The optional args dictionary holds
+        solver parameters passed in the command line, which are overridden by the input file.
+
+        The solver is executed directly rather than through a shell, so that terminating the
+        process signals the solver itself, which then stops gracefully.
+        """
+        command = LindbladMPOSolver._get_solver_command(
+            s_cygwin_path, s_solver_path, s_input_file, b_serve, args, b_stdin
+        )
+        print("Executing solver with command:")
+        print("\t" + " ".join(shlex.quote(s_arg) for s_arg in command) + "\n")
+        if b_serve:
+            return subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                universal_newlines=True,
+                bufsize=1,
+                env=env,
+            )
+        if b_stdin:
+            return subprocess.Popen(
+                command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env
+            )
+        return subprocess.Popen(command, env=env)
+
+    @staticmethod
+    def solve_many(
+        parameters_list: Iterable[dict],
+        max_workers: Optional[int] = None,
+        threads_per_job: Optional[int] = None,
+        s_cygwin_path: Optional[str] = None,
+        s_solver_path: Optional[str] = None,
+        b_plan_cores: bool = False,
+    ) -> list:
+        """Solves a sweep of simulations, running up to max_workers solver processes concurrently.
+
+        The input files of all simulations are built first, and the results of each simulation are
+        loaded as soon as its solver process terminates. A failure of one simulation (invalid
+        parameters, a solver error, or output paths shared with another simulation of the sweep)
+        does not stop the other simulations; it is reported when the sweep ends, and stored in
+        the `error` attribute of the solver instance of the simulation.
         Args:
-                value : value to test.
+                parameters_list : The model parameters of each simulation. The simulations must have
+                        distinct output file prefixes (or unique ids).
+                max_workers : The maximal number of solver processes running concurrently. If None,
+                        the number of CPUs divided by threads_per_job is used.
+                threads_per_job : If not None, the number of threads each solver process may use,
+                        assigned to the environment variables in THREAD_ENV_VARIABLES, which
+                        control the multithreading of the BLAS/LAPACK libraries.
+                s_cygwin_path : On Windows only, indicates the cygwin executable path.
+                s_solver_path : Indicates the solver executable path.
+                b_plan_cores : If True, max_workers and threads_per_job (if they are None) are
+                        chosen by `plan_cores()`, which runs short calibration simulations.
         Returns:
-                True if value is a float or int.
+                A list with a solver instance of each simulation (in the given order), whose
+                "result" attribute holds the results, or whose "error" attribute is not None.
         """
-        # in python terms the value <4> is not float type, in the simulator context float
-        # can also be a python int:
-        return isinstance(value, (float, int))
+        if b_plan_cores and (max_workers is None or threads_per_job is None):
+            parameters_list = list(parameters_list)
+            plan = LindbladMPOSolver.plan_cores(
+                parameters_list, None, s_cygwin_path, s_solver_path
+            )
+            if max_workers is None:
+                max_workers = plan["max_workers"]
+            if threads_per_job is None:
+                threads_per_job = plan["threads_per_job"]
+            print(
+                f"Running {max_workers} concurrent simulations, "
+                f"with {threads_per_job} threads each."
+            )
+        solvers = []
+        s_output_paths = {}
+        for i_job, parameters in enumerate(parameters_list):
+            solver = LindbladMPOSolver(parameters, s_cygwin_path, s_solver_path)
+            try:
+                solver.build()
+                if solver.s_output_path in s_output_paths:
+                    raise Exception(
+                        "The output path "
+                        + solver.s_output_path
+                        + f" is already used by simulation {s_output_paths[solver.s_output_path]}."
+                    )
+                s_output_paths[solver.s_output_path] = i_job
+            except Exception as error:
+                solver.error = error
+            solvers.append(solver)
+        env = None
+        if threads_per_job is not None:
+            env = dict(os.environ)
+            for s_variable in LindbladMPOSolver.THREAD_ENV_VARIABLES:
+                env[s_variable] = str(threads_per_job)
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 1) // (threads_per_job or 1))
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            futures = {
+                executor.submit(LindbladMPOSolver._solve_job, solver, env): i_job
+                for i_job, solver in enumerate(solvers)
+                if solver.error is None
+            }
+            for n_done, future in enumerate(
+                concurrent.futures.as_completed(futures), 1
+            ):
+                i_job = futures[future]
+                s_status = "failed" if solvers[i_job].error else "completed"
+                print(f"Simulation {i_job} {s_status} ({n_done}/{len(futures)}).")
+        failed_jobs = [
+            i_job for i_job, solver in enumerate(solvers) if solver.error is not None
+        ]
+        if failed_jobs:
+            print(f"{len(failed_jobs)} of {len(solvers)} simulations failed:")
+            for i_job in failed_jobs:
+                print(f"\tSimulation {i_job}: {solvers[i_job].error}")
+        return solvers
 
     @staticmethod
-    # returns the number of qubits based on the given parameters, returns -1 if found an error
-    def _get_number_of_qubits(parameters: Dict) -> int:
-        if "N" in parameters:
-            if LindbladMPOSolver._is_int(parameters["N"]):
-                return parameters["N"]
-        return -1
+    def plan_cores(
+        parameters_list: Iterable[dict],
+        n_cores: Optional[int] = None,
+        s_cygwin_path: Optional[str] = None,
+        s_solver_path: Optional[str] = None,
+        n_calibration_steps: int = 10,
+    ) -> dict:
+        """Chooses the number of concurrent solver processes and the number of threads of each,
+        for solving a sweep of simulations in the shortest time.
 
-    def _virtual_verify_parameters(self, ignore_params: Optional[list] = None) -> str:
-        """An overridable function that verifies the parameters by calling verify_parameters().
+        Short calibration simulations are run with the parameters of the largest simulation of the
+        sweep (with the largest N, and then the largest max_dim_rho), evolved for
+        n_calibration_steps time steps. For each number of threads t (the powers of 2 up to
+        n_cores, and n_cores), as many calibration simulations are run concurrently as the sweep
+        would run with t threads each, measuring their run time under the same load. A model
+        T(t) = a + b / t of the run time is fitted to the measurements, and the number of threads
+        minimizing the run time of the sweep (in rounds of concurrent simulations) is chosen.
+        Since the calibration starts from the initial state, whose bond dimension may be much
+        smaller than later in the evolution, n_calibration_steps should cover the growth of the
+        bond dimension when possible. The calibration simulations are run without the result
+        registry and the propagator cache, which would replace later runs by copies of earlier ones.
 
         Args:
-                ignore_params: A list with parameter names that this solver does not recognize, but
-                        should be ignored in the verification (so that an error message for unknown
-                        parameters is not issued). This is useful for derived classes.
+                parameters_list : The model parameters of each simulation of the sweep.
+                n_cores : The number of cores to use. If None, the number of CPUs is used.
+                s_cygwin_path : On Windows only, indicates the cygwin executable path.
+                s_solver_path : Indicates the solver executable path.
+                n_calibration_steps : The number of time steps of the calibration simulations.
         Returns:
-                A detailed error message if parameters arguments are not in the correct format (which
-                        is stated in the spec of the simulator). Otherwise, returns "" (checks passed).
+                A dictionary with the keys "max_workers" and "threads_per_job" (the arguments of
+                `solve_many()`), and "run_times", a dictionary of the measured run time in seconds
+                of a calibration simulation for each number of threads.
         """
-        return LindbladMPOSolver.verify_parameters(self.parameters, ignore_params)
+        parameters_list = list(parameters_list)
+        if not parameters_list:
+            raise Exception("The sweep has no simulations to plan.")
+        if n_cores is None:
+            n_cores = os.cpu_count() or 1
+        n_jobs = len(parameters_list)
+        parameters = max(
+            parameters_list,
+            key=lambda p: (
+                p.get("N", 0),
+                p.get("max_dim_rho", LindbladMPOSolver.DEFAULT_MAX_DIM_RHO),
+            ),
+        )
+        # The calibration simulations are all run (rather than loaded from the result registry, or
+        # reusing cached propagators), so that the measured run times are comparable
+        parameters = {
+            key: value
+            for key, value in parameters.items()
+            if key
+            not in (
+                "unique_id",
+                "b_unique_id",
+                "progress_file",
+                "checkpoint_step",
+                "b_save_final_state",
+                "result_registry_dir",
+                "propagator_cache_dir",
+                "metadata",
+            )
+        }
+        t_init = parameters.get("t_init", 0.0)
+        parameters["t_final"] = t_init + n_calibration_steps * parameters.get(
+            "tau", 0.1
+        )
+        threads = [
+            t for t in (2**i for i in range(n_cores.bit_length())) if t <= n_cores
+        ]
+        if threads[-1] != n_cores:
+            threads.append(n_cores)
+        run_times = {}
+        s_temp_dir = tempfile.mkdtemp()
+        try:
+            for t in threads:
+                n_workers = min(n_cores // t, n_jobs)
+                calibration_list = [
+                    dict(
+                        parameters,
+                        output_files_prefix=os.path.join(
+                            s_temp_dir, f"calibration{t}.{i}"
+                        ),
+                    )
+                    for i in range(n_workers)
+                ]
+                f_start_time = time.perf_counter()
+                solvers = LindbladMPOSolver.solve_many(
+                    calibration_list, n_workers, t, s_cygwin_path, s_solver_path
+                )
+                run_times[t] = time.perf_counter() - f_start_time
+                for solver in solvers:
+                    if solver.error is not None:
+                        raise Exception(
+                            f"The calibration simulation failed: {solver.error}"
+                        )
+        finally:
+            shutil.rmtree(s_temp_dir, ignore_errors=True)
+        n_threads = LindbladMPOSolver._choose_core_plan(run_times, n_cores, n_jobs)
+        return {
+            "max_workers": min(n_cores // n_threads, n_jobs),
+            "threads_per_job": n_threads,
+            "run_times": run_times,
+        }
 
     @staticmethod
-    def verify_parameters(
-        parameters: dict, ignore_params: Optional[list] = None
-    ) -> str:
-        """Returns a detailed Error message if parameters are not in the correct format.
+    def _choose_core_plan(run_times: dict, n_cores: int, n_jobs: int) -> int:
+        """Fits the model T(t) = a + b / t to the run times of a simulation with t threads, and
+        returns the number of threads per simulation minimizing the run time of n_jobs simulations
+        on n_cores cores."""
+        threads = np.array(list(run_times.keys()), dtype=float)
+        times = np.array(list(run_times.values()), dtype=float)
+        if len(threads) > 1:
+            matrix = np.stack([np.ones_like(threads), 1.0 / threads], axis=1)
+            a, b = np.maximum(np.linalg.lstsq(matrix, times, rcond=None)[0], 0.0)
+        else:
+            a, b = times[0], 0.0
+        n_threads = 1
+        f_min_time = None
+        for t in range(1, n_cores + 1):
+            n_workers = min(n_cores // t, n_jobs)
+            f_time = ceil(n_jobs / n_workers) * (a + b / t)
+            if f_min_time is None or f_time < f_min_time * (1.0 - 1e-9):
+                n_threads, f_min_time = t, f_time
+        return n_threads
+
+    @staticmethod
+    def _solve_job(solver, env: Optional[dict]):
+        """Runs the solver process of a built simulation and loads its results, storing a failure
+        in the error attribute of the solver instead of raising it."""
+        try:
+            if solver._load_registered_result():
+                return
+            process = LindbladMPOSolver._start_process(
+                solver.s_cygwin_path, solver.s_solver_path, solver.s_input_file, env=env
+            )
+            exit_code = process.wait()
+            if exit_code != 0:
+                raise Exception(
+                    f"There was an error executing the solver (exit code {exit_code})."
+                )
+            solver.result = LindbladMPOSolver.load_output(solver.s_output_path)
+            solver._register_result()
+        except Exception as error:
+            solver.error = error
+
+    @staticmethod
+    def execute(s_cygwin_path=None, s_solver_path=None, s_input_file="") -> int:
+        """Execute the simulation solver.
 
         Args:
-                parameters: A dictionary of solver parameters.
-                ignore_params: A list with parameter names that this solver does not recognize, but
-                        should be ignored in the verification (so that an error message for unknown
-                        parameters is not issued). This is mostly useful for derived subclasses.
+                s_cygwin_path : the path of the cygwin bash terminal execution
+                s_solver_path : the path of the simulator executable
+                s_input_file : input file path, if empty then the simulator is run using default values.
+
         Returns:
-                A detailed error message if parameters are not in the correct format.
-                Otherwise, returns "" (checks passed).
+                exit code : the exit code of the solver.
         """
-        check_msg = ""
-        if parameters is None:
-            check_msg += "Error 100: The `parameters` dictionary must be assigned\n"
-            return check_msg
-        if (
-            ("N" not in parameters)
-            or ("t_final" not in parameters)
-            or ("tau" not in parameters)
-        ):
-            check_msg += (
-                "Error 110: N, t_final and tau must be defined as they do not have default "
-                "values\n"
+        s_cygwin_path, s_solver_path = LindbladMPOSolver.process_default_paths(
+            s_cygwin_path, s_solver_path
+        )
+        process = LindbladMPOSolver._start_process(
+            s_cygwin_path, s_solver_path, s_input_file
+        )
+        exit_code = process.wait()
+        print(f"Solver process terminated with exit code {exit_code}.\n")
+        return exit_code
+
+    @staticmethod
+    def load_output(
+        s_output_path: str,
+        observables: Optional[Iterable[str]] = None,
+        qubits: Optional[Iterable[int]] = None,
+        t_range: Optional[tuple] = None,
+        types: Optional[Iterable[str]] = None,
+        n_workers: int = 1,
+        b_use_cache: bool = True,
+    ):
+        """Read the solver output files and returns a dictionary with the results.
+
+        The optional filters are applied while the files are parsed, so data that is not
+        requested is never stored. Without filters, the parsed results are saved to a cache file
+        (the output path with the ending ".result.npz"), which is used by later calls as long as
+        the sizes and modification times of the output files are unchanged.
+        Args:
+                s_output_path : prefix of the output files path. To this string the corresponding file
+                        endings according to each output type will be appended.
+                observables : If not None, only the operators (or global quantities and custom
+                        observables) with these names (case insensitive) are loaded.
+                qubits : If not None, only observables all of whose (0-based) qubit indices are in
+                        this collection are loaded. Global data and custom observables are not
+                        filtered by their qubits.
+                t_range : If not None, a tuple (t_min, t_max) such that only the data at times
+                        t_min <= t <= t_max are loaded. Either limit can be None.
+                types : If not None, only the output files of these types are read, and the
+                        results of the other types are left empty.
+                n_workers : The number of worker processes parsing the output files in the text
+                        format. If larger than 1, the files are parsed in parallel (by at most
+                        one worker per core), with large files split into parts of whole time
+                        steps. Small files are parsed by the calling process. On platforms
+                        starting processes by spawning (such as Windows), the calling script must
+                        be protected by `if __name__ == "__main__":`.
+                b_use_cache : Whether to use the cache file of the results, and create or update it
+                        if needed. The cache is not used if any filter is given.
+        Returns:
+                result : A dictionary with a ResultStore for each of the different output types.
+        """
+        filters = LindbladMPOSolver._get_output_filters(observables, qubits, t_range)
+        s_output_types = LindbladMPOSolver.OUTPUT_TYPES
+        if types is not None:
+            types = set(types)
+            for s_output_type in types:
+                LindbladMPOSolver._get_output_type_indices(s_output_type)
+            s_output_types = [s for s in LindbladMPOSolver.OUTPUT_TYPES if s in types]
+        b_use_cache = b_use_cache and filters is None
+        cached_result = {}
+        stamps = {}
+        if b_use_cache:
+            for s_output_type in s_output_types:
+                stamps[s_output_type] = LindbladMPOSolver._get_output_file_stamp(
+                    s_output_path, s_output_type
+                )
+            cached_result = LindbladMPOSolver._read_result_cache(s_output_path, stamps)
+            if cached_result:
+                print(
+                    "Loaded cached output data: "
+                    + s_output_path
+                    + LindbladMPOSolver.RESULT_CACHE_SUFFIX
+                )
+            s_output_types = [s for s in s_output_types if s not in cached_result]
+        if n_workers > 1 and s_output_types:
+            result = LindbladMPOSolver._read_data_files_parallel(
+                s_output_path, s_output_types, filters, n_workers
             )
-            return check_msg
-        N = LindbladMPOSolver._get_number_of_qubits(parameters)
-        for key in dict.keys(parameters):
-            if parameters[key] is None or (
-                isinstance(parameters[key], str) and "" == parameters[key]
-            ):  # ignore empty entrances/space holders <"">
-                continue
-            flag_continue = False
+        else:
+            result = {}
+            for s_output_type in s_output_types:
+                result[s_output_type] = LindbladMPOSolver._read_data_file(
+                    s_output_path, s_output_type, filters
+                )
+        if b_use_cache and s_output_types:
+            LindbladMPOSolver._write_result_cache(
+                s_output_path,
+                {
+                    s_output_type: result[s_output_type]
+                    for s_output_type in s_output_types
+                },
+                stamps,
+            )
+        result.update(cached_result)
+        for s_output_type in LindbladMPOSolver.OUTPUT_TYPES:
+            if s_output_type not in result:
+                result[s_output_type] = ResultStore(
+                    LindbladMPOSolver._get_output_type_indices(s_output_type)
+                )
+        return {
+            s_output_type: result[s_output_type]
+            for s_output_type in LindbladMPOSolver.OUTPUT_TYPES
+        }
 
-            if key == "N":
-                if not LindbladMPOSolver._is_int(parameters[key]):
-                    check_msg += "Error 120: " + key + " should be an integer\n"
-                    continue
-                if parameters[key] <= 0:
-                    check_msg += (
-                        "Error 130: " + key + " should be bigger/equal to 1 (integer)\n"
-                    )
-                    continue
-            elif key == "t_init" or key == "t_final" or key == "tau":
-                if not LindbladMPOSolver.is_float(parameters[key]):
-                    check_msg += "Error 140: " + key + " is not a float\n"
-                    continue
-                if key == "tau" and parameters[key] <= 0:
-                    check_msg += "Error 150: " + key + " must be larger than 0\n"
-                    continue
-                if key == "t_init" and parameters[key] > parameters["t_final"]:
-                    check_msg += (
-                        "Error 151: " + key + " must be equal or smaller than t_final\n"
-                    )
-                    continue
-            elif (key == "l_x") or (key == "l_y"):
-                if not LindbladMPOSolver._is_int(parameters[key]):
-                    check_msg += "Error 160: " + key + " should be an integer\n"
-                    continue
-                if parameters[key] < 0:
-                    check_msg += (
-                        "Error 170: "
-                        + key
-                        + " should be equal to or larger than 0 (integer)\n"
-                    )
-                    continue
-            elif (
-                key == "output_step"
-                or key == "force_rho_hermitian_step"
-                or key == "force_rho_hermitian_gates"
-            ):
-                if not LindbladMPOSolver._is_int(parameters[key]):
-                    check_msg += "Error 180: " + key + " should be an integer\n"
-                    continue
-                if parameters[key] < 0:
-                    check_msg += (
-                        "Error 190: "
-                        + key
-                        + " should be equal to or larger than 0 (integer)\n"
-                    )
-                    continue
-            elif (
-                (key == "h_x")
-                or (key == "h_y")
-                or (key == "h_z")
-                or (key == "g_0")
-                or (key == "g_1")
-                or (key == "g_2")
-                or (key == "g_3")
-                or (key == "g_4")
-            ):
-                if LindbladMPOSolver.is_float(parameters[key]):
-                    continue
-                if N == -1:
-                    check_msg += (
-                        "Error 200: " + key + " could not be validated because 'N' "
-                        "(or alternatively l_x, l_y) are not "
-                        "defined properly\n "
-                    )
-                    continue
-                if isinstance(parameters[key], list):
-                    if len(parameters[key]) != N:
-                        check_msg += (
-                            "Error 210: " + key + " is not a float / N-length list / "
-                            "numpy array (of floats)\n"
-                        )
-                        continue
-                    for element in parameters[key]:
-                        if not LindbladMPOSolver.is_float(element):
-                            check_msg += (
-                                "Error 220: " + key + "is not a float / N-length list "
-                                "/ numpy array (of floats)\n "
-                            )
-                            flag_continue = True
-                            break
-                    if flag_continue:
-                        continue
-                elif isinstance(parameters[key], np.ndarray):
-                    if (str((parameters[key]).dtype).find("int") == -1) and (
-                        str((parameters[key]).dtype).find("float") == -1
-                    ):
-                        check_msg += (
-                            "Error 230: " + key + " is not a float / N-length list / "
-                            "numpy array (of floats)\n"
-                        )
-                        continue
-                    if parameters[key].size == 1:
-                        continue
-                    if (parameters[key].shape[0] != N) or (
-                        parameters[key].shape[0] != parameters[key].size
+    @staticmethod
+    def _get_output_file_stamp(s_output_path: str, s_output_type: str) -> np.ndarray:
+        """Returns an array identifying the current contents of the output file of the given type,
+        holding the file format (0 for a missing file, 1 for text, 2 for binary and 3 for compressed
+        text), the file size and its modification time in nanoseconds."""
+        full_filename = LindbladMPOSolver._get_data_file_name(
+            s_output_path, s_output_type
+        )
+        if not os.path.isfile(full_filename):
+            return np.array([0, -1, -1], dtype=np.int64)
+        stat = os.stat(full_filename)
+        n_format = 1
+        if full_filename.endswith(".bin"):
+            n_format = 2
+        elif full_filename.endswith(".gz"):
+            n_format = 3
+        return np.array([n_format, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+    @staticmethod
+    def _read_result_cache(s_output_path: str, stamps: dict) -> dict:
+        """Reads the results of the given output types from the cache file, if they were saved
+        from output files with the given stamps, returning a dictionary of those results."""
+        s_cache_file = s_output_path + LindbladMPOSolver.RESULT_CACHE_SUFFIX
+        result = {}
+        if not os.path.isfile(s_cache_file):
+            return result
+        try:
+            with np.load(s_cache_file, allow_pickle=False) as cache:
+                if int(cache["version"]) != LindbladMPOSolver.RESULT_CACHE_VERSION:
+                    return result
+                for s_output_type, stamp in stamps.items():
+                    s_stamp_key = s_output_type + ".stamp"
+                    if s_stamp_key in cache and np.array_equal(
+                        cache[s_stamp_key], stamp
                     ):
-                        check_msg += (
-                            "Error 240: " + key + " is not a float / N-length list / "
-                            "numpy array (of floats)\n"
-                        )
-                        continue
-                else:
-                    check_msg += (
-                        "Error 250: " + key + " is not a float / N-length list / numpy "
-                        "array (of floats)\n"
-                    )
-                    continue
-            elif (key == "J_z") or (key == "J"):
-                if LindbladMPOSolver.is_float(parameters[key]):
-                    continue
-                if N == -1:
-                    check_msg += (
-                        "Error 260: " + key + " could not be validated because 'N' "
-                        "(or alternatively l_x, l_y) are not "
-                        "defined properly\n"
-                    )
-                    continue
-                if isinstance(parameters[key], list):
-                    if len(parameters[key]) != N:
-                        check_msg += (
-                            "Error 270: "
-                            + key
-                            + " should be a constant, or a square matrix"
-                            " (nested lists/np.array) of N^2 floats\n "
+                        result[s_output_type] = ResultStore.from_arrays(
+                            LindbladMPOSolver._get_cache_arrays(cache, s_output_type)
                         )
-                        continue
-                    for lst in parameters[key]:
-                        if not isinstance(lst, list):
-                            check_msg += (
-                                "Error 280: "
-                                + key
-                                + "should be a constant, or a square "
-                                "matrix (nested lists/np.array) of "
-                                "floats with a size N^2\n "
-                            )
-                            flag_continue = True
-                            break
-                        if len(lst) != N:
-                            check_msg += (
-                                "Error 290: "
-                                + key
-                                + "should be a constant, or a square matrix (nested "
-                                "lists/np.array) with N^2 floats\n"
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            # A damaged cache file is ignored, and replaced
+            return {}
+        return result
+
+    @staticmethod
+    def _get_cache_arrays(cache, s_output_type: str) -> dict:
+        s_prefix = s_output_type + "."
+        return {
+            key[len(s_prefix) :]: cache[key]
+            for key in cache.files
+            if key.startswith(s_prefix)
+        }
+
+    @staticmethod
+    def _write_result_cache(s_output_path: str, result: dict, stamps: dict):
+        """Saves to the cache file the results of output files whose stamps are unchanged since
+        before they were read, keeping the results of other output types that are still valid."""
+        s_cache_file = s_output_path + LindbladMPOSolver.RESULT_CACHE_SUFFIX
+        arrays = {}
+        s_old_types = [
+            s_output_type
+            for s_output_type in LindbladMPOSolver.OUTPUT_TYPES
+            if s_output_type not in result
+        ]
+        old_stamps = {
+            s_output_type: LindbladMPOSolver._get_output_file_stamp(
+                s_output_path, s_output_type
+            )
+            for s_output_type in s_old_types
+        }
+        result = dict(result)
+        result.update(LindbladMPOSolver._read_result_cache(s_output_path, old_stamps))
+        stamps = dict(stamps)
+        stamps.update(old_stamps)
+        for s_output_type, store in result.items():
+            stamp = LindbladMPOSolver._get_output_file_stamp(
+                s_output_path, s_output_type
+            )
+            if not np.array_equal(stamp, stamps[s_output_type]):
+                # The output file was modified while it was read
+                continue
+            arrays[s_output_type + ".stamp"] = stamp
+            for key, array in store.to_arrays().items():
+                arrays[f"{s_output_type}.{key}"] = array
+        if not arrays:
+            return
+        arrays["version"] = np.array(LindbladMPOSolver.RESULT_CACHE_VERSION)
+        s_temp_file = f"{s_cache_file}.{os.getpid()}.tmp.npz"
+        try:
+            np.savez(s_temp_file, **arrays)
+            os.replace(s_temp_file, s_cache_file)
+        except OSError:
+            # The output directory may be read-only, the output files are then parsed on each load
+            if os.path.isfile(s_temp_file):
+                os.remove(s_temp_file)
+
+    @staticmethod
+    def rebuild_result_caches(
+        s_directory: str, b_recursive: bool = True, b_force: bool = False
+    ) -> list:
+        """Creates or updates the result cache files of all solver outputs in a directory.
+        Args:
+                s_directory : The directory in which the output files are searched.
+                b_recursive : Whether to search the subdirectories as well.
+                b_force : Whether to rebuild also cache files that are valid.
+        Returns:
+                The list of output paths (the prefixes of the output files) that were found.
+        """
+        s_output_paths = LindbladMPOSolver._find_output_paths(s_directory, b_recursive)
+        for s_output_path in s_output_paths:
+            s_cache_file = s_output_path + LindbladMPOSolver.RESULT_CACHE_SUFFIX
+            if b_force and os.path.isfile(s_cache_file):
+                os.remove(s_cache_file)
+            LindbladMPOSolver.load_output(s_output_path)
+        return s_output_paths
+
+    @staticmethod
+    def purge_result_caches(s_directory: str, b_recursive: bool = True) -> list:
+        """Deletes the result cache files in a directory.
+        Args:
+                s_directory : The directory in which the cache files are searched.
+                b_recursive : Whether to search the subdirectories as well.
+        Returns:
+                The list of deleted files.
+        """
+        s_deleted_files = []
+        for s_dir, s_file_names in LindbladMPOSolver._walk_directory(
+            s_directory, b_recursive
+        ):
+            for s_file_name in s_file_names:
+                if s_file_name.endswith(LindbladMPOSolver.RESULT_CACHE_SUFFIX):
+                    s_cache_file = os.path.join(s_dir, s_file_name)
+                    os.remove(s_cache_file)
+                    s_deleted_files.append(s_cache_file)
+        return s_deleted_files
+
+    @staticmethod
+    def _find_output_paths(s_directory: str, b_recursive: bool) -> list:
+        """Returns the sorted list of the output paths of all solver output files in a directory."""
+        s_output_paths = set()
+        for s_dir, s_file_names in LindbladMPOSolver._walk_directory(
+            s_directory, b_recursive
+        ):
+            for s_file_name in s_file_names:
+                for s_output_type in LindbladMPOSolver.OUTPUT_TYPES:
+                    for s_ending in LindbladMPOSolver.DATA_FILE_ENDINGS:
+                        s_suffix = f".{s_output_type}{s_ending}"
+                        if s_file_name.endswith(s_suffix):
+                            s_output_paths.add(
+                                os.path.join(s_dir, s_file_name[: -len(s_suffix)])
                             )
-                            flag_continue = True
-                            break
-                        for val in lst:
-                            if not LindbladMPOSolver.is_float(val):
-                                check_msg += (
-                                    "Error 300: "
-                                    + key
-                                    + "should be a constant, or a square matrix (nested "
-                                    "lists/np.array) in the size of number_of_qubits^2 "
-                                    "of floats\n"
-                                )
-                                flag_continue = True
-                                break
-                        if flag_continue:
-                            break
-                    if flag_continue:
-                        continue
-                elif isinstance(parameters[key], np.ndarray):
-                    if (str((parameters[key]).dtype).find("int") == -1) and (
-                        str((parameters[key]).dtype).find("float") == -1
-                    ):
-                        check_msg += (
-                            "Error 310: "
-                            + key
-                            + "should be a constant, or a square matrix (nested "
-                            "lists/np.array) in the size of number_of_qubits^2 of "
-                            "floats\n"
-                        )
-                        continue
-                    if parameters[key].size == 1:
-                        continue
-                    if parameters[key].shape[0] != N:
-                        check_msg += (
-                            "Error 320: "
-                            + key
-                            + "should be a constant, or a square matrix (nested "
-                            "lists/np.array) in the size of number_of_qubits^2 of "
-                            "floats\n"
-                        )
-                        continue
-                    if parameters[key].shape[0] ** 2 != parameters[key].size:
-                        check_msg += (
-                            "Error 330: "
-                            + key
-                            + "should be a constant, or a square matrix (nested "
-                            "lists/np.array) in the size of number_of_qubits^2 of "
-                            "floats\n"
-                        )
-                        continue
-                else:
-                    check_msg += (
-                        "Error 340: "
-                        + key
-                        + " should be a constant, or a square matrix (nested "
-                        "list/np.array) in the size of number_of_qubits^2 of floats\n"
-                    )
-                    continue
-            elif (
-                key == "apply_gates" or key == "custom_observables" or key == "collapse"
-            ):
-                if (
-                    not isinstance(parameters[key], tuple)
-                    and not isinstance(parameters[key], list)
-                    and not isinstance(parameters[key], np.ndarray)
-                ):
-                    check_msg += (
-                        "Error 345: "
-                        + key
-                        + " must be a tuple or a list/ array of tuples\n"
+        return sorted(s_output_paths)
+
+    @staticmethod
+    def _walk_directory(s_directory: str, b_recursive: bool):
+        for s_dir, _, s_file_names in os.walk(s_directory):
+            yield s_dir, s_file_names
+            if not b_recursive:
+                break
+
+    @staticmethod
+    def _read_data_files_parallel(
+        s_output_path: str,
+        s_output_types: list,
+        filters: Optional[dict],
+        n_workers: int,
+    ) -> dict:
+        """Reads solver output files using a pool of worker processes, returning a dictionary with
+        a ResultStore for each of the given output types.
+
+        The output files in the text format are split into parts holding whole time steps, which
+        are parsed by the workers. Each worker reads its part of the file, and is passed only the
+        byte range of the part. The parts of all files are submitted before any results are
+        collected, so the files are parsed in parallel. Files in the binary format are
+        memory-mapped, and read by the calling process. The number of workers is limited to the
+        number of cores, and the files are parsed by the calling process if there is a single
+        core or if their total size is less than DATA_FILE_PARALLEL_MIN_SIZE.
+        """
+        n_workers = min(n_workers, os.cpu_count() or 1)
+        result = {}
+        file_parts = {}
+        n_total_size = 0
+        for s_output_type in s_output_types:
+            full_filename = LindbladMPOSolver._get_data_file_name(
+                s_output_path, s_output_type
+            )
+            if not os.path.isfile(full_filename) or full_filename.endswith(".bin"):
+                result[s_output_type] = LindbladMPOSolver._read_data_file(
+                    s_output_path, s_output_type, filters
+                )
+                continue
+            print("Loading output data file: " + full_filename)
+            n_start, n_end = LindbladMPOSolver._get_data_file_filter_range(
+                full_filename, filters
+            )
+            n_stop = os.path.getsize(full_filename) if n_end is None else n_end
+            n_total_size += n_stop - n_start
+            file_parts[s_output_type] = (full_filename, n_start, n_end)
+        if (
+            n_workers <= 1
+            or n_total_size < LindbladMPOSolver.DATA_FILE_PARALLEL_MIN_SIZE
+        ):
+            for s_output_type, (full_filename, n_start, n_end) in file_parts.items():
+                n_indices = LindbladMPOSolver._get_output_type_indices(s_output_type)
+                columns = LindbladMPOSolver._parse_data_range(
+                    full_filename, n_indices, filters, n_start, n_end
+                )
+                result[s_output_type] = LindbladMPOSolver._group_data_columns(
+                    columns, n_indices
+                )
+            return result
+        for s_output_type, (full_filename, n_start, n_end) in file_parts.items():
+            file_parts[s_output_type] = (
+                full_filename,
+                LindbladMPOSolver._split_data_file_range(
+                    full_filename, n_start, n_end, 4 * n_workers
+                ),
+            )
+        with concurrent.futures.ProcessPoolExecutor(n_workers) as executor:
+            futures = {}
+            for s_output_type, (full_filename, parts) in file_parts.items():
+                n_indices = LindbladMPOSolver._get_output_type_indices(s_output_type)
+                futures[s_output_type] = [
+                    executor.submit(
+                        LindbladMPOSolver._parse_data_range,
+                        full_filename,
+                        n_indices,
+                        filters,
+                        n_start,
+                        n_end,
                     )
-                    continue
-                custom_list = (
-                    [parameters[key]]
-                    if isinstance(parameters[key], tuple)
-                    else parameters[key]
+                    for n_start, n_end in parts
+                ]
+            for s_output_type, part_futures in futures.items():
+                n_indices = LindbladMPOSolver._get_output_type_indices(s_output_type)
+                columns = LindbladMPOSolver._concatenate_data_columns(
+                    [future.result() for future in part_futures], n_indices
                 )
-                if key == "apply_gates":
-                    for g_tuple in custom_list:
-                        tuple_len = len(g_tuple)
-                        if tuple_len < 3 or tuple_len > 4:
-                            check_msg += (
-                                "Error 346: every member of "
-                                + key
-                                + " must be of 3 or 4 elements\n"
-                            )
-                            continue
-                        if (
-                            not LindbladMPOSolver.is_float(g_tuple[0])
-                            or not isinstance(g_tuple[1], str)
-                            or not LindbladMPOSolver._is_int(g_tuple[2])
-                            or (
-                                tuple_len > 3
-                                and not LindbladMPOSolver._is_int(g_tuple[3])
-                            )
-                        ):
-                            check_msg += (
-                                "Error 347: each member of "
-                                + key
-                                + " must be a tuple of the form"
-                                " (time, gate name, qubit, [qubit])\n"
-                            )
-                            continue
-                else:  # Hence key == "custom_observables" or key == "collapse"
-                    b_is_collapse = key == "collapse"
-                    for g_tuple in custom_list:
-                        tuple_len = len(g_tuple)
-                        if (
-                            tuple_len != 2
-                            or not isinstance(g_tuple[0], tuple)
-                            or len(g_tuple[0]) != 2
-                            or not isinstance(g_tuple[1], list)
-                        ):
-                            check_msg += (
-                                "Error 341: every member of "
-                                + key
-                                + " must be a 2-tuple of a 2-tuple and a list\n"
-                            )
-                            continue
-                        obs_type = g_tuple[0][1]
-                        if not isinstance(g_tuple[0][0], str):
-                            check_msg += (
-                                "Error 342: each member of the first element of"
-                                + key
-                                + " must be a tuple of the form"
-                                " (obs_name, obs_type)\n"
-                            )
-                            continue
-                        if b_is_collapse:
-                            if obs_type != "o":
-                                check_msg += (
-                                    "Error 342: each member of the first element of"
-                                    + key
-                                    + " must be a tuple of the form"
-                                    " (obs_name, obs_type), with obs_type being 'o' to indicate"
-                                    " a 1Q operator expansion\n"
-                                )
-                                continue
-                        elif obs_type != "g" and obs_type != "o":
-                            check_msg += (
-                                "Error 342: each member of the first element of"
-                                + key
-                                + " must be a tuple of the form (obs_name, obs_type),"
-                                " with obs_type being either 'g' or 'o' to indicate"
-                                " a gate-based observable or a 1Q operator expansion\n"
-                            )
-                            continue
-                        for o_tuple in g_tuple[1]:
-                            # tuple_len = len(o_tuple)
-                            if obs_type == "g" and (
-                                not isinstance(o_tuple[0], str)
-                                or not LindbladMPOSolver._is_int(o_tuple[1])
-                            ):
-                                check_msg += (
-                                    "Error 343: each member of gate-based component of"
-                                    + key
-                                    + " must be a tuple of the form"
-                                    " (gate_name, q0, q1, ...)\n"
-                                )
-                                continue
-                            if obs_type == "o" and (
-                                not isinstance(o_tuple[0], str)
-                                or not LindbladMPOSolver._is_int(o_tuple[1])
-                            ):
-                                check_msg += (
-                                    "Error 343: each member of an operator-based component of"
-                                    + key
-                                    + " must be a tuple of the form"
-                                    " (operator name, qubit)\n"
-                                )
-                                continue
+                result[s_output_type] = LindbladMPOSolver._group_data_columns(
+                    columns, n_indices
+                )
+        return result
 
-            elif (key == "init_pauli_state") or (key == "init_product_state"):
+    @staticmethod
+    def _split_data_file_range(
+        full_filename: str, n_start: int, n_end: Optional[int], n_parts: int
+    ) -> list:
+        """Splits a byte range of an output file in the text format into up to n_parts parts of at
+        least DATA_FILE_MIN_PART_SIZE bytes, returning a list of (n_start, n_end) tuples. The end
+        of the last part is None if the range extends to the end of the file. The parts are split
+        after the blank lines ending the time steps, so that each part is parsed by whole time
+        steps. A compressed file is split at the gzip members of the time steps."""
+        n_stop = os.path.getsize(full_filename) if n_end is None else n_end
+        n_parts = min(
+            n_parts,
+            max(1, (n_stop - n_start) // LindbladMPOSolver.DATA_FILE_MIN_PART_SIZE),
+        )
+        boundaries = [n_start]
+        if full_filename.endswith(".gz") and n_parts > 1:
+            # A compressed file can only be split between gzip members, found in the index
+            offsets = LindbladMPOSolver._update_data_file_index(full_filename)[1]
+            for i_part in range(1, n_parts):
+                n_position = n_start + (n_stop - n_start) * i_part // n_parts
+                i_offset = np.searchsorted(offsets, n_position, side="left")
                 if (
-                    not isinstance(parameters[key], (str, float, tuple))
-                    and not isinstance(parameters[key], list)
-                    and not isinstance(parameters[key], np.ndarray)
+                    i_offset < len(offsets)
+                    and boundaries[-1] < offsets[i_offset] < n_stop
                 ):
-                    check_msg += (
-                        "Error 350: "
-                        + key
-                        + " must be a string, float, tuple or a list/ array of strings/floats/tuples\n"
-                    )
-                    continue
-                init_list = (
-                    [parameters[key]]
-                    if isinstance(parameters[key], (str, float, tuple))
-                    else parameters[key]
+                    boundaries.append(int(offsets[i_offset]))
+            boundaries.append(n_end)
+            return list(zip(boundaries[:-1], boundaries[1:]))
+        with open(full_filename, "rb") as file:
+            for i_part in range(1, n_parts):
+                n_position = n_start + (n_stop - n_start) * i_part // n_parts
+                # Move the boundary forward to the beginning of the next time step, searching
+                # from the byte before, in case the boundary falls just after a newline
+                n_position = max(n_position - 1, boundaries[-1])
+                file.seek(n_position)
+                s_tail = b""
+                while True:
+                    s_data = s_tail + file.read(1 << 16)
+                    i_end = s_data.find(b"\n\n")
+                    if i_end >= 0 or len(s_data) == len(s_tail):
+                        break
+                    n_position += len(s_data) - 1
+                    s_tail = s_data[-1:]
+                n_position += i_end + 2 if i_end >= 0 else len(s_data)
+                if boundaries[-1] < n_position < n_stop:
+                    boundaries.append(n_position)
+        boundaries.append(n_end)
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    @staticmethod
+    def _get_output_filters(
+        observables: Optional[Iterable[str]],
+        qubits: Optional[Iterable[int]],
+        t_range: Optional[tuple],
+    ) -> Optional[dict]:
+        """Returns a dictionary with the filters of the loaded output data in a normalized form,
+        or None if there are no filters."""
+        if observables is None and qubits is None and t_range is None:
+            return None
+        filters = {"observables": None, "qubits": None, "t_range": (-np.inf, np.inf)}
+        if observables is not None:
+            if isinstance(observables, str):
+                observables = [observables]
+            filters["observables"] = {s_op.lower() for s_op in observables}
+        if qubits is not None:
+            filters["qubits"] = np.asarray(list(qubits), dtype=np.int64)
+        if t_range is not None:
+            t_min, t_max = t_range
+            filters["t_range"] = (
+                -np.inf if t_min is None else t_min,
+                np.inf if t_max is None else t_max,
+            )
+        return filters
+
+    @staticmethod
+    def _read_data_file(
+        s_output_path: str, s_output_type: str, filters: Optional[dict] = None
+    ) -> ResultStore:
+        """Reads one of the solver output files and returns a result store with the data.
+        Args:
+                s_output_path : prefix of the output files path. To this string the corresponding file
+                        endings according to each output type will be appended.
+                s_output_type : A string defining the observable type, one of the 1-qubit, 2-qubits,
+                        or global observables.
+                filters : An optional dictionary of the data filters, as returned by
+                        `_get_output_filters()`.
+        Returns:
+                result : A ResultStore with the data, which is empty if the file does not exist.
+        """
+        n_indices = LindbladMPOSolver._get_output_type_indices(s_output_type)
+        full_filename = LindbladMPOSolver._get_data_file_name(
+            s_output_path, s_output_type
+        )
+        if os.path.isfile(full_filename):
+            print("Loading output data file: " + full_filename)
+            if full_filename.endswith(".bin"):
+                result = LindbladMPOSolver._read_binary_file(
+                    full_filename, n_indices, filters
                 )
-                for q_init in init_list:
-                    if isinstance(q_init, (float, int)) or (
-                        isinstance(q_init, tuple) and len(q_init) == 1
-                    ):
-                        val = q_init[0] if isinstance(q_init, tuple) else q_init
-                        if (
-                            not LindbladMPOSolver.is_float(val)
-                            or not isfinite(val)
-                            or val < 0.0
-                            or val > 1.0
-                        ):
-                            check_msg += (
-                                "Error 361: a float or a length-1 tuple member of "
-                                + key
-                                + " represents a probability and must be between 0 and 1\n"
-                            )
-                        continue
-                    if isinstance(q_init, tuple):
-                        for val in q_init:
-                            if not LindbladMPOSolver.is_float(val) or not isfinite(val):
-                                check_msg += (
-                                    "Error 362: the values in a tuple member of "
-                                    + key
-                                    + " must be valid numbers\n"
-                                )
-                        if len(q_init) == 2:
-                            if q_init[0] < 0 or q_init[0] > np.pi:
-                                check_msg += (
-                                    "Error 363: the first value in a length-2 tuple of "
-                                    + key
-                                    + " represents a polar angle and must be in the range 0 to pi\n"
-                                )
-                        elif len(q_init) == 3:
-                            if not (
-                                0 <= q_init[0] <= 1
-                                and -1 <= q_init[1] <= 1
-                                and -1 <= q_init[2] <= 1
-                            ):
-                                check_msg += (
-                                    "Error 364: a tuple member of "
-                                    + key
-                                    + " with three elements must contain valid entries of a"
-                                    " density matrix\n"
-                                )
-                        else:
-                            check_msg += (
-                                "Error 365: a tuple member of "
-                                + key
-                                + " must be of 1, 2, or 3 elements\n"
-                            )
-                        continue
-                    if not isinstance(q_init, str):
-                        check_msg += (
-                            "Error 360: each member of "
-                            + key
-                            + " must be a string, a float, or a tuple\n"
-                        )
-                        continue
-                    allowed_init = ["+x", "-x", "+y", "-y", "+z", "-z", "id"]
-                    if q_init.lower() not in allowed_init:
-                        check_msg += (
-                            "Error 370: "
-                            + key
-                            + " can only be one of: +x, -x, +y, -y, +z, -z, id\n"
-                        )
-                        continue
-            elif (
-                (key == "b_periodic_x")
-                or (key == "b_periodic_y")
-                or (key == "b_force_rho_trace")
-                or (key == "b_unique_id")
-                or (key == "b_quiet")
-                or (key == "b_save_final_state")
-                or (key == "b_initial_rho_compression")
-                or (key == "b_apply_gate_compression")
-            ):
-                if not isinstance(parameters[key], bool):
-                    check_msg += (
-                        "Error 390: " + key + " should be a boolean True or False\n"
-                    )
-                    continue
-            elif key == "trotter_order":
-                if not LindbladMPOSolver._is_int(parameters[key]):
-                    check_msg += "Error 400: " + key + " should be 2, 3 or 4\n"
-                    continue
-                if (
-                    (parameters[key] != 2)
-                    and (parameters[key] != 3)
-                    and (parameters[key] != 4)
-                ):
-                    check_msg += "Error 401: " + key + " should be 2, 3 or 4\n"
-                    continue
-            elif key == "max_dim_rho":  # int
-                if (
-                    not LindbladMPOSolver._is_int(parameters[key])
-                    or parameters[key] < 0
-                ):
-                    check_msg += (
-                        "Error 410: " + key + " must be a non-negative integer\n"
-                    )
-                    continue
-            elif (key == "cut_off") or (key == "cut_off_rho"):
-                if not LindbladMPOSolver.is_float(parameters[key]):
-                    check_msg += "Error 420: " + key + " is not a float\n"
-                    continue
-            elif key == "metadata":
-                if not isinstance(parameters[key], str):
-                    check_msg += "Error 422: " + key + " is not a string\n"
-                    continue
-                if "\n" in parameters[key]:
-                    check_msg += (
-                        "Error 423: "
-                        "The metadata string cannot contain the new line "
-                        "character code ('\\n'). Please reformat the string\n"
-                    )
-                    continue
-            elif key == "load_files_prefix" or key == "output_files_prefix":
-                if not isinstance(parameters[key], str):
-                    check_msg += "Error 425: " + key + " is not a string\n"
-                    continue
-            elif key == "1q_components":
-                x_c = 0
-                y_c = 0
-                z_c = 0
-                if not isinstance(parameters[key], list):
-                    check_msg += (
-                        "Error 430: "
-                        + key
-                        + " should be a list of size 1,2,3 with x,y,z\n"
-                    )
-                    continue
-                if len(parameters[key]) > 3:
-                    check_msg += (
-                        "Error 440: "
-                        + key
-                        + " should be a list of size 1,2,3 with x,y,z\n"
-                    )
-                    continue
-                for val in parameters[key]:
-                    if not isinstance(val, str):
-                        check_msg += (
-                            "Error 441: " + key + " only takes x,y,z (or a subset)\n"
-                        )
-                        flag_continue = True
+            else:
+                columns = LindbladMPOSolver._parse_data_file(
+                    full_filename, n_indices, filters
+                )
+                result = LindbladMPOSolver._group_data_columns(columns, n_indices)
+        else:
+            print("Skipping non-existing file: " + full_filename)
+            result = ResultStore(n_indices)
+        return result
+
+    @staticmethod
+    def _get_data_file_name(s_output_path: str, s_output_type: str) -> str:
+        """Returns the name of the output file of the given type, in the text format (ending with
+        ".dat"), the compressed text format (ending with ".dat.gz") or the binary format (ending
+        with ".bin"). If several files exist, the one that was modified last is returned. If none
+        exists, the name of the text file is returned."""
+        s_data_file = s_output_path + f".{s_output_type}.dat"
+        f_mtime = None
+        for s_ending in LindbladMPOSolver.DATA_FILE_ENDINGS:
+            full_filename = s_output_path + f".{s_output_type}{s_ending}"
+            if os.path.isfile(full_filename):
+                f_file_mtime = os.path.getmtime(full_filename)
+                if f_mtime is None or f_file_mtime >= f_mtime:
+                    s_data_file = full_filename
+                    f_mtime = f_file_mtime
+        return s_data_file
+
+    @staticmethod
+    def _get_output_type_indices(s_output_type: str) -> int:
+        """Returns the number of qubit index columns stored in an output file of the given type."""
+        n_indices = LindbladMPOSolver.OUTPUT_TYPE_INDICES.get(s_output_type, None)
+        if n_indices is None:
+            raise Exception(f"Unknown output type {s_output_type}.")
+        return n_indices
+
+    @staticmethod
+    def _parse_data_file(
+        full_filename: str, n_indices: int, filters: Optional[dict] = None
+    ) -> tuple:
+        """Parses a solver output file in large line-aligned chunks into columnar arrays.
+        Args:
+                full_filename : The full path of the output file.
+                n_indices : The number of qubit index columns in each row of the file.
+                filters : An optional dictionary of the data filters, as returned by
+                        `_get_output_filters()`. If a time range is given, the index file is used
+                        to read only the lines of the time steps in the range. Since the solver
+                        writes the time steps in increasing order, chunks outside the time range
+                        are not parsed, and the file is read only up to the end of the time range.
+        Returns:
+                A tuple (times, ops, q_indices, values) of arrays with one entry (row) per
+                line of data in the file. The qubit indices are converted to 0-based indices.
+        """
+        n_start, n_end = LindbladMPOSolver._get_data_file_filter_range(
+            full_filename, filters
+        )
+        return LindbladMPOSolver._parse_data_range(
+            full_filename, n_indices, filters, n_start, n_end
+        )
+
+    @staticmethod
+    def _get_data_file_filter_range(
+        full_filename: str, filters: Optional[dict]
+    ) -> tuple:
+        """Returns the byte range (n_start, n_end) of an output file in the text format that holds
+        the time steps passing the filters, where n_end is None for the end of the file."""
+        if filters is not None and filters["t_range"] != (-np.inf, np.inf):
+            return LindbladMPOSolver._get_data_file_range(
+                full_filename, *filters["t_range"]
+            )
+        return 0, None
+
+    @staticmethod
+    def _parse_data_range(
+        full_filename: str,
+        n_indices: int,
+        filters: Optional[dict],
+        n_start: int,
+        n_end: Optional[int],
+    ) -> tuple:
+        """Parses the lines in a byte range of a solver output file into columnar arrays, as
+        described in `_parse_data_file()`. The range must begin at the beginning of a line, and
+        n_end is either None (for the end of the file) or the beginning of a line. For a
+        compressed file, the range boundaries must be those of gzip members."""
+        chunks = []
+        s_remainder = b""
+        data_chunks = LindbladMPOSolver._read_data_chunks(full_filename, n_start, n_end)
+        with contextlib.closing(data_chunks):
+            for s_chunk in itertools.chain(data_chunks, [b""]):
+                b_eof = len(s_chunk) == 0
+                s_chunk = s_remainder + s_chunk
+                s_remainder = b""
+                if not b_eof:
+                    # Parse only complete time steps (or lines, if the chunk is shorter than a
+                    # time step), the tail is carried over to the next chunk
+                    i_end = s_chunk.rfind(b"\n\n") + 2
+                    if i_end < 2:
+                        i_end = s_chunk.rfind(b"\n") + 1
+                    s_remainder = s_chunk[i_end:]
+                    s_chunk = s_chunk[:i_end]
+                else:
+                    # A partially written last line (without a newline) is skipped
+                    s_chunk = s_chunk[: s_chunk.rfind(b"\n") + 1]
+                if s_chunk and filters is not None:
+                    t_min, t_max = filters["t_range"]
+                    t_first, t_last = LindbladMPOSolver._get_chunk_times(s_chunk)
+                    if t_first is not None and t_first > t_max:
                         break
-                    val = str.lower(val)
-                    if val == "x":
-                        x_c += 1
-                    elif val == "y":
-                        y_c += 1
-                    elif val == "z":
-                        z_c += 1
-                    else:
-                        check_msg += (
-                            "Error 450: " + key + " only takes x,y,z (or a subset)\n"
+                    if t_last is not None and t_last < t_min:
+                        s_chunk = b""
+                if s_chunk:
+                    try:
+                        columns = LindbladMPOSolver._parse_data_chunk(
+                            s_chunk, n_indices
                         )
-                        flag_continue = True
-                        break
-                if flag_continue:
-                    continue
-                if (x_c > 1) or (y_c > 1) or (z_c > 1):
-                    check_msg += (
-                        "Error 460: " + key + " only takes x,y,z (or a subset)\n"
+                    except Exception as err:
+                        raise Exception(f"{full_filename}: {err}") from err
+                    chunks.append(
+                        LindbladMPOSolver._filter_data_columns(columns, filters)
                     )
-                    continue
-            elif key == "1q_indices":
-                if parameters[key] != "":
-                    if not isinstance(parameters[key], list):
-                        check_msg += (
-                            "Error 470: "
-                            + key
-                            + " should be an integer list (1,2,3,4..)\n"
-                        )
-                        continue
-                    if N == -1:
-                        check_msg += (
-                            "Error 480: " + key + "could not be validated because 'N'"
-                            " (or alternatively l_x,"
-                            " l_y) are not defined properly\n "
-                        )
-                        continue
-                    for element in parameters[key]:
-                        if not LindbladMPOSolver._is_int(element):
-                            check_msg += (
-                                "Error 490: "
-                                + key
-                                + " should be an integer list (1,2,3,4..)\n"
-                            )
-                            flag_continue = True
-                            break
-                        if element >= N:
-                            check_msg += (
-                                "Error 500: "
-                                + key
-                                + " should be an integer list listing "
-                                "qubits, therefore integers in the "
-                                "range 0 to N-1\n"
+        return LindbladMPOSolver._concatenate_data_columns(chunks, n_indices)
+
+    @staticmethod
+    def _read_data_chunks(full_filename: str, n_start: int, n_end: Optional[int]):
+        """Yields the data of a byte range of an output file in the text format, in chunks of
+        about DATA_FILE_CHUNK_SIZE bytes. The gzip members of a compressed file are decompressed,
+        and only complete members are read."""
+        n_chunk_size = LindbladMPOSolver.DATA_FILE_CHUNK_SIZE
+        with open(full_filename, "rb") as file:
+            file.seek(n_start)
+            if full_filename.endswith(".gz"):
+                members = []
+                n_size = 0
+                for _, s_member in LindbladMPOSolver._read_gzip_members(file, n_end):
+                    members.append(s_member)
+                    n_size += len(s_member)
+                    if n_size >= n_chunk_size:
+                        yield b"".join(members)
+                        members = []
+                        n_size = 0
+                if n_size:
+                    yield b"".join(members)
+                return
+            while True:
+                n_read = n_chunk_size
+                if n_end is not None:
+                    n_read = max(0, min(n_read, n_end - file.tell()))
+                s_chunk = file.read(n_read)
+                if len(s_chunk) == 0:
+                    return
+                yield s_chunk
+
+    @staticmethod
+    def _read_gzip_members(file, n_end: Optional[int] = None):
+        """Decompresses the gzip members of a compressed output file from the current position of
+        the file up to the offset n_end (or the end of the file), yielding a tuple with the
+        compressed length and the decompressed data of each complete member. The solver writes
+        every output time step (and the file header) as a separate member."""
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        members = []
+        n_length = 0
+        s_input = b""
+        while True:
+            if len(s_input) == 0:
+                n_read = 1 << 16
+                if n_end is not None:
+                    n_read = max(0, min(n_read, n_end - file.tell()))
+                s_input = file.read(n_read)
+                if len(s_input) == 0:
+                    return
+            members.append(decompressor.decompress(s_input))
+            if not decompressor.eof:
+                n_length += len(s_input)
+                s_input = b""
+                continue
+            # The input following the end of the member begins the next member
+            n_length += len(s_input) - len(decompressor.unused_data)
+            s_input = decompressor.unused_data
+            yield n_length, b"".join(members)
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            members = []
+            n_length = 0
+
+    @staticmethod
+    def index_output(s_output_path: str):
+        """Creates or updates the index files of the solver output files in the text format.
+
+        The index file of each output file (with the file name ending ".idx" replacing ".dat" or
+        ".dat.gz") holds the byte offset and length of every output time step in the output file
+        (for a compressed file, of the gzip member holding the time step), and
+        is used by `load_output()` to read only the time steps in a requested time range. The
+        solver writes the index files together with the output files, and older output files are
+        indexed when first loaded with a time range.
+        Args:
+                s_output_path : prefix of the output files path. To this string the corresponding file
+                        endings according to each output type will be appended.
+        """
+        for s_output_type in LindbladMPOSolver.OUTPUT_TYPES:
+            full_filename = LindbladMPOSolver._get_data_file_name(
+                s_output_path, s_output_type
+            )
+            if os.path.isfile(full_filename) and not full_filename.endswith(".bin"):
+                LindbladMPOSolver._update_data_file_index(full_filename)
+
+    @staticmethod
+    def _get_data_file_range(full_filename: str, t_min: float, t_max: float) -> tuple:
+        """Returns the byte range (n_start, n_end) of an output file in the text format, that holds
+        the lines of the time steps t_min <= t <= t_max, where n_end is None if the range extends
+        to the end of the file."""
+        times, offsets, lengths, _ = LindbladMPOSolver._update_data_file_index(
+            full_filename
+        )
+        if len(times) == 0:
+            return 0, None
+        i_first = np.searchsorted(times, t_min, side="left")
+        i_last = np.searchsorted(times, t_max, side="right")
+        if i_first < len(times):
+            n_start = int(offsets[i_first])
+        else:
+            # Data following the indexed time steps may still be written to the file
+            n_start = int(offsets[-1] + lengths[-1])
+        n_end = int(offsets[i_last]) if i_last < len(times) else None
+        return n_start, n_end
+
+    @staticmethod
+    def _update_data_file_index(full_filename: str) -> tuple:
+        """Reads the index file of an output file in the text format, and extends it with the
+        time steps written to the output file since it was last updated. The index is rebuilt if
+        it does not match the output file.
+        Args:
+                full_filename : The full path of the output file.
+        Returns:
+                A tuple (times, offsets, lengths, rows) of arrays with one entry per time step, with
+                its time, the byte offset and the length of its lines, and the number of records.
+        """
+        s_index_file = LindbladMPOSolver._get_index_file_name(full_filename)
+        b_compressed = full_filename.endswith(".gz")
+        n_size = os.path.getsize(full_filename)
+        entries = []
+        if os.path.isfile(s_index_file):
+            entries = LindbladMPOSolver._read_data_file_index(s_index_file)
+        # Time steps that were indexed but not yet flushed to the output file are read again later
+        while entries and entries[-1][1] + entries[-1][2] > n_size:
+            entries.pop()
+        n_indexed = len(entries)
+        with open(full_filename, "rb") as file:
+            if entries:
+                t, n_offset, n_length, _ = entries[-1]
+                file.seek(n_offset)
+                if b_compressed:
+                    try:
+                        s_block = b"".join(
+                            s_member
+                            for _, s_member in LindbladMPOSolver._read_gzip_members(
+                                file, n_offset + n_length
                             )
-                            flag_continue = True
-                            break
-                    if flag_continue:
-                        continue
-                    if len(parameters[key]) > N:
-                        check_msg += (
-                            "Error 510: "
-                            + key
-                            + " 's length should be equal/smaller than "
-                            "the amount of qubits\n "
-                        )
-                        continue
-                    if not len(set(parameters[key])) == len(parameters[key]):
-                        check_msg += (
-                            "Error 520: "
-                            + key
-                            + " 's List does not contain unique elements"
-                        )
-                        continue
-            elif key == "2q_components":
-                if not isinstance(parameters[key], list):
-                    check_msg += (
-                        "Error 530: "
-                        + key
-                        + "only accepts xx,yy,zz,xy,xz,yz (or a subset) "
-                        "as a strings list\n"
-                    )
-                    continue
-                if len(parameters[key]) > 6:
-                    check_msg += (
-                        "Error 540: "
-                        + key
-                        + " only accepts xx,yy,zz,xy,xz,yz (or a subset)\n"
-                    )
-                    continue
-                check_me = [0, 0, 0, 0, 0, 0, 0, 0, 0]
-                for val in parameters[key]:
-                    val = str.lower(val)
-                    if val == "xx":
-                        check_me[0] += 1
-                    elif val == "yy":
-                        check_me[1] += 1
-                    elif val == "zz":
-                        check_me[2] += 1
-                    elif val == "xy":
-                        check_me[3] += 1
-                    elif val == "xz":
-                        check_me[4] += 1
-                    elif val == "yz":
-                        check_me[5] += 1
-                    elif val == "yx":
-                        check_me[6] += 1
-                    elif val == "zx":
-                        check_me[7] += 1
-                    elif val == "zy":
-                        check_me[8] += 1
-                    else:
-                        check_msg += (
-                            "Error 550: "
-                            + key
-                            + " only accepts string from xx, yy, zz, xy, "
-                            "xz, yz (or a permutation thereof)\n"
-                        )
-                        flag_continue = True
-                        break
-                if flag_continue:
-                    continue
-                for check_val in check_me:
-                    if check_val > 1:
-                        check_msg += (
-                            "Error 550: "
-                            + key
-                            + " only accepts strings from xx, yy, zz, xy, "
-                            "xz, yz (or a permutation thereof)\n"
-                        )
-                        flag_continue = True
-                        break
-                if flag_continue:
-                    continue
-            elif key == "3q_components":
-                if not isinstance(parameters[key], list):
-                    check_msg += (
-                        "Error 530: "
-                        + key
-                        + "only accepts xx,yy,zz,xy,xz,yz (or a subset) "
-                        "as a strings list\n"
-                    )
-                    continue
-                for val in parameters[key]:
-                    val = str.lower(val)
-                    b_ok = True
-                    if len(val) != 3:
-                        b_ok = False
-                    else:
-                        for c in val:
-                            if c not in "xyz":
-                                b_ok = False
-                                break
-                    if not b_ok:
-                        check_msg += (
-                            "Error 531: "
-                            + key
-                            + "only accepts length-3 Pauli strings\n"
                         )
-                        flag_continue = True
-                        break
-                if flag_continue:
-                    continue
-            elif (
-                key == "2q_indices"
-                or key == "3q_indices"
-                or key == "init_graph_state"
-                or key == "init_cz_gates"
-            ):  # expecting an integer tuples list
-                if not isinstance(parameters[key], list):
-                    check_msg += (
-                        "Error 570: " + key + " should be a list of tuples"
-                        " containing integers\n"
+                    except zlib.error:
+                        s_block = b""
+                else:
+                    s_block = file.read(n_length)
+                if (
+                    not s_block.endswith(b"\n\n")
+                    or LindbladMPOSolver._get_chunk_times(s_block)[0] != t
+                ):
+                    # The output file was rewritten
+                    entries = []
+                    n_indexed = -1
+            i_block = entries[-1][1] + entries[-1][2] if entries else 0
+            if b_compressed:
+                file.seek(i_block)
+                for n_length, s_block in LindbladMPOSolver._read_gzip_members(file):
+                    LindbladMPOSolver._append_data_block(
+                        entries, s_block, i_block, n_length
                     )
+                    i_block += n_length
+            elif n_size > 0:
+                with mmap.mmap(file.fileno(), n_size, access=mmap.ACCESS_READ) as data:
+                    LindbladMPOSolver._scan_data_blocks(data, i_block, entries)
+        if len(entries) != n_indexed:
+            LindbladMPOSolver._write_data_file_index(s_index_file, entries)
+        return (
+            np.array([entry[0] for entry in entries], dtype=np.float64),
+            np.array([entry[1] for entry in entries], dtype=np.int64),
+            np.array([entry[2] for entry in entries], dtype=np.int64),
+            np.array([entry[3] for entry in entries], dtype=np.int64),
+        )
+
+    @staticmethod
+    def _scan_data_blocks(data, i_block: int, entries: list):
+        """Appends to entries the (time, offset, length, rows) tuples of the time steps written
+        (completely) to the data of an output file after the offset i_block."""
+        while True:
+            # The header line of the file is not a part of the first time step
+            while data[i_block : i_block + 1] == b"#":
+                i_line = data.find(b"\n", i_block)
+                if i_line < 0:
+                    return
+                i_block = i_line + 1
+            i_end = data.find(b"\n\n", i_block)
+            if i_end < 0:
+                break
+            i_end += 2
+            LindbladMPOSolver._append_data_block(
+                entries, data[i_block:i_end], i_block, i_end - i_block
+            )
+            i_block = i_end
+
+    @staticmethod
+    def _append_data_block(entries: list, s_block: bytes, n_offset: int, n_length: int):
+        """Appends to entries the (time, offset, length, rows) tuple of a time step, given the
+        lines of the time step and its byte offset and length in the output file."""
+        t = LindbladMPOSolver._get_chunk_times(s_block[:4096])[0]
+        n_rows = s_block.count(b"\n") - 1
+        if t is not None and n_rows > 0:
+            entries.append((t, n_offset, n_length, n_rows))
+        elif entries:
+            # Merge lines without data into the preceding time step
+            t, n_block_offset, n_block_length, n_rows = entries[-1]
+            entries[-1] = (t, n_block_offset, n_block_length + n_length, n_rows)
+
+    @staticmethod
+    def _get_index_file_name(full_filename: str) -> str:
+        """Returns the name of the index file of an output file in the (compressed) text format."""
+        for s_ending in (".dat.gz", ".dat"):
+            if full_filename.endswith(s_ending):
+                return full_filename[: -len(s_ending)] + ".idx"
+        return full_filename + ".idx"
+
+    @staticmethod
+    def _read_data_file_index(s_index_file: str) -> list:
+        """Reads an index file, returning a list of (time, offset, length, rows) tuples."""
+        entries = []
+        with open(s_index_file, "r") as file:
+            for line in file:
+                words = line.split()
+                if len(words) != 4 or line.startswith("#"):
                     continue
-                if N == -1:
-                    check_msg += (
-                        "Error 580: " + key + " could not be validated because 'N' "
-                        "(or alternatively l_x, "
-                        "l_y) are not defined properly\n"
+                try:
+                    entries.append(
+                        (float(words[0]), int(words[1]), int(words[2]), int(words[3]))
                     )
-                    continue
-                tup_len = 3 if key == "3q_indices" else 2
-                for tup in parameters[key]:
-                    if not isinstance(tup, tuple):
-                        check_msg += (
-                            "Error 590: "
-                            + key
-                            + " should be a list of tuples containing integers\n "
-                        )
-                        flag_continue = True
-                        break
-                    if (
-                        (len(tup) != tup_len)
-                        or (not LindbladMPOSolver._is_int(tup[0]))
-                        or (not LindbladMPOSolver._is_int(tup[1]))
-                        or (tup_len == 3 and not LindbladMPOSolver._is_int(tup[2]))
-                    ):
-                        check_msg += (
-                            "Error 600: "
-                            + key
-                            + f" should be a list of tuples of size {tup_len}, "
-                            "containing integers\n "
-                        )
-                        flag_continue = True
-                        break
-                    if (tup[0] >= N) or (tup[1] >= N) or (tup_len == 3 and tup[2] >= N):
-                        check_msg += (
-                            "Error 610: "
-                            + key
-                            + f" should be a list of tuples of size {tup_len}, "
-                            "containing integers equal to or smaller than "
-                            "the total number of qubits\n "
-                        )
-                        flag_continue = True
-                        break
-                if flag_continue:
-                    continue
-                if not len(set(parameters[key])) == len(parameters[key]):
-                    check_msg += "Error 630: " + key + " contains duplicate elements\n"
-                    continue
-            elif ignore_params is None or key not in ignore_params:
-                check_msg += "Error: unknown parameter key passed: " + key + "\n"
-        # End of: "for key in dict.keys(parameters)"
+                except ValueError:
+                    break
+        return entries
+
+    @staticmethod
+    def _write_data_file_index(s_index_file: str, entries: list):
+        # The index is replaced by a new file, since a running solver may be writing to the old one
+        s_temp_file = f"{s_index_file}.{os.getpid()}.tmp"
+        try:
+            with open(s_temp_file, "w") as file:
+                file.write("#time\toffset\tlength\trows\n")
+                for t, n_offset, n_length, n_rows in entries:
+                    file.write(f"{t!r}\t{n_offset}\t{n_length}\t{n_rows}\n")
+            os.replace(s_temp_file, s_index_file)
+        except OSError:
+            # The output directory may be read-only, the index is then rebuilt on each load
+            pass
 
-        return check_msg
+    @staticmethod
+    def _parse_data_chunk(s_chunk: bytes, n_indices: int) -> tuple:
+        """Parses a chunk of lines of a solver output file into columnar arrays.
+
+        Comment lines (the file header) and blank lines (separating the output time steps) are
+        skipped. The fields of the lines, separated by tabs as written by the solver, are located
+        with vectorized operations over all the lines of the chunk and converted by numpy. A chunk
+        holding lines of a different layout is parsed line by line, and an exception is raised
+        for a malformed line.
+        """
+        if not s_chunk.endswith(b"\n"):
+            s_chunk += b"\n"
+        columns = LindbladMPOSolver._parse_data_fields(s_chunk, n_indices)
+        if columns is None:
+            columns = LindbladMPOSolver._parse_data_lines(s_chunk, n_indices)
+        return columns
+
+    @staticmethod
+    def _parse_data_fields(s_chunk: bytes, n_indices: int) -> Optional[tuple]:
+        """Parses the lines of a chunk of an output file ending with a newline by vectorized
+        operations, returning None if any line is not in the layout written by the solver or
+        holds a field that could not be converted.
+
+        The lines of each time step hold the same time, which is converted only once per step.
+        When all the time steps hold the same observables in the same order, as written by the
+        solver, the operators and qubit indices are converted only for the first step."""
+        n_tabs = n_indices + 2
+        buf = np.frombuffer(s_chunk, dtype=np.uint8)
+        newlines = np.flatnonzero(buf == ord("\n"))
+        starts = np.concatenate(([0], newlines[:-1] + 1))
+        b_nonblank = newlines > starts
+        starts, ends = starts[b_nonblank], newlines[b_nonblank]
+        tabs = np.flatnonzero(buf == ord("\t"))
+        # The comment lines (the file header) may only precede the data lines
+        b_comment = buf[starts] == ord("#")
+        n_comments = int(np.argmin(b_comment)) if not b_comment.all() else len(starts)
+        if s_chunk.find(b"\0") >= 0 or b_comment[n_comments:].any():
+            return None
+        if n_comments:
+            tabs = tabs[np.searchsorted(tabs, ends[n_comments - 1]) :]
+            starts, ends = starts[n_comments:], ends[n_comments:]
+        n_lines = len(starts)
+        if n_lines == 0:
+            return LindbladMPOSolver._get_empty_data_columns(n_indices)
+        if len(tabs) != n_lines * n_tabs:
+            return None
+        tabs = tabs.reshape(-1, n_tabs)
+        field_starts = np.column_stack((starts, tabs + 1))
+        field_lengths = np.column_stack((tabs, ends)) - field_starts
+        # Given the total number of tabs, all the fields are nonempty only if each line holds
+        # exactly its own tabs
+        if field_lengths.min() <= 0:
+            return None
+        # The buffer is padded for reading the longest field from the start of the last line
+        buf = np.frombuffer(s_chunk + bytes(int(field_lengths.max())), dtype=np.uint8)
+        t_strings = LindbladMPOSolver._gather_data_strings(
+            buf, starts, field_lengths[:, 0]
+        )
+        run_starts = np.flatnonzero(
+            np.concatenate(([True], t_strings[1:] != t_strings[:-1]))
+        )
+        # The part of each line from its first tab to its last tab, holding the observable
+        prefixes = LindbladMPOSolver._gather_data_strings(
+            buf, tabs[:, 0], tabs[:, -1] - tabs[:, 0]
+        )
+        n_rows = int(run_starts[1]) if len(run_starts) > 1 else n_lines
+        n_steps = n_lines // n_rows
+        if n_steps * n_rows != n_lines or np.any(
+            prefixes.reshape(n_steps, n_rows) != prefixes[:n_rows]
+        ):
+            n_rows, n_steps = n_lines, 1
+        ops = LindbladMPOSolver._gather_data_strings(
+            buf, field_starts[:n_rows, 1], field_lengths[:n_rows, 1]
+        )
+        q_indices = np.empty((n_rows, n_indices), dtype=np.int64)
+        try:
+            times = np.repeat(
+                t_strings[run_starts].astype(np.float64),
+                np.diff(np.append(run_starts, n_lines)),
+            )
+            for i_index in range(n_indices):
+                q_indices[:, i_index] = LindbladMPOSolver._gather_data_strings(
+                    buf,
+                    field_starts[:n_rows, 2 + i_index],
+                    field_lengths[:n_rows, 2 + i_index],
+                ).astype(np.int64)
+            values = LindbladMPOSolver._gather_data_strings(
+                buf, field_starts[:, -1], field_lengths[:, -1]
+            ).astype(np.float64)
+        except ValueError:
+            return None
+        # data files are storing 1-based indices because of iTensor, while we use 0-based indices
+        q_indices -= 1
+        if n_steps > 1:
+            ops, q_indices = np.tile(ops, n_steps), np.tile(q_indices, (n_steps, 1))
+        return times, ops, q_indices, values
+
+    @staticmethod
+    def _gather_data_strings(
+        buf: np.ndarray, starts: np.ndarray, lengths: np.ndarray
+    ) -> np.ndarray:
+        """Returns an array of bytes strings with the fields of given offsets and lengths in a
+        buffer, which must extend beyond the start of each field by the length of the longest
+        field."""
+        n_width = int(lengths.max())
+        rows = np.lib.stride_tricks.as_strided(
+            buf,
+            shape=(len(buf) - n_width + 1, n_width),
+            strides=(1, 1),
+            writeable=False,
+        )
+        fields = rows[starts]
+        fields[np.arange(n_width) >= lengths[:, np.newaxis]] = 0
+        return fields.view(f"S{n_width}").reshape(-1)
+
+    @staticmethod
+    def _parse_data_lines(s_chunk: bytes, n_indices: int) -> tuple:
+        """Parses the lines of a chunk of an output file one by one, as described in
+        `_parse_data_chunk()`, raising an exception for a malformed line."""
+        rows = []
+        for line in s_chunk.splitlines():
+            words = line.split()
+            if len(words) == 0 or line.startswith(b"#"):
+                continue
+            row = LindbladMPOSolver._parse_data_words(words, n_indices)
+            if row is None:
+                raise Exception(
+                    "Malformed line in an output file: " + line.decode(errors="replace")
+                )
+            rows.append(row)
+        if len(rows) == 0:
+            return LindbladMPOSolver._get_empty_data_columns(n_indices)
+        columns = list(zip(*rows))
+        q_indices = np.array(columns[2 : 2 + n_indices], dtype=np.int64)
+        return (
+            np.array(columns[0], dtype=np.float64),
+            np.array(columns[1], dtype=bytes),
+            # data files are storing 1-based indices because of iTensor, while we use 0-based
+            q_indices.reshape(n_indices, len(rows)).T - 1,
+            np.array(columns[-1], dtype=np.float64),
+        )
+
+    @staticmethod
+    def _get_chunk_times(s_chunk: bytes) -> tuple:
+        """Returns the times of the first and of the last data lines of a chunk of an output file,
+        each of which is None if it could not be found among the lines at the chunk edges."""
+        times = []
+        for lines in (s_chunk.split(b"\n", 3)[:3], s_chunk.rsplit(b"\n", 3)[-3:][::-1]):
+            t = None
+            for line in lines:
+                if line and not line.startswith(b"#"):
+                    try:
+                        t = float(line.split(None, 1)[0])
+                    except ValueError:
+                        pass
+                    break
+            times.append(t)
+        return times[0], times[1]
+
+    @staticmethod
+    def _filter_data_columns(columns: tuple, filters: Optional[dict]) -> tuple:
+        """Returns the rows of columnar output data that pass the given filters."""
+        if filters is None:
+            return columns
+        times, ops, q_indices, values = columns
+        t_min, t_max = filters["t_range"]
+        mask = (times >= t_min) & (times <= t_max)
+        if filters["observables"] is not None:
+            op_codes, op_names = LindbladMPOSolver._classify_op_names(ops)
+            selected_codes = [
+                i_op
+                for i_op, s_op in enumerate(op_names)
+                if s_op.lower() in filters["observables"]
+            ]
+            mask &= np.isin(op_codes, selected_codes)
+        if filters["qubits"] is not None and q_indices.shape[1] > 0:
+            mask &= np.all(np.isin(q_indices, filters["qubits"]), axis=1)
+        if np.all(mask):
+            return columns
+        return times[mask], ops[mask], q_indices[mask], values[mask]
+
+    @staticmethod
+    def _parse_data_words(words: list, n_indices: int) -> Optional[tuple]:
+        """Converts the words of one data line into a row tuple, or returns None if malformed."""
+        if len(words) != n_indices + 3:
+            return None
+        try:
+            row = [float(words[0]), words[1]]
+            row += [int(word) for word in words[2 : 2 + n_indices]]
+            row.append(float(words[-1]))
+        except ValueError:
+            return None
+        return tuple(row)
+
+    @staticmethod
+    def _concatenate_data_columns(chunks: list, n_indices: int) -> tuple:
+        if len(chunks) == 1:
+            return chunks[0]
+        if len(chunks) == 0:
+            return LindbladMPOSolver._get_empty_data_columns(n_indices)
+        return tuple(
+            np.concatenate([chunk[i_column] for chunk in chunks])
+            for i_column in range(4)
+        )
+
+    @staticmethod
+    def _get_empty_data_columns(n_indices: int) -> tuple:
+        return (
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype="S1"),
+            np.empty((0, n_indices), dtype=np.int64),
+            np.empty(0, dtype=np.float64),
+        )
+
+    @staticmethod
+    def _group_data_columns(columns: tuple, n_indices: int) -> ResultStore:
+        """Groups columnar output data by observable into a result store.
+
+        Args:
+                columns : A tuple (times, ops, q_indices, values) of arrays.
+                n_indices : The number of qubit index columns in the data.
+        Returns:
+                The result store, whose operator names are converted to lowercase.
+        """
+        times, ops, q_indices, values = columns
+        n_rows = LindbladMPOSolver._get_data_step_rows(columns)
+        if n_rows:
+            # The observables are classified in the first time step only
+            op_codes, op_names = LindbladMPOSolver._classify_op_names(ops[:n_rows])
+            op_codes, op_names = LindbladMPOSolver._merge_op_names(op_codes, op_names)
+            return ResultStore.from_blocks(
+                times[::n_rows],
+                values.reshape(-1, n_rows),
+                op_codes,
+                op_names,
+                q_indices[:n_rows],
+                n_indices,
+            )
+        op_codes, op_names = LindbladMPOSolver._classify_op_names(ops)
+        op_codes, op_names = LindbladMPOSolver._merge_op_names(op_codes, op_names)
+        return ResultStore.from_columns(
+            (times, op_codes, op_names, q_indices, values), n_indices
+        )
+
+    @staticmethod
+    def _get_data_step_rows(columns: tuple) -> int:
+        """Returns the number of rows of each time step of columnar output data, if all the time
+        steps hold the same observables in the same order, and 0 otherwise."""
+        times, ops, q_indices, _ = columns
+        if len(times) == 0:
+            return 0
+        n_rows = int(np.argmax(times != times[0])) or len(times)
+        if len(times) % n_rows != 0:
+            return 0
+        n_steps = len(times) // n_rows
+        step_times = times.reshape(n_steps, n_rows)
+        if np.any(step_times != step_times[:, :1]):
+            return 0
+        if np.any(ops.reshape(n_steps, n_rows) != ops[:n_rows]):
+            return 0
+        if np.any(
+            q_indices.reshape((n_steps,) + q_indices[:n_rows].shape)
+            != q_indices[:n_rows]
+        ):
+            return 0
+        return n_rows
+
+    @staticmethod
+    def _classify_op_names(ops: np.ndarray) -> tuple:
+        """Returns an integer array with the index of the name of each entry of a bytes array of
+        operator names, and the list of names (decoded) in the order of their first appearance."""
+        # Output files hold few distinct operator names, so the names are classified by comparing
+        # the whole column against each name, which is much faster than sorting the strings
+        op_codes = np.full(len(ops), -1, dtype=np.int64)
+        op_names = []
+        i_unassigned = 0
+        while i_unassigned < len(ops):
+            if len(op_names) == 32:
+                # Many distinct names (such as custom observables), classify the rest by sorting
+                unassigned = np.flatnonzero(op_codes < 0)
+                rest_names, rest_codes = np.unique(ops[unassigned], return_inverse=True)
+                op_codes[unassigned] = rest_codes.reshape(-1) + len(op_names)
+                op_names += [s_op.decode() for s_op in rest_names]
+                break
+            s_op = ops[i_unassigned]
+            op_codes[ops == s_op] = len(op_names)
+            op_names.append(s_op.decode())
+            unassigned = np.flatnonzero(op_codes[i_unassigned:] < 0)
+            i_unassigned += unassigned[0] if len(unassigned) else len(ops)
+        return op_codes, op_names
+
+    @staticmethod
+    def _merge_op_names(op_codes: np.ndarray, op_names: list) -> tuple:
+        """Converts operator names to lowercase, mapping names differing only by case to the same
+        operator, while keeping the operators in the order of their first appearance."""
+        lower_names, first_codes, lower_codes = np.unique(
+            [s_op.lower() for s_op in op_names], return_index=True, return_inverse=True
+        )
+        lower_order = np.argsort(first_codes)
+        lower_rank = np.empty(len(lower_order), dtype=np.int64)
+        lower_rank[lower_order] = np.arange(len(lower_order))
+        op_codes = lower_rank[lower_codes.reshape(-1)][op_codes]
+        return op_codes, [str(s_op) for s_op in lower_names[lower_order]]
+
+    @staticmethod
+    def _read_binary_header(file, full_filename: str) -> Optional[tuple]:
+        """Reads the header of an output file in the binary format, leaving the file positioned at
+        the first block of data.
+        Args:
+                file : The output file, opened for reading in binary mode at its beginning.
+                full_filename : The full path of the output file.
+        Returns:
+                A tuple (s_byte_order, op_names, columns), where s_byte_order is the numpy byte
+                order character of the file, and columns is an integer array whose rows hold the
+                operator name index and the (1-based) qubit indices of each column of the data.
+                None is returned if the header was not completely written yet.
+        """
+        s_header = file.read(24)
+        if len(s_header) < 24:
+            return None
+        if s_header[0:8] != LindbladMPOSolver.BINARY_FILE_MAGIC:
+            raise Exception(f"{full_filename} is not a valid binary output file.")
+        s_byte_order = "<"
+        if struct.unpack("<I", s_header[8:12])[0] != 0x01020304:
+            s_byte_order = ">"
+        _, n_indices, n_names, n_columns = struct.unpack(
+            s_byte_order + "4I", s_header[8:24]
+        )
+        op_names = []
+        try:
+            for _ in range(n_names):
+                (n_length,) = struct.unpack(s_byte_order + "I", file.read(4))
+                op_names.append(file.read(n_length).decode())
+            columns = np.frombuffer(
+                file.read(4 * n_columns * (1 + n_indices)), dtype=s_byte_order + "i4"
+            ).reshape(n_columns, 1 + n_indices)
+        except (struct.error, ValueError):
+            return None
+        n_padding = (8 - file.tell() % 8) % 8
+        if len(file.read(n_padding)) < n_padding:
+            return None
+        return s_byte_order, op_names, columns
+
+    @staticmethod
+    def _read_binary_file(
+        full_filename: str, n_indices: int, filters: Optional[dict] = None
+    ) -> ResultStore:
+        """Reads a solver output file written in the binary format, by memory-mapping its data.
+        Args:
+                full_filename : The full path of the output file.
+                n_indices : The number of qubit indices of each observable in the file.
+                filters : An optional dictionary of the data filters, as returned by
+                        `_get_output_filters()`. Only the selected columns of the time steps in
+                        the time range are read from the file.
+        Returns:
+                A ResultStore with the data of all time steps that were completely written.
+        """
+        with open(full_filename, "rb") as file:
+            header = LindbladMPOSolver._read_binary_header(file, full_filename)
+            if header is None:
+                raise Exception(f"{full_filename} is not a valid binary output file.")
+            n_header_size = file.tell()
+        s_byte_order, op_names, columns = header
+        n_columns = len(columns)
+        op_codes, op_names, q_indices = LindbladMPOSolver._get_binary_columns(
+            op_names, columns, n_indices, full_filename
+        )
+        n_block_size = 8 * (1 + n_columns)
+        n_steps = (os.path.getsize(full_filename) - n_header_size) // n_block_size
+        if n_steps > 0:
+            blocks = np.memmap(
+                full_filename,
+                dtype=s_byte_order + "f8",
+                mode="r",
+                offset=n_header_size,
+                shape=(n_steps, 1 + n_columns),
+            )
+        else:
+            blocks = np.zeros((0, 1 + n_columns))
+        if filters is None:
+            return ResultStore.from_blocks(
+                np.array(blocks[:, 0]),
+                np.array(blocks[:, 1:]),
+                op_codes,
+                op_names,
+                q_indices,
+                n_indices,
+            )
+        column_mask = np.ones(n_columns, dtype=bool)
+        if filters["observables"] is not None:
+            selected_codes = [
+                i_op
+                for i_op, s_op in enumerate(op_names)
+                if s_op in filters["observables"]
+            ]
+            column_mask &= np.isin(op_codes, selected_codes)
+        if filters["qubits"] is not None and n_indices > 0:
+            column_mask &= np.all(np.isin(q_indices, filters["qubits"]), axis=1)
+        selected_columns = np.flatnonzero(column_mask)
+        # The time steps are written in increasing order, so the time range is found by bisection
+        t_min, t_max = filters["t_range"]
+        time_column = blocks[:, 0]
+        i_start = bisect.bisect_left(time_column, t_min)
+        i_end = bisect.bisect_right(time_column, t_max)
+        step_blocks = blocks[i_start : max(i_start, i_end)]
+        # Only the operators of the selected columns are kept
+        used_codes, op_codes = np.unique(
+            op_codes[selected_columns], return_inverse=True
+        )
+        return ResultStore.from_blocks(
+            np.array(step_blocks[:, 0]),
+            np.array(step_blocks[:, 1 + selected_columns]),
+            op_codes.reshape(-1),
+            [op_names[i_op] for i_op in used_codes],
+            q_indices[selected_columns],
+            n_indices,
+        )
+
+    @staticmethod
+    def _get_binary_columns(
+        op_names: list, columns: np.ndarray, n_indices: int, s_name: str
+    ) -> tuple:
+        """Returns a tuple (op_codes, op_names, q_indices) with the operator codes, the merged
+        operator names and the 0-based qubit indices of the columns of binary output data, read
+        from its header."""
+        if columns.shape[1] != 1 + n_indices:
+            raise Exception(
+                f"{s_name} holds observables with {columns.shape[1] - 1} qubit indices, "
+                f"while {n_indices} indices are expected."
+            )
+        op_codes, op_names = LindbladMPOSolver._merge_op_names(
+            columns[:, 0].astype(np.int64), op_names
+        )
+        # data files are storing 1-based indices because of iTensor, while we use 0-based indices
+        q_indices = columns[:, 1:].astype(np.int64) - 1
+        return op_codes, op_names, q_indices
+
+    @staticmethod
+    def decode_output_stream(s_stream: bytes) -> dict:
+        """Decodes the results stream written by the solver in the stream output format.
+        Args:
+                s_stream : The bytes of the stream.
+        Returns:
+                result : A dictionary with a ResultStore for each of the different output types, as
+                        returned by `load_output()`.
+        """
+        n_offset = len(LindbladMPOSolver.OUTPUT_STREAM_MAGIC)
+        if s_stream[:n_offset] != LindbladMPOSolver.OUTPUT_STREAM_MAGIC:
+            raise Exception("The solver output is not a valid results stream.")
+        parts = {}
+        try:
+            while n_offset < len(s_stream):
+                (n_length,) = struct.unpack_from("=I", s_stream, n_offset)
+                s_output_type = s_stream[
+                    n_offset + 4 : n_offset + 4 + n_length
+                ].decode()
+                n_offset += 4 + n_length
+                (n_length,) = struct.unpack_from("=I", s_stream, n_offset)
+                n_offset += 4
+                parts.setdefault(s_output_type, []).append(
+                    s_stream[n_offset : n_offset + n_length]
+                )
+                n_offset += n_length
+        except struct.error:
+            raise Exception("The results stream of the solver is incomplete.")
+        result = {}
+        for s_output_type in LindbladMPOSolver.OUTPUT_TYPES:
+            n_indices = LindbladMPOSolver._get_output_type_indices(s_output_type)
+            if s_output_type in parts:
+                result[s_output_type] = LindbladMPOSolver._parse_binary_data(
+                    b"".join(parts[s_output_type]), n_indices, s_output_type
+                )
+            else:
+                result[s_output_type] = ResultStore(n_indices)
+        return result
+
+    @staticmethod
+    def _parse_binary_data(s_data: bytes, n_indices: int, s_name: str) -> ResultStore:
+        """Parses data in the binary format of the output files, held in memory, and returns a
+        ResultStore with the data of all time steps that were completely written."""
+        file = io.BytesIO(s_data)
+        header = LindbladMPOSolver._read_binary_header(file, s_name)
+        if header is None:
+            raise Exception(f"{s_name} is not valid binary output data.")
+        s_byte_order, op_names, columns = header
+        op_codes, op_names, q_indices = LindbladMPOSolver._get_binary_columns(
+            op_names, columns, n_indices, s_name
+        )
+        n_header_size = file.tell()
+        n_steps = (len(s_data) - n_header_size) // (8 * (1 + len(columns)))
+        blocks = np.frombuffer(
+            s_data,
+            dtype=s_byte_order + "f8",
+            count=n_steps * (1 + len(columns)),
+            offset=n_header_size,
+        ).reshape(n_steps, 1 + len(columns))
+        return ResultStore.from_blocks(
+            np.array(blocks[:, 0]),
+            np.array(blocks[:, 1:]),
+            op_codes,
+            op_names,
+            q_indices,
+            n_indices,
+        )
+
+    @staticmethod
+    # checks if the value is int (for cleaner code)
+    def _is_int(value):
+        return ParameterSchema.is_int(value)
+
+    @staticmethod
+    def is_float(value):
+        """checks if the value is a float (for cleaner code).
+        Args:
+                value : value to test.
+        Returns:
+                True if value is a float or int.
+        """
+        return ParameterSchema.is_float(value)
+
+    @staticmethod
+    # returns the number of qubits based on the given parameters, returns -1 if found an error
+    def _get_number_of_qubits(parameters: Dict) -> int:
+        return ParameterSchema.get_number_of_qubits(parameters)
+
+    def _virtual_verify_parameters(self, ignore_params: Optional[list] = None) -> str:
+        """An overridable function that verifies the parameters by calling verify_parameters().
+
+        Args:
+                ignore_params: A list with parameter names that this solver does not recognize, but
+                        should be ignored in the verification (so that an error message for unknown
+                        parameters is not issued). This is useful for derived classes.
+        Returns:
+                A detailed error message if parameters arguments are not in the correct format (which
+                        is stated in the spec of the simulator). Otherwise, returns "" (checks passed).
+        """
+        return LindbladMPOSolver.verify_parameters(self.parameters, ignore_params)
+
+    @staticmethod
+    def verify_parameters(
+        parameters: dict, ignore_params: Optional[list] = None
+    ) -> str:
+        """Returns a detailed Error message if parameters are not in the correct format.
+
+        Args:
+                parameters: A dictionary of solver parameters.
+                ignore_params: A list with parameter names that this solver does not recognize, but
+                        should be ignored in the verification (so that an error message for unknown
+                        parameters is not issued). This is mostly useful for derived subclasses.
+        Returns:
+                A detailed error message if parameters are not in the correct format.
+                Otherwise, returns "" (checks passed).
+        """
+        return LindbladMPOSolver.PARAMETER_SCHEMA.verify(parameters, ignore_params)
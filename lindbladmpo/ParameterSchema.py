@@ -0,0 +1,804 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Defines the validation of solver parameters using a declarative schema.
+"""
+
+import functools
+import hashlib
+import marshal
+import pickle
+import threading
+from collections import OrderedDict
+from math import isfinite
+from typing import Optional
+
+import numpy as np
+import scipy.sparse
+
+
+class ParameterSchema:
+    """A schema of the solver parameters, compiled into validators of the parameter values.
+
+    The schema is a dictionary whose keys are parameter names (or tuples of names sharing a
+    validation), and whose values are tuples (s_kind, options). The kind names one of the
+    `_validate_<kind>` methods, which is called with the key and the value of the parameter, the
+    options and the keyword arguments `parameters` and `N` (which it may ignore). The
+    optional "depends" option is a tuple of the names of other parameters that the validation of
+    the parameter depends on (with "N" standing for the number of qubits). Lists and arrays are
+    checked as whole NumPy arrays wherever their elements have a uniform type.
+
+    The error messages are memoized, both for complete parameter dictionaries and for each
+    parameter separately, keyed on a fingerprint of the parameter value (and of the parameters it
+    depends on). Sweeps verifying many similar parameter dictionaries therefore validate only the
+    parameters whose values change. Scalars are their own fingerprints. Values that can be
+    modified in place (lists, writeable arrays and matrices) are fingerprinted at every
+    verification, while the fingerprints of immutable values (tuples of scalars, and arrays that
+    own their data and are not writeable) are memoized by the identity of the value, so that such a
+    value shared by the dictionaries of a sweep is fingerprinted once.
+    """
+
+    MAX_CACHE_SIZE = 10000
+    """The maximal number of memoized error messages, of complete dictionaries and of parameters."""
+
+    MAX_FINGERPRINT_CACHE_SIZE = 64
+    """The maximal number of memoized fingerprints of immutable values, which are kept alive (so
+    that their identity is not reused) while memoized."""
+
+    def __init__(self, schema: dict):
+        """Initialize the schema, compiling its validators.
+
+        Args:
+                schema: The schema dictionary, as described in the class documentation.
+        """
+        self._validators = {}
+        for keys, (s_kind, options) in schema.items():
+            options = dict(options)
+            dependencies = tuple(options.pop("depends", ()))
+            validator = functools.partial(
+                getattr(ParameterSchema, "_validate_" + s_kind), **options
+            )
+            for key in (keys,) if isinstance(keys, str) else keys:
+                self._validators[key] = (validator, dependencies)
+        self._cache = OrderedDict()
+        self._dict_cache = OrderedDict()
+        self._fingerprints = OrderedDict()
+        self._lock = threading.Lock()
+
+    def verify(self, parameters: dict, ignore_params: Optional[list] = None) -> str:
+        """Returns a detailed error message if parameters are not in the correct format.
+
+        Args:
+                parameters: A dictionary of solver parameters.
+                ignore_params: A list with parameter names that are not in the schema, but should
+                        be ignored in the verification (so that an error message for unknown
+                        parameters is not issued).
+        Returns:
+                A detailed error message if parameters are not in the correct format.
+                Otherwise, returns "" (checks passed).
+        """
+        if parameters is None:
+            return "Error 100: The `parameters` dictionary must be assigned\n"
+        if (
+            ("N" not in parameters)
+            or ("t_final" not in parameters)
+            or ("tau" not in parameters)
+        ):
+            return (
+                "Error 110: N, t_final and tau must be defined as they do not have default "
+                "values\n"
+            )
+        N = ParameterSchema.get_number_of_qubits(parameters)
+        fingerprints = {
+            key: self._get_value_fingerprint(value)
+            for key, value in parameters.items()
+            if not (value is None or (isinstance(value, str) and value == ""))
+        }
+        dict_key = (tuple(fingerprints.items()), tuple(ignore_params or ()))
+        check_msg = self._get_cached(self._dict_cache, dict_key)
+        if check_msg is not None:
+            return check_msg
+        check_msg = ""
+        for key, fingerprint in fingerprints.items():
+            if key not in self._validators:
+                if ignore_params is None or key not in ignore_params:
+                    check_msg += "Error: unknown parameter key passed: " + key + "\n"
+                continue
+            validator, dependencies = self._validators[key]
+            cache_key = (key, fingerprint) + tuple(
+                N if s_dep == "N" else fingerprints.get(s_dep) for s_dep in dependencies
+            )
+            s_msg = self._get_cached(self._cache, cache_key)
+            if s_msg is None:
+                s_msg = validator(key, parameters[key], parameters=parameters, N=N)
+                self._set_cached(self._cache, cache_key, s_msg)
+            check_msg += s_msg
+        self._set_cached(self._dict_cache, dict_key, check_msg)
+        return check_msg
+
+    def _get_value_fingerprint(self, value):
+        """Returns the fingerprint of a parameter value, memoized by identity for immutable values
+        other than scalars."""
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return type(value).__name__, value
+        if not ParameterSchema._is_immutable(value):
+            return ParameterSchema.get_fingerprint(value)
+        with self._lock:
+            entry = self._fingerprints.get(id(value))
+            if entry is not None and entry[0] is value:
+                self._fingerprints.move_to_end(id(value))
+                return entry[1]
+        fingerprint = ParameterSchema.get_fingerprint(value)
+        with self._lock:
+            self._fingerprints[id(value)] = (value, fingerprint)
+            if len(self._fingerprints) > ParameterSchema.MAX_FINGERPRINT_CACHE_SIZE:
+                self._fingerprints.popitem(last=False)
+        return fingerprint
+
+    @staticmethod
+    def _is_immutable(value) -> bool:
+        """Returns whether a value cannot be modified in place: a tuple of scalars (or of such
+        tuples), or an array of numbers that owns its data and is not writeable."""
+        if isinstance(value, np.ndarray):
+            return (
+                value.dtype.kind != "O"
+                and value.base is None
+                and not value.flags.writeable
+            )
+        if not isinstance(value, tuple):
+            return False
+        return all(
+            item is None
+            or isinstance(item, (bool, int, float, str))
+            or ParameterSchema._is_immutable(item)
+            for item in value
+        )
+
+    def _get_cached(self, cache: OrderedDict, key) -> Optional[str]:
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _set_cached(self, cache: OrderedDict, key, value: str):
+        with self._lock:
+            cache[key] = value
+            if len(cache) > ParameterSchema.MAX_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    @staticmethod
+    def get_fingerprint(value):
+        """Returns a hashable fingerprint identifying the type and content of a parameter value,
+        which distinguishes for example 1, 1.0, True and "1". Arrays are identified by a hash of
+        their data, and lists and tuples by a hash of their serialized content (which records the
+        type of each element). The marshal format is used for values made of built-in types, being
+        more compact than pickle, which serializes any other values."""
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return type(value).__name__, value
+        if isinstance(value, np.ndarray) and value.dtype.kind != "O":
+            return (
+                "ndarray",
+                value.dtype.str,
+                value.shape,
+                ParameterSchema._get_digest(np.ascontiguousarray(value).tobytes()),
+            )
+        if scipy.sparse.issparse(value):
+            matrix = scipy.sparse.coo_matrix(value)
+            return (
+                "sparse",
+                matrix.dtype.str,
+                matrix.shape,
+                ParameterSchema._get_digest(
+                    *(
+                        np.ascontiguousarray(array).tobytes()
+                        for array in (matrix.row, matrix.col, matrix.data)
+                    )
+                ),
+            )
+        try:
+            # Version 2 of the marshal format does not depend on the sharing of objects
+            return "marshal", ParameterSchema._get_digest(marshal.dumps(value, 2))
+        except ValueError:
+            pass  # The value holds objects of other types
+        try:
+            return "pickle", ParameterSchema._get_digest(pickle.dumps(value, 4))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return type(value).__name__, repr(value)
+
+    @staticmethod
+    def _get_digest(*data: bytes) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        for chunk in data:
+            digest.update(chunk)
+        return digest.digest()
+
+    @staticmethod
+    def is_int(value) -> bool:
+        """Returns whether the value is an int."""
+        return isinstance(value, int)
+
+    @staticmethod
+    def is_float(value) -> bool:
+        """Returns whether the value is a float or an int (an int is a float in the simulator
+        context)."""
+        return isinstance(value, (float, int))
+
+    @staticmethod
+    def is_edge_list(value) -> bool:
+        """Returns whether a coupling (J or J_z) is given as a nonempty list of (i, j, value) tuples."""
+        return (
+            isinstance(value, list)
+            and len(value) > 0
+            and ParameterSchema._get_types(value) == {tuple}
+        )
+
+    @staticmethod
+    def get_number_of_qubits(parameters: dict) -> int:
+        """Returns the number of qubits based on the given parameters, or -1 if it is invalid."""
+        if "N" in parameters:
+            if ParameterSchema.is_int(parameters["N"]):
+                return parameters["N"]
+        return -1
+
+    @staticmethod
+    def _get_types(values) -> set:
+        """Returns the set of the types of the elements of a list."""
+        return set(map(type, values))
+
+    @staticmethod
+    def _get_array(values, ndim: int, s_kinds: str) -> Optional[np.ndarray]:
+        """Returns the elements of (nested) lists as a NumPy array, or None if the array does not
+        have the given number of dimensions, or its data type kind is not one of s_kinds."""
+        try:
+            array = np.array(values)
+        except ValueError:  # Nested lists of different lengths
+            return None
+        if array.ndim != ndim or array.dtype.kind not in s_kinds:
+            return None
+        return array
+
+    @staticmethod
+    def _validate_int(
+        key: str,
+        value,
+        type_code: int,
+        range_code: int,
+        n_min: int = 0,
+        s_range: str = " should be equal to or larger than 0 (integer)",
+        **_,
+    ) -> str:
+        if not ParameterSchema.is_int(value):
+            return f"Error {type_code}: " + key + " should be an integer\n"
+        if value < n_min:
+            return f"Error {range_code}: " + key + s_range + "\n"
+        return ""
+
+    @staticmethod
+    def _validate_time(key: str, value, parameters: dict, **_) -> str:
+        if not ParameterSchema.is_float(value):
+            return "Error 140: " + key + " is not a float\n"
+        if key == "tau" and value <= 0:
+            return "Error 150: " + key + " must be larger than 0\n"
+        if (
+            key == "t_init"
+            and ParameterSchema.is_float(parameters["t_final"])
+            and value > parameters["t_final"]
+        ):
+            return "Error 151: " + key + " must be equal or smaller than t_final\n"
+        return ""
+
+    @staticmethod
+    def _validate_float(key: str, value, code: int, **_) -> str:
+        if not ParameterSchema.is_float(value):
+            return f"Error {code}: " + key + " is not a float\n"
+        return ""
+
+    @staticmethod
+    def _validate_bool(key: str, value, **_) -> str:
+        if not isinstance(value, bool):
+            return "Error 390: " + key + " should be a boolean True or False\n"
+        return ""
+
+    @staticmethod
+    def _validate_string(key: str, value, **_) -> str:
+        if not isinstance(value, str):
+            return "Error 425: " + key + " is not a string\n"
+        return ""
+
+    @staticmethod
+    def _validate_choice(key: str, value, code: int, choices: list, **_) -> str:
+        if value not in choices:
+            return (
+                f"Error {code}: "
+                + key
+                + " must be one of: "
+                + ", ".join(choices)
+                + "\n"
+            )
+        return ""
+
+    @staticmethod
+    def _validate_trotter_order(key: str, value, **_) -> str:
+        if not ParameterSchema.is_int(value):
+            return "Error 400: " + key + " should be 2, 3 or 4\n"
+        if value not in (2, 3, 4):
+            return "Error 401: " + key + " should be 2, 3 or 4\n"
+        return ""
+
+    @staticmethod
+    def _validate_max_dim(key: str, value, **_) -> str:
+        if not ParameterSchema.is_int(value) or value < 0:
+            return "Error 410: " + key + " must be a non-negative integer\n"
+        return ""
+
+    @staticmethod
+    def _validate_metadata(key: str, value, **_) -> str:
+        if not isinstance(value, str):
+            return "Error 422: " + key + " is not a string\n"
+        if "\n" in value:
+            return (
+                "Error 423: "
+                "The metadata string cannot contain the new line "
+                "character code ('\\n'). Please reformat the string\n"
+            )
+        return ""
+
+    @staticmethod
+    def _validate_compression(key: str, value, parameters: dict, **_) -> str:
+        if not ParameterSchema.is_int(value) or not 0 <= value <= 9:
+            return "Error 427: " + key + " must be an integer between 0 and 9\n"
+        if value > 0 and parameters.get("output_format") == "binary":
+            return (
+                "Error 428: " + key + " is supported only with the text output format\n"
+            )
+        return ""
+
+    # The validators below return the error message of their first failed check, as the checks of
+    # the parameters did before the schema, which takes a return statement per check.
+    # pylint: disable=too-many-return-statements
+
+    @staticmethod
+    def _validate_site_vector(key: str, value, N: int, **_) -> str:
+        if ParameterSchema.is_float(value):
+            return ""
+        if N == -1:
+            return (
+                "Error 200: " + key + " could not be validated because 'N' "
+                "(or alternatively l_x, l_y) are not "
+                "defined properly\n "
+            )
+        if isinstance(value, list):
+            if len(value) != N:
+                return (
+                    "Error 210: " + key + " is not a float / N-length list / "
+                    "numpy array (of floats)\n"
+                )
+            if ParameterSchema._get_array(value, 1, "biuf") is None:
+                return (
+                    "Error 220: " + key + "is not a float / N-length list "
+                    "/ numpy array (of floats)\n "
+                )
+            return ""
+        if isinstance(value, np.ndarray):
+            if (str(value.dtype).find("int") == -1) and (
+                str(value.dtype).find("float") == -1
+            ):
+                return (
+                    "Error 230: " + key + " is not a float / N-length list / "
+                    "numpy array (of floats)\n"
+                )
+            if value.size == 1:
+                return ""
+            if (value.shape[0] != N) or (value.shape[0] != value.size):
+                return (
+                    "Error 240: " + key + " is not a float / N-length list / "
+                    "numpy array (of floats)\n"
+                )
+            return ""
+        return (
+            "Error 250: " + key + " is not a float / N-length list / numpy "
+            "array (of floats)\n"
+        )
+
+    @staticmethod
+    def _validate_coupling(key: str, value, N: int, **_) -> str:
+        s_matrix = (
+            "should be a constant, or a square matrix (nested "
+            "lists/np.array) in the size of number_of_qubits^2 of "
+            "floats\n"
+        )
+        if ParameterSchema.is_float(value):
+            return ""
+        if N == -1:
+            return (
+                "Error 260: " + key + " could not be validated because 'N' "
+                "(or alternatively l_x, l_y) are not "
+                "defined properly\n"
+            )
+        if ParameterSchema.is_edge_list(value):
+            if set(map(len, value)) != {3}:
+                return (
+                    "Error 335: "
+                    + key
+                    + " given as an edge list must hold (i, j, value) tuples\n"
+                )
+            edges = ParameterSchema._get_array(value, 2, "biuf")
+            if edges is None:
+                return (
+                    "Error 336: "
+                    + key
+                    + " given as an edge list must hold (i, j, value) tuples of "
+                    "numbers\n"
+                )
+            indices = edges[:, :2]
+            if (
+                np.any(indices != np.round(indices))
+                or np.any(indices < 0)
+                or np.any(indices >= N)
+            ):
+                return (
+                    "Error 337: "
+                    + key
+                    + " given as an edge list must hold qubit indices in the "
+                    "range [0, N - 1]\n"
+                )
+            return ""
+        if scipy.sparse.issparse(value):
+            if value.dtype.kind not in "iuf":
+                return "Error 310: " + key + s_matrix
+            if value.shape != (N, N):
+                return "Error 320: " + key + s_matrix
+            return ""
+        if isinstance(value, list):
+            if len(value) != N:
+                return (
+                    "Error 270: " + key + " should be a constant, or a square matrix"
+                    " (nested lists/np.array) of N^2 floats\n "
+                )
+            if ParameterSchema._get_types(value) != {list}:
+                return (
+                    "Error 280: " + key + "should be a constant, or a square "
+                    "matrix (nested lists/np.array) of "
+                    "floats with a size N^2\n "
+                )
+            if set(map(len, value)) != {N}:
+                return (
+                    "Error 290: "
+                    + key
+                    + "should be a constant, or a square matrix (nested "
+                    "lists/np.array) with N^2 floats\n"
+                )
+            if ParameterSchema._get_array(value, 2, "biuf") is None:
+                return (
+                    "Error 300: "
+                    + key
+                    + "should be a constant, or a square matrix (nested "
+                    "lists/np.array) in the size of number_of_qubits^2 "
+                    "of floats\n"
+                )
+            return ""
+        if isinstance(value, np.ndarray):
+            if (str(value.dtype).find("int") == -1) and (
+                str(value.dtype).find("float") == -1
+            ):
+                return "Error 310: " + key + s_matrix
+            if value.size == 1:
+                return ""
+            if value.shape[0] != N:
+                return "Error 320: " + key + s_matrix
+            if value.shape[0] ** 2 != value.size:
+                return "Error 330: " + key + s_matrix
+            return ""
+        return (
+            "Error 340: " + key + " should be a constant, or a square matrix (nested "
+            "list/np.array) in the size of number_of_qubits^2 of floats\n"
+        )
+
+    @staticmethod
+    def _validate_gates(key: str, value, **_) -> str:
+        check_msg = ""
+        if not isinstance(value, (tuple, list, np.ndarray)):
+            return "Error 345: " + key + " must be a tuple or a list/ array of tuples\n"
+        for g_tuple in [value] if isinstance(value, tuple) else value:
+            tuple_len = len(g_tuple)
+            if tuple_len < 3 or tuple_len > 4:
+                check_msg += (
+                    "Error 346: every member of "
+                    + key
+                    + " must be of 3 or 4 elements\n"
+                )
+                continue
+            if (
+                not ParameterSchema.is_float(g_tuple[0])
+                or not isinstance(g_tuple[1], str)
+                or not ParameterSchema.is_int(g_tuple[2])
+                or (tuple_len > 3 and not ParameterSchema.is_int(g_tuple[3]))
+            ):
+                check_msg += (
+                    "Error 347: each member of " + key + " must be a tuple of the form"
+                    " (time, gate name, qubit, [qubit])\n"
+                )
+        return check_msg
+
+    @staticmethod
+    def _validate_observables(key: str, value, **_) -> str:
+        check_msg = ""
+        if not isinstance(value, (tuple, list, np.ndarray)):
+            return "Error 345: " + key + " must be a tuple or a list/ array of tuples\n"
+        b_is_collapse = key == "collapse"
+        for g_tuple in [value] if isinstance(value, tuple) else value:
+            if (
+                len(g_tuple) != 2
+                or not isinstance(g_tuple[0], tuple)
+                or len(g_tuple[0]) != 2
+                or not isinstance(g_tuple[1], list)
+            ):
+                check_msg += (
+                    "Error 341: every member of "
+                    + key
+                    + " must be a 2-tuple of a 2-tuple and a list\n"
+                )
+                continue
+            obs_type = g_tuple[0][1]
+            if not isinstance(g_tuple[0][0], str):
+                check_msg += (
+                    "Error 342: each member of the first element of"
+                    + key
+                    + " must be a tuple of the form"
+                    " (obs_name, obs_type)\n"
+                )
+                continue
+            if b_is_collapse:
+                if obs_type != "o":
+                    check_msg += (
+                        "Error 342: each member of the first element of"
+                        + key
+                        + " must be a tuple of the form"
+                        " (obs_name, obs_type), with obs_type being 'o' to indicate"
+                        " a 1Q operator expansion\n"
+                    )
+                    continue
+            elif obs_type != "g" and obs_type != "o":
+                check_msg += (
+                    "Error 342: each member of the first element of"
+                    + key
+                    + " must be a tuple of the form (obs_name, obs_type),"
+                    " with obs_type being either 'g' or 'o' to indicate"
+                    " a gate-based observable or a 1Q operator expansion\n"
+                )
+                continue
+            for o_tuple in g_tuple[1]:
+                if not isinstance(o_tuple[0], str) or not ParameterSchema.is_int(
+                    o_tuple[1]
+                ):
+                    if obs_type == "g":
+                        check_msg += (
+                            "Error 343: each member of gate-based component of"
+                            + key
+                            + " must be a tuple of the form"
+                            " (gate_name, q0, q1, ...)\n"
+                        )
+                    else:
+                        check_msg += (
+                            "Error 343: each member of an operator-based component of"
+                            + key
+                            + " must be a tuple of the form"
+                            " (operator name, qubit)\n"
+                        )
+        return check_msg
+
+    @staticmethod
+    def _validate_init_state(key: str, value, **_) -> str:
+        if not isinstance(value, (str, float, tuple, list, np.ndarray)):
+            return (
+                "Error 350: "
+                + key
+                + " must be a string, float, tuple or a list/ array of strings/floats/tuples\n"
+            )
+        init_list = [value] if isinstance(value, (str, float, tuple)) else value
+        types = ParameterSchema._get_types(init_list)
+        allowed_init = ["+x", "-x", "+y", "-y", "+z", "-z", "id"]
+        s_pauli_error = (
+            "Error 370: " + key + " can only be one of: +x, -x, +y, -y, +z, -z, id\n"
+        )
+        s_probability_error = (
+            "Error 361: a float or a length-1 tuple member of "
+            + key
+            + " represents a probability and must be between 0 and 1\n"
+        )
+        if len(init_list) == 0:
+            return ""
+        if types == {str}:
+            states = np.char.lower(np.array(init_list))
+            return s_pauli_error * int(np.sum(~np.isin(states, allowed_init)))
+        if types <= {float, int}:
+            values = np.array(init_list, dtype=float)
+            b_valid = np.isfinite(values) & (values >= 0.0) & (values <= 1.0)
+            return s_probability_error * int(np.sum(~b_valid))
+        # A list mixing different types of single-qubit states is checked element by element
+        check_msg = ""
+        for q_init in init_list:
+            if isinstance(q_init, (float, int)) or (
+                isinstance(q_init, tuple) and len(q_init) == 1
+            ):
+                val = q_init[0] if isinstance(q_init, tuple) else q_init
+                if (
+                    not ParameterSchema.is_float(val)
+                    or not isfinite(val)
+                    or val < 0.0
+                    or val > 1.0
+                ):
+                    check_msg += s_probability_error
+                continue
+            if isinstance(q_init, tuple):
+                for val in q_init:
+                    if not ParameterSchema.is_float(val) or not isfinite(val):
+                        check_msg += (
+                            "Error 362: the values in a tuple member of "
+                            + key
+                            + " must be valid numbers\n"
+                        )
+                if len(q_init) == 2:
+                    if q_init[0] < 0 or q_init[0] > np.pi:
+                        check_msg += (
+                            "Error 363: the first value in a length-2 tuple of "
+                            + key
+                            + " represents a polar angle and must be in the range 0 to pi\n"
+                        )
+                elif len(q_init) == 3:
+                    if not (
+                        0 <= q_init[0] <= 1
+                        and -1 <= q_init[1] <= 1
+                        and -1 <= q_init[2] <= 1
+                    ):
+                        check_msg += (
+                            "Error 364: a tuple member of "
+                            + key
+                            + " with three elements must contain valid entries of a"
+                            " density matrix\n"
+                        )
+                else:
+                    check_msg += (
+                        "Error 365: a tuple member of "
+                        + key
+                        + " must be of 1, 2, or 3 elements\n"
+                    )
+                continue
+            if not isinstance(q_init, str):
+                check_msg += (
+                    "Error 360: each member of "
+                    + key
+                    + " must be a string, a float, or a tuple\n"
+                )
+                continue
+            if q_init.lower() not in allowed_init:
+                check_msg += s_pauli_error
+        return check_msg
+
+    @staticmethod
+    def _validate_1q_components(key: str, value, **_) -> str:
+        if not isinstance(value, list):
+            return "Error 430: " + key + " should be a list of size 1,2,3 with x,y,z\n"
+        if len(value) > 3:
+            return "Error 440: " + key + " should be a list of size 1,2,3 with x,y,z\n"
+        if not ParameterSchema._get_types(value) <= {str}:
+            return "Error 441: " + key + " only takes x,y,z (or a subset)\n"
+        components = [val.lower() for val in value]
+        if not set(components) <= {"x", "y", "z"}:
+            return "Error 450: " + key + " only takes x,y,z (or a subset)\n"
+        if len(set(components)) != len(components):
+            return "Error 460: " + key + " only takes x,y,z (or a subset)\n"
+        return ""
+
+    @staticmethod
+    def _validate_2q_components(key: str, value, **_) -> str:
+        if not isinstance(value, list):
+            return (
+                "Error 530: " + key + "only accepts xx,yy,zz,xy,xz,yz (or a subset) "
+                "as a strings list\n"
+            )
+        if len(value) > 6:
+            return (
+                "Error 540: " + key + " only accepts xx,yy,zz,xy,xz,yz (or a subset)\n"
+            )
+        components = [str.lower(val) for val in value]
+        allowed = {"xx", "yy", "zz", "xy", "xz", "yz", "yx", "zx", "zy"}
+        if not set(components) <= allowed:
+            return (
+                "Error 550: " + key + " only accepts string from xx, yy, zz, xy, "
+                "xz, yz (or a permutation thereof)\n"
+            )
+        if len(set(components)) != len(components):
+            return (
+                "Error 550: " + key + " only accepts strings from xx, yy, zz, xy, "
+                "xz, yz (or a permutation thereof)\n"
+            )
+        return ""
+
+    @staticmethod
+    def _validate_3q_components(key: str, value, **_) -> str:
+        if not isinstance(value, list):
+            return (
+                "Error 530: " + key + "only accepts xx,yy,zz,xy,xz,yz (or a subset) "
+                "as a strings list\n"
+            )
+        for val in value:
+            val = str.lower(val)
+            if len(val) != 3 or not set(val) <= set("xyz"):
+                return "Error 531: " + key + "only accepts length-3 Pauli strings\n"
+        return ""
+
+    @staticmethod
+    def _validate_1q_indices(key: str, value, N: int, **_) -> str:
+        if not isinstance(value, list):
+            return "Error 470: " + key + " should be an integer list (1,2,3,4..)\n"
+        if N == -1:
+            return (
+                "Error 480: " + key + "could not be validated because 'N'"
+                " (or alternatively l_x,"
+                " l_y) are not defined properly\n "
+            )
+        if len(value) == 0:
+            return ""
+        indices = ParameterSchema._get_array(value, 1, "biu")
+        if indices is None:
+            return "Error 490: " + key + " should be an integer list (1,2,3,4..)\n"
+        if np.any(indices >= N) or np.any(indices < 0):
+            return (
+                "Error 500: " + key + " should be an integer list listing "
+                "qubits, therefore integers in the "
+                "range 0 to N-1\n"
+            )
+        if len(value) > N:
+            return (
+                "Error 510: " + key + " 's length should be equal/smaller than "
+                "the amount of qubits\n "
+            )
+        if len(np.unique(indices)) != len(value):
+            return "Error 520: " + key + " 's List does not contain unique elements"
+        return ""
+
+    @staticmethod
+    def _validate_index_tuples(key: str, value, N: int, **_) -> str:
+        if not isinstance(value, list):
+            return (
+                "Error 570: " + key + " should be a list of tuples"
+                " containing integers\n"
+            )
+        if N == -1:
+            return (
+                "Error 580: " + key + " could not be validated because 'N' "
+                "(or alternatively l_x, "
+                "l_y) are not defined properly\n"
+            )
+        if len(value) == 0:
+            return ""
+        tup_len = 3 if key == "3q_indices" else 2
+        if ParameterSchema._get_types(value) != {tuple}:
+            return (
+                "Error 590: "
+                + key
+                + " should be a list of tuples containing integers\n "
+            )
+        indices = ParameterSchema._get_array(value, 2, "biu")
+        if set(map(len, value)) != {tup_len} or indices is None:
+            return (
+                "Error 600: " + key + f" should be a list of tuples of size {tup_len}, "
+                "containing integers\n "
+            )
+        if np.any(indices >= N) or np.any(indices < 0):
+            return (
+                "Error 610: " + key + f" should be a list of tuples of size {tup_len}, "
+                "containing integers equal to or smaller than "
+                "the total number of qubits\n "
+            )
+        if len(np.unique(indices, axis=0)) != len(value):
+            return "Error 630: " + key + " contains duplicate elements\n"
+        return ""
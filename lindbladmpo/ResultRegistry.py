@@ -0,0 +1,163 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Defines a registry of completed simulations in a directory, addressed by the hash of their
+parameters, through which the results of identical simulations are reused.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from typing import Iterable, Optional
+
+
+class ResultRegistry:
+    """A registry of the output files of completed simulations, stored in a directory.
+
+    Each entry of the registry is a small file named by the key of a simulation (the hash of its
+    parameters, see `LindbladMPOSolver.get_parameters_hash()`), holding the output path and the
+    output format and compression of the simulation, and the suffixes, sizes, modification times
+    and content hashes of its output files. Looking up a
+    key is a single file read, independent of the number of entries. An entry is written with a
+    temporary name and renamed, which is atomic on a single file system, so that processes sharing
+    the registry concurrently never read a partially written entry. An entry whose output files
+    were modified or deleted since it was registered is ignored, and replaced when the simulation
+    is registered again.
+    """
+
+    ENTRY_SUFFIX = ".json"
+    """The suffix of the names of the entry files."""
+
+    ENTRY_VERSION = 2
+    """The version of the format of the entry files, which are ignored if it differs."""
+
+    def __init__(self, s_directory: str):
+        """Initialize the registry, creating its directory if needed.
+
+        Args:
+                s_directory: The registry directory.
+        """
+        self.s_directory = s_directory
+        os.makedirs(s_directory, exist_ok=True)
+
+    def _get_entry_file(self, s_key: str) -> str:
+        """Returns the name of the entry file of a key, in a subdirectory named by the first two
+        characters of the key, which keeps the directories small in large registries."""
+        return os.path.join(
+            self.s_directory, s_key[:2], s_key + ResultRegistry.ENTRY_SUFFIX
+        )
+
+    def lookup(self, s_key: str) -> Optional[dict]:
+        """Returns the entry of a key, if it exists and its output files are unchanged.
+
+        Args:
+                s_key: The key of the simulation.
+        Returns:
+                A dictionary with the key "output_path", holding the output path of the registered
+                simulation, the keys "output_format" and "output_compression", holding the values
+                of these parameters of the simulation, and the key "files", mapping the suffix of
+                each of its output files (appended to the output path) to a list with the size and
+                modification time in nanoseconds of the file, and the SHA-256 hash of its content
+                (see `get_file_hash()`), or None if no valid entry was found.
+        """
+        try:
+            with open(self._get_entry_file(s_key)) as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != ResultRegistry.ENTRY_VERSION:
+            return None
+        for s_suffix, (n_size, n_mtime, _) in entry["files"].items():
+            stamp = ResultRegistry.get_file_stamp(entry["output_path"] + s_suffix)
+            if stamp != [n_size, n_mtime]:
+                return None
+        return entry
+
+    def register(
+        self,
+        s_key: str,
+        s_output_path: str,
+        s_suffixes: Iterable[str],
+        s_output_format: str,
+        n_output_compression: int,
+    ):
+        """Registers the output files of a completed simulation, replacing an existing entry of the
+        key. A failure to write the entry is reported as a warning.
+
+        Args:
+                s_key: The key of the simulation.
+                s_output_path: The output path (prefix of the output files) of the simulation.
+                s_suffixes: The suffixes of the output files, appended to the output path.
+                s_output_format: The `output_format` parameter of the simulation.
+                n_output_compression: The `output_compression` parameter of the simulation.
+        """
+        s_output_path = os.path.abspath(s_output_path)
+        files = {}
+        for s_suffix in s_suffixes:
+            s_file = s_output_path + s_suffix
+            stamp = ResultRegistry.get_file_stamp(s_file)
+            if stamp is None:
+                raise Exception(f"The output file {s_file} is missing.")
+            files[s_suffix] = stamp + [ResultRegistry.get_file_hash(s_file)]
+        entry = {
+            "version": ResultRegistry.ENTRY_VERSION,
+            "output_path": s_output_path,
+            "output_format": s_output_format,
+            "output_compression": n_output_compression,
+            "files": files,
+        }
+        s_entry_file = self._get_entry_file(s_key)
+        s_temp_file = f"{s_entry_file}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(s_entry_file), exist_ok=True)
+            with open(s_temp_file, "w") as file:
+                json.dump(entry, file)
+            os.replace(s_temp_file, s_entry_file)
+        except OSError:
+            print(
+                "Warning: unable to write to the result registry directory "
+                + self.s_directory
+                + "."
+            )
+            if os.path.isfile(s_temp_file):
+                os.remove(s_temp_file)
+
+    def remove(self, s_key: str) -> bool:
+        """Removes the entry of a key (the output files are kept).
+
+        Args:
+                s_key: The key of the simulation.
+        Returns:
+                Whether the entry existed.
+        """
+        try:
+            os.remove(self._get_entry_file(s_key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    @staticmethod
+    def get_file_stamp(s_file: str) -> Optional[list]:
+        """Returns a list with the size and modification time in nanoseconds of a file, or None if
+        it does not exist."""
+        try:
+            stat = os.stat(s_file)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    @staticmethod
+    def get_file_hash(s_file: str) -> str:
+        """Returns the SHA-256 hash of the content of a file, as a hexadecimal string."""
+        file_hash = hashlib.sha256()
+        with open(s_file, "rb") as file:
+            for s_block in iter(lambda: file.read(1 << 20), b""):
+                file_hash.update(s_block)
+        return file_hash.hexdigest()
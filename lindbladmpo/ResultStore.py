@@ -0,0 +1,386 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Defines a columnar storage class for the observables of one solver output type.
+"""
+
+from collections.abc import Mapping
+from typing import Optional, Sequence, Tuple
+import numpy as np
+
+
+class ResultStore(Mapping):
+    """Columnar storage of the observables of one output type (such as 1-qubit observables).
+
+    The values are stored in one contiguous array `data` of shape [op, qubits, time], where the
+    first axis runs over the operator names in `ops`, the second axis runs over the qubit index
+    tuples in `qubits`, and the third axis runs over the shared time axis `times`. Entries for
+    which no value was loaded are marked as False in the boolean array `mask` of the same shape,
+    and hold a NaN value in `data`.
+
+    The class implements a read-only mapping view that is backwards compatible with the
+    dictionary previously used to store the results. It is indexed by a tuple whose first entry is
+    the lowercase operator name, and the second entry is a tuple of (0-based) qubit indices. Each
+    value is a tuple of two lists, the first being the time points and the second holding the
+    values of the observable. The array methods of the class should be used for efficient access.
+    """
+
+    def __init__(
+        self,
+        n_indices: int,
+        ops: Optional[Sequence[str]] = None,
+        qubits: Optional[np.ndarray] = None,
+        times: Optional[np.ndarray] = None,
+        data: Optional[np.ndarray] = None,
+        mask: Optional[np.ndarray] = None,
+        obs_keys: Optional[Sequence[Tuple[int, int]]] = None,
+    ):
+        """Initialize the instance.
+
+        Args:
+                n_indices: The number of qubit indices of each observable (0 for global data and
+                        custom observables).
+                ops: The operator names, indexing the first axis of the data.
+                qubits: An integer array of shape (n_tuples, n_indices), whose rows are the qubit
+                        index tuples indexing the second axis of the data.
+                times: The times of the data, indexing its third axis.
+                data: A float array with the values of the observables, of shape [op, qubits, time].
+                mask: An optional boolean array of the same shape as data, with False entries marking
+                        missing values. If None, all entries of the data which are not NaN are used.
+                obs_keys: An optional sequence of (op, qubits) index pairs, determining the entries
+                        of the mapping view and their order. If None, all pairs with any values
+                        are included, ordered by the qubits and then by the operators.
+        """
+        self.n_indices = n_indices
+        self.ops = list(ops) if ops is not None else []
+        if qubits is None:
+            qubits = np.zeros((0, n_indices), dtype=np.int64)
+        self.qubits = np.asarray(qubits, dtype=np.int64)
+        if times is None:
+            times = np.zeros(0, dtype=np.float64)
+        self.times = np.asarray(times, dtype=np.float64)
+        shape = (len(self.ops), len(self.qubits), len(self.times))
+        if data is None:
+            data = np.full(shape, np.nan)
+        self.data = np.asarray(data, dtype=np.float64)
+        if self.data.shape != shape:
+            raise Exception(
+                f"The data array of shape {self.data.shape} does not match the expected shape {shape}."
+            )
+        if mask is None:
+            mask = ~np.isnan(self.data)
+        self.mask = np.asarray(mask, dtype=bool)
+        if obs_keys is None:
+            obs_keys = [
+                (i_op, i_tuple)
+                for i_tuple, i_op in zip(*np.nonzero(self.mask.any(axis=2).T))
+            ]
+        self._op_index = {s_op: i_op for i_op, s_op in enumerate(self.ops)}
+        self._qubits_index = {
+            tuple(q_tuple): i_tuple
+            for i_tuple, q_tuple in enumerate(self.qubits.tolist())
+        }
+        self._time_index = {t: i_t for i_t, t in enumerate(self.times.tolist())}
+        self._obs_index = {}
+        for i_op, i_tuple in obs_keys:
+            obs_key = (self.ops[i_op], tuple(self.qubits[i_tuple].tolist()))
+            self._obs_index[obs_key] = (int(i_op), int(i_tuple))
+
+    @classmethod
+    def from_columns(cls, columns: tuple, n_indices: int) -> "ResultStore":
+        """Creates a store from columnar data, with one entry per row.
+
+        Args:
+                columns: A tuple (times, op_codes, ops, q_indices, values), where times and values
+                        are float arrays, op_codes is an integer array indexing the operator names
+                        in the sequence ops, and q_indices is an integer array of shape
+                        (n_rows, n_indices).
+                n_indices: The number of qubit indices of each observable.
+        Returns:
+                The created store. The entries of the mapping view are ordered by the first
+                appearance of each observable in the rows. If a value appears more than once for the
+                same observable and time, the last one is stored.
+        """
+        times, op_codes, ops, q_indices, values = columns
+        if len(times) == 0:
+            return cls(n_indices)
+        tuple_rows, tuple_codes = _classify_qubits(q_indices, n_indices)
+        # The solver writes the rows of each time step consecutively, so the times are classified
+        # only at the first row of each run of repeated times
+        run_starts = np.flatnonzero(np.concatenate(([True], times[1:] != times[:-1])))
+        unique_times, run_codes = np.unique(times[run_starts], return_inverse=True)
+        time_codes = np.repeat(
+            run_codes.reshape(-1), np.diff(np.append(run_starts, len(times)))
+        )
+        data = np.full((len(ops), len(tuple_rows), len(unique_times)), np.nan)
+        mask = np.zeros(data.shape, dtype=bool)
+        data[op_codes, tuple_codes, time_codes] = values
+        mask[op_codes, tuple_codes, time_codes] = True
+        # Order the observables by their first appearance
+        obs_codes = op_codes * len(tuple_rows) + tuple_codes
+        first_rows = np.full(len(ops) * len(tuple_rows), len(times), dtype=np.int64)
+        np.minimum.at(first_rows, obs_codes, np.arange(len(times)))
+        obs_codes = np.flatnonzero(first_rows < len(times))
+        obs_codes = obs_codes[np.argsort(first_rows[obs_codes], kind="stable")]
+        obs_keys = list(
+            zip(
+                (obs_codes // len(tuple_rows)).tolist(),
+                (obs_codes % len(tuple_rows)).tolist(),
+            )
+        )
+        return cls(
+            n_indices,
+            ops,
+            q_indices[tuple_rows],
+            unique_times,
+            data,
+            mask,
+            obs_keys,
+        )
+
+    @classmethod
+    def from_blocks(
+        cls,
+        times: np.ndarray,
+        values: np.ndarray,
+        op_codes: np.ndarray,
+        ops: Sequence[str],
+        q_indices: np.ndarray,
+        n_indices: int,
+    ) -> "ResultStore":
+        """Creates a store from data holding the same observables (columns) at each time.
+
+        Args:
+                times: A float array with the times.
+                values: A float array of shape (len(times), n_columns) with the values.
+                op_codes: An integer array with the index of the operator of each column in ops.
+                ops: The operator names.
+                q_indices: An integer array of shape (n_columns, n_indices) with the qubit indices
+                        of each column.
+                n_indices: The number of qubit indices of each observable.
+        Returns:
+                The created store. The entries of the mapping view are ordered as the columns.
+        """
+        n_times, n_columns = values.shape
+        if n_times > 0 and n_columns > 0 and np.all(np.diff(times) > 0):
+            tuple_rows, tuple_codes = _classify_qubits(q_indices, n_indices)
+            obs_codes = op_codes * len(tuple_rows) + tuple_codes
+            _, first_columns = np.unique(obs_codes, return_index=True)
+            if len(first_columns) == n_columns:
+                data = np.full((len(ops), len(tuple_rows), n_times), np.nan)
+                mask = np.zeros(data.shape, dtype=bool)
+                data[op_codes, tuple_codes, :] = values.T
+                mask[op_codes, tuple_codes, :] = True
+                first_columns = np.sort(first_columns)
+                obs_keys = list(
+                    zip(
+                        op_codes[first_columns].tolist(),
+                        tuple_codes[first_columns].tolist(),
+                    )
+                )
+                return cls(
+                    n_indices,
+                    ops,
+                    q_indices[tuple_rows],
+                    times,
+                    data,
+                    mask,
+                    obs_keys,
+                )
+        # The general (slower) construction also handles repeated times and observables
+        return cls.from_columns(
+            (
+                np.repeat(times, n_columns),
+                np.tile(op_codes, n_times),
+                ops,
+                np.tile(q_indices, (n_times, 1)),
+                values.reshape(-1),
+            ),
+            n_indices,
+        )
+
+    @classmethod
+    def from_dict(cls, obs_dict: Mapping, n_indices: int) -> "ResultStore":
+        """Creates a store from a dictionary in the format of the mapping view of the class.
+
+        Args:
+                obs_dict: A dictionary indexed by (op, q_indices) tuples, whose values are tuples of
+                        a sequence of times and a sequence of values.
+                n_indices: The number of qubit indices of each observable.
+        Returns:
+                The created store.
+        """
+        if isinstance(obs_dict, ResultStore):
+            return obs_dict
+        op_names = []
+        op_index = {}
+        columns = ([], [], [], [])
+        for (s_op, q_tuple), (obs_times, obs_values) in obs_dict.items():
+            i_op = op_index.get(s_op, None)
+            if i_op is None:
+                i_op = len(op_names)
+                op_index[s_op] = i_op
+                op_names.append(s_op)
+            columns[0].extend(obs_times)
+            columns[1].extend([i_op] * len(obs_times))
+            columns[2].extend([tuple(q_tuple)] * len(obs_times))
+            columns[3].extend(obs_values)
+        return cls.from_columns(
+            (
+                np.asarray(columns[0], dtype=np.float64),
+                np.asarray(columns[1], dtype=np.int64),
+                op_names,
+                np.asarray(columns[2], dtype=np.int64).reshape(
+                    len(columns[2]), n_indices
+                ),
+                np.asarray(columns[3], dtype=np.float64),
+            ),
+            n_indices,
+        )
+
+    def to_arrays(self) -> dict:
+        """Returns a dictionary of arrays holding the contents of the store, which can be saved
+        by `np.savez()` and restored (without pickling) by `from_arrays()`."""
+        return {
+            "n_indices": np.array(self.n_indices, dtype=np.int64),
+            "ops": np.array(self.ops, dtype=str),
+            "qubits": self.qubits,
+            "times": self.times,
+            "data": self.data,
+            "mask": self.mask,
+            "obs_keys": np.array(
+                list(self._obs_index.values()), dtype=np.int64
+            ).reshape(-1, 2),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping) -> "ResultStore":
+        """Creates a store from a dictionary of arrays, as returned by `to_arrays()`."""
+        n_indices = int(arrays["n_indices"])
+        return cls(
+            n_indices,
+            [str(s_op) for s_op in arrays["ops"]],
+            arrays["qubits"],
+            arrays["times"],
+            arrays["data"],
+            arrays["mask"],
+            arrays["obs_keys"].tolist(),
+        )
+
+    def __getitem__(self, key) -> Tuple[list, list]:
+        i_op, i_tuple = self._obs_index[key]
+        obs_mask = self.mask[i_op, i_tuple]
+        return (
+            self.times[obs_mask].tolist(),
+            self.data[i_op, i_tuple][obs_mask].tolist(),
+        )
+
+    def __iter__(self):
+        return iter(self._obs_index)
+
+    def __len__(self) -> int:
+        return len(self._obs_index)
+
+    def __contains__(self, key) -> bool:
+        return key in self._obs_index
+
+    def __repr__(self) -> str:
+        return (
+            f"ResultStore(n_indices={self.n_indices}, ops={self.ops}, "
+            f"n_qubit_tuples={len(self.qubits)}, n_times={len(self.times)})"
+        )
+
+    def time_index(self, t: float) -> Optional[int]:
+        """Returns the index of a time in the shared time axis, or None if it is not found."""
+        return self._time_index.get(t, None)
+
+    def op_index(self, s_op: str) -> Optional[int]:
+        """Returns the index of an operator in the first data axis, or None if it is not found."""
+        return self._op_index.get(s_op.lower(), None)
+
+    def qubits_index(self, q_indices: Sequence[int]) -> Optional[int]:
+        """Returns the index of a qubit indices tuple in the second data axis, or None if it is
+        not found."""
+        return self._qubits_index.get(tuple(q_indices), None)
+
+    def get_series(
+        self, s_op: str, q_indices: Sequence[int] = ()
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Returns the time series of one observable.
+
+        Args:
+                s_op: The operator name.
+                q_indices: The qubit indices of the observable (empty for global data and custom
+                        observables).
+        Returns:
+                A tuple of two arrays, the first being the time points and the second holding the
+                values of the observable, or None if the observable is not found.
+        """
+        obs_index = self._obs_index.get((s_op.lower(), tuple(q_indices)), None)
+        if obs_index is None:
+            return None
+        obs_mask = self.mask[obs_index]
+        return self.times[obs_mask], self.data[obs_index][obs_mask]
+
+    def get_tensor(
+        self, s_op: str, n_qubits: Optional[int] = None, t: Optional[float] = None
+    ) -> Optional[np.ndarray]:
+        """Returns the values of one operator for all qubits as a dense array.
+
+        Args:
+                s_op: The operator name.
+                n_qubits: The number of qubits, determining the size of each qubit axis. If None,
+                        the largest stored qubit index plus one is used.
+                t: An optional time at which to take the values. If None, all times are returned.
+        Returns:
+                An array of shape (n_qubits,) * n_indices + (len(times),) if `t` is None, or of shape
+                (n_qubits,) * n_indices otherwise. Entries without a value hold NaN. None is returned
+                if the operator or the time are not found.
+        """
+        i_op = self.op_index(s_op)
+        if i_op is None:
+            return None
+        if t is None:
+            time_slice = slice(None)
+            n_times = (len(self.times),)
+        else:
+            time_slice = self.time_index(t)
+            if time_slice is None:
+                return None
+            n_times = ()
+        if n_qubits is None:
+            n_qubits = int(self.qubits.max()) + 1 if self.qubits.size else 0
+        tensor = np.full((n_qubits,) * self.n_indices + n_times, np.nan)
+        in_range = np.all(self.qubits < n_qubits, axis=1)
+        values = np.where(self.mask[i_op], self.data[i_op], np.nan)[in_range]
+        if self.n_indices == 0:
+            # Global data and custom observables have one qubits entry (an empty tuple)
+            if len(values):
+                tensor[...] = values[0, time_slice]
+        else:
+            tensor[tuple(self.qubits[in_range].T)] = values[:, time_slice]
+        return tensor
+
+
+def _classify_qubits(q_indices: np.ndarray, n_indices: int) -> tuple:
+    """Finds the distinct rows (qubit index tuples) of an integer array of shape (n_rows, n_indices).
+
+    Returns:
+            A tuple (tuple_rows, tuple_codes), where tuple_rows holds the index of one row with each
+            distinct tuple, and tuple_codes holds for each row the index of its tuple in tuple_rows.
+    """
+    # Encode each qubit indices tuple as a single integer
+    n_radix = int(q_indices.max()) + 2 if q_indices.size else 1
+    tuple_codes = np.zeros(len(q_indices), dtype=np.int64)
+    for i_index in range(n_indices):
+        tuple_codes = tuple_codes * n_radix + (q_indices[:, i_index] + 1)
+    _, tuple_rows, tuple_codes = np.unique(
+        tuple_codes, return_index=True, return_inverse=True
+    )
+    return tuple_rows, tuple_codes.reshape(-1)
@@ -0,0 +1,151 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Defines a pool of persistent solver processes, to which simulations are sent one after another.
+"""
+
+import concurrent.futures
+import queue
+import subprocess
+from collections import deque
+from typing import Iterable, List, Optional
+
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+
+
+class SolverPool:
+    """A pool of persistent solver processes running in the serve mode.
+
+    Starting the solver executable for every simulation repeats the loading and initialization of
+    the executable and its libraries, which can dominate the run time of sweeps of many small
+    simulations. The processes of the pool are started with the `--serve` command line argument,
+    and each of them runs the simulations sent to it one after another. A process that terminates
+    (for example, after a solver error) is replaced by a new process for the next simulation.
+
+    The pool can be used as a context manager, which closes the processes when exiting.
+    """
+
+    SERVE_DONE_MARKER = "#lindbladmpo-serve: done"
+    """The line written by the solver to its standard output after each simulation in the serve
+    mode, followed by the exit code of the simulation (which is nonzero if it failed)."""
+
+    SERVE_LOG_PREFIX = "|"
+    """The prefix of every line of the console output of the simulations in the serve mode, which
+    distinguishes it from the lines with SERVE_DONE_MARKER."""
+
+    def __init__(
+        self,
+        n_processes: int = 2,
+        s_cygwin_path: Optional[str] = None,
+        s_solver_path: Optional[str] = None,
+    ):
+        """Initialize the pool. The solver processes are started when first used.
+
+        Args:
+                n_processes: The number of solver processes, which is the maximal number of
+                        simulations that run concurrently.
+                s_cygwin_path: On Windows only, indicates the cygwin executable path. A default
+                        location will be assigned if this argument is not passed.
+                s_solver_path: Indicates the solver executable path. A default location will be
+                        assigned if this argument is not passed.
+        """
+        if n_processes < 1:
+            raise Exception("The number of solver processes must be at least 1.")
+        s_cygwin_path, s_solver_path = LindbladMPOSolver.process_default_paths(
+            s_cygwin_path, s_solver_path
+        )
+        self.s_cygwin_path = s_cygwin_path
+        self.s_solver_path = s_solver_path
+        self.n_processes = n_processes
+        self._processes = queue.Queue()
+        for _ in range(n_processes):
+            self._processes.put(None)
+
+    def solve(self, parameters: dict) -> LindbladMPOSolver:
+        """Solves a simulation using one of the processes of the pool, waiting for a process to
+        become available if all are busy. This method may be called concurrently from several
+        threads.
+
+        Args:
+                parameters: The model parameters.
+        Returns:
+                A solver instance with the simulation parameters, whose `result` member holds the
+                result dictionaries of the simulation, as after calling its `solve()` method.
+        """
+        solver = LindbladMPOSolver(parameters, self.s_cygwin_path, self.s_solver_path)
+        solver.build()
+        process = self._processes.get()
+        try:
+            if process is None or process.poll() is not None:
+                process = LindbladMPOSolver._start_process(
+                    self.s_cygwin_path, self.s_solver_path, "", b_serve=True
+                )
+            exit_code = SolverPool._run_simulation(process, solver.s_input_file)
+        finally:
+            self._processes.put(process)
+        if exit_code != 0:
+            raise Exception("There was an error executing the solver.")
+        solver.result = LindbladMPOSolver.load_output(solver.s_output_path)
+        return solver
+
+    def map(self, parameters_list: Iterable[dict]) -> List[LindbladMPOSolver]:
+        """Solves a sequence of simulations concurrently using all processes of the pool.
+
+        Args:
+                parameters_list: The model parameters of each simulation.
+        Returns:
+                A list of the solver instances of the simulations (in the same order), as returned
+                by `solve()`.
+        """
+        with concurrent.futures.ThreadPoolExecutor(self.n_processes) as executor:
+            return list(executor.map(self.solve, parameters_list))
+
+    def close(self):
+        """Closes the solver processes of the pool, waiting for them to terminate."""
+        for _ in range(self.n_processes):
+            process = self._processes.get()
+            if process is not None:
+                process.stdin.close()
+                process.wait()
+                process.stdout.close()
+        for _ in range(self.n_processes):
+            self._processes.put(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _run_simulation(process: subprocess.Popen, s_input_file: str) -> int:
+        """Sends the input file of a simulation to a solver process in the serve mode, and waits for
+        the simulation to end, returning its exit code. The console output of the solver is also
+        saved to the log file of the simulation, and the last lines are printed if it fails."""
+        lines = deque(maxlen=20)
+        try:
+            process.stdin.write(s_input_file + "\n")
+            process.stdin.flush()
+            for line in process.stdout:
+                if line.startswith(SolverPool.SERVE_LOG_PREFIX):
+                    lines.append(line[len(SolverPool.SERVE_LOG_PREFIX) :])
+                elif line.startswith(SolverPool.SERVE_DONE_MARKER):
+                    exit_code = int(line[len(SolverPool.SERVE_DONE_MARKER) :])
+                    if exit_code != 0:
+                        print("".join(lines))
+                    return exit_code
+                else:
+                    lines.append(line)
+        except BrokenPipeError:
+            pass
+        # The process terminated during the simulation
+        exit_code = process.wait()
+        print("".join(lines))
+        print(f"Solver process terminated with exit code {exit_code}.\n")
+        return exit_code if exit_code != 0 else 1
@@ -17,6 +17,9 @@ import matplotlib.pyplot as plt
 import numpy as np
 import scipy
 
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from lindbladmpo.ResultStore import ResultStore
+
 
 LINDBLADMPO_TEX_LABELS = {
     "tr_rho": "{\\rm tr}\\rho",
@@ -40,6 +43,25 @@ def _save_fig(b_save_figures, s_file_prefix, s_file_label):
         plt.savefig(s_file_prefix + s_file_label + ".png")
 
 
+def _get_result_store(
+    result: Union[dict, str],
+    s_output_type: str,
+    t: Optional[float] = None,
+    observables: Optional[Sequence[str]] = None,
+) -> Optional[ResultStore]:
+    if isinstance(result, str):
+        # Load from the output files only the observables used, at the time used (if given)
+        t_range = None if t is None else (t, t)
+        return LindbladMPOSolver.load_output(
+            result, observables, t_range=t_range, types=[s_output_type]
+        )[s_output_type]
+    obs_dict = result[s_output_type]
+    if obs_dict is None:
+        return None
+    n_indices = LindbladMPOSolver.OUTPUT_TYPE_INDICES[s_output_type]
+    return ResultStore.from_dict(obs_dict, n_indices)
+
+
 def prepare_time_data(
     parameters: dict,
     n_t_ticks=10,
@@ -155,16 +177,16 @@ def prepare_2q_correlation_data(
                             indicate that the data is of 2Q connected correlation (the subtraction of
                             the 1Q product).
     """
-    obs_1q_dict = result["obs-1q"]
-    obs_2q_dict = result["obs-2q"]
+    obs_1q = _get_result_store(result, "obs-1q")
+    obs_2q = _get_result_store(result, "obs-2q")
     obs_data = None
     s_tex_label = ""
     s_obs_name = s_obs_name.lower()
     # Below we verify that all required 1Q and 2Q observables have complete data available.
-    if obs_1q_dict is not None and obs_2q_dict is not None:
-        obs_0 = obs_1q_dict.get((s_obs_name[0], (q_indices[0],)))
-        obs_1 = obs_1q_dict.get((s_obs_name[1], (q_indices[1],)))
-        obs_2 = obs_2q_dict.get((s_obs_name, q_indices))
+    if obs_1q is not None and obs_2q is not None:
+        obs_0 = obs_1q.get_series(s_obs_name[0], (q_indices[0],))
+        obs_1 = obs_1q.get_series(s_obs_name[1], (q_indices[1],))
+        obs_2 = obs_2q.get_series(s_obs_name, q_indices)
         if (
             obs_0 is not None
             and obs_1 is not None
@@ -176,10 +198,8 @@ def prepare_2q_correlation_data(
             # times are identical, if they are equal in number. Verifying the time array lengths
             # will avoid crashes due to interrupted simulations with incomplete data files.
             obs_data = (
-                obs_0[0],
-                (
-                    np.asarray(obs_2[1]) - np.asarray(obs_0[1]) * np.asarray(obs_1[1])
-                ).tolist(),
+                obs_0[0].tolist(),
+                (obs_2[1] - obs_0[1] * obs_1[1]).tolist(),
             )
             s_tex_label = (
                 f"\\sigma^{s_obs_name[0]}_{{{q_indices[0]}}} "
@@ -189,7 +209,7 @@ def prepare_2q_correlation_data(
 
 
 def prepare_2q_correlation_matrix(
-    result: dict, s_obs_name: str, t: float, n_qubits: int
+    result: Union[dict, str], s_obs_name: str, t: float, n_qubits: int
 ) -> (np.ndarray, str):
     """
     Prepare the data used for plotting the matrix of connected correlation values of one type for all.
@@ -197,7 +217,8 @@ def prepare_2q_correlation_matrix(
     corresponding 1Q observables is subtracted.
 
     Args:
-            result: A dictionary from which the observables are taken.
+            result: A dictionary from which the observables are taken, or the prefix of the output
+                    files path, from which only the observables at time `t` are loaded.
             s_obs_name: The name of the specific observable, used a key into the relevant observables
                     dict, and also in formatting the descriptive tex label of the data.
             t: The simulation time for which the data is to be calculated.
@@ -210,43 +231,25 @@ def prepare_2q_correlation_matrix(
                             indicate that the data is of 2Q connected correlation (the subtraction of
                             the 1Q product).
     """
-    obs_1q_dict = result["obs-1q"]
-    obs_2q_dict = result["obs-2q"]
-    obs_data = np.full(shape=(n_qubits, n_qubits), dtype=float, fill_value=np.nan)
     s_obs_name = s_obs_name.lower()
-    r_qubits = range(n_qubits)
-    # Below we verify that all required 1Q and 2Q observables have complete data available.
-    if obs_1q_dict is not None and obs_2q_dict is not None:
-        for i in r_qubits:
-            for j in r_qubits:
-                if i == j:
-                    continue
-                obs_0 = obs_1q_dict.get((s_obs_name[0], (i,)))
-                obs_1 = obs_1q_dict.get((s_obs_name[1], (j,)))
-                obs_2 = obs_2q_dict.get((s_obs_name, (i, j)))
-                if (
-                    obs_0 is not None
-                    and obs_1 is not None
-                    and obs_2 is not None
-                    and len(obs_0[0]) == len(obs_1[0])
-                    and len(obs_0[0]) == len(obs_2[0])
-                ):
-                    # The data all comes from one simulation, so we can safely assume that the time
-                    # arrays are identical, if they are equal in number. Verifying the time array lengths
-                    # will avoid crashes due to interrupted simulations with incomplete data files.
-                    try:
-                        t_index = obs_0[0].index(t)
-                        obs_data[i, j] = (
-                            obs_2[1][t_index] - obs_0[1][t_index] * obs_1[1][t_index]
-                        )
-                    except ValueError:
-                        pass
+    obs_1q = _get_result_store(result, "obs-1q", t, [s_obs_name[0], s_obs_name[1]])
+    obs_2q = _get_result_store(result, "obs-2q", t, [s_obs_name])
+    obs_data = np.full(shape=(n_qubits, n_qubits), dtype=float, fill_value=np.nan)
+    # Missing 1Q and 2Q values (for example at times beyond the end of interrupted simulations
+    # with incomplete data files) are filled with NaN values in the tensors taken below.
+    if obs_1q is not None and obs_2q is not None:
+        obs_0 = obs_1q.get_tensor(s_obs_name[0], n_qubits, t)
+        obs_1 = obs_1q.get_tensor(s_obs_name[1], n_qubits, t)
+        obs_2 = obs_2q.get_tensor(s_obs_name, n_qubits, t)
+        if obs_0 is not None and obs_1 is not None and obs_2 is not None:
+            obs_data = obs_2 - np.outer(obs_0, obs_1)
+            np.fill_diagonal(obs_data, np.nan)
     s_tex_label = f"\\sigma^{s_obs_name[0]}_{{i}}\\sigma^{s_obs_name[1]}_{{j}}"
     return obs_data, s_tex_label
 
 
 def prepare_xy_current_data(
-    result: dict, qubit_pairs: Sequence[Sequence], t: float
+    result: Union[dict, str], qubit_pairs: Sequence[Sequence], t: float
 ) -> (np.ndarray, str):
     """
     Prepare the data used for plotting the current operator between qubit pairs, based on
@@ -255,7 +258,8 @@ def prepare_xy_current_data(
         0.5 (X_i Y_j - X_j Y_i).
 
     Args:
-            result: A dictionary from which the observables are taken.
+            result: A dictionary from which the observables are taken, or the prefix of the output
+                    files path, from which only the observables at time `t` are loaded.
             qubit_pairs: A sequence of qubit pairs for which the current operator is calculated.
             t: The simulation time for which the data is to be calculated.
 
@@ -264,30 +268,17 @@ def prepare_xy_current_data(
                 obs_data: A list with the current operator for each qubit pair at time `t`.
                 s_tex_label: A formatted tex label describing the data.
     """
-    obs_2q_dict = result["obs-2q"]
-    obs_data = np.full(shape=(len(qubit_pairs),), dtype=float, fill_value=np.nan)
     s_obs_name = "xy"
-    if obs_2q_dict is not None:
-        for i_bond, bond in enumerate(qubit_pairs):
-            i = bond[0]
-            j = bond[1]
-            if i == j:
-                continue
-            obs_1 = obs_2q_dict.get((s_obs_name, (i, j)))
-            obs_2 = obs_2q_dict.get((s_obs_name, (j, i)))
-            if (
-                obs_1 is not None
-                and obs_2 is not None
-                and len(obs_1[0]) == len(obs_2[0])
-            ):
-                # The data all comes from one simulation, so we can safely assume that the time
-                # arrays are identical, if they are equal in number. Verifying the time array lengths
-                # will avoid crashes due to interrupted simulations with incomplete data files.
-                try:
-                    t_index = obs_2[0].index(t)
-                    obs_data[i_bond] = 0.5 * (obs_1[1][t_index] - obs_2[1][t_index])
-                except ValueError:
-                    pass
+    obs_2q = _get_result_store(result, "obs-2q", t, [s_obs_name])
+    obs_data = np.full(shape=(len(qubit_pairs),), dtype=float, fill_value=np.nan)
+    if obs_2q is not None and len(qubit_pairs):
+        pairs = np.asarray(qubit_pairs, dtype=int)[:, 0:2]
+        obs_2 = obs_2q.get_tensor(s_obs_name, int(pairs.max()) + 1, t)
+        if obs_2 is not None:
+            i = pairs[:, 0]
+            j = pairs[:, 1]
+            obs_data = 0.5 * (obs_2[i, j] - obs_2[j, i])
+            obs_data[i == j] = np.nan
     s_tex_label = (
         f"\\frac{{1}}{{2}}\\left(\\sigma^{s_obs_name[0]}_{{i}}\\sigma^{s_obs_name[1]}_{{j}} -"
         f"\\sigma^{s_obs_name[1]}_{{i}}\\sigma^{s_obs_name[0]}_{{j}}\\right)"
@@ -348,9 +339,9 @@ def prepare_2q_density_operator(
         "y": np.asarray([[0, -1j], [1j, 0]], dtype=complex),
         "z": np.asarray([[1, 0], [0, -1]], dtype=complex),
     }
-    obs_1q_dict = result["obs-1q"]
-    obs_2q_dict = result["obs-2q"]
-    if obs_1q_dict is None or obs_2q_dict is None:
+    obs_1q = _get_result_store(result, "obs-1q")
+    obs_2q = _get_result_store(result, "obs-2q")
+    if obs_1q is None or obs_2q is None:
         raise Exception("Could not find the 'obs-1q' or the 'obs-2q' results.")
 
     rho_list = []
@@ -358,12 +349,12 @@ def prepare_2q_density_operator(
     b_failed = False
     if t_indices is None:
         t_indices = [-1]
-    obs_1 = obs_1q_dict.get(("x", i_1q_observables[0]))
+    obs_1 = obs_1q.get_series("x", i_1q_observables[0])
     if obs_1 is not None:
         if len(t_indices) == 0:
             t_indices = range(0, len(obs_1[0]))
         for t_index in t_indices:
-            t_list.append(obs_1[0][t_index])
+            t_list.append(float(obs_1[0][t_index]))
             rho_list.append(0.25 * np.asarray(np.diag([1, 1, 1, 1]), dtype=complex))
     else:
         b_failed = True
@@ -371,7 +362,7 @@ def prepare_2q_density_operator(
     for i_obs, s_obs_name in enumerate(s_1q_observables):
         if b_failed:
             break
-        obs_1 = obs_1q_dict.get((s_obs_name, i_1q_observables[i_obs]))
+        obs_1 = obs_1q.get_series(s_obs_name, i_1q_observables[i_obs])
         if obs_1 is not None:
             for i_t, t_index in enumerate(t_indices):
                 if t_index < len(obs_1[1]):
@@ -391,7 +382,7 @@ def prepare_2q_density_operator(
     for i_obs, s_obs_name in enumerate(s_2q_observables):
         if b_failed:
             break
-        obs_2 = obs_2q_dict.get((s_obs_name, i_2q_observables[i_obs]))
+        obs_2 = obs_2q.get_series(s_obs_name, i_2q_observables[i_obs])
         if obs_2 is not None:
             for i_t, t_index in enumerate(t_indices):
                 if t_index < len(obs_2[1]):
@@ -610,14 +601,18 @@ def prepare_2q_space_time_data(
 
 
 def prepare_2q_matrix_data(
-    parameters: dict, result: dict, s_obs_name: str, t: Optional[float] = None
+    parameters: dict,
+    result: Union[dict, str],
+    s_obs_name: str,
+    t: Optional[float] = None,
 ) -> (np.ndarray, np.ndarray):
     """
     Prepare the data used for plotting a two-qubit connected correlation matrix.
 
     Args:
             parameters: A dictionary from which the basic time parameters are taken.
-            result: A dictionary from which the observables are taken.
+            result: A dictionary from which the observables are taken, or the prefix of the output
+                    files path, from which only the observables at time `t` are loaded.
             s_obs_name: The name of the specific two-qubit observable, used a key into the relevant
                     observables dict, and also in formatting the descriptive tex label of the data.
             t: An optional time for which to take the data. If unspecified the final time is used.
@@ -779,7 +774,7 @@ def plot_full_1q_space_time(
 
 def plot_full_2q_correlation_matrix(
     parameters: dict,
-    result: dict,
+    result: Union[dict, str],
     s_obs_name: str,
     t: Optional[float] = None,
     ax=None,
@@ -793,7 +788,8 @@ def plot_full_2q_correlation_matrix(
 
     Args:
             parameters: A dictionary from which the basic time parameters are taken.
-            result: A dictionary from which the observables are taken.
+            result: A dictionary from which the observables are taken, or the prefix of the output
+                    files path, from which only the observables at time `t` are loaded.
             s_obs_name: The name of the two-qubit observable, used to obtain the data, and in formatting
                     the descriptive tex label of the data and the saved file name.
             t: An optional time for which to take the data. If unspecified the final time is used.
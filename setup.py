@@ -95,6 +95,9 @@ setup(
     install_requires=REQUIREMENTS,
     include_package_data=True,
     python_requires=">=3.8",
+    entry_points={
+        "console_scripts": ["lindbladmpo-worker=lindbladmpo.JobQueue:main"],
+    },
     extras_require={
         "visualization": ["matplotlib>=2.1"],
     },
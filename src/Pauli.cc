@@ -316,7 +316,8 @@ void SpinHalfSystem::psi2rho(const MPS &psi, MPS &RHO, const Args &args)
     ITensor right_combined, left_combined;
     int N = psi.length();
     if (RHO.length() != N)
-        cout2 << "Error in psi2rho: psi has lenght " << N << " and RHO has lenghth " << RHO.length() << "\n.", exit(0);
+        cout2 << "Error in psi2rho: psi has lenght " << N << " and RHO has lenghth " << RHO.length() << "\n.",
+            exit_simulation(0);
 
     for (int j = 1; j <= N; ++j)
     {
@@ -611,7 +612,8 @@ Cplx SpinHalfSystem::Expect(const string &opname1, int i1, const string &opname2
 Cplx SpinHalfSystem::Expect(const vector<string> &opnames, const vector<int> &indices) const
 {
     if (opnames.size() != indices.size())
-        cout2 << "Error in SpinHalfSystem::Expect, openames and indices should have the same size.\n", exit(1);
+        cout2 << "Error in SpinHalfSystem::Expect, openames and indices should have the same size.\n",
+            exit_simulation(1);
     MPS rho_tmp(rho); // Could we avoid making this copy ?
     for (unsigned int n = 0; n < opnames.size(); n++)
     {
@@ -13,6 +13,7 @@
 #ifndef _SIMPLESQUARELATTICE_
 #define _SIMPLESQUARELATTICE_
 
+#include "io_utils.h"
 #include <sstream>
 //____________________________________________________________
 // Super basic lattice class
@@ -33,19 +34,19 @@ class Lattice2d
         : N(N_), predefined(false), predefined_chain(false)
     {
         if (N < 2)
-            cerr << "Error: the number of sites N = " << N_ << ", must be >= 2.\n", exit(1);
+            cerr << "Error: the number of sites N = " << N_ << ", must be >= 2.\n", exit_simulation(1);
         const unsigned int n = A.size();
         if (n != B.size())
             cerr << "Error: the two lists of sites have size " << A.size() << " and " << B.size()
                  << " but they should be identical.\n",
-                exit(1);
+                exit_simulation(1);
         // Loop over the bonds
         for (unsigned int i = 0; i < n; i++)
         {
             if (A[i] < 1 || A[i] > N)
-                cerr << "Error, site number " << A[i] << " is not in [1,...,N=" << N << "].\n", exit(1);
+                cerr << "Error, site number " << A[i] << " is not in [1,...,N=" << N << "].\n", exit_simulation(1);
             if (B[i] < 1 || B[i] > N)
-                cerr << "Error, site number " << B[i] << " is not in [1,...,N=" << N << "].\n", exit(1);
+                cerr << "Error, site number " << B[i] << " is not in [1,...,N=" << N << "].\n", exit_simulation(1);
             I.push_back(A[i]);
             J.push_back(B[i]);
         }
@@ -58,7 +59,7 @@ class Lattice2d
         : N(Lx * Ly), predefined(true)
     {
         if (N < 2)
-            cerr << "Error: the number of sites N = " << N << ", must be >= 2.\n", exit(1);
+            cerr << "Error: the number of sites N = " << N << ", must be >= 2.\n", exit_simulation(1);
         predefined_chain = (Ly == 1) ? (true) : (false);
         bool up;
         int n = 0;
@@ -88,6 +88,41 @@ class SimulationParameters : public Parameters
                                        // addition to the command line ones).
         operator[]("output_files_prefix") =
             "lindblad"; // Path and prefix of the file names where various simulation output is written
+        operator[]("output_format") =
+            "text"; // Format of the observables output files. Either "text" for tab-separated files with
+                    // names ending with ".dat", or "binary" for files with names ending with ".bin",
+                    // storing fixed-size blocks of doubles for each output time step (see output_files.h).
+                    // With "stream", the binary format of all observables is written to the standard output
+                    // as a single stream (see output_files.h), and the console output is written to the
+                    // standard error.
+        operator[]("output_compression") =
+            "0"; // The zlib compression level (1 to 9) of the observables files in the text format, which are then
+                 // written with names ending with ".dat.gz". If set to 0, the files are not compressed.
+        operator[]("output_flush_step") =
+            "1"; // Determines every how many output time steps the observables files are flushed to the disk.
+                 // If set to 0, the files are flushed only at the end of the simulation.
+        operator[]("b_log_file") = "1"; // Whether to write the log file, whose name ends with ".log.txt".
+        operator[]("progress_file") =
+            ""; // If not empty, the name of a file to which progress events are written as JSON lines
+                // (see output_files.h). On POSIX systems, a file descriptor n can be given as /dev/fd/n.
+        operator[]("checkpoint_step") =
+            "0"; // Determines every how many tau time steps a checkpoint is saved, from which the simulation can
+                 // be resumed. A checkpoint consists of the state (density matrix), saved alternately with the
+                 // file name prefixes output_files_prefix + ".checkpoint0" and ".checkpoint1", and of the file
+                 // output_files_prefix + ".checkpoint.txt", which is replaced atomically after the state was saved,
+                 // and holds the time, the step and the sizes of the observables files at the checkpoint.
+                 // A checkpoint is saved also at the final time step, and when the simulation is stopped.
+                 // If set to 0, no checkpoints are saved.
+        operator[]("propagator_cache_dir") =
+            ""; // If not empty, a directory in which the propagators of the time step (as MPOs) and the projectors of
+                // custom observables defined by gates are cached, to be read by simulations with the same Lindbladian,
+                // tau and trotter_order instead of being computed (see propagator_cache.h).
+        operator[]("initial_step") =
+            "0"; // The index of the first time step, counted from the start of the original simulation when
+                 // resuming from a checkpoint, such that output and checkpoint steps remain at the same times.
+        operator[]("b_append_output") =
+            "0"; // Whether to append to the existing observables and log files instead of overwriting them.
+                 // Used when resuming from a checkpoint, after truncating the files to the checkpoint sizes.
     }
 };
 
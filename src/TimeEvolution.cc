@@ -13,17 +13,45 @@
 #include "TimeEvolution.h"
 #include "io_utils.h"
 //____________________________________________________________________
-void TimeEvolver::init(double tau, const AutoMPO &auto_L, Args args, int ord)
+void TimeEvolver::init_args(Args args, int ord)
 {
     order = ord;
     if (order > 4 || order < 2)
-        cout2 << "Error, Trotter_order=" << order << " not implemented.\n", exit(1);
+        cout2 << "Error, Trotter_order=" << order << " not implemented.\n", exit_simulation(1);
 
     argsApplyMPOtoRho = args; // Take the options given
     argsApplyMPOtoRho.add("Method", "Fit");
     // argsApplyMPOtoRho.add("Method", "DensityMatrix"); //Alternative method/algorithm to apply an MPO to an MPS. More
     // precise.
     argsApplyMPOtoRho.add("Normalize", false);
+}
+//____________________________________________________________________
+int TimeEvolver::n_propagators(int ord)
+{
+    return (ord == 2) ? 2 : (ord == 3) ? 4 : 7;
+}
+//____________________________________________________________________
+void TimeEvolver::init(const vector<MPO> &expL, Args args, int ord)
+{
+    init_args(args, ord);
+    if ((int)expL.size() != n_propagators(order))
+        cout2 << "Error, " << expL.size() << " propagators given for Trotter_order=" << order << ".\n",
+            exit_simulation(1);
+    MPO *propagators[] = {&expL1, &expL2, &expL3, &expL4, &expL5, &expL6, &expL7};
+    for (unsigned int i = 0; i < expL.size(); i++)
+        *propagators[i] = expL[i];
+}
+//____________________________________________________________________
+vector<MPO> TimeEvolver::propagators() const
+{
+    vector<MPO> expL = {expL1, expL2, expL3, expL4, expL5, expL6, expL7};
+    expL.resize(n_propagators(order));
+    return expL;
+}
+//____________________________________________________________________
+void TimeEvolver::init(double tau, const AutoMPO &auto_L, Args args, int ord)
+{
+    init_args(args, ord);
 
     Cplx t1 = 0, t2 = 0, t3 = 0, t4 = 0, t5 = 0, t6 = 0, t7 = 0;
     if (order == 2)
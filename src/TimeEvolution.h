@@ -15,6 +15,7 @@
 
 #include "itensor/all.h"
 #include <string>
+#include <vector>
 
 using namespace itensor;
 using namespace std;
@@ -34,8 +35,17 @@ class TimeEvolver
     // The 'init' below has be be called once, so that the expL1...expL7 above are constructed
     // if the Lindbladian and/or the time step changes, then init has to be called again
     void init(double tau, const AutoMPO &auto_L, Args args, int ord = 4);
+    // Alternatively, init can be called with the propagators expL1, expL2, ... precomputed (as returned by
+    // propagators() below), which must be 2, 4 or 7 MPOs for order 2, 3 or 4, respectively
+    void init(const vector<MPO> &expL, Args args, int ord = 4);
+    // The propagators of the time step (the first 2, 4 or 7 of expL1...expL7, according to the order)
+    vector<MPO> propagators() const;
     // Actual time evolution (1 'small' time step tau [value defined])
     void evolve(MPS &rho) const;
+
+  private:
+    void init_args(Args args, int ord);
+    static int n_propagators(int ord);
 };
 //____________________________________________________________________
 #endif
\ No newline at end of file
@@ -55,7 +55,8 @@ void ApplyControlledXYZGateONPureState(MPS &psi, const SpinHalf &sites, int cont
                                        Args args)
 {
     if (control == target)
-        cerr << "Error, ApplyControlledXYZGateONPureState was called with control=target=" << control << ".\n", exit(1);
+        cerr << "Error, ApplyControlledXYZGateONPureState was called with control=target=" << control << ".\n",
+            exit_simulation(1);
     const int i = min(target, control), j = max(target, control);
     const int N = length(psi);
     {
@@ -164,7 +165,7 @@ void ApplyControlledXYZGateONPureState(MPS &psi, const SpinHalf &sites, int cont
 void ApplyControlledXYZGate(MPS &rho, const Pauli &siteops, int control, int target, string opname, Args args)
 {
     if (control == target)
-        cerr << "Error, ApplyControlledXYZGate was called with control=target=" << control << ".\n", exit(1);
+        cerr << "Error, ApplyControlledXYZGate was called with control=target=" << control << ".\n", exit_simulation(1);
     const int i = min(target, control), j = max(target, control);
     const int N = length(rho);
     for (int braket = 0; braket <= 1; braket++)
@@ -315,7 +316,7 @@ void ApplyListOfGatesOnAPureState(string s, MPS &psi, const SpinHalfSystem &C)
             if (i < 1 || i > C.N)
                 cout2 << "Error in SpinHalfSystem::ConstructProjectorFromGates: qubit index i=" << i
                       << " is out of range.\n",
-                    exit(0);
+                    exit_simulation(0);
             if (op_name == "X" || op_name == "x")
                 psi.ref(i) *= 2 * C.sites.op("Sx", i), psi.ref(i).noPrime();
             else if (op_name == "Y" || op_name == "y")
@@ -332,7 +333,7 @@ void ApplyListOfGatesOnAPureState(string s, MPS &psi, const SpinHalfSystem &C)
             else
                 cout2 << "Error in SpinHalfSystem::ConstructProjectorFromGates: unknown 1-qubit operator " << op_name
                       << ".\n",
-                    exit(0);
+                    exit_simulation(0);
             break;
         case 3:
             op_name = st[0];
@@ -349,13 +350,13 @@ void ApplyListOfGatesOnAPureState(string s, MPS &psi, const SpinHalfSystem &C)
             else
                 cout2 << "Error in SpinHalfSystem::ConstructProjectorFromGates: unknown 2-qubit gate " << op_name
                       << ".\n",
-                    exit(0);
+                    exit_simulation(0);
             break;
         default:
             cout2 << "Error in SpinHalfSystem::ConstructProjectorFromGates: expecting an operator name followed by 1 "
                      "or 2 qubit number but got "
                   << op << ".\n",
-                exit(0);
+                exit_simulation(0);
         }
     }
 }
@@ -377,7 +378,8 @@ void StringToOperatorsList(string s, vector<string> &ops, vector<int> &qubits)
             op_name = st[0];
             i = stoi(st[1]);
             if (i < 1) // || i>C.N)
-                cout2 << "Error in StringToOperatorsList: qubit index i=" << i << " is out of range.\n", exit(0);
+                cout2 << "Error in StringToOperatorsList: qubit index i=" << i << " is out of range.\n",
+                    exit_simulation(0);
             char op_lower = char(tolower(op_name[0]));
             if (op_lower == 'x' || op_lower == 'y' || op_lower == 'z' || op_lower == 'u' || op_lower == 'd')
             {
@@ -387,13 +389,14 @@ void StringToOperatorsList(string s, vector<string> &ops, vector<int> &qubits)
                 qubits.push_back(i);
             }
             else
-                cout2 << "Error in StringToOperatorsList: unknown 1-qubit operator " << op_name << ".\n", exit(0);
+                cout2 << "Error in StringToOperatorsList: unknown 1-qubit operator " << op_name << ".\n",
+                    exit_simulation(0);
             break;
         }
         default:
             cout2 << "Error in StringToOperatorsList: expecting an operator name followed by 1 qubit number but got "
                   << op << ".\n",
-                exit(0);
+                exit_simulation(0);
         }
     }
 }
\ No newline at end of file
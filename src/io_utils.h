@@ -89,6 +89,19 @@ class stream2d
 
 extern stream2d cout2;
 
+//____________________________________________________________
+// Thrown by exit_simulation() to end a simulation with an exit code. Unlike exit(), it lets the
+// serve mode report the failed simulation and continue with the next one.
+struct SimulationExit
+{
+    int exit_code;
+};
+
+[[noreturn]] inline void exit_simulation(int exit_code)
+{
+    throw SimulationExit{exit_code};
+}
+
 //____________________________________________________________
 inline vector<string> &split(const string &s, char delimiter, vector<std::string> &elems)
 {
@@ -136,9 +149,15 @@ class Parameters : public map<string, string>
     {
         ifstream file(filename);
         if (!file)
-            cerr << "Error: unable to open the file " << filename << endl, exit(1);
+            cerr << "Error: unable to open the file " << filename << endl, exit_simulation(1);
         else
             cout << "Reading parameters from the file " << filename << endl;
+        ReadFromStream(file);
+    }
+    //------------------------------------------------------
+    // The method 'ReadFromStream' reads parameter lines in the format of an input file from a stream.
+    void ReadFromStream(istream &file)
+    {
         string line;
         while (getline(file, line))
         {
@@ -161,11 +180,11 @@ class Parameters : public map<string, string>
                         operator[](var_name) = var_value;
                     else
                         cerr << "Error, the input parameter " << var_name << " does not exist in this model.\n",
-                            exit(1);
+                            exit_simulation(1);
                 }
                 else
                 {
-                    cout << "\nWarning: the input line :" << line << " has been ignored (no '=')." << endl;
+                    cerr << "\nWarning: the input line :" << line << " has been ignored (no '=')." << endl;
                 }
             }
         }
@@ -176,7 +195,7 @@ class Parameters : public map<string, string>
         map<string, string>::const_iterator it = find(var_name);
         if (it == end())
         {
-            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit(1);
+            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit_simulation(1);
             return 0;
         }
         else
@@ -190,7 +209,7 @@ class Parameters : public map<string, string>
             {
                 cout2 << "Error: was expecting a double after '" << var_name << "' and instead got '" << it->second
                       << "'\n",
-                    exit(1);
+                    exit_simulation(1);
             }
             return value;
         }
@@ -201,7 +220,7 @@ class Parameters : public map<string, string>
         map<string, string>::const_iterator it = find(var_name);
         if (it == end())
         {
-            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit(1);
+            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit_simulation(1);
             return 0;
         }
         else
@@ -213,7 +232,7 @@ class Parameters : public map<string, string>
             }
             catch (...)
             {
-                cout2 << "Error: was expecting a long int and instead got '" << it->second << "'\n", exit(1);
+                cout2 << "Error: was expecting a long int and instead got '" << it->second << "'\n", exit_simulation(1);
             }
             return i;
         }
@@ -224,7 +243,7 @@ class Parameters : public map<string, string>
         map<string, string>::const_iterator it = find(var_name);
         if (it == end())
         {
-            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit(1);
+            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit_simulation(1);
             return 0;
         }
         else
@@ -237,7 +256,7 @@ class Parameters : public map<string, string>
                 return false;
             cout2 << "Error " << var_name << "=" << it->second
                   << " but a boolean was expected: true/false (case-insensitive), or 1/0\n",
-                exit(1);
+                exit_simulation(1);
         }
     } //------------------------------------------------------
     string stringval(string var_name) const
@@ -245,7 +264,7 @@ class Parameters : public map<string, string>
         map<string, string>::const_iterator it = find(var_name);
         if (it == end())
         {
-            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit(1);
+            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit_simulation(1);
             return 0;
         }
         else
@@ -281,7 +300,7 @@ class Parameters : public map<string, string>
             {
                 n++;
                 if (n == argc)
-                    cerr << "Error: missing value after " << var_name << endl, exit(1);
+                    cerr << "Error: missing value after " << var_name << endl, exit_simulation(1);
                 operator[](var_name) = string(argv[n]);
             }
             else
@@ -289,7 +308,7 @@ class Parameters : public map<string, string>
                 cerr << "Error, the input parameter " << var_name << " does not exist in this model.\n";
                 cout << "List of command-line parameters :\n";
                 Print(cout);
-                exit(1);
+                exit_simulation(1);
             }
         }
     }
@@ -301,7 +320,7 @@ class Parameters : public map<string, string>
         map<string, string>::const_iterator it = find(var_name);
         if (it == end())
         {
-            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit(1);
+            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit_simulation(1);
         }
         else
         {
@@ -316,7 +335,7 @@ class Parameters : public map<string, string>
                 }
                 catch (...)
                 {
-                    cout2 << "Error: was expecting a double and instead got " << s << "\n", exit(1);
+                    cout2 << "Error: was expecting a double and instead got " << s << "\n", exit_simulation(1);
                 }
                 vec.push_back(x);
             }
@@ -331,7 +350,7 @@ class Parameters : public map<string, string>
         map<string, string>::const_iterator it = find(var_name);
         if (it == end())
         {
-            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit(1);
+            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit_simulation(1);
         }
         else
         {
@@ -346,7 +365,7 @@ class Parameters : public map<string, string>
                 }
                 catch (...)
                 {
-                    cout2 << "Error: was expecting a long int and instead got '" << s << "'\n", exit(1);
+                    cout2 << "Error: was expecting a long int and instead got '" << s << "'\n", exit_simulation(1);
                 }
                 vec.push_back(i);
             }
@@ -361,7 +380,7 @@ class Parameters : public map<string, string>
         map<string, string>::const_iterator it = find(var_name);
         if (it == end())
         {
-            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit(1);
+            cout2 << "Error: Parameter " << var_name << " is not defined.\n", exit_simulation(1);
         }
         else
         {
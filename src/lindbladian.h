@@ -37,15 +37,15 @@ bool SetLindbladian(SpinHalfSystem &C, ModelParameters param, Lattice2d L)
     if (h_x_len != 1 && L.predefined && !L.predefined_chain)
         cout2 << "Error: the parameter h_x has " << h_x_len << " value(s) but L.predefined_chain=" << L.predefined_chain
               << ". h_x should be uniform for such a lattice.\n",
-            exit(1);
+            exit_simulation(1);
     if (h_y_len != 1 && L.predefined && !L.predefined_chain)
         cout2 << "Error: the parameter h_y has " << h_y_len << " value(s) but L.predefined_chain=" << L.predefined_chain
               << ". h_y should be uniform for such a lattice.\n",
-            exit(1);
+            exit_simulation(1);
     if (h_z_len != 1 && L.predefined && !L.predefined_chain)
         cout2 << "Error: the parameter h_z has " << h_z_len << " value(s) but L.predefined_chain=" << L.predefined_chain
               << ". h_z should be uniform for such a lattice.\n",
-            exit(1);
+            exit_simulation(1);
 
     vector<double> g_0 = param.doublevec("g_0");
     vector<double> g_1 = param.doublevec("g_1");
@@ -61,36 +61,36 @@ bool SetLindbladian(SpinHalfSystem &C, ModelParameters param, Lattice2d L)
     if (g_0_len != 1 && L.predefined && !L.predefined_chain)
         cout2 << "Error: the parameter g_0 has " << g_0_len << " value(s) but L.predefined_chain=" << L.predefined_chain
               << ". g_0 should be uniform for such a lattice.\n",
-            exit(1);
+            exit_simulation(1);
     if (g_1_len != 1 && L.predefined && !L.predefined_chain)
         cout2 << "Error: the parameter g_1 has " << g_1_len << " value(s) but L.predefined_chain=" << L.predefined_chain
               << ". g_1 should be uniform for such a lattice.\n",
-            exit(1);
+            exit_simulation(1);
     if (g_2_len != 1 && L.predefined && !L.predefined_chain)
         cout2 << "Error: the parameter g_2 has " << g_2_len << " value(s) but L.predefined_chain=" << L.predefined_chain
               << ". g_2 should be uniform for such a lattice.\n",
-            exit(1);
+            exit_simulation(1);
     if (g_3_len != 1 && L.predefined && !L.predefined_chain)
         cout2 << "Error: the parameter g_3 has " << g_3_len << " value(s) but L.predefined_chain=" << L.predefined_chain
               << ". g_3 should be uniform for such a lattice.\n",
-            exit(1);
+            exit_simulation(1);
     if (g_4_len != 1 && L.predefined && !L.predefined_chain)
         cout2 << "Error: the parameter g_4 has " << g_4_len << " value(s) but L.predefined_chain=" << L.predefined_chain
               << ". g_4 should be uniform for such a lattice.\n",
-            exit(1);
+            exit_simulation(1);
 
     if (h_x_len != 1 && h_x_len != N)
         cout2 << "Error: the parameter h_x has " << h_x_len << " value(s) but 1 or " << N
               << " value(s) were expected.\n",
-            exit(1);
+            exit_simulation(1);
     if (h_y_len != 1 && h_y_len != N)
         cout2 << "Error: the parameter h_y has " << h_y_len << " value(s) but 1 or " << N
               << " value(s) were expected.\n",
-            exit(1);
+            exit_simulation(1);
     if (h_z_len != 1 && h_z_len != N)
         cout2 << "Error: the parameter h_z has " << h_z_len << " value(s) but 1 or " << N
               << " value(s) were expected.\n",
-            exit(1);
+            exit_simulation(1);
     if (h_x_len == 1)
         h_x = vector<double>(N, h_x[0]);
     if (h_y_len == 1)
@@ -105,13 +105,13 @@ bool SetLindbladian(SpinHalfSystem &C, ModelParameters param, Lattice2d L)
     {
         cout2 << "Error: J_z.size()=" << J_z.size() << " and " << J.size() << " but L.predefined=" << L.predefined
               << ". Couplings J and J_z must be uniform in such a predefined lattice.\n",
-            exit(1);
+            exit_simulation(1);
     }
 
     if (J.size() > 1 && J.size() != num_bonds)
         cout2 << "Error: the paramter J has " << J.size() << " values but 0, 1 or " << num_bonds
               << " value(s) were expected.\n",
-            exit(1);
+            exit_simulation(1);
     if (J.size() <= 1)
     {
         double J_0 = .0;
@@ -123,7 +123,7 @@ bool SetLindbladian(SpinHalfSystem &C, ModelParameters param, Lattice2d L)
     if (J_z.size() > 1 && J_z.size() != num_bonds)
         cout2 << "Error: the paramter J_z has " << J_z.size() << " values but 0, 1 or " << num_bonds
               << " value(s) were expected.\n",
-            exit(1);
+            exit_simulation(1);
     if (J_z.size() <= 1)
     {
         double J_z_0 = .0;
@@ -185,23 +185,23 @@ bool SetLindbladian(SpinHalfSystem &C, ModelParameters param, Lattice2d L)
     if (g_0_len != 1 && g_0_len != N)
         cout2 << "Error: the parameter g_0 has " << g_0_len << " value(s) but 1 or " << N
               << " value(s) were expected.\n",
-            exit(1);
+            exit_simulation(1);
     if (g_1_len != 1 && g_1_len != N)
         cout2 << "Error: the parameter g_1 has " << g_1_len << " value(s) but 1 or " << N
               << " value(s) were expected.\n",
-            exit(1);
+            exit_simulation(1);
     if (g_2_len != 1 && g_2_len != N)
         cout2 << "Error: the parameter g_2 has " << g_2_len << " value(s) but 1 or " << N
               << " value(s) were expected.\n",
-            exit(1);
+            exit_simulation(1);
     if (g_3_len != 1 && g_3_len != N)
         cout2 << "Error: the parameter g_3 has " << g_3_len << " value(s) but 1 or " << N
               << " value(s) were expected.\n",
-            exit(1);
+            exit_simulation(1);
     if (g_4_len != 1 && g_4_len != N)
         cout2 << "Error: the parameter g_4 has " << g_4_len << " value(s) but 1 or " << N
               << " value(s) were expected.\n",
-            exit(1);
+            exit_simulation(1);
     if (g_0_len == 1)
         g_0 = vector<double>(N, g_0[0]);
     if (g_1_len == 1)
@@ -19,8 +19,15 @@
 #include "itensor/all.h"
 #include "lindbladian.h"
 #include "mps_mpo_utils.h"
+#include "observables.h"
+#include "output_files.h"
+#include "propagator_cache.h"
 #include <chrono>
+#include <csignal>
+#include <cstdio>
+#include <iomanip>
 #include <iostream>
+#include <memory>
 #include <sstream>
 
 using namespace itensor;
@@ -40,25 +47,191 @@ const double TRACE_RHO_WARN_THRESHOLD = 1e-4;
 const double TRACE_RHO_DIV_THRESHOLD = 1e-10;
 // Threshold for the deviation of the density matrix trace from 1, to normalize
 
+const string SERVE_DONE_MARKER = "#lindbladmpo-serve: done";
+// Line written to the standard output in the serve mode after each simulation, followed by its exit code
+
+const string SERVE_LOG_PREFIX = "|";
+// Prefix of every line of the console output of the simulations in the serve mode, so that it cannot be
+// mistaken for a line with SERVE_DONE_MARKER
+
+const int STOPPED_EXIT_CODE = 3;
+// Exit code of a simulation that was stopped (by SIGTERM or SIGINT) before reaching t_final
+
+volatile sig_atomic_t b_stop_requested = 0;
+// Set when the process receives SIGTERM or SIGINT. The simulation then stops before the next time step,
+// and ends normally (closing the output files, and saving the final state if requested).
+
+void request_stop(int)
+{
+    b_stop_requested = 1;
+}
+
+class LinePrefixBuffer : public streambuf
+{
+    // A stream buffer writing to another stream buffer, with a prefix at the start of every line
+  public:
+    LinePrefixBuffer(streambuf *buffer, const string &prefix) : buffer(buffer), prefix(prefix), b_line_start(true)
+    {
+    }
+
+  protected:
+    int overflow(int c) override
+    {
+        if (c == traits_type::eof())
+            return traits_type::not_eof(c);
+        if (b_line_start && buffer->sputn(prefix.data(), prefix.size()) != (streamsize)prefix.size())
+            return traits_type::eof();
+        b_line_start = (c == '\n');
+        return buffer->sputc(traits_type::to_char_type(c));
+    }
+
+    int sync() override
+    {
+        return buffer->pubsync();
+    }
+
+  private:
+    streambuf *buffer;
+    string prefix;
+    bool b_line_start;
+};
+
 void validate_2q_list(vector<long> &vect, int N, string const &list_name);
 void validate_3q_list(vector<long> &vect, int N, string const &list_name);
+string get_propagator_cache_key(ModelParameters &param, const Lattice2d &lattice, double tau, int order);
+int run_simulation(ModelParameters &param);
+int serve();
 
 int main(int argc, char *argv[])
 {
-    ModelParameters param;
+    signal(SIGTERM, request_stop);
+    signal(SIGINT, request_stop);
 
-    auto t_start_sim = steady_clock::now();
-    // Start tracking simulation time
+    // In the serve mode, simulations are read from the standard input and run one after another
+    if (argc == 2 && string(argv[1]) == "--serve")
+        return serve();
 
-    // Read the input parameters given in the command line. Default values are substituted for all
-    // missing parameters, as defined in the files SimulationParameters.h and ModelParameters.h
-    param.ReadArguments(argc, argv);
+    try
+    {
+        // In the stdin mode, the parameters of a single simulation are read from the standard input, in the
+        // format of an input file (which allows running without files, together with the stream output format)
+        if (argc == 2 && string(argv[1]) == "--stdin")
+        {
+            ModelParameters param;
+            param.ReadFromStream(cin);
+            return run_simulation(param);
+        }
+
+        ModelParameters param;
 
-    // If a filename was given as the parameter `input_file`, read the parameters given in this file.
-    string inputfilename = param.stringval("input_file");
-    if (inputfilename != "")
-        param.ReadFromFile(inputfilename);
-    // Now `param` contains all parameters.
+        // Read the input parameters given in the command line. Default values are substituted for all
+        // missing parameters, as defined in the files SimulationParameters.h and ModelParameters.h
+        param.ReadArguments(argc, argv);
+
+        // If a filename was given as the parameter `input_file`, read the parameters given in this file.
+        string inputfilename = param.stringval("input_file");
+        if (inputfilename != "")
+            param.ReadFromFile(inputfilename);
+        // Now `param` contains all parameters.
+
+        return run_simulation(param);
+    }
+    catch (const SimulationExit &e)
+    {
+        return e.exit_code;
+    }
+}
+
+int serve()
+{
+    // Each simulation is given on the standard input either as a single line with the name of an
+    // input file, or as a block of parameter lines in the format of an input file, terminated by an
+    // empty line (or the end of the input). After each simulation, a line starting with
+    // SERVE_DONE_MARKER is written to the standard output, followed by the exit code of the simulation
+    // (nonzero if it failed). Since the process is reused, the executable is loaded and initialized only
+    // once for all simulations. The console output of the simulations (to both the standard output and
+    // the standard error) is written to the standard output with SERVE_LOG_PREFIX at the start of every
+    // line, so the lines with SERVE_DONE_MARKER are told apart from it.
+    streambuf *cerr_buffer = cerr.rdbuf();
+    ostream serve_out(cout.rdbuf());
+    LinePrefixBuffer log_buffer(cout.rdbuf(), SERVE_LOG_PREFIX);
+    cout.rdbuf(&log_buffer);
+    cerr.rdbuf(&log_buffer);
+    string line;
+    bool b_eof = false;
+    while (!b_eof && !b_stop_requested)
+    {
+        stringstream block;
+        string inputfilename = "";
+        int n_lines = 0;
+        while (true)
+        {
+            if (!getline(cin, line))
+            {
+                b_eof = true;
+                break;
+            }
+            trim(line);
+            if (line == "")
+            {
+                if (n_lines)
+                    break;
+                continue;
+            }
+            if (n_lines == 0 && line.find('=') == string::npos)
+            {
+                inputfilename = line;
+                break;
+            }
+            block << line << "\n";
+            n_lines++;
+        }
+        if (inputfilename == "" && n_lines == 0)
+            break;
+
+        int exit_code = 1;
+        try
+        {
+            ModelParameters param;
+            if (n_lines)
+            {
+                param.ReadFromStream(block);
+                inputfilename = param.stringval("input_file");
+            }
+            if (inputfilename != "")
+                param.ReadFromFile(inputfilename);
+
+            // The standard output holds the markers of the simulations, and cannot hold results
+            if (param.stringval("output_format") == "stream")
+                cerr << "Error: the stream output_format is not supported in the serve mode.\n";
+            else
+                exit_code = run_simulation(param);
+        }
+        catch (const SimulationExit &e)
+        {
+            // A failed simulation may exit with the code 0 (for some invalid parameters), but it is reported
+            // as failed, since its output is incomplete
+            exit_code = e.exit_code != 0 ? e.exit_code : 1;
+        }
+        catch (const exception &e)
+        {
+            cerr << "Error: " << e.what() << "\n";
+            exit_code = 1;
+        }
+        // The log file of a failed simulation was closed when it ended
+        cout2 = stream2d(&cerr, NULL);
+        cout.flush();
+        serve_out << SERVE_DONE_MARKER << "\t" << exit_code << endl;
+    }
+    cout.rdbuf(serve_out.rdbuf());
+    cerr.rdbuf(cerr_buffer);
+    return 0;
+}
+
+int run_simulation(ModelParameters &param)
+{
+    auto t_start_sim = steady_clock::now();
+    // Start tracking simulation time
 
     Lattice2d lattice;
     int N = param.longval("N");
@@ -78,7 +251,7 @@ int main(int argc, char *argv[])
         if (!(Lx == 0 && Ly == 1))
             cerr << "Error, when bond couplings are specified explicitly, the parameters "
                     "(l_x, l_y) must be left at their default values (0, 1).\n",
-                exit(1);
+                exit_simulation(1);
         lattice = Lattice2d(N, A, B, strstr);
     }
     else
@@ -88,18 +261,24 @@ int main(int argc, char *argv[])
         {
             // If N is nonzero, it has to be consistent with l_x, l_y
             if (N > 0 && N != Lx * Ly)
-                cerr << "Error, invalid N = " << N << ", not equal to l_x * l_y.\n", exit(1);
+                cerr << "Error, invalid N = " << N << ", not equal to l_x * l_y.\n", exit_simulation(1);
             N = Lx * Ly; // If N is zero, it is assigned with l_x * l_y
         }
         else if (Lx == 0 && Ly == 1)
             Lx = N; // The Lattice2d() constructor below will verify N.
         else
-            cerr << "Error, invalid (l_x, l_y) = " << Lx << "," << Ly << ".\n", exit(1);
+            cerr << "Error, invalid (l_x, l_y) = " << Lx << "," << Ly << ".\n", exit_simulation(1);
         lattice = Lattice2d(Lx, Ly, strstr, param.boolval("b_periodic_x"), param.boolval("b_periodic_y"));
     }
     string output_prefix = param.stringval("output_files_prefix");
-    ofstream log_file(output_prefix + ".log.txt");
-    cout2 = stream2d(&cout, &log_file);
+    const bool b_append_output = param.boolval("b_append_output");
+    const bool b_log_file = param.boolval("b_log_file");
+    // With the stream output format, the standard output is reserved for the results stream
+    const bool b_stream_output = (param.stringval("output_format") == "stream");
+    ofstream log_file;
+    if (b_log_file)
+        log_file.open(output_prefix + ".log.txt", b_append_output ? ios::app : ios::out);
+    cout2 = stream2d(b_stream_output ? &cerr : &cout, b_log_file ? &log_file : NULL);
 
     cout2.precision(8);
     cout2 << "lindbladmpo solver log. Solver version: " << SOLVER_VERSION << "\n";
@@ -153,7 +332,7 @@ int main(int argc, char *argv[])
         else
             cout2 << "Error: the parameter init_cz_gates cannot be used "
                   << "if init_graph_state is nonempty.\n",
-                exit(1);
+                exit_simulation(1);
     }
     else if (init_cz_gates.size() > 0)
     {
@@ -162,7 +341,7 @@ int main(int argc, char *argv[])
     }
     if (init_cz_gates.size() % 2 == 1)
         cout2 << "Error: the list of indices given in the parameter " << s_cz_param << " should have an even length.\n",
-            exit(1);
+            exit_simulation(1);
 
     vector<string> init_pauli_state = param.stringvec("init_pauli_state");
     vector<string> init_product_state = param.stringvec("init_product_state");
@@ -177,7 +356,7 @@ int main(int argc, char *argv[])
         else
             cout2 << "Error: the parameter init_pauli_state cannot be used "
                   << "if init_product_state is nonempty.\n",
-                exit(1);
+                exit_simulation(1);
     }
     else
         s_init_param = "init_product_state";
@@ -186,7 +365,7 @@ int main(int argc, char *argv[])
     if (load_prefix != "" && (b_cz_pairs || init_len > 0))
         cout2 << "Error: if load_files_prefix is nonempty, no other initialization "
               << "parameter can be used.\n",
-            exit(1);
+            exit_simulation(1);
     if (init_len == 0)
     {
         if (b_graph_state)
@@ -199,13 +378,13 @@ int main(int argc, char *argv[])
         if (b_graph_state)
             cout2 << "Error: If init_graph_state is nonempty, no other initialization "
                   << "parameter can be used.\n",
-                exit(1);
+                exit_simulation(1);
         if (init_len == 1)
             init_product_state = vector<string>(N, init_product_state[0]);
         else if (int(init_len) != N)
             cout2 << "Error: the parameter " << s_init_param << " has " << init_len << " value(s) but 0, 1 or " << N
                   << " value(s) were expected.\n",
-                exit(1);
+                exit_simulation(1);
     }
     if (b_cz_pairs)
         validate_2q_list(init_cz_gates, N, s_cz_param);
@@ -287,13 +466,13 @@ int main(int argc, char *argv[])
                             cout2 << "Error: " << s_init
                                   << " is an unknown 1-qubit initial state. "
                                      "After the prefix \"p \" should follow a valid float value.\n",
-                                exit(1);
+                                exit_simulation(1);
                         }
                         if (b < 0. || b > 1.)
                             cout2 << "Error: " << s_val
                                   << " is an unknown 1-qubit initial "
                                      "mixed state coefficient (should be in the range [0, 1]).\n",
-                                exit(1);
+                                exit_simulation(1);
                         R0 = 1.; // A valid value must be set to get a regular pure state
                         a_mixed_state[i_site] = b;
                     }
@@ -323,7 +502,7 @@ int main(int argc, char *argv[])
                             cout2 << "Error: " << s_init
                                   << " is an unknown 1-qubit initial state. "
                                      "After the prefix \"q \" should follow two space-separated floats.\n",
-                                exit(1);
+                                exit_simulation(1);
                         R0 = cos(values[0] / 2.);
                         double r1 = pow(1. - pow(R0, 2), .5);
                         R1 = r1 * cos(values[1]);
@@ -355,7 +534,7 @@ int main(int argc, char *argv[])
                             cout2 << "Error: " << s_init
                                   << " is an unknown 1-qubit initial state. "
                                      "After the prefix \"r \" should follow three space-separated floats.\n",
-                                exit(1);
+                                exit_simulation(1);
                         R0 = 1.;
                         a_mixed_state[i_site] = values[0];
                         dr_mixed_state[i_site] = values[1];
@@ -367,7 +546,7 @@ int main(int argc, char *argv[])
                               << " is an unknown 1-qubit initial state. "
                                  "It should be a string in {+x, -x, +y, -y, +z, -z, id}, \"p \" "
                                  "followed by a float, or \"q \" followed by two space-separated floats).\n",
-                            exit(1);
+                            exit_simulation(1);
                     }
                 }
             }
@@ -509,7 +688,8 @@ int main(int argc, char *argv[])
     {
         vector<string> vs = split(apply_gates[n], ' ');
         if (vs.size() != 3 && vs.size() != 4)
-            cout2 << "Error: expecting time gate qubit1 (qubit2) but got '" << apply_gates[n] << "'.\n", exit(1);
+            cout2 << "Error: expecting time gate qubit1 (qubit2) but got '" << apply_gates[n] << "'.\n",
+                exit_simulation(1);
         double time = 0;
         int i = 0, j = 0;
         try
@@ -519,12 +699,12 @@ int main(int argc, char *argv[])
         catch (...)
         {
             cout2 << "Error: " << vs[0] << " is not a double (expecting a time value) in '" << apply_gates[n] << "'.\n",
-                exit(1);
+                exit_simulation(1);
         }
         if ((time - t_0) < (-.1 * tau) || (time - t_f) > .1 * tau)
             cout2 << "Error: time " << vs[0]
                   << " defined in parameter apply_gates is not between t_init and t_final.\n",
-                exit(1);
+                exit_simulation(1);
         //		if (fmod(abs(time / tau), 1.) > 0.1 && fmod(abs(time / tau), 1.) < 0.9)
         //			cout2 << "Error: time " << vs[0] << " defined in parameter apply_gates is not close to an integer
         //multiple of tau.\n", exit(1);
@@ -541,16 +721,18 @@ int main(int argc, char *argv[])
             {
                 i = stod(vs[2]);
                 if (i < 1 || i > N)
-                    cout2 << "Error: qubit index " << i << " out of range in '" << apply_gates[n] << "'.\n", exit(1);
+                    cout2 << "Error: qubit index " << i << " out of range in '" << apply_gates[n] << "'.\n",
+                        exit_simulation(1);
             }
             catch (...)
             {
                 cout2 << "Error: " << vs[2] << " is not a valid integer (expecting a qubit number) in '"
                       << apply_gates[n] << "'.\n",
-                    exit(1);
+                    exit_simulation(1);
             }
             if (vs.size() == 4)
-                cout2 << "Error: too many arguments for gate " << sgate << " in '" << apply_gates[n] << "'.\n", exit(1);
+                cout2 << "Error: too many arguments for gate " << sgate << " in '" << apply_gates[n] << "'.\n",
+                    exit_simulation(1);
             gate_times.push_back(time);
             gate_names.push_back(sgate);
             gate_i.push_back(i);
@@ -559,30 +741,33 @@ int main(int argc, char *argv[])
         else if (sgate == "CZ" || sgate == "CX")
         {
             if (vs.size() == 3)
-                cout2 << "Error: missing argument for gate " << sgate << " in '" << apply_gates[n] << "'.\n", exit(1);
+                cout2 << "Error: missing argument for gate " << sgate << " in '" << apply_gates[n] << "'.\n",
+                    exit_simulation(1);
             try
             {
                 i = stod(vs[2]);
                 if (i < 1 || i > N)
-                    cout2 << "Error: qubit index " << i << " out of range in '" << apply_gates[n] << "'.\n", exit(1);
+                    cout2 << "Error: qubit index " << i << " out of range in '" << apply_gates[n] << "'.\n",
+                        exit_simulation(1);
             }
             catch (...)
             {
                 cout2 << "Error: " << vs[2] << " is not a valid integer (expecting a qubit number) in '"
                       << apply_gates[n] << "'.\n",
-                    exit(1);
+                    exit_simulation(1);
             }
             try
             {
                 j = stod(vs[3]);
                 if (j < 1 || j > N)
-                    cout2 << "Error: qubit index " << j << " out of range in '" << apply_gates[n] << "'.\n", exit(1);
+                    cout2 << "Error: qubit index " << j << " out of range in '" << apply_gates[n] << "'.\n",
+                        exit_simulation(1);
             }
             catch (...)
             {
                 cout2 << "Error: " << vs[3] << " is not a valid integer (expecting a qubit number) in '"
                       << apply_gates[n] << "'.\n",
-                    exit(1);
+                    exit_simulation(1);
             }
             gate_times.push_back(time);
             gate_names.push_back(sgate);
@@ -591,7 +776,7 @@ int main(int argc, char *argv[])
         }
         else
         {
-            cout2 << "Error: " << sgate << " is not a valid gate name.\n", exit(1);
+            cout2 << "Error: " << sgate << " is not a valid gate name.\n", exit_simulation(1);
         }
     }
 
@@ -606,6 +791,7 @@ int main(int argc, char *argv[])
     // obs_type is 'g' for gates and 'o' for operators
     // gate_name is similar to the names in 'apply_gates', and q0 q1 are the qubits (q1 for 2Q gates only).
 
+    PropagatorCache cache(param.stringval("propagator_cache_dir"));
     vector<MPS> ProjectorList;
     vector<string> ProjectorNames;
     vector<string> OperatorObsNames;
@@ -615,22 +801,31 @@ int main(int argc, char *argv[])
     {
         vector<string> obs_defs = split(c_obs, ':');
         if (obs_defs.size() != 2)
-            cout2 << "No gate or operator data in parameter custom_observables: " << c_obs << "\n", exit(0);
+            cout2 << "No gate or operator data in parameter custom_observables: " << c_obs << "\n", exit_simulation(0);
         vector<string> obs_head = split(obs_defs[0], ' ');
         if (obs_head[1] == "g")
         {
             // cout2 << "Custom observable defined by gates, name: " << obs_head[0] << ", gates: "<< obs_defs[1] << ";
             // ";
             ProjectorNames.push_back(obs_head[0]);
-            auto psi0_ini = InitState(C.sites);
-            for (int i = 1; i <= N; ++i)
-                psi0_ini.set(i, "Up"); // Start with all spins up
-            MPS psi0 = MPS(psi0_ini);
-            ApplyListOfGatesOnAPureState(obs_defs[1], psi0, C);
-            psi0.position(1);
-            ProjectorList.push_back(MPS(C.siteops));
+            const string key = "projector\nsolver_version = " + SOLVER_VERSION + "\nN = " + to_string(N) +
+                               "\ngates = " + obs_defs[1] + "\n";
+            vector<MPS> cached_proj;
+            if (cache.read(key, cached_proj, C.siteops))
+                ProjectorList.push_back(cached_proj[0]);
+            else
+            {
+                auto psi0_ini = InitState(C.sites);
+                for (int i = 1; i <= N; ++i)
+                    psi0_ini.set(i, "Up"); // Start with all spins up
+                MPS psi0 = MPS(psi0_ini);
+                ApplyListOfGatesOnAPureState(obs_defs[1], psi0, C);
+                psi0.position(1);
+                ProjectorList.push_back(MPS(C.siteops));
+                C.psi2rho(psi0, ProjectorList.back());
+                cache.write(key, vector<MPS>{ProjectorList.back()}, C.siteops);
+            }
             MPS &proj = ProjectorList.back();
-            C.psi2rho(psi0, proj);
             int max_bd = maxLinkDim(proj);
             cout2 << "Max bond dimension of the custom observable " << obs_head[0] << ": " << max_bd << ".\n";
         }
@@ -647,7 +842,7 @@ int main(int argc, char *argv[])
         }
         else
             cout2 << "Type of an observable in custom_observables is unknown (must be 'g' or 'o'): " << c_obs << "\n",
-                exit(0);
+                exit_simulation(0);
     }
 
     vector<string> collapse = param.stringvec("collapse", ';');
@@ -658,7 +853,7 @@ int main(int argc, char *argv[])
     {
         vector<string> op_defs = split(coll, ':');
         if (op_defs.size() != 2)
-            cout2 << "No operator data in parameter collapse: " << coll << "\n", exit(0);
+            cout2 << "No operator data in parameter collapse: " << coll << "\n", exit_simulation(0);
         vector<string> op_head = split(op_defs[0], ' ');
         if (op_head[1] == "o")
         {
@@ -671,7 +866,7 @@ int main(int argc, char *argv[])
             CollapseOpsQubits.push_back(coll_qubits);
         }
         else
-            cout2 << "Type of an operator in collapse is unknown (must be 'o'): " << coll << "\n", exit(0);
+            cout2 << "Type of an operator in collapse is unknown (must be 'o'): " << coll << "\n", exit_simulation(0);
     }
     cout2.flush();
 
@@ -719,7 +914,7 @@ int main(int argc, char *argv[])
                 if (std::abs(with_rho - with_psi) > TRACE_RHO_WARN_THRESHOLD)
                     cout2 << "Error: <psi|" << opname << "(" << i << ")|psi> / <psi|psi> =" << with_psi << "\t"
                           << "Tr[rho*" << opname << "(" << i << ")]=" << with_rho << "\n",
-                        exit(1);
+                        exit_simulation(1);
             }
         }
     }
@@ -731,12 +926,24 @@ int main(int argc, char *argv[])
     bool b_time_evolution = SetLindbladian(C, param, lattice);
     if (b_time_evolution)
     {
-        cout2 << "Computing exp(tau*L) as an MPO... ";
-        cout2.flush();
         const int o = param.val("trotter_order");
-        TE.init(tau, C.Lindbladian, argsRho, o);
-        cout2 << "done.\n";
-        cout2.flush();
+        const string key = get_propagator_cache_key(param, lattice, tau, o);
+        vector<MPO> propagators;
+        if (cache.read(key, propagators, C.siteops))
+        {
+            TE.init(propagators, argsRho, o);
+            cout2 << "exp(tau*L) read from the propagator cache.\n";
+            cout2.flush();
+        }
+        else
+        {
+            cout2 << "Computing exp(tau*L) as an MPO... ";
+            cout2.flush();
+            TE.init(tau, C.Lindbladian, argsRho, o);
+            cout2 << "done.\n";
+            cout2.flush();
+            cache.write(key, TE.propagators(), C.siteops);
+        }
         cout2 << "Largest bond dimension of exp(tau*L): " << maxLinkDim(TE.expL1) << ".\n";
     }
     else
@@ -747,15 +954,47 @@ int main(int argc, char *argv[])
     const int n_steps = int(t_total / tau);
 
     // Open output files
-    ofstream file_1q, file_2q, file_3q, file_global, file_custom;
-    file_global.open(output_prefix + ".global.dat"); // Always written to.
-    file_global.precision(15);
-    file_global << "#time\tquantity\tvalue" << endl;
+    const string output_format = param.stringval("output_format");
+    if (output_format != "text" && output_format != "binary" && output_format != "stream")
+        cout2 << "Error: " << output_format << " is an unknown output_format (should be text, binary or stream).\n",
+            exit_simulation(1);
+    const bool b_binary_output = (output_format == "binary" || b_stream_output);
+    const int output_compression = param.longval("output_compression");
+    if (output_compression < 0 || output_compression > 9)
+        cout2 << "Error: output_compression=" << output_compression << " should be between 0 and 9.\n",
+            exit_simulation(1);
+    if (output_compression > 0 && b_binary_output)
+        cout2 << "Error: output_compression is supported only with the text output_format.\n", exit_simulation(1);
+    const int output_flush_step = param.longval("output_flush_step");
+    if (output_flush_step < 0)
+        cout2 << "Error: output_flush_step=" << output_flush_step << " should be equal to or larger than 0.\n",
+            exit_simulation(1);
+    // The observables files are written by a background thread, overlapping the time evolution
+    OutputWriter output_writer(output_flush_step);
+    ObservablesFile file_1q(&output_writer), file_2q(&output_writer), file_3q(&output_writer),
+        file_global(&output_writer), file_custom(&output_writer);
+    if (b_stream_output)
+    {
+        cout.write(OUTPUT_STREAM_MAGIC.data(), OUTPUT_STREAM_MAGIC.size());
+        for (ObservablesFile *file : {&file_1q, &file_2q, &file_3q, &file_global, &file_custom})
+            file->set_stream(&cout);
+    }
+    ProgressFile progress;
+    const string progress_file = param.stringval("progress_file");
+    progress.open(progress_file);
+    if (progress_file != "" && !progress.is_open())
+        cout2 << "Error: unable to open the progress_file " << progress_file << ".\n", exit_simulation(1);
+    const vector<string> global_names = {"tr_rho", "S_2", "OSEE_center", "max_bond_dim", "duration_ms"};
+    file_global.open(output_prefix, "global", "#time\tquantity\tvalue", global_names, 0, {0, 1, 2, 3, 4},
+                     b_binary_output, output_compression, b_append_output); // Always written to.
     if (b_custom_obs)
     {
-        file_custom.open(output_prefix + ".obs-cu.dat");
-        file_custom.precision(15);
-        file_custom << "#time\tobservable\tvalue" << endl;
+        vector<string> custom_names(ProjectorNames);
+        custom_names.insert(custom_names.end(), OperatorObsNames.begin(), OperatorObsNames.end());
+        vector<long> custom_columns(custom_names.size());
+        iota(custom_columns.begin(), custom_columns.end(), 0);
+        file_custom.open(output_prefix, "obs-cu", "#time\tobservable\tvalue", custom_names, 0, custom_columns,
+                         b_binary_output, output_compression, b_append_output);
     }
     // Some preparation/checks for the 1-qubit observables
     auto components = param.stringvec("1q_components");
@@ -766,11 +1005,11 @@ int main(int argc, char *argv[])
         {
             if (s.length() != 1)
                 cout2 << "Error: " << s << " is an unknown 1-qubit component (should be in {x,y,z} or in {X,Y,Z}).\n",
-                    exit(1);
+                    exit_simulation(1);
             char c = toupper(s[0]);
             if (c != 'X' && c != 'Y' && c != 'Z')
                 cout2 << "Error: " << s << " is an unknown 1-qubit component (should be in {x,y,z} or in {X,Y,Z}).\n",
-                    exit(1);
+                    exit_simulation(1);
         }
         if (sit.size() == 0)
         { // If no sites are given explicitly we consider all: 1,...,N
@@ -780,11 +1019,17 @@ int main(int argc, char *argv[])
         for (int i : sit)
         {
             if (i < 1 || i > N)
-                cout2 << "Error: invalid index i=" << i << " found in list `1q_indices`.\n", exit(1);
+                cout2 << "Error: invalid index i=" << i << " found in list `1q_indices`.\n", exit_simulation(1);
         }
-        file_1q.open(output_prefix + ".obs-1q.dat");
-        file_1q.precision(15);
-        file_1q << "#time\toperator\tindex\tvalue" << endl;
+        vector<string> names;
+        vector<long> columns;
+        for (auto &s : components)
+            names.push_back(string(1, toupper(s[0])));
+        for (long i : sit)
+            for (unsigned int c = 0; c < components.size(); c++)
+                columns.insert(columns.end(), {long(c), i});
+        file_1q.open(output_prefix, "obs-1q", "#time\toperator\tindex\tvalue", names, 1, columns, b_binary_output,
+                     output_compression, b_append_output);
     }
 
     // Some preparation/checks for the 2-qubit observables
@@ -794,7 +1039,7 @@ int main(int argc, char *argv[])
     {
         if (sit2.size() % 2 == 1)
             cout2 << "Error: the list of indices given in the parameter `2q_indices` should have an even length.\n",
-                exit(1);
+                exit_simulation(1);
         if (sit2.size() == 0)
         { // If no sites are given explicitly we consider all pairs 1,2,1,3,...,1,N,    2,1,2,3,2,4,...,2,N,  ...  N,N-1
             for (int i = 1; i <= N; i++)
@@ -809,18 +1054,24 @@ int main(int argc, char *argv[])
         {
             if (s.length() != 2)
                 cout2 << "Error: " << s << " is an unknown 2-qubit component (should be a pair in (x,y,z)*(x,y,z)).\n",
-                    exit(1);
+                    exit_simulation(1);
             for (int n = 0; n <= 1; n++)
             {
                 char c = toupper(s[n]);
                 if (c != 'X' && c != 'Y' && c != 'Z')
                     cout2 << "Error: " << s << " is an unknown component (should be a pair in (x,y,z)*(x,y,z)).\n",
-                        exit(1);
+                        exit_simulation(1);
             }
         }
-        file_2q.open(output_prefix + ".obs-2q.dat");
-        file_2q.precision(15);
-        file_2q << "#time\toperator\tindex_1\tindex_2\tvalue" << endl;
+        vector<string> names;
+        vector<long> columns;
+        for (auto &s : components2)
+            names.push_back({char(toupper(s[0])), char(toupper(s[1]))});
+        for (unsigned int n = 0; n < sit2.size(); n += 2)
+            for (unsigned int c = 0; c < components2.size(); c++)
+                columns.insert(columns.end(), {long(c), sit2[n], sit2[n + 1]});
+        file_2q.open(output_prefix, "obs-2q", "#time\toperator\tindex_1\tindex_2\tvalue", names, 2, columns,
+                     b_binary_output, output_compression, b_append_output);
     }
 
     // Some preparation/checks for the 3-qubit observables
@@ -830,7 +1081,7 @@ int main(int argc, char *argv[])
     {
         if (sit3.size() % 3 > 0)
             cout2 << "Error: the list of indices given in the parameter `3q_indices` should be multiple of three.\n",
-                exit(1);
+                exit_simulation(1);
         if (sit3.size() == 0)
         { // If no sites are given explicitly we consider all triples
             for (int i = 1; i <= N; i++)
@@ -847,21 +1098,64 @@ int main(int argc, char *argv[])
             if (s.length() != 3)
                 cout2 << "Error: " << s
                       << " is an unknown 3-qubit component (should be a triplet in (x,y,z)*(x,y,z)*(x,y,z)).\n",
-                    exit(1);
+                    exit_simulation(1);
             for (int n = 0; n <= 2; n++)
             {
                 char c = toupper(s[n]);
                 if (c != 'X' && c != 'Y' && c != 'Z')
                     cout2 << "Error: " << s
                           << " is an unknown component (should be a triplet in (x,y,z)*(x,y,z)*(x,y,z)).\n",
-                        exit(1);
+                        exit_simulation(1);
             }
         }
-        file_3q.open(output_prefix + ".obs-3q.dat");
-        file_3q.precision(15);
-        file_3q << "#time\toperator\tindex_1\tindex_2\tindex_3\tvalue" << endl;
+        vector<string> names;
+        vector<long> columns;
+        for (auto &s : components3)
+            names.push_back({char(toupper(s[0])), char(toupper(s[1])), char(toupper(s[2]))});
+        for (unsigned int n = 0; n < sit3.size(); n += 3)
+            for (unsigned int c = 0; c < components3.size(); c++)
+                columns.insert(columns.end(), {long(c), sit3[n], sit3[n + 1], sit3[n + 2]});
+        file_3q.open(output_prefix, "obs-3q", "#time\toperator\tindex_1\tindex_2\tindex_3\tvalue", names, 3,
+                     columns, b_binary_output, output_compression, b_append_output);
     }
 
+    // Prepare the checkpoints
+    const long checkpoint_step = param.longval("checkpoint_step");
+    if (checkpoint_step < 0)
+        cout2 << "Error: checkpoint_step=" << checkpoint_step << " should be equal to or larger than 0.\n",
+            exit_simulation(1);
+    if (checkpoint_step > 0 && b_stream_output)
+        cout2 << "Error: checkpoints are not supported with the stream output_format.\n", exit_simulation(1);
+    const long initial_step = param.longval("initial_step");
+    if (initial_step < 0)
+        cout2 << "Error: initial_step=" << initial_step << " should be equal to or larger than 0.\n",
+            exit_simulation(1);
+    const string checkpoint_file = output_prefix + ".checkpoint.txt";
+    if (!b_append_output)
+        remove(checkpoint_file.c_str()); // A checkpoint of an earlier simulation does not match the new output files
+    // The state is saved alternately with two file name prefixes, such that the state of the last checkpoint
+    // remains intact until the checkpoint file is replaced. The first prefix used is not the one resumed from.
+    int checkpoint_slot = (load_prefix == output_prefix + ".checkpoint0") ? 1 : 0;
+    auto save_checkpoint = [&](int n, long n_abs, double t) {
+        const string state_prefix = output_prefix + ".checkpoint" + to_string(checkpoint_slot);
+        writeToFile(state_prefix + ".state.ops", C.siteops);
+        writeToFile(state_prefix + ".state.rho", C.rho);
+        writeToFile(state_prefix + ".state.sites", C.sites);
+        const string temp_file = checkpoint_file + ".tmp";
+        ofstream stream(temp_file);
+        stream.precision(17);
+        stream << "t = " << t << "\nstep = " << n_abs << "\nstate_prefix = " << state_prefix << "\n";
+        for (ObservablesFile *file : {&file_1q, &file_2q, &file_3q, &file_global, &file_custom})
+            if (file->is_open())
+                file->write_checkpoint(stream);
+        stream.close();
+        if (!stream || rename(temp_file.c_str(), checkpoint_file.c_str()) != 0)
+            cout2 << "Error: unable to write the checkpoint file " << checkpoint_file << ".\n", exit_simulation(1);
+        checkpoint_slot = 1 - checkpoint_slot;
+        cout2 << "\tCheckpoint saved, with the state files prefix " << state_prefix << ".\n";
+        progress.write("checkpoint", {{"step", n}, {"t", t}});
+    };
+
     //-----------------------------------------------------
     const int output_step = param.longval("output_step");
     auto t_init_end = steady_clock::now();
@@ -869,6 +1163,12 @@ int main(int argc, char *argv[])
     cout2 << "\nSimulation initialization duration: " << duration_ms.count() / 1000. << "s"
           << "\n";
     cout2.flush();
+    progress.write("start", {{"N", N},
+                             {"n_steps", n_steps},
+                             {"t_init", t_0},
+                             {"tau", tau},
+                             {"output_step", output_step},
+                             {"duration_ms", duration_ms.count()}});
 
     if (collapse.size())
     {
@@ -899,7 +1199,7 @@ int main(int argc, char *argv[])
                     cout2 << "Error: Collapse operator " << s_coll_op
                           << " can only contain Paulis or standard-basis projectors (u or d),"
                           << " but contains " << op_name << ".\n",
-                        exit(1);
+                        exit_simulation(1);
                 i_op++;
             }
             if (i_coll == 0)
@@ -929,9 +1229,22 @@ int main(int argc, char *argv[])
     const bool b_quiet = param.boolval("b_quiet");
     cout2.quiet(b_quiet);
     double t = t_0;
+    bool b_stopped = false;
     for (int n = 0; n <= n_steps; n++)
     {
         t = t_0 + n * tau;
+        // The step index counted from the start of the original simulation, if resumed from a checkpoint
+        const long n_abs = initial_step + n;
+        if (checkpoint_step > 0 && n > 0 && (b_stop_requested || n == n_steps || (n_abs % checkpoint_step) == 0))
+            save_checkpoint(n, n_abs, t);
+        if (b_stop_requested)
+        {
+            cout2.quiet(false);
+            cout2 << "\nStop requested, ending the simulation at t = " << t << ".\n";
+            progress.write("stop", {{"step", n}, {"t", t}});
+            b_stopped = true;
+            break;
+        }
         // Print data about this time step
         auto t_now = steady_clock::now();
         auto tot_duration = duration_cast<milliseconds>(t_now - t_start_sim);
@@ -1029,11 +1342,11 @@ int main(int argc, char *argv[])
             cout2.flush();
         }
 
-        if (force_rho_hermitian_step && (n % force_rho_hermitian_step) == 0)
+        if (force_rho_hermitian_step && (n_abs % force_rho_hermitian_step) == 0)
             C.MakeRhoHermitian(argsRho);
         if (output_step > 0)
         {
-            if ((n % output_step) == 0 || n == n_steps)
+            if ((n_abs % output_step) == 0 || n == n_steps)
             {
                 // Print and save output data at initial time, final time, and every output_step time steps
 
@@ -1053,42 +1366,42 @@ int main(int argc, char *argv[])
 
                 //				file_global << t << " \t" << tr.real() << " \t" << S_2 << " \t" << osee << " \t" <<
                 //bd_max << " \t" << tot_duration.count() << endl;
-                file_global << t << " \t"
-                            << "tr_rho\t" << tr.real() << "\n";
-                file_global << t << " \t"
-                            << "S_2\t" << S_2 << "\n";
-                file_global << t << " \t"
-                            << "OSEE_center\t" << osee << "\n";
-                file_global << t << " \t"
-                            << "max_bond_dim\t" << bd_max << "\n";
-                file_global << t << " \t"
-                            << "duration_ms\t" << tot_duration.count() << "\n";
-                file_global << endl; // Skip a line between time steps
+                file_global.write(t, 0, NULL, tr.real());
+                file_global.write(t, 1, NULL, S_2);
+                file_global.write(t, 2, NULL, osee);
+                file_global.write(t, 3, NULL, bd_max);
+                file_global.write(t, 4, NULL, tot_duration.count());
+                file_global.end_step(t);
 
                 // --------------------------------------------------
                 // Compute 1-qubit observables and write them to file
                 int count = 0;
                 auto t_1q_start = steady_clock::now();
+                // The partial traces of rho are computed once for all the 1-, 2- and 3-qubit expectation values,
+                // and only if any of them are requested
+                unique_ptr<ObservablesEngine> engine;
+                if (components.size() || components2.size() || components3.size())
+                    engine = make_unique<ObservablesEngine>(C);
                 if (components.size())
                 {
                     for (long &i : sit)
                     {
-                        for (auto &s : components)
+                        for (unsigned int c = 0; c < components.size(); c++)
                         {
+                            auto &s = components[c];
                             string c1("S");
                             c1 += char(tolower(s[0]));
-                            Cplx expectation_value = C.Expect(c1, i);
+                            Cplx expectation_value = engine->Expect(c1, i);
                             if (abs(expectation_value.imag()) > IMAGINARY_THRESHOLD)
                                 cout2 << "\tWarning: <S^" << s << "(" << i << ")> = " << expectation_value
                                       << "; it should be real, but has an imaginary part > " << IMAGINARY_THRESHOLD
                                       << ".\n";
-                            file_1q << t << "\t" << char(toupper(s[0])) << "\t" << i << "\t" << expectation_value.real()
-                                    << endl;
+                            file_1q.write(t, c, &i, expectation_value.real());
                             count++;
                         }
                         //					file_1q << endl;
                     }
-                    file_1q << endl; // Skip a line between time steps
+                    file_1q.end_step(t);
                 }
                 auto t_1q_end = steady_clock::now();
                 if (count)
@@ -1103,27 +1416,37 @@ int main(int argc, char *argv[])
                 // Compute 2-qubit observables and write them to file
                 if (components2.size())
                 {
+                    // All the correlators are computed together by the engine, and then written in order
+                    vector<vector<string>> opnames;
+                    vector<vector<int>> indices;
+                    for (unsigned int n = 0; n < sit2.size(); n += 2)
+                    {
+                        for (auto &s : components2)
+                        {
+                            opnames.push_back({string("S") + char(tolower(s[0])), string("S") + char(tolower(s[1]))});
+                            indices.push_back({int(sit2[n]), int(sit2[n + 1])});
+                        }
+                    }
+                    const vector<Cplx> values = engine->Expect(opnames, indices);
                     for (unsigned int n = 0; n < sit2.size(); n += 2)
                     {
                         const int i = sit2[n], j = sit2[n + 1];
                         // Loop over components
-                        for (auto &s : components2)
+                        for (unsigned int c = 0; c < components2.size(); c++)
                         {
-                            string c1("S"), c2("S");
-                            c1 += char(tolower(s[0]));
-                            c2 += char(tolower(s[1]));
-                            Cplx expectation_value = C.Expect(c1, i, c2, j);
+                            const unsigned int m = (n / 2) * components2.size() + c;
+                            const string &c1 = opnames[m][0], &c2 = opnames[m][1];
+                            Cplx expectation_value = values[m];
                             if (abs(expectation_value.imag()) > IMAGINARY_THRESHOLD)
                                 cout2 << "\tWarning: <" << c1 << "(" << i << ")" << c2 << "(" << j
                                       << ")> = " << expectation_value
                                       << "; it should be real, but has an imaginary part > " << IMAGINARY_THRESHOLD
                                       << ".\n";
-                            file_2q << t << "\t" << char(toupper(s[0])) << char(toupper(s[1])) << "\t" << i << "\t" << j
-                                    << "\t" << expectation_value.real() << endl;
+                            file_2q.write(t, c, &sit2[n], expectation_value.real());
                             count++;
                         }
                     }
-                    file_2q << endl; // Skip a line between time steps
+                    file_2q.end_step(t);
                 }
                 auto t_2q_end = steady_clock::now();
                 if (count)
@@ -1138,28 +1461,37 @@ int main(int argc, char *argv[])
                 // Compute 3-qubit observables and write them to file
                 if (components3.size())
                 {
+                    vector<vector<string>> opnames;
+                    vector<vector<int>> indices;
+                    for (unsigned int n = 0; n < sit3.size(); n += 3)
+                    {
+                        for (auto &s : components3)
+                        {
+                            opnames.push_back({string("S") + char(tolower(s[0])), string("S") + char(tolower(s[1])),
+                                               string("S") + char(tolower(s[2]))});
+                            indices.push_back({int(sit3[n]), int(sit3[n + 1]), int(sit3[n + 2])});
+                        }
+                    }
+                    const vector<Cplx> values = engine->Expect(opnames, indices);
                     for (unsigned int n = 0; n < sit3.size(); n += 3)
                     {
                         const int i = sit3[n], j = sit3[n + 1], k = sit3[n + 2];
                         // Loop over components
-                        for (auto &s : components3)
+                        for (unsigned int c = 0; c < components3.size(); c++)
                         {
-                            string c1("S"), c2("S"), c3("S");
-                            c1 += char(tolower(s[0]));
-                            c2 += char(tolower(s[1]));
-                            c3 += char(tolower(s[2]));
-                            Cplx expectation_value = C.Expect(c1, i, c2, j, c3, k);
+                            const unsigned int m = (n / 3) * components3.size() + c;
+                            const string &c1 = opnames[m][0], &c2 = opnames[m][1], &c3 = opnames[m][2];
+                            Cplx expectation_value = values[m];
                             if (abs(expectation_value.imag()) > IMAGINARY_THRESHOLD)
                                 cout2 << "\tWarning: <" << c1 << "(" << i << ")" << c2 << "(" << j << ")" << c3 << "("
                                       << k << ")" << expectation_value
                                       << "; it should be real, but has an imaginary part > " << IMAGINARY_THRESHOLD
                                       << ".\n";
-                            file_3q << t << "\t" << char(toupper(s[0])) << char(toupper(s[1])) << char(toupper(s[2]))
-                                    << "\t" << i << "\t" << j << "\t" << k << "\t" << expectation_value.real() << endl;
+                            file_3q.write(t, c, &sit3[n], expectation_value.real());
                             count++;
                         }
                     }
-                    file_3q << endl; // Skip a line between time steps
+                    file_3q.end_step(t);
                 }
                 auto t_3q_end = steady_clock::now();
                 if (count)
@@ -1181,24 +1513,24 @@ int main(int argc, char *argv[])
                         for (MPS &proj : ProjectorList)
                         {
                             Cplx op_val = innerC(proj, C.rho);
-                            file_custom << t << " \t" << ProjectorNames[c] << "\t" << op_val.real() << endl;
+                            file_custom.write(t, c, NULL, op_val.real());
                             c++;
                         }
                         count += c;
                     }
                     if (OperatorObsNames.size())
                     {
+                        const int c_0 = ProjectorNames.size();
                         int c = 0;
-                        for (string &s_op_obs : OperatorObsNames)
+                        for (; c < int(OperatorObsNames.size()); c++)
                         {
                             Cplx op_val = C.Expect(OperatorObs[c], OperatorObsQubits[c]);
                             // cout2 << "\nCalculating: " << OperatorObs[c] << " " << OperatorObsQubits[c];
-                            file_custom << t << " \t" << s_op_obs << "\t" << op_val.real() << endl;
-                            c++;
+                            file_custom.write(t, c_0 + c, NULL, op_val.real());
                         }
                         count += c;
                     }
-                    file_custom << endl; // Skip a line between time steps
+                    file_custom.end_step(t);
                 }
                 auto t_cu_end = steady_clock::now();
                 if (count)
@@ -1211,6 +1543,19 @@ int main(int argc, char *argv[])
                 }
                 cout2 << "\n";
                 cout2.flush();
+                progress.write(
+                    "observables",
+                    {{"step", n},
+                     {"t", t},
+                     {"tr_rho", tr.real()},
+                     {"S_2", S_2},
+                     {"OSEE_center", osee},
+                     {"max_bond_dim", bd_max},
+                     {"duration_1q_ms", duration_cast<milliseconds>(t_1q_end - t_1q_start).count()},
+                     {"duration_2q_ms", duration_cast<milliseconds>(t_2q_end - t_1q_end).count()},
+                     {"duration_3q_ms", duration_cast<milliseconds>(t_3q_end - t_2q_end).count()},
+                     {"duration_custom_ms", duration_cast<milliseconds>(t_cu_end - t_3q_end).count()},
+                     {"total_duration_ms", tot_duration.count()}});
             }
         }
         if (b_time_evolution && n < n_steps)
@@ -1238,6 +1583,11 @@ int main(int argc, char *argv[])
             //			if (std::abs(z - 1) > TRACE_RHO_WARN_THRESHOLD)
             //				cout2 << "\nWarning: Tr[rho] != 1 :" << z << "\n";
             cout2.flush();
+            progress.write("evolve", {{"step", n + 1},
+                                      {"t", t + tau},
+                                      {"duration_ms", duration_ms.count()},
+                                      {"tr_rho", tr.real()},
+                                      {"max_bond_dim", maxLinkDim(C.rho)}});
         }
     }
     cout2.quiet(false);
@@ -1271,8 +1621,12 @@ int main(int argc, char *argv[])
     sprintf(buf, "%.2fhr", tot_duration.count() / 3600.);
     cout2 << "\nTotal simulation duration: " << buf << "\n";
     cout2.flush();
+    progress.write("end", {{"total_duration_ms", duration_cast<milliseconds>(t_end_sim - t_start_sim).count()}});
+    progress.close();
     log_file.close();
-    return 0;
+    cout2 = stream2d(&cerr, NULL);
+    // The log file of the next simulation (in the serve mode) is opened by it
+    return b_stopped ? STOPPED_EXIT_CODE : 0;
 }
 
 void validate_2q_list(vector<long> &vect, int N, string const &list_name)
@@ -1281,13 +1635,13 @@ void validate_2q_list(vector<long> &vect, int N, string const &list_name)
     {
         const int i = vect[n], j = vect[n + 1];
         if (i < 1 || i > N)
-            cout2 << "Error: invalid index i =" << i << " found in list `" << list_name << "`.\n", exit(1);
+            cout2 << "Error: invalid index i =" << i << " found in list `" << list_name << "`.\n", exit_simulation(1);
         if (j < 1 || j > N)
-            cout2 << "Error: invalid index i =" << j << " found in list `" << list_name << "`.\n", exit(1);
+            cout2 << "Error: invalid index i =" << j << " found in list `" << list_name << "`.\n", exit_simulation(1);
         if (i == j)
             cout2 << "Error: an invalid identical index pair (" << i << ") found in list `" << list_name
                   << "`. Two-qubit operators must involve two distinct qubits.\n",
-                exit(1);
+                exit_simulation(1);
     }
 }
 
@@ -1297,16 +1651,37 @@ void validate_3q_list(vector<long> &vect, int N, string const &list_name)
     {
         const int i = vect[n], j = vect[n + 1], k = vect[n + 2];
         if (i < 1 || i > N)
-            cout2 << "Error: invalid index i =" << i << " found in list `" << list_name << "`.\n", exit(1);
+            cout2 << "Error: invalid index i =" << i << " found in list `" << list_name << "`.\n", exit_simulation(1);
         if (j < 1 || j > N)
-            cout2 << "Error: invalid index j =" << j << " found in list `" << list_name << "`.\n", exit(1);
+            cout2 << "Error: invalid index j =" << j << " found in list `" << list_name << "`.\n", exit_simulation(1);
         if (k < 1 || k > N)
-            cout2 << "Error: invalid index k =" << k << " found in list `" << list_name << "`.\n", exit(1);
+            cout2 << "Error: invalid index k =" << k << " found in list `" << list_name << "`.\n", exit_simulation(1);
         if (i == j || i == k || k == j)
             cout2 << "Error: invalid index triplet (" << i << "," << j << "," << k << ") found in list `" << list_name
                   << "`. 3-qubit operators must involve 3 distinct qubits.\n",
-                exit(1);
+                exit_simulation(1);
+    }
+}
+
+string get_propagator_cache_key(ModelParameters &param, const Lattice2d &lattice, double tau, int order)
+{
+    // The key holds everything that the Lindbladian terms depend on, with the exact values of the couplings,
+    // together with the time step and the Trotter order
+    stringstream key;
+    key << setprecision(17) << "propagators\nsolver_version = " << SOLVER_VERSION << "\nN = " << lattice.N
+        << "\nbonds =";
+    for (unsigned int n = 0; n < lattice.I.size(); n++)
+        key << " " << lattice.I[n] << "," << lattice.J[n];
+    key << "\n";
+    for (string name : {"h_x", "h_y", "h_z", "g_0", "g_1", "g_2", "g_3", "g_4", "J", "J_z"})
+    {
+        key << name << " =";
+        for (double val : param.doublevec(name))
+            key << " " << val;
+        key << "\n";
     }
+    key << "tau = " << tau << "\ntrotter_order = " << order << "\n";
+    return key.str();
 }
 
 // Old initialization code
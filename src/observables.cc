@@ -0,0 +1,126 @@
+// Licensed under the Apache License, Version 2.0 (the "License"); you may
+// not use this file except in compliance with the License. You may obtain
+// a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+
+#include "observables.h"
+#include "io_utils.h"
+#include <algorithm>
+
+ObservablesEngine::ObservablesEngine(const SpinHalfSystem &C)
+    : C(C), Identity(dag(C.Identity)), traced(C.N + 2), left(C.N + 2), right(C.N + 2)
+{
+    const int N = C.N;
+    // As in innerC(), the link indices of the identity are replaced, in case rho shares them
+    Identity.replaceLinkInds(sim(linkInds(Identity)));
+    for (int i = 1; i <= N; i++)
+        traced[i] = C.rho.A(i) * Identity.A(i);
+    left[0] = ITensor(1.);
+    for (int i = 1; i <= N; i++)
+        left[i] = left[i - 1] * traced[i];
+    right[N + 1] = ITensor(1.);
+    for (int i = N; i >= 1; i--)
+        right[i] = traced[i] * right[i + 1];
+}
+
+Cplx ObservablesEngine::trace() const
+{
+    return left[C.N].cplx();
+}
+
+Cplx ObservablesEngine::Expect(const string &opname, int i)
+{
+    // Contracted from the left, so that each product is of a vector and a matrix
+    ITensor B = left[i - 1] * traced_op(opname, i);
+    B *= right[i + 1];
+    return B.cplx();
+}
+
+vector<Cplx> ObservablesEngine::Expect(const vector<vector<string>> &opnames, const vector<vector<int>> &indices)
+{
+    if (opnames.size() != indices.size())
+        cout2 << "Error in ObservablesEngine::Expect, opnames and indices should have the same size.\n",
+            exit_simulation(1);
+    const int n_products = indices.size();
+    // The operators of each product, sorted by their sites
+    vector<vector<pair<int, string>>> products(n_products);
+    for (int n = 0; n < n_products; n++)
+    {
+        if (opnames[n].size() != indices[n].size() || indices[n].empty())
+            cout2 << "Error in ObservablesEngine::Expect, invalid operators of product " << n << ".\n",
+                exit_simulation(1);
+        for (unsigned int m = 0; m < indices[n].size(); m++)
+            products[n].push_back({indices[n][m], opnames[n][m]});
+        sort(products[n].begin(), products[n].end());
+        for (unsigned int m = 1; m < products[n].size(); m++)
+            if (products[n][m].first == products[n][m - 1].first)
+                cout2 << "Error in ObservablesEngine::Expect, the sites of product " << n << " must be distinct.\n",
+                    exit_simulation(1);
+    }
+    // The products are evaluated in lexicographic order, such that consecutive products share their first operators
+    vector<int> order(n_products);
+    for (int n = 0; n < n_products; n++)
+        order[n] = n;
+    stable_sort(order.begin(), order.end(), [&](int a, int b) { return products[a] < products[b]; });
+
+    // The levels of the current product, holding for its first operators the contraction of rho (with the operators
+    // applied) from site 1 up to `position`. The contraction of each level is advanced to the right as needed by the
+    // following products sharing the operators of that level, which are evaluated in order of their next site.
+    struct Level
+    {
+        int site;
+        string opname;
+        ITensor contraction;
+        int position;
+    };
+    vector<Level> levels;
+    vector<Cplx> values(n_products);
+    for (int n : order)
+    {
+        const auto &product = products[n];
+        unsigned int n_shared = 0;
+        while (n_shared < levels.size() && n_shared < product.size() &&
+               levels[n_shared].site == product[n_shared].first && levels[n_shared].opname == product[n_shared].second)
+            n_shared++;
+        levels.resize(n_shared);
+        for (unsigned int m = n_shared; m < product.size(); m++)
+        {
+            const int site = product[m].first;
+            ITensor contraction;
+            if (m == 0)
+                contraction = left[site - 1];
+            else
+            {
+                Level &previous = levels[m - 1];
+                while (previous.position < site - 1)
+                    previous.contraction *= traced[++previous.position];
+                contraction = previous.contraction;
+            }
+            contraction *= traced_op(product[m].second, site);
+            levels.push_back({site, product[m].second, contraction, site});
+        }
+        const Level &last = levels.back();
+        ITensor B = last.contraction * right[last.position + 1];
+        values[n] = B.cplx();
+    }
+    return values;
+}
+
+const ITensor &ObservablesEngine::traced_op(const string &opname, int i)
+{
+    auto key = make_pair(i, opname);
+    auto it = traced_ops.find(key);
+    if (it != traced_ops.end())
+        return it->second;
+    ITensor A = C.rho.A(i) * C.siteops.op(opname, i);
+    A.noPrime();
+    A *= Identity.A(i);
+    return traced_ops[key] = A;
+}
@@ -0,0 +1,63 @@
+// Licensed under the Apache License, Version 2.0 (the "License"); you may
+// not use this file except in compliance with the License. You may obtain
+// a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+
+#ifndef _OBSERVABLES_
+#define _OBSERVABLES_
+
+#include "Pauli.h"
+#include "itensor/all.h"
+#include <map>
+#include <string>
+#include <utility>
+#include <vector>
+
+using namespace itensor;
+using namespace std;
+
+// Computes expectation values Tr[O rho] of the density matrix of a system without copying rho, using the partial
+// traces of rho over the sites to the left and to the right of each site (the environments). The environments are
+// computed once, when the engine is constructed, after which each single-site expectation value requires only
+// the contraction of one site tensor. Correlators (products of operators at several sites) are computed together,
+// sweeping the contraction of rho to the right from the cached left environment of the first site of each product,
+// so that all the products sharing their first operators share the contraction up to the last shared site.
+// The engine refers to the system, and is valid as long as rho is unchanged.
+class ObservablesEngine
+{
+  public:
+    ObservablesEngine(const SpinHalfSystem &C);
+
+    // Trace of rho
+    Cplx trace() const;
+
+    // Expectation value of a single-site operator
+    Cplx Expect(const string &opname, int i);
+
+    // Expectation values of products of single-site operators. Product n is of the operators opnames[n][m] at the
+    // distinct sites indices[n][m], given in any order. Returns the expectation value of each product.
+    vector<Cplx> Expect(const vector<vector<string>> &opnames, const vector<vector<int>> &indices);
+
+  private:
+    // The tensor of rho at site i multiplied by an operator, traced over the site index (cached)
+    const ITensor &traced_op(const string &opname, int i);
+
+    const SpinHalfSystem &C;
+    // The identity MPS (conjugated), with link indices distinct from those of rho
+    MPS Identity;
+    // traced[i] is the tensor of rho at site i, traced over the site index
+    vector<ITensor> traced;
+    // left[i] is the partial trace of rho over the sites 1...i, and right[i] over the sites i...N,
+    // with left[0] = right[N + 1] = 1
+    vector<ITensor> left, right;
+    map<pair<int, string>, ITensor> traced_ops;
+};
+
+#endif
@@ -0,0 +1,319 @@
+// Licensed under the Apache License, Version 2.0 (the "License"); you may
+// not use this file except in compliance with the License. You may obtain
+// a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+
+#include "output_files.h"
+#include <cmath>
+#include <cstdint>
+#include <stdexcept>
+#include <zlib.h>
+
+using namespace std;
+
+OutputWriter::OutputWriter(int flush_step)
+    : flush_step(flush_step), queued_bytes(0), b_busy(false), b_stop(false), writer_thread(&OutputWriter::run, this)
+{
+}
+
+OutputWriter::~OutputWriter()
+{
+    {
+        lock_guard<mutex> lock(tasks_mutex);
+        b_stop = true;
+    }
+    tasks_cv.notify_all();
+    writer_thread.join();
+}
+
+void OutputWriter::submit(ostream *stream, string &&data, bool b_flush)
+{
+    unique_lock<mutex> lock(tasks_mutex);
+    // Limit the memory held by the queue if the disk is slower than the computation
+    done_cv.wait(lock, [this] { return queued_bytes < OUTPUT_WRITER_MAX_QUEUED_BYTES; });
+    queued_bytes += data.size();
+    tasks.push_back(Task{stream, move(data), b_flush});
+    lock.unlock();
+    tasks_cv.notify_one();
+}
+
+void OutputWriter::wait()
+{
+    unique_lock<mutex> lock(tasks_mutex);
+    done_cv.wait(lock, [this] { return tasks.empty() && !b_busy; });
+}
+
+int OutputWriter::get_flush_step() const
+{
+    return flush_step;
+}
+
+void OutputWriter::run()
+{
+    unique_lock<mutex> lock(tasks_mutex);
+    while (true)
+    {
+        tasks_cv.wait(lock, [this] { return b_stop || !tasks.empty(); });
+        if (tasks.empty())
+            break; // Stopped, after all the queued data was written
+        Task task = move(tasks.front());
+        tasks.pop_front();
+        b_busy = true;
+        lock.unlock();
+        task.stream->write(task.data.data(), task.data.size());
+        if (task.b_flush)
+            task.stream->flush();
+        lock.lock();
+        b_busy = false;
+        queued_bytes -= task.data.size();
+        done_cv.notify_all();
+    }
+}
+
+ObservablesFile::ObservablesFile(OutputWriter *writer)
+    : writer(writer), stream(NULL), b_stream_open(false), step_offset(0), step_rows(0), n_steps(0), n_indices(0), b_binary(false), compression_level(0)
+{
+}
+
+ObservablesFile::~ObservablesFile()
+{
+    close();
+}
+
+void ObservablesFile::set_stream(ostream *stream)
+{
+    this->stream = stream;
+}
+
+void ObservablesFile::open(const string &prefix, const string &output_type, const string &text_header,
+                           const vector<string> &names, int n_indices, const vector<long> &columns, bool b_binary,
+                           int compression_level, bool b_append)
+{
+    this->names = names;
+    this->n_indices = n_indices;
+    this->b_binary = b_binary;
+    this->compression_level = b_binary ? 0 : compression_level;
+    this->output_type = output_type;
+    n_steps = 0;
+    const ios::openmode mode = ios::out | ios::binary | (b_append ? ios::app : ios::trunc);
+    if (!b_binary)
+    {
+        filename = prefix + "." + output_type + (this->compression_level > 0 ? ".dat.gz" : ".dat");
+        file.open(filename, mode);
+        file.seekp(0, ios::end);
+        if (file.tellp() == 0)
+        {
+            if (this->compression_level > 0)
+            {
+                const string header = compress(text_header + "\n");
+                file.write(header.data(), header.size());
+            }
+            else
+                file << text_header << "\n";
+            file.flush();
+        }
+        step_offset = file.tellp();
+        step_rows = 0;
+        step_buffer.str("");
+        step_buffer.precision(15);
+        index_filename = prefix + "." + output_type + ".idx";
+        index_file.open(index_filename, mode);
+        index_file.precision(15);
+        index_file.seekp(0, ios::end);
+        if (index_file.tellp() == 0)
+            index_file << "#time\toffset\tlength\trows" << endl;
+        return;
+    }
+    const uint32_t n_columns = columns.size() / (1 + n_indices);
+    block.reserve(1 + n_columns);
+    if (stream)
+        b_stream_open = true;
+    else
+    {
+        filename = prefix + "." + output_type + ".bin";
+        file.open(filename, mode);
+        file.seekp(0, ios::end);
+        if (file.tellp() != 0)
+            return;
+    }
+    ostringstream header;
+    header.write(BINARY_FILE_MAGIC.data(), BINARY_FILE_MAGIC.size());
+    uint32_t header_values[4] = {BINARY_FILE_BYTE_ORDER_MARK, uint32_t(n_indices), uint32_t(names.size()), n_columns};
+    header.write(reinterpret_cast<const char *>(header_values), sizeof(header_values));
+    for (const string &name : names)
+    {
+        uint32_t length = name.size();
+        header.write(reinterpret_cast<const char *>(&length), sizeof(length));
+        header.write(name.data(), length);
+    }
+    for (long column_entry : columns)
+    {
+        int32_t entry = column_entry;
+        header.write(reinterpret_cast<const char *>(&entry), sizeof(entry));
+    }
+    const char padding[8] = {0};
+    header.write(padding, (8 - streamoff(header.tellp()) % 8) % 8);
+    write_data(stream ? *stream : file, header.str(), true);
+}
+
+bool ObservablesFile::is_open() const
+{
+    return file.is_open() || b_stream_open;
+}
+
+void ObservablesFile::write_checkpoint(ostream &stream)
+{
+    if (writer)
+        writer->wait();
+    file.flush();
+    stream << "file = " << file.tellp() << "\t" << filename << "\n";
+    if (index_file.is_open())
+    {
+        index_file.flush();
+        stream << "file = " << index_file.tellp() << "\t" << index_filename << "\n";
+    }
+}
+
+void ObservablesFile::write(double t, int name_index, const long *indices, double value)
+{
+    if (!b_binary)
+    {
+        step_buffer << t << (n_indices ? "\t" : " \t") << names[name_index];
+        for (int i = 0; i < n_indices; i++)
+            step_buffer << "\t" << indices[i];
+        step_buffer << "\t" << value << "\n";
+        step_rows++;
+        return;
+    }
+    if (block.empty())
+        block.push_back(t);
+    block.push_back(value);
+}
+
+void ObservablesFile::end_step(double t)
+{
+    n_steps++;
+    const int flush_step = writer ? writer->get_flush_step() : 1;
+    const bool b_flush = flush_step > 0 && (n_steps % flush_step) == 0;
+    if (!b_binary)
+    {
+        step_buffer << "\n"; // Skip a line between time steps
+        string data = step_buffer.str();
+        step_buffer.str("");
+        if (compression_level > 0)
+            data = compress(data);
+        const streamoff length = data.size();
+        ostringstream index_line;
+        index_line.precision(15);
+        index_line << t << "\t" << step_offset << "\t" << length << "\t" << step_rows << "\n";
+        // The index line is written (and flushed) after the lines of the time step
+        write_data(file, move(data), b_flush);
+        write_data(index_file, index_line.str(), b_flush);
+        step_offset += length;
+        step_rows = 0;
+        return;
+    }
+    if (block.empty())
+        block.push_back(t);
+    write_data(stream ? *stream : file, string(reinterpret_cast<const char *>(block.data()), block.size() * sizeof(double)),
+               b_flush);
+    block.clear();
+}
+
+string ObservablesFile::compress(const string &data) const
+{
+    // Compress the data into a complete gzip member (window bits 15, plus 16 for the gzip wrapper)
+    z_stream stream = {};
+    if (deflateInit2(&stream, compression_level, Z_DEFLATED, 15 + 16, 8, Z_DEFAULT_STRATEGY) != Z_OK)
+        throw runtime_error("Failed to initialize the zlib compression.");
+    string compressed(deflateBound(&stream, data.size()), '\0');
+    stream.next_in = reinterpret_cast<Bytef *>(const_cast<char *>(data.data()));
+    stream.avail_in = data.size();
+    stream.next_out = reinterpret_cast<Bytef *>(&compressed[0]);
+    stream.avail_out = compressed.size();
+    const int result = deflate(&stream, Z_FINISH);
+    compressed.resize(stream.total_out);
+    deflateEnd(&stream);
+    if (result != Z_STREAM_END)
+        throw runtime_error("Failed to compress an output time step.");
+    return compressed;
+}
+
+void ObservablesFile::write_data(ostream &stream, string &&data, bool b_flush)
+{
+    if (this->stream)
+    {
+        // A frame of the stream output format, consisting of the output type and the data
+        uint32_t lengths[2] = {uint32_t(output_type.size()), uint32_t(data.size())};
+        string frame(reinterpret_cast<const char *>(&lengths[0]), sizeof(uint32_t));
+        frame += output_type;
+        frame.append(reinterpret_cast<const char *>(&lengths[1]), sizeof(uint32_t));
+        data = frame + data;
+    }
+    if (writer)
+    {
+        writer->submit(&stream, move(data), b_flush);
+        return;
+    }
+    stream.write(data.data(), data.size());
+    if (b_flush)
+        stream.flush();
+}
+
+void ObservablesFile::close()
+{
+    if (writer)
+        writer->wait();
+    if (file.is_open())
+        file.close();
+    if (index_file.is_open())
+        index_file.close();
+    if (b_stream_open)
+        stream->flush();
+    b_stream_open = false;
+}
+
+void ProgressFile::open(const string &filename)
+{
+    if (filename == "")
+        return;
+    file.open(filename, ios::out | ios::trunc);
+}
+
+bool ProgressFile::is_open() const
+{
+    return file.is_open();
+}
+
+void ProgressFile::write(const string &event, const vector<pair<string, double>> &fields)
+{
+    if (!file.is_open())
+        return;
+    ostringstream line;
+    line.precision(12);
+    line << "{\"event\": \"" << event << "\"";
+    for (auto &field : fields)
+    {
+        line << ", \"" << field.first << "\": ";
+        if (std::isfinite(field.second))
+            line << field.second;
+        else
+            line << "null";
+    }
+    line << "}\n";
+    file << line.str();
+    file.flush();
+}
+
+void ProgressFile::close()
+{
+    if (file.is_open())
+        file.close();
+}
@@ -0,0 +1,190 @@
+// Licensed under the Apache License, Version 2.0 (the "License"); you may
+// not use this file except in compliance with the License. You may obtain
+// a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+
+#ifndef _OUTPUT_FILES_
+#define _OUTPUT_FILES_
+
+#include <condition_variable>
+#include <deque>
+#include <fstream>
+#include <mutex>
+#include <sstream>
+#include <string>
+#include <thread>
+#include <utility>
+#include <vector>
+
+using namespace std;
+
+// The first bytes of a binary observables file, identifying the format and its version
+const string BINARY_FILE_MAGIC = "LMPOBIN1";
+
+// Written after the magic string, allowing a reader to verify the byte order
+const unsigned int BINARY_FILE_BYTE_ORDER_MARK = 0x01020304;
+
+// The first bytes of the results stream of the stream output format, identifying the format and its version
+const string OUTPUT_STREAM_MAGIC = "LMPOSTR1";
+
+// The maximal number of bytes queued for writing, above which OutputWriter::submit() blocks
+const size_t OUTPUT_WRITER_MAX_QUEUED_BYTES = size_t(1) << 28;
+
+// Writes data to output streams in a background thread, so that the disk I/O of the output files
+// overlaps the computation of the following time steps. The streams are flushed according to the
+// flush policy: after every flush_step output time steps of each file, or only when the files are
+// closed if flush_step is 0.
+class OutputWriter
+{
+  public:
+    OutputWriter(int flush_step = 1);
+    ~OutputWriter();
+
+    // Queue data to be written to a stream, which is flushed afterwards if b_flush is true.
+    // The stream must not be accessed by the caller until wait() returns.
+    void submit(ostream *stream, string &&data, bool b_flush);
+
+    // Wait until all the queued data was written.
+    void wait();
+
+    int get_flush_step() const;
+
+  private:
+    struct Task
+    {
+        ostream *stream;
+        string data;
+        bool b_flush;
+    };
+    void run();
+
+    int flush_step;
+    deque<Task> tasks;
+    size_t queued_bytes;
+    bool b_busy;
+    bool b_stop;
+    mutex tasks_mutex;
+    condition_variable tasks_cv;
+    condition_variable done_cv;
+    thread writer_thread;
+};
+
+// Writes the records of one output type (1-qubit, 2-qubit, 3-qubit, custom observables, or global
+// data) to an observables file, in either a tab-separated text format or a binary format.
+//
+// The text format has a one-line header, followed by lines of the form
+// "time<tab>name<tab>index_1<tab>...<tab>value", with an empty line after each output time step.
+// For data without qubit indices, a space precedes the tab that follows the time.
+// Alongside a text file, an index file (with the file name ending ".idx" replacing ".dat") is
+// written, with a one-line header followed by a line "time<tab>offset<tab>length<tab>rows" for
+// each output time step, giving the byte offset and length of the lines of the time step in the
+// text file (including the empty line ending it), and the number of records.
+// With a compression level larger than 0, the text file is written compressed by zlib, with the
+// file name ending ".dat.gz". The header line and the lines of each output time step are written
+// as separate gzip members (which together form a valid gzip file), and the offsets and lengths
+// in the index file refer to the compressed members, allowing to decompress single time steps.
+//
+// The binary format stores the same fixed set of columns (observables) at every output time step.
+// It starts with a header, consisting of the 8 characters of BINARY_FILE_MAGIC, and the following
+// unsigned 32-bit integers: BINARY_FILE_BYTE_ORDER_MARK, the number of qubit indices of each
+// column, the number of names, and the number of columns. Each name follows as a 32-bit length and
+// its characters, and then each column as a 32-bit name index followed by the 1-based qubit indices
+// (32-bit integers). The header is zero-padded to a multiple of 8 bytes. Then follows one block for
+// each output time step, consisting of the time and the value of each column (64-bit doubles).
+//
+// With the stream output format, the binary format of all output types is written to a single stream
+// (the standard output) instead of files. The stream starts with OUTPUT_STREAM_MAGIC, followed by frames,
+// each consisting of the output type (a 32-bit length followed by its characters), and a 32-bit length
+// followed by that many bytes of data. Concatenating the data of the frames of one output type gives the
+// content of its binary file.
+//
+// The records of each output time step are collected in memory, and written at its end, using
+// the OutputWriter if one is given (and otherwise directly, flushing the file after every step).
+class ObservablesFile
+{
+  public:
+    ObservablesFile(OutputWriter *writer = NULL);
+    ~ObservablesFile();
+
+    // Write to a stream in frames of the stream output format, instead of opening a file in open(). Must be
+    // called before open(), which then writes in the binary format.
+    void set_stream(ostream *stream);
+
+    // Open the file prefix + "." + output_type + ".dat" (or ".bin" in binary format) and write the header.
+    // Records refer to names using their index in the `names` vector. The `columns` vector holds for
+    // each column the name index followed by n_indices qubit indices. In binary format the records
+    // of each time step must be written in the order of the columns. A compression_level between
+    // 1 and 9 writes a text file compressed with zlib (ending ".dat.gz"). If b_append is true, the
+    // records are appended to an existing file (and its index file), whose header is written only if
+    // the file is empty.
+    void open(const string &prefix, const string &output_type, const string &text_header,
+              const vector<string> &names, int n_indices, const vector<long> &columns, bool b_binary,
+              int compression_level = 0, bool b_append = false);
+
+    bool is_open() const;
+
+    // Wait until the completed output time steps are written and flush the files, then write a line
+    // "file = size<tab>name" with the size of the data file, and of the index file (if any).
+    void write_checkpoint(ostream &stream);
+
+    // Write one record, with n_indices (1-based) qubit indices.
+    void write(double t, int name_index, const long *indices, double value);
+
+    // Mark the end of an output time step.
+    void end_step(double t);
+
+    void close();
+
+  private:
+    void write_data(ostream &stream, string &&data, bool b_flush);
+    string compress(const string &data) const;
+
+    OutputWriter *writer;
+    ostream *stream;
+    string output_type;
+    bool b_stream_open;
+    string filename;
+    string index_filename;
+    ofstream file;
+    ofstream index_file;
+    ostringstream step_buffer;
+    streamoff step_offset;
+    long step_rows;
+    long n_steps;
+    vector<string> names;
+    int n_indices;
+    bool b_binary;
+    int compression_level;
+    vector<double> block;
+};
+
+// Writes machine-readable progress events of a simulation to a file, as JSON lines. Each event is a
+// JSON object on a separate line, with an "event" field holding the name of the event, followed by
+// numeric fields (non-finite values are written as null). The file is flushed after every event,
+// so that it can be followed while the simulation runs.
+class ProgressFile
+{
+  public:
+    // Open the file (truncating it). An empty file name leaves the events disabled, and otherwise
+    // is_open() should be checked by the caller.
+    void open(const string &filename);
+
+    bool is_open() const;
+
+    // Write an event with the given numeric fields, if the file is open.
+    void write(const string &event, const vector<pair<string, double>> &fields);
+
+    void close();
+
+  private:
+    ofstream file;
+};
+
+#endif
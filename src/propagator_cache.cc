@@ -0,0 +1,142 @@
+// Licensed under the Apache License, Version 2.0 (the "License"); you may
+// not use this file except in compliance with the License. You may obtain
+// a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+
+#include "propagator_cache.h"
+#include "io_utils.h"
+#include <cstdint>
+#include <cstdio>
+#include <fstream>
+#include <sstream>
+#include <sys/stat.h>
+
+string hash_string(const string &s)
+{
+    uint64_t hash = 14695981039346656037ULL;
+    for (unsigned char c : s)
+    {
+        hash ^= c;
+        hash *= 1099511628211ULL;
+    }
+    char buf[17];
+    snprintf(buf, sizeof(buf), "%016llx", (unsigned long long)hash);
+    return buf;
+}
+
+// Replace the site indices of an MPO (unprimed and primed) or an MPS, read from the cache
+static void replace_site_indices(MPO &mpo, const Pauli &old_sites, const Pauli &sites)
+{
+    for (int j = 1; j <= length(mpo); j++)
+        mpo.ref(j).replaceInds({old_sites(j), prime(old_sites(j))}, {sites(j), prime(sites(j))});
+}
+
+static void replace_site_indices(MPS &state, const Pauli &old_sites, const Pauli &sites)
+{
+    for (int j = 1; j <= length(state); j++)
+        state.ref(j).replaceInds({old_sites(j)}, {sites(j)});
+}
+
+PropagatorCache::PropagatorCache(const string &directory) : directory(directory)
+{
+    if (directory != "")
+        mkdir(directory.c_str(), 0777); // Fails harmlessly if the directory exists
+}
+
+bool PropagatorCache::is_enabled() const
+{
+    return directory != "";
+}
+
+string PropagatorCache::get_prefix(const string &key) const
+{
+    return directory + "/" + hash_string(key);
+}
+
+bool PropagatorCache::read(const string &key, vector<MPO> &mpos, const Pauli &sites) const
+{
+    return read_entry(key, mpos, sites);
+}
+
+bool PropagatorCache::read(const string &key, vector<MPS> &states, const Pauli &sites) const
+{
+    return read_entry(key, states, sites);
+}
+
+void PropagatorCache::write(const string &key, const vector<MPO> &mpos, const Pauli &sites) const
+{
+    write_entry(key, mpos, sites);
+}
+
+void PropagatorCache::write(const string &key, const vector<MPS> &states, const Pauli &sites) const
+{
+    write_entry(key, states, sites);
+}
+
+template <class T> bool PropagatorCache::read_entry(const string &key, vector<T> &entries, const Pauli &sites) const
+{
+    if (!is_enabled())
+        return false;
+    // The key file holds the number of MPOs (or MPSs) and the tag of the files of the entry in the first line,
+    // followed by the key
+    ifstream key_file(get_prefix(key) + ".key");
+    if (!key_file.is_open())
+        return false;
+    int n_entries = 0;
+    string tag;
+    key_file >> n_entries >> tag;
+    key_file.ignore(1);
+    stringstream saved_key;
+    saved_key << key_file.rdbuf();
+    if (n_entries <= 0 || saved_key.str() != key)
+        return false;
+    const string prefix = get_prefix(key) + "." + tag;
+    for (int i = 0; i < n_entries; i++)
+        if (!ifstream(prefix + "." + to_string(i)).good())
+            return false;
+    Pauli old_sites;
+    readFromFile(prefix + ".sites", old_sites);
+    entries.resize(n_entries);
+    for (int i = 0; i < n_entries; i++)
+    {
+        readFromFile(prefix + "." + to_string(i), entries[i]);
+        replace_site_indices(entries[i], old_sites, sites);
+    }
+    return true;
+}
+
+template <class T>
+void PropagatorCache::write_entry(const string &key, const vector<T> &entries, const Pauli &sites) const
+{
+    if (!is_enabled())
+        return;
+    // The files are tagged by the (random) id of the first site index of the simulation, so that simulations
+    // writing the same entry concurrently do not mix their files, which hold different site indices
+    ostringstream tag;
+    tag << hex << sites(1).id();
+    const string key_file_name = get_prefix(key) + ".key";
+    const string temp_file_name = key_file_name + "." + tag.str() + ".tmp";
+    // The key file is written first, verifying that the directory is writable
+    ofstream key_file(temp_file_name);
+    if (!key_file.is_open())
+    {
+        cout2 << "Warning: unable to write to the propagator cache directory " << directory << ".\n";
+        return;
+    }
+    key_file << entries.size() << " " << tag.str() << "\n" << key;
+    key_file.close();
+    const string prefix = get_prefix(key) + "." + tag.str();
+    writeToFile(prefix + ".sites", sites);
+    for (unsigned int i = 0; i < entries.size(); i++)
+        writeToFile(prefix + "." + to_string(i), entries[i]);
+    // The entry becomes visible once the key file is in place
+    if (rename(temp_file_name.c_str(), key_file_name.c_str()) != 0)
+        cout2 << "Warning: unable to write to the propagator cache directory " << directory << ".\n";
+}
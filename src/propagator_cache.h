@@ -0,0 +1,61 @@
+// Licensed under the Apache License, Version 2.0 (the "License"); you may
+// not use this file except in compliance with the License. You may obtain
+// a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+
+#ifndef _PROPAGATOR_CACHE_
+#define _PROPAGATOR_CACHE_
+
+#include "Pauli.h"
+#include "itensor/all.h"
+#include <string>
+#include <vector>
+
+using namespace itensor;
+using namespace std;
+
+// A persistent cache of the MPOs and MPSs that are costly to construct (the propagators exp(t_k * L) of the
+// time evolution, and the projectors of custom observables defined by gates), shared by simulations through
+// a directory. Each entry is addressed by a hash of its key, a string describing everything that the entry
+// depends on. The files of an entry are named by the hash and a tag of the simulation that wrote them,
+// followed by ".sites" for the site indices, and ".0", ".1", ... for the MPOs or MPSs. The file named by the
+// hash followed by ".key" holds the tag and the key itself. It is written last (with a temporary name that is
+// renamed), and its key is compared when reading the entry, so that partially written entries and hash
+// collisions are never used, and simulations may share the cache concurrently.
+// The site indices of an entry are replaced by the site indices of the simulation when the entry is read.
+class PropagatorCache
+{
+  public:
+    // An empty directory disables the cache. The directory is created if it does not exist.
+    PropagatorCache(const string &directory = "");
+
+    bool is_enabled() const;
+
+    // Read the MPOs (or MPSs) of an entry. Returns false if the cache is disabled or the entry is not found.
+    bool read(const string &key, vector<MPO> &mpos, const Pauli &sites) const;
+    bool read(const string &key, vector<MPS> &states, const Pauli &sites) const;
+
+    // Write an entry, if the cache is enabled. A failure to write is reported as a warning. The entry should
+    // be written only after read() returned false, since a replaced entry leaves its files behind.
+    void write(const string &key, const vector<MPO> &mpos, const Pauli &sites) const;
+    void write(const string &key, const vector<MPS> &states, const Pauli &sites) const;
+
+  private:
+    template <class T> bool read_entry(const string &key, vector<T> &entries, const Pauli &sites) const;
+    template <class T> void write_entry(const string &key, const vector<T> &entries, const Pauli &sites) const;
+    string get_prefix(const string &key) const;
+
+    string directory;
+};
+
+// The 64-bit FNV-1a hash of a string, as 16 hexadecimal digits.
+string hash_string(const string &s);
+
+#endif
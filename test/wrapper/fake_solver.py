@@ -0,0 +1,260 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+A fake solver executable, and a base class of the tests running simulations with it.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from lindbladmpo.SolverPool import SolverPool
+
+FAKE_SOLVER_BEHAVIORS = {
+    "ok": "writes the process id, N and the number of threads to the global output file, "
+    "and progress events if a progress file is given",
+    "fail": "writes the output files as 'ok', and returns the exit code 2",
+    "crash": "exits with the exit code 3 without writing any output, also in the serve mode",
+    "invalid": "prints an error (in a line starting with the serve done marker, which must not be "
+    "taken for it) and exits with the exit code 1, or reports it and continues in the serve mode",
+    "hang": "prints its process id and sleeps for a minute",
+    "step_hang": "writes the first output time step, and sleeps for a minute",
+    "trace_drift": "writes progress events with an increasing trace, and sleeps for a minute",
+    "bond_saturation": "writes progress events at the maximal bond dimension, and sleeps "
+    "for a minute",
+    "checkpoint": "writes the step index at each time step with periodic checkpoints, "
+    "failing at step 7 unless appending to the output files (when resumed)",
+}
+"""The behaviors of the fake solver, selected for each simulation by its number of qubits."""
+
+FAKE_SOLVER = """# A fake solver, whose behavior for each value of N is given in the command line
+import os
+import signal
+import struct
+import sys
+import time
+
+s_output_prefix = ""
+
+
+def stop(signum, frame):
+    with open(s_output_prefix + ".global.dat", "w") as file:
+        file.write("#time\\tquantity\\tvalue\\n0\\tstopped\\t1\\n\\n")
+    sys.exit(3)
+
+
+def get_binary_data(n_indices, names, columns, blocks):
+    data = b"LMPOBIN1" + struct.pack("=4I", 0x01020304, n_indices, len(names), len(columns))
+    for name in names:
+        data += struct.pack("=I", len(name)) + name.encode()
+    for column in columns:
+        data += struct.pack("=" + str(len(column)) + "i", *column)
+    data += bytes((8 - len(data) % 8) % 8)
+    for block in blocks:
+        data += struct.pack("=" + str(len(block)) + "d", *block)
+    return data
+
+
+class LogOutput:
+    # The console output in the serve mode, with the log prefix at the start of every line
+    def __init__(self, stream):
+        self.stream = stream
+        self.b_line_start = True
+
+    def write(self, s):
+        for s_part in s.splitlines(True):
+            if self.b_line_start:
+                self.stream.write("{s_log_prefix}")
+            self.stream.write(s_part)
+            self.b_line_start = s_part.endswith("\\n")
+        return len(s)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def write_frame(output_type, data):
+    sys.stdout.buffer.write(struct.pack("=I", len(output_type)) + output_type.encode())
+    sys.stdout.buffer.write(struct.pack("=I", len(data)) + data)
+
+
+def run_stdin():
+    # Reads the parameters from the standard input, and writes a results stream
+    parameters = {{}}
+    for s_line in sys.stdin:
+        if " = " in s_line:
+            key, value = s_line.split(" = ", 1)
+            parameters[key] = value.strip()
+    print("Reading parameters from the standard input", file=sys.stderr)
+    if parameters["output_format"] != "stream" or parameters["b_log_file"] != "0":
+        return 1
+    sys.stdout.buffer.write(b"LMPOSTR1")
+    write_frame("global", get_binary_data(0, ["N"], [(0,)], [(0.0, float(parameters["N"]))]))
+    write_frame("obs-1q", get_binary_data(1, ["Z"], [(0, 1), (0, 2)], []))
+    for n in range(3):
+        write_frame("obs-1q", struct.pack("=3d", 0.1 * n, n, -n))
+    sys.stdout.flush()
+    return 0
+
+
+def run_checkpointed(parameters):
+    t_0 = float(parameters.get("t_init", "0"))
+    tau = float(parameters["tau"])
+    n_steps = int(round((float(parameters["t_final"]) - t_0) / tau))
+    n_checkpoint_step = int(parameters.get("checkpoint_step", "0"))
+    n_initial_step = int(parameters.get("initial_step", "0"))
+    b_append = parameters.get("b_append_output", "0") == "1"
+    s_file = s_output_prefix + ".global.dat"
+    with open(s_file, "a" if b_append else "w") as file:
+        if file.tell() == 0:
+            file.write("#time\\tquantity\\tvalue\\n")
+        for n in range(n_steps + 1):
+            t = t_0 + n * tau
+            n_abs = n_initial_step + n
+            if n_checkpoint_step and n and (n_abs % n_checkpoint_step == 0 or n == n_steps):
+                file.flush()
+                with open(s_output_prefix + ".checkpoint.txt", "w") as checkpoint:
+                    checkpoint.write("t = " + repr(t) + "\\nstep = " + str(n_abs) + "\\n")
+                    checkpoint.write("state_prefix = " + s_output_prefix + ".checkpoint0\\n")
+                    checkpoint.write("file = " + str(file.tell()) + "\\t" + s_file + "\\n")
+            if n_abs == 7 and not b_append:
+                file.write(str(t) + "\\tst")
+                return 1
+            file.write(str(t) + "\\tstep\\t" + str(n_abs) + "\\n\\n")
+    return 0
+
+
+def run(s_input_file, s_progress_file=""):
+    global s_output_prefix
+    parameters = {{"progress_file": s_progress_file}}
+    with open(s_input_file) as file:
+        for s_line in file:
+            if " = " in s_line:
+                key, value = s_line.split(" = ", 1)
+                parameters[key] = value.strip()
+    print("Reading parameters from the file " + s_input_file, flush=True)
+    s_output_prefix = parameters["output_files_prefix"]
+    s_behavior = behaviors.get(parameters["N"], "ok")
+    if s_behavior == "crash":
+        os._exit(3)
+    if s_behavior == "invalid":
+        print("{s_marker}\\t0 is not written, since the parameters are invalid.")
+        sys.exit(1)
+    if s_behavior in ("trace_drift", "bond_saturation"):
+        with open(parameters["progress_file"], "w") as file:
+            for n in range(5):
+                f_trace = 1.0 + 0.1 * n if s_behavior == "trace_drift" else 1.0
+                file.write('{{"event": "evolve", "step": ' + str(n + 1) + ', "t": ' + str(n + 1))
+                file.write(', "tr_rho": ' + str(f_trace) + ', "max_bond_dim": 4}}\\n')
+        time.sleep(60)
+    if s_behavior == "checkpoint":
+        return run_checkpointed(parameters)
+    if s_behavior == "step_hang":
+        with open(s_output_prefix + ".global.dat", "w") as file:
+            file.write("#time\\tquantity\\tvalue\\n0\\tN\\t" + parameters["N"] + "\\n\\n")
+        time.sleep(60)
+    if s_behavior == "hang":
+        print("pid " + str(os.getpid()), flush=True)
+        time.sleep(60)
+    with open(parameters["output_files_prefix"] + ".global.dat", "w") as file:
+        file.write("#time\\tquantity\\tvalue\\n")
+        file.write("0\\tpid\\t" + str(os.getpid()) + "\\n")
+        file.write("0\\tthreads\\t" + os.environ.get("OMP_NUM_THREADS", "0") + "\\n")
+        file.write("0\\tN\\t" + parameters["N"] + "\\n\\n")
+    if parameters["progress_file"]:
+        with open(parameters["progress_file"], "w") as file:
+            file.write('{{"event": "start", "N": ' + parameters["N"] + '}}\\n')
+            for n in range(3):
+                file.flush()
+                time.sleep(0.01)
+                file.write('{{"event": "evolve", "step": ' + str(n + 1) + '}}\\n')
+            file.write('{{"event": "end"}}\\n')
+    return 2 if s_behavior == "fail" else 0
+
+
+# The first arguments are "--behaviors N1=BEHAVIOR1,N2=BEHAVIOR2,...", followed by those of the solver
+behaviors = dict(s_item.split("=") for s_item in sys.argv[2].split(",") if s_item)
+argv = sys.argv[3:]
+signal.signal(signal.SIGTERM, stop)
+if argv == ["--stdin"]:
+    sys.exit(run_stdin())
+if argv != ["--serve"]:
+    options = dict(zip(argv[0::2], argv[1::2]))
+    sys.exit(run(options["input_file"], options.get("progress_file", "")))
+serve_out = sys.stdout
+sys.stdout = sys.stderr = LogOutput(serve_out)
+for line in sys.stdin:
+    if line.strip():
+        try:
+            exit_code = run(line.strip())
+        except SystemExit as e:
+            exit_code = e.code or 1
+        sys.stdout.flush()
+        serve_out.write("{s_marker}\\t" + str(exit_code) + "\\n")
+        serve_out.flush()
+"""
+
+
+class FakeSolverTestCase(unittest.TestCase):
+    """Base class of the tests running simulations with the fake solver, in a temporary directory.
+
+    The fake solver is a Python script, which is executed by the running Python interpreter
+    (rather than as an executable), so that the tests run also on Windows.
+    """
+
+    BEHAVIORS = {}
+    """Maps the number of qubits of a simulation to the behavior of the fake solver running it,
+    one of FAKE_SOLVER_BEHAVIORS. The behavior is "ok" for any other number of qubits."""
+
+    def setUp(self):
+        for s_behavior in self.BEHAVIORS.values():
+            self.assertIn(s_behavior, FAKE_SOLVER_BEHAVIORS)
+        self.s_temp_dir = tempfile.mkdtemp()
+        self.s_solver_path = os.path.join(self.s_temp_dir, "fake_solver.py")
+        with open(self.s_solver_path, "w") as file:
+            file.write(
+                FAKE_SOLVER.format(
+                    s_marker=SolverPool.SERVE_DONE_MARKER,
+                    s_log_prefix=SolverPool.SERVE_LOG_PREFIX,
+                )
+            )
+        s_behaviors = ",".join(
+            f"{n_qubits}={s_behavior}"
+            for n_qubits, s_behavior in self.BEHAVIORS.items()
+        )
+        get_solver_command = LindbladMPOSolver._get_solver_command
+
+        def get_fake_solver_command(*args, **kwargs):
+            command = get_solver_command(*args, **kwargs)
+            return [sys.executable, command[0], "--behaviors", s_behaviors] + command[
+                1:
+            ]
+
+        patcher = mock.patch.object(
+            LindbladMPOSolver,
+            "_get_solver_command",
+            staticmethod(get_fake_solver_command),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.s_temp_dir)
+
+    def get_parameters(self, n_qubits: int, i_run: int) -> dict:
+        """Returns the parameters of a short run writing its output into the temporary directory."""
+        return {
+            "N": n_qubits,
+            "t_final": 1.0,
+            "tau": 0.1,
+            "output_files_prefix": os.path.join(self.s_temp_dir, f"run{i_run}"),
+        }
@@ -11,8 +11,11 @@ Tests of the solver parameters handling.
 """
 
 import unittest
+from unittest import mock
 import numpy as np
+import scipy.sparse
 from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from lindbladmpo.ParameterSchema import ParameterSchema
 
 # Defaults that should not interfere with the parameters check, are added just so we don't fail
 # due to them being required arguments (don't have default values):
@@ -195,6 +198,30 @@ class LindbladMPOSolverTestArguments(unittest.TestCase):
         out = LindbladMPOSolver.verify_parameters(parameters)
         self.assertEqual(expected, out)
 
+    def test_arg_output_flush_step_F1(self):
+        """Argument test."""
+        parameters = {
+            "output_flush_step": -1,
+            "N": DEFAULT_N,
+            "t_final": DEFAULT_T_FINAL,
+            "tau": DEFAULT_TAU,
+        }
+        expected = ""
+        out = LindbladMPOSolver.verify_parameters(parameters)
+        self.assertNotEqual(expected, out)
+
+    def test_arg_output_flush_step_P(self):
+        """Argument test."""
+        parameters = {
+            "output_flush_step": 0,
+            "N": DEFAULT_N,
+            "t_final": DEFAULT_T_FINAL,
+            "tau": DEFAULT_TAU,
+        }
+        expected = ""
+        out = LindbladMPOSolver.verify_parameters(parameters)
+        self.assertEqual(expected, out)
+
     def test_arg_h_x_F1(self):
         """Argument test."""
         parameters = {
@@ -462,6 +489,150 @@ class LindbladMPOSolverTestArguments(unittest.TestCase):
         out = LindbladMPOSolver.verify_parameters(parameters)
         self.assertEqual(expected, out)
 
+    def test_arg_J_P_6(self):
+        """Argument test."""
+        parameters = {
+            "N": 5,
+            "J_z": scipy.sparse.diags([1.0, 2.0, 3.0, 4.0], 1, shape=(5, 5)),
+            "J": [(0, 1, 1.0), (3, 4, -0.5)],
+            "t_final": DEFAULT_T_FINAL,
+            "tau": DEFAULT_TAU,
+        }
+        expected = ""
+        out = LindbladMPOSolver.verify_parameters(parameters)
+        self.assertEqual(expected, out)
+
+    def test_arg_J_F7(self):
+        """Argument test."""
+        parameters = {
+            "N": 5,
+            "J": [(0, 1, 1.0), (3, 5, -0.5)],
+            "t_final": DEFAULT_T_FINAL,
+            "tau": DEFAULT_TAU,
+        }
+        self.assertIn("Error 337", LindbladMPOSolver.verify_parameters(parameters))
+        parameters["J"] = [(0, 1, 1.0), (3, 4)]
+        self.assertIn("Error 335", LindbladMPOSolver.verify_parameters(parameters))
+        parameters["J"] = [(0, 1, 1.0), (3, 4, "1")]
+        self.assertIn("Error 336", LindbladMPOSolver.verify_parameters(parameters))
+
+    def test_arg_J_F8(self):
+        """Argument test."""
+        parameters = {
+            "N": 5,
+            "J": scipy.sparse.eye(4, format="csr"),
+            "t_final": DEFAULT_T_FINAL,
+            "tau": DEFAULT_TAU,
+        }
+        self.assertIn("Error 320", LindbladMPOSolver.verify_parameters(parameters))
+
+    def test_verify_memoization(self):
+        """Test that only parameters whose values changed are validated again."""
+        with mock.patch.object(
+            ParameterSchema,
+            "_validate_site_vector",
+            wraps=ParameterSchema._validate_site_vector,
+        ) as validator:
+            schema = ParameterSchema(
+                {
+                    "N": ("int", {"type_code": 120, "range_code": 130, "n_min": 1}),
+                    ("t_final", "tau"): ("time", {}),
+                    ("h_x", "h_z"): ("site_vector", {"depends": ("N",)}),
+                }
+            )
+            parameters = {"N": 3, "t_final": 1.0, "tau": 0.1, "h_x": [1, 2, 3]}
+            parameters["h_z"] = np.zeros(3)
+            self.assertEqual(schema.verify(parameters), "")
+            self.assertEqual(validator.call_count, 2)
+            self.assertEqual(schema.verify(dict(parameters)), "")
+            self.assertEqual(validator.call_count, 2)
+            parameters["h_z"] = np.ones(3)
+            self.assertEqual(schema.verify(parameters), "")
+            self.assertEqual(validator.call_count, 3)
+            parameters["h_x"] = [1, 2, "3"]
+            self.assertIn("Error 220", schema.verify(parameters))
+            self.assertEqual(validator.call_count, 4)
+            parameters["N"] = 4
+            self.assertIn("Error 210", schema.verify(parameters))
+            self.assertEqual(validator.call_count, 6)
+        fingerprints = {ParameterSchema.get_fingerprint(v) for v in [1, 1.0, True, "1"]}
+        self.assertEqual(len(fingerprints), 4)
+
+    def test_verify_fingerprints(self):
+        """Test that values modified in place are validated again, and immutable values shared by
+        the dictionaries of a sweep are fingerprinted once."""
+        schema = ParameterSchema(
+            {
+                "N": ("int", {"type_code": 120, "range_code": 130, "n_min": 1}),
+                ("t_final", "tau"): ("time", {}),
+                ("h_x", "h_z"): ("site_vector", {"depends": ("N",)}),
+            }
+        )
+        parameters = {"N": 3, "t_final": 1.0, "tau": 0.1, "h_x": [0.1, 0.2, 0.3]}
+        self.assertEqual(schema.verify(parameters), "")
+        parameters["h_x"][1] = "bad"
+        self.assertIn("Error 220", schema.verify(parameters))
+
+        h_x = np.arange(3.0)
+        h_x.flags.writeable = False
+        h_z = np.ones(3)
+        h_z.flags.writeable = False
+        with mock.patch.object(
+            ParameterSchema, "get_fingerprint", wraps=ParameterSchema.get_fingerprint
+        ) as get_fingerprint:
+            for n in range(10):
+                parameters = {
+                    "N": 3,
+                    "t_final": 1.0,
+                    "tau": 0.1 * (n + 1),
+                    "h_x": h_x,
+                    "h_z": h_z,
+                }
+                self.assertEqual(schema.verify(parameters), "")
+            self.assertEqual(get_fingerprint.call_count, 2)
+            # A list and a writeable array are fingerprinted at every verification
+            parameters["h_x"] = list(h_x)
+            parameters["h_z"] = np.ones(3)
+            for _ in range(2):
+                self.assertEqual(schema.verify(parameters), "")
+            self.assertEqual(get_fingerprint.call_count, 6)
+        self.assertTrue(ParameterSchema._is_immutable((1, (2.0, "a"), None)))
+        self.assertFalse(ParameterSchema._is_immutable((1, [2.0])))
+        view = np.ones(3)[:2]
+        view.flags.writeable = False
+        self.assertFalse(ParameterSchema._is_immutable(view))
+
+    def test_J_formats(self):
+        """Test that dense, sparse and edge list couplings are written identically."""
+        n_qubits = 6
+        dense_J = np.zeros((n_qubits, n_qubits))
+        dense_J_z = np.zeros((n_qubits, n_qubits))
+        edges = []
+        for i in range(n_qubits - 1):
+            dense_J[i, i + 1] = 0.5 + i
+            edges.append((i, i + 1, 0.5 + i))
+        dense_J_z[4, 0] = -2.0
+        parameters = {"N": n_qubits, "t_final": 1.0, "tau": 0.1}
+        s_dense = LindbladMPOSolver(
+            dict(parameters, J=dense_J, J_z=dense_J_z)
+        )._build_input()
+        self.assertIn("first_bond_indices = 1,2,3,4,5,5\n", s_dense)
+        self.assertIn("second_bond_indices = 2,3,4,5,1,6\n", s_dense)
+        self.assertIn("J = 0.5,1.5,2.5,3.5,0.0,4.5\n", s_dense)
+        self.assertIn("J_z = 0.0,0.0,0.0,0.0,-2.0,0.0\n", s_dense)
+        s_sparse = LindbladMPOSolver(
+            dict(
+                parameters,
+                J=scipy.sparse.csr_matrix(dense_J),
+                J_z=dense_J_z.tolist(),
+            )
+        )._build_input()
+        self.assertEqual(s_sparse, s_dense)
+        s_edges = LindbladMPOSolver(
+            dict(parameters, J=edges[::-1], J_z=[(4, 0, -1.5), (4, 0, -0.5)])
+        )._build_input()
+        self.assertEqual(s_edges, s_dense)
+
     def test_arg_J_P_5(self):
         """Argument test."""
         parameters = {
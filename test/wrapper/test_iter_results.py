@@ -0,0 +1,53 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of iterating over the results of a running simulation, with a fake solver executable.
+"""
+
+import os
+import time
+import unittest
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from .fake_solver import FakeSolverTestCase
+
+
+class LindbladMPOSolverTestIterResults(FakeSolverTestCase):
+    """This class tests following the output of the solver while it runs."""
+
+    BEHAVIORS = {3: "fail", 7: "step_hang"}
+
+    def test_iter_results(self):
+        """Test that the output time steps are yielded, and the results loaded at the end."""
+        solver = LindbladMPOSolver(self.get_parameters(5, 0), "", self.s_solver_path)
+        steps = list(solver.iter_results(0.01))
+        self.assertEqual([t for t, _ in steps], [0.0])
+        self.assertEqual(steps[0][1]["global"][("n", ())][1], [5.0])
+        self.assertEqual(solver.result["global"][("n", ())][1], [5.0])
+        solver = LindbladMPOSolver(self.get_parameters(3, 1), "", self.s_solver_path)
+        with self.assertRaises(Exception):
+            list(solver.iter_results(0.01))
+
+    @unittest.skipIf(os.name == "nt", "checks that the solver handled SIGTERM")
+    def test_iter_results_close(self):
+        """Test that closing the iteration before the solver ends stops the solver."""
+        solver = LindbladMPOSolver(self.get_parameters(7, 0), "", self.s_solver_path)
+        iterator = solver.iter_results(0.01)
+        f_start_time = time.time()
+        t, result = next(iterator)
+        self.assertEqual(t, 0.0)
+        self.assertEqual(result["global"][("n", ())][1], [7.0])
+        iterator.close()
+        self.assertLess(time.time() - f_start_time, 30.0)
+        self.assertEqual(solver.result, {})
+        with open(solver.s_output_path + ".global.dat") as file:
+            self.assertIn("stopped", file.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of the job queue and its workers, with a fake solver executable.
+"""
+
+import concurrent.futures
+import os
+import time
+import unittest
+from unittest import mock
+from lindbladmpo.JobQueue import JobQueue, main as worker_main
+from .fake_solver import FakeSolverTestCase
+
+
+class LindbladMPOSolverTestJobQueue(FakeSolverTestCase):
+    """This class tests running the jobs of a queue by concurrent workers."""
+
+    BEHAVIORS = {3: "fail"}
+
+    def test_job_queue_workers(self):
+        """Test that concurrent workers run each job of the queue once, isolating failures."""
+        job_queue = JobQueue(os.path.join(self.s_temp_dir, "spool"))
+        job_ids = [
+            job_queue.submit(self.get_parameters(n_qubits, i_run))
+            for i_run, n_qubits in enumerate([2, 2, 3, 2, 5, 2])
+        ]
+        self.assertEqual(job_queue.get_jobs("pending"), job_ids)
+        with concurrent.futures.ThreadPoolExecutor(3) as executor:
+            futures = [
+                executor.submit(job_queue.work, "", self.s_solver_path)
+                for _ in range(3)
+            ]
+            n_jobs = sum(future.result() for future in futures)
+        self.assertEqual(n_jobs, 6)
+        self.assertEqual(
+            job_queue.status(), {"pending": 0, "running": 0, "done": 5, "failed": 1}
+        )
+        self.assertEqual(job_queue.get_jobs("failed"), [job_ids[2]])
+        self.assertEqual(
+            job_queue.load_result(job_ids[4])["global"][("n", ())][1], [5.0]
+        )
+        with self.assertRaises(Exception):
+            job_queue.load_result(job_ids[2])
+        self.assertEqual(job_queue.retry_failed(), [job_ids[2]])
+        self.assertEqual(job_queue.get_jobs("pending"), [job_ids[2]])
+
+    def test_job_queue_stale(self):
+        """Test that a running job without heartbeats is reclaimed and run by a worker."""
+        s_directory = os.path.join(self.s_temp_dir, "spool")
+        job_queue = JobQueue(s_directory)
+        s_job_id = job_queue.submit(self.get_parameters(2, 0), "job")
+        self.assertEqual(job_queue.claim(), s_job_id)
+        self.assertIsNone(job_queue.claim())
+        self.assertEqual(job_queue.reclaim_stale(60.0), [])
+        f_time = time.time() - 100
+        os.utime(
+            os.path.join(s_directory, "running", "job.input.txt"), (f_time, f_time)
+        )
+        worker_main(
+            [
+                s_directory,
+                "--solver-path",
+                self.s_solver_path,
+                "--cygwin-path",
+                "",
+                "--stale-timeout",
+                "60",
+            ]
+        )
+        self.assertEqual(job_queue.get_jobs("done"), [s_job_id])
+        self.assertFalse(job_queue.complete(s_job_id))
+
+        # The job was run again with a new output path, since the stale solver may still be running
+        s_output_path = job_queue.get_output_path(s_job_id)
+        self.assertTrue(
+            s_output_path.startswith(
+                os.path.join(self.s_temp_dir, "run0") + JobQueue.RETRY_SUFFIX
+            )
+        )
+        self.assertTrue(os.path.isfile(s_output_path + ".global.dat"))
+        self.assertEqual(job_queue.load_result(s_job_id)["global"][("n", ())][1], [2.0])
+
+    def test_job_queue_reclaim(self):
+        """Test that a job is reclaimed only while stale, also if its reclaiming worker failed."""
+        s_directory = os.path.join(self.s_temp_dir, "spool")
+        job_queue = JobQueue(s_directory)
+        s_job_id = job_queue.submit(self.get_parameters(2, 0), "job")
+        job_queue.claim()
+        s_running_file = os.path.join(s_directory, "running", "job.input.txt")
+        f_time = time.time() - 100
+        os.utime(s_running_file, (f_time, f_time))
+
+        # A heartbeat given after the job was found stale keeps it running
+        getmtime = os.path.getmtime
+        with mock.patch(
+            "os.path.getmtime",
+            side_effect=[f_time, time.time()],
+        ):
+            self.assertEqual(job_queue.reclaim_stale(60.0), [])
+        self.assertEqual(job_queue.get_jobs("running"), [s_job_id])
+        self.assertEqual(getmtime(s_running_file), f_time)
+
+        # A job left by a worker that failed while reclaiming it is reclaimed again
+        s_reclaim_file = s_running_file + ".0123abcd" + JobQueue.RECLAIM_SUFFIX
+        os.rename(s_running_file, s_reclaim_file)
+        self.assertEqual(job_queue.reclaim_stale(60.0), [s_job_id])
+        self.assertEqual(os.listdir(os.path.join(s_directory, "running")), [])
+        s_output_path = job_queue.get_output_path(s_job_id)
+        self.assertIn(JobQueue.RETRY_SUFFIX, s_output_path)
+
+        # A job reclaimed again gets a new output path, from its original one
+        job_queue.claim()
+        os.utime(s_running_file, (f_time, f_time))
+        self.assertEqual(job_queue.reclaim_stale(60.0), [s_job_id])
+        s_new_output_path = job_queue.get_output_path(s_job_id)
+        self.assertNotEqual(s_new_output_path, s_output_path)
+        self.assertEqual(s_new_output_path.count(JobQueue.RETRY_SUFFIX), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
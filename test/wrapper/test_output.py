@@ -0,0 +1,535 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of the loading of solver output files.
+"""
+
+import gzip
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+import numpy as np
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from lindbladmpo.ResultStore import ResultStore
+from lindbladmpo.plot_routines import prepare_2q_correlation_matrix
+
+N_OUTPUT_STEPS = 4
+N_QUBITS = 3
+TAU = 0.25
+
+
+def write_output_files(s_output_path: str, s_partial_line: str = ""):
+    """Writes output files in the format of the solver, for a fictitious simulation."""
+    with open(s_output_path + ".obs-1q.dat", "w") as file:
+        file.write("#time\toperator\tindex\tvalue\n")
+        for n in range(N_OUTPUT_STEPS):
+            for i in range(1, N_QUBITS + 1):
+                for s_op in ["X", "Z"]:
+                    file.write(f"{n * TAU}\t{s_op}\t{i}\t{0.1 * i + n}\n")
+            file.write("\n")
+    with open(s_output_path + ".obs-2q.dat", "w") as file:
+        file.write("#time\toperator\tindex_1\tindex_2\tvalue\n")
+        for n in range(N_OUTPUT_STEPS):
+            for i in range(1, N_QUBITS + 1):
+                for j in range(1, N_QUBITS + 1):
+                    if i != j:
+                        file.write(f"{n * TAU}\tZZ\t{i}\t{j}\t{i - j + 0.5 * n}\n")
+            file.write("\n")
+        file.write(s_partial_line)
+    with open(s_output_path + ".global.dat", "w") as file:
+        file.write("#time\tquantity\tvalue\n")
+        for n in range(N_OUTPUT_STEPS):
+            file.write(f"{n * TAU} \ttr_rho\t1\n")
+            file.write(f"{n * TAU} \tmax_bond_dim\t{n + 1}\n")
+            file.write("\n")
+
+
+def write_binary_file(
+    s_filename: str, ops: list, columns: list, blocks: np.ndarray, n_indices: int
+):
+    """Writes an output file in the binary format of the solver."""
+    with open(s_filename, "wb") as file:
+        file.write(LindbladMPOSolver.BINARY_FILE_MAGIC)
+        file.write(struct.pack("<4I", 0x01020304, n_indices, len(ops), len(columns)))
+        for s_op in ops:
+            file.write(struct.pack("<I", len(s_op)) + s_op.encode())
+        file.write(np.asarray(columns, dtype="<i4").tobytes())
+        file.write(b"\0" * ((8 - file.tell() % 8) % 8))
+        file.write(np.asarray(blocks, dtype="<f8").tobytes())
+
+
+def compress_output_file(s_filename: str):
+    """Replaces an output file in the text format by a compressed file as written by the solver,
+    with the header and each time step compressed as a separate gzip member."""
+    with open(s_filename, "rb") as file:
+        s_header = file.readline()
+        s_data = file.read()
+    with open(s_filename + ".gz", "wb") as file:
+        file.write(gzip.compress(s_header))
+        for s_block in s_data.split(b"\n\n")[:-1]:
+            file.write(gzip.compress(s_block + b"\n\n"))
+    os.remove(s_filename)
+
+
+class LindbladMPOSolverTestOutput(unittest.TestCase):
+    """This class tests the loading of the solver output files."""
+
+    def setUp(self):
+        self.s_dir = tempfile.mkdtemp()
+        self.s_output_path = os.path.join(self.s_dir, "test")
+
+    def tearDown(self):
+        shutil.rmtree(self.s_dir)
+
+    def test_load_output_keys(self):
+        """Test the keys and their order in the loaded result."""
+        write_output_files(self.s_output_path)
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        self.assertEqual(
+            list(result["obs-1q"].keys()),
+            [(s_op, (i,)) for i in range(N_QUBITS) for s_op in ["x", "z"]],
+        )
+        self.assertEqual(len(result["obs-2q"]), N_QUBITS * (N_QUBITS - 1))
+        self.assertEqual(
+            list(result["global"].keys()), [("tr_rho", ()), ("max_bond_dim", ())]
+        )
+        self.assertEqual(len(result["obs-3q"]), 0)
+        self.assertEqual(len(result["obs-cu"]), 0)
+
+    def test_load_output_values(self):
+        """Test the times and values in the loaded result."""
+        write_output_files(self.s_output_path)
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        times = [n * TAU for n in range(N_OUTPUT_STEPS)]
+        obs_data = result["obs-1q"][("z", (1,))]
+        self.assertEqual(obs_data[0], times)
+        np.testing.assert_allclose(
+            obs_data[1], [0.2 + n for n in range(N_OUTPUT_STEPS)]
+        )
+        obs_data = result["obs-2q"][("zz", (2, 0))]
+        self.assertEqual(obs_data[0], times)
+        np.testing.assert_allclose(
+            obs_data[1], [2 + 0.5 * n for n in range(N_OUTPUT_STEPS)]
+        )
+        obs_data = result["global"][("max_bond_dim", ())]
+        self.assertEqual(obs_data[1], [1.0, 2.0, 3.0, 4.0])
+
+    def test_load_output_partial_line(self):
+        """Test that a partially written last line of a file is skipped."""
+        write_output_files(self.s_output_path, "1.0\tZZ\t1\t")
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        self.assertEqual(len(result["obs-2q"][("zz", (0, 1))][0]), N_OUTPUT_STEPS)
+
+    def test_load_output_malformed_line(self):
+        """Test that a malformed line other than a partially written last line raises."""
+        write_output_files(self.s_output_path, "1.0\tZZ\t1\t\n1.0\tZZ\t1\t2\t0.5\n\n")
+        with self.assertRaises(Exception):
+            LindbladMPOSolver.load_output(self.s_output_path)
+        write_output_files(self.s_output_path, "1.0\tZZ\t1\t2\tvalue\n")
+        with self.assertRaises(Exception):
+            LindbladMPOSolver.load_output(self.s_output_path)
+
+    def test_load_output_step_order(self):
+        """Test that time steps holding the observables in a different order are loaded."""
+        with open(self.s_output_path + ".obs-1q.dat", "w") as file:
+            file.write("#time\toperator\tindex\tvalue\n")
+            file.write("0\tX\t1\t0.5\n0\tZ\t2\t-1e-05\n\n")
+            file.write("0.25\tZ\t2\t1.5\n0.25\tX\t1\t2\n\n")
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        self.assertEqual(result["obs-1q"][("x", (0,))], ([0.0, 0.25], [0.5, 2.0]))
+        self.assertEqual(result["obs-1q"][("z", (1,))], ([0.0, 0.25], [-1e-05, 1.5]))
+
+    def test_load_output_chunks(self):
+        """Test that parsing a file in multiple chunks gives the same result."""
+        write_output_files(self.s_output_path)
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        n_chunk_size = LindbladMPOSolver.DATA_FILE_CHUNK_SIZE
+        try:
+            LindbladMPOSolver.DATA_FILE_CHUNK_SIZE = 50
+            chunked_result = LindbladMPOSolver.load_output(
+                self.s_output_path, b_use_cache=False
+            )
+        finally:
+            LindbladMPOSolver.DATA_FILE_CHUNK_SIZE = n_chunk_size
+        self.assertEqual(result, chunked_result)
+
+    def test_load_binary_output(self):
+        """Test that an output file in the binary format is loaded like the text format."""
+        write_output_files(self.s_output_path)
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        columns = [
+            [0, i, j]
+            for i in range(1, N_QUBITS + 1)
+            for j in range(1, N_QUBITS + 1)
+            if i != j
+        ]
+        blocks = [
+            [n * TAU] + [i - j + 0.5 * n for _, i, j in columns]
+            for n in range(N_OUTPUT_STEPS)
+        ]
+        s_filename = self.s_output_path + ".obs-2q.bin"
+        write_binary_file(s_filename, ["ZZ"], columns, blocks, 2)
+        # A partially written last step is ignored
+        with open(s_filename, "ab") as file:
+            file.write(b"\0" * 20)
+        binary_result = LindbladMPOSolver.load_output(self.s_output_path)
+        self.assertEqual(
+            list(binary_result["obs-2q"].keys()), list(result["obs-2q"].keys())
+        )
+        self.assertEqual(binary_result["obs-2q"], result["obs-2q"])
+
+    def test_verify_output_format(self):
+        """Test the verification of the output format parameter."""
+        parameters = {"N": N_QUBITS, "t_final": 1.0, "tau": TAU}
+        self.assertEqual(
+            LindbladMPOSolver.verify_parameters(
+                dict(parameters, output_format="binary")
+            ),
+            "",
+        )
+        self.assertIn(
+            "Error 426",
+            LindbladMPOSolver.verify_parameters(dict(parameters, output_format="csv")),
+        )
+
+    def test_verify_output_compression(self):
+        """Test the verification of the output compression parameter."""
+        parameters = {"N": N_QUBITS, "t_final": 1.0, "tau": TAU}
+        self.assertEqual(
+            LindbladMPOSolver.verify_parameters(dict(parameters, output_compression=6)),
+            "",
+        )
+        self.assertIn(
+            "Error 427",
+            LindbladMPOSolver.verify_parameters(
+                dict(parameters, output_compression=10)
+            ),
+        )
+        self.assertIn(
+            "Error 428",
+            LindbladMPOSolver.verify_parameters(
+                dict(parameters, output_format="binary", output_compression=1)
+            ),
+        )
+
+    def test_load_compressed_output(self):
+        """Test loading, filtering and following compressed output files."""
+        write_output_files(self.s_output_path)
+        result = LindbladMPOSolver.load_output(self.s_output_path, b_use_cache=False)
+        for s_output_type in ["obs-1q", "obs-2q", "global"]:
+            compress_output_file(self.s_output_path + f".{s_output_type}.dat")
+        compressed_result = LindbladMPOSolver.load_output(
+            self.s_output_path, b_use_cache=False
+        )
+        self.assertEqual(compressed_result, result)
+        filtered_result = LindbladMPOSolver.load_output(
+            self.s_output_path, t_range=(TAU, 2 * TAU), b_use_cache=False
+        )
+        self.assertTrue(os.path.isfile(self.s_output_path + ".obs-2q.idx"))
+        for key, (times, values) in filtered_result["obs-2q"].items():
+            self.assertEqual(times, [TAU, 2 * TAU])
+            self.assertEqual(values, result["obs-2q"][key][1][1:3])
+        n_part_size = LindbladMPOSolver.DATA_FILE_MIN_PART_SIZE
+        try:
+            LindbladMPOSolver.DATA_FILE_MIN_PART_SIZE = 64
+            parts = LindbladMPOSolver._split_data_file_range(
+                self.s_output_path + ".obs-2q.dat.gz", 0, None, 8
+            )
+        finally:
+            LindbladMPOSolver.DATA_FILE_MIN_PART_SIZE = n_part_size
+        self.assertGreater(len(parts), 1)
+        for n_start, n_end in parts:
+            columns = LindbladMPOSolver._parse_data_range(
+                self.s_output_path + ".obs-2q.dat.gz", 2, None, n_start, n_end
+            )
+            self.assertGreater(len(columns[0]), 0)
+        steps = list(LindbladMPOSolver.follow_output(self.s_output_path))
+        self.assertEqual(
+            [t for t, _ in steps], [n * TAU for n in range(N_OUTPUT_STEPS)]
+        )
+        self.assertEqual(
+            steps[1][1]["obs-1q"][("z", (2,))][1], [result["obs-1q"][("z", (2,))][1][1]]
+        )
+
+    def test_load_output_filters(self):
+        """Test filtering the loaded observables, qubits and times."""
+        write_output_files(self.s_output_path)
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        n_chunk_size = LindbladMPOSolver.DATA_FILE_CHUNK_SIZE
+        for n_size in [n_chunk_size, 50]:
+            try:
+                LindbladMPOSolver.DATA_FILE_CHUNK_SIZE = n_size
+                filtered_result = LindbladMPOSolver.load_output(
+                    self.s_output_path,
+                    observables=["Z", "zz", "tr_rho"],
+                    qubits=[0, 2],
+                    t_range=(TAU, 2 * TAU),
+                    types=["obs-1q", "obs-2q", "global"],
+                )
+            finally:
+                LindbladMPOSolver.DATA_FILE_CHUNK_SIZE = n_chunk_size
+            self.assertEqual(
+                list(filtered_result["obs-1q"].keys()), [("z", (0,)), ("z", (2,))]
+            )
+            self.assertEqual(
+                list(filtered_result["obs-2q"].keys()), [("zz", (0, 2)), ("zz", (2, 0))]
+            )
+            self.assertEqual(list(filtered_result["global"].keys()), [("tr_rho", ())])
+            for s_output_type in ["obs-1q", "obs-2q"]:
+                for key, (times, values) in filtered_result[s_output_type].items():
+                    self.assertEqual(times, [TAU, 2 * TAU])
+                    self.assertEqual(values, result[s_output_type][key][1][1:3])
+        filtered_result = LindbladMPOSolver.load_output(
+            self.s_output_path, t_range=(None, 0.0), types=["obs-2q"]
+        )
+        self.assertEqual(len(filtered_result["obs-1q"]), 0)
+        self.assertEqual(filtered_result["obs-2q"].times.tolist(), [0.0])
+
+    def test_index_output(self):
+        """Test the index files of the time steps of the output files."""
+        write_output_files(self.s_output_path)
+        LindbladMPOSolver.index_output(self.s_output_path)
+        s_data_file = self.s_output_path + ".obs-2q.dat"
+        times, offsets, lengths, rows = LindbladMPOSolver._update_data_file_index(
+            s_data_file
+        )
+        np.testing.assert_allclose(times, [n * TAU for n in range(N_OUTPUT_STEPS)])
+        self.assertEqual(rows.tolist(), [N_QUBITS * (N_QUBITS - 1)] * N_OUTPUT_STEPS)
+        with open(s_data_file, "rb") as file:
+            s_data = file.read()
+        for n in range(N_OUTPUT_STEPS):
+            s_block = s_data[offsets[n] : offsets[n] + lengths[n]]
+            self.assertTrue(s_block.endswith(b"\n\n"))
+            self.assertEqual(s_block.count(f"{n * TAU}\tZZ".encode()), rows[n])
+        # A rewritten output file is indexed again
+        with open(s_data_file, "w") as file:
+            file.write("#time\toperator\tindex_1\tindex_2\tvalue\n")
+            file.write("0.0\tZZ\t1\t2\t0.5\n\n")
+            file.write("5.0\tZZ\t1\t2\t0.5\n\n")
+        times, _, _, _ = LindbladMPOSolver._update_data_file_index(s_data_file)
+        self.assertEqual(times.tolist(), [0.0, 5.0])
+        result = LindbladMPOSolver.load_output(
+            self.s_output_path, t_range=(1.0, None), types=["obs-2q"]
+        )
+        self.assertEqual(result["obs-2q"][("zz", (0, 1))], ([5.0], [0.5]))
+
+    def test_prepare_2q_correlation_matrix_from_files(self):
+        """Test the correlation matrix calculated from the output files at one time."""
+        write_output_files(self.s_output_path)
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        data, _ = prepare_2q_correlation_matrix(result, "zz", 2 * TAU, N_QUBITS)
+        file_data, _ = prepare_2q_correlation_matrix(
+            self.s_output_path, "zz", 2 * TAU, N_QUBITS
+        )
+        np.testing.assert_allclose(file_data, data)
+
+    def test_load_binary_output_filters(self):
+        """Test filtering the observables loaded from the binary format."""
+        columns = [[i_op, i] for i in range(1, N_QUBITS + 1) for i_op in range(2)]
+        blocks = [
+            [n * TAU] + [i_op + 0.1 * i + n for i_op, i in columns]
+            for n in range(N_OUTPUT_STEPS)
+        ]
+        write_binary_file(
+            self.s_output_path + ".obs-1q.bin", ["X", "Z"], columns, blocks, 1
+        )
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        filtered_result = LindbladMPOSolver.load_output(
+            self.s_output_path, observables="z", qubits=[1], t_range=(2 * TAU, None)
+        )
+        obs_1q = filtered_result["obs-1q"]
+        self.assertEqual(obs_1q.ops, ["z"])
+        self.assertEqual(list(obs_1q.keys()), [("z", (1,))])
+        self.assertEqual(obs_1q[("z", (1,))][0], [2 * TAU, 3 * TAU])
+        self.assertEqual(obs_1q[("z", (1,))][1], result["obs-1q"][("z", (1,))][1][2:])
+
+    def test_follow_output(self):
+        """Test following the time steps written to the output files."""
+        write_output_files(self.s_output_path, "1.0\tZZ\t1\t")
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        steps = list(LindbladMPOSolver.follow_output(self.s_output_path))
+        self.assertEqual(
+            [t for t, _ in steps], [n * TAU for n in range(N_OUTPUT_STEPS)]
+        )
+        for n, (t, step_result) in enumerate(steps):
+            self.assertEqual(len(step_result["obs-3q"]), 0)
+            for s_output_type in ["obs-1q", "obs-2q", "global"]:
+                step_store = step_result[s_output_type]
+                self.assertEqual(
+                    list(step_store.keys()), list(result[s_output_type].keys())
+                )
+                for key, (times, values) in step_store.items():
+                    self.assertEqual(times, [t])
+                    self.assertEqual(values, [result[s_output_type][key][1][n]])
+
+    def test_follow_output_running(self):
+        """Test following output files while they are being written."""
+        s_text = self.s_output_path + ".obs-1q.dat"
+        s_binary = self.s_output_path + ".global.bin"
+
+        def write_steps():
+            with open(s_text, "w") as text_file, open(s_binary, "wb") as binary_file:
+                write_binary_file(s_binary, ["tr_rho"], [[0]], [], 0)
+                binary_file.seek(0, os.SEEK_END)
+                text_file.write("#time\toperator\tindex\tvalue\n")
+                for n in range(N_OUTPUT_STEPS):
+                    binary_file.write(np.array([n * TAU, 1.0]).tobytes())
+                    binary_file.flush()
+                    text_file.write(f"{n * TAU}\tZ\t1\t{n}\n")
+                    text_file.flush()
+                    time.sleep(0.02)
+                    text_file.write(f"{n * TAU}\tZ\t2\t{-n}\n\n")
+                    text_file.flush()
+
+        thread = threading.Thread(target=write_steps)
+        thread.start()
+        steps = list(
+            LindbladMPOSolver.follow_output(self.s_output_path, thread.is_alive, 0.005)
+        )
+        thread.join()
+        self.assertEqual(
+            [t for t, _ in steps], [n * TAU for n in range(N_OUTPUT_STEPS)]
+        )
+        for n, (_, step_result) in enumerate(steps):
+            self.assertEqual(step_result["obs-1q"][("z", (1,))][1], [-n])
+            self.assertEqual(step_result["global"][("tr_rho", ())][1], [1.0])
+
+    def test_load_output_parallel(self):
+        """Test that loading with parallel workers and split files gives the same result."""
+        write_output_files(self.s_output_path, "1.0\tZZ\t1\t")
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        n_part_size = LindbladMPOSolver.DATA_FILE_MIN_PART_SIZE
+        n_parallel_size = LindbladMPOSolver.DATA_FILE_PARALLEL_MIN_SIZE
+        s_data_file = self.s_output_path + ".obs-2q.dat"
+        try:
+            LindbladMPOSolver.DATA_FILE_MIN_PART_SIZE = 64
+            LindbladMPOSolver.DATA_FILE_PARALLEL_MIN_SIZE = 0
+            parts = LindbladMPOSolver._split_data_file_range(s_data_file, 0, None, 8)
+            # The workers are used also on a machine with a single core
+            with mock.patch("os.cpu_count", return_value=2):
+                parallel_result = LindbladMPOSolver.load_output(
+                    self.s_output_path, n_workers=2, b_use_cache=False
+                )
+                filtered_result = LindbladMPOSolver.load_output(
+                    self.s_output_path, t_range=(TAU, None), n_workers=2
+                )
+        finally:
+            LindbladMPOSolver.DATA_FILE_MIN_PART_SIZE = n_part_size
+            LindbladMPOSolver.DATA_FILE_PARALLEL_MIN_SIZE = n_parallel_size
+        self.assertGreater(len(parts), 1)
+        self.assertIsNone(parts[-1][1])
+        with open(s_data_file, "rb") as file:
+            s_data = file.read()
+        for n_start, _ in parts[1:]:
+            # Each part begins with a time step
+            self.assertEqual(s_data[n_start - 2 : n_start], b"\n\n")
+        self.assertEqual(parallel_result, result)
+        for s_output_type in LindbladMPOSolver.OUTPUT_TYPES:
+            self.assertEqual(
+                list(parallel_result[s_output_type].keys()),
+                list(result[s_output_type].keys()),
+            )
+        self.assertEqual(
+            filtered_result["obs-1q"].times.tolist(), [TAU, 2 * TAU, 3 * TAU]
+        )
+
+    def test_result_cache(self):
+        """Test saving the loaded result to the cache file, and its validation."""
+        write_output_files(self.s_output_path)
+        s_cache_file = self.s_output_path + LindbladMPOSolver.RESULT_CACHE_SUFFIX
+        result = LindbladMPOSolver.load_output(self.s_output_path, b_use_cache=False)
+        self.assertFalse(os.path.isfile(s_cache_file))
+        LindbladMPOSolver.load_output(self.s_output_path, types=["obs-1q"])
+        self.assertTrue(os.path.isfile(s_cache_file))
+        cached_result = LindbladMPOSolver.load_output(self.s_output_path)
+        for s_output_type in LindbladMPOSolver.OUTPUT_TYPES:
+            self.assertEqual(
+                list(cached_result[s_output_type].keys()),
+                list(result[s_output_type].keys()),
+            )
+        self.assertEqual(cached_result, result)
+        stamps = {
+            s_output_type: LindbladMPOSolver._get_output_file_stamp(
+                self.s_output_path, s_output_type
+            )
+            for s_output_type in LindbladMPOSolver.OUTPUT_TYPES
+        }
+        self.assertEqual(
+            list(LindbladMPOSolver._read_result_cache(self.s_output_path, stamps)),
+            LindbladMPOSolver.OUTPUT_TYPES,
+        )
+        # A modified output file is parsed again
+        with open(self.s_output_path + ".global.dat", "a") as file:
+            file.write(f"{N_OUTPUT_STEPS * TAU} \ttr_rho\t0.5\n\n")
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        self.assertEqual(result["global"][("tr_rho", ())][1][-1], 0.5)
+        self.assertEqual(
+            LindbladMPOSolver.rebuild_result_caches(self.s_dir), [self.s_output_path]
+        )
+        self.assertEqual(
+            LindbladMPOSolver.purge_result_caches(self.s_dir), [s_cache_file]
+        )
+        self.assertFalse(os.path.isfile(s_cache_file))
+
+    def test_result_store_arrays(self):
+        """Test the array access methods of the result store."""
+        write_output_files(self.s_output_path)
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        obs_2q = result["obs-2q"]
+        self.assertIsInstance(obs_2q, ResultStore)
+        self.assertEqual(obs_2q.time_index(2 * TAU), 2)
+        self.assertIsNone(obs_2q.time_index(0.1))
+        tensor = obs_2q.get_tensor("zz", N_QUBITS)
+        self.assertEqual(tensor.shape, (N_QUBITS, N_QUBITS, N_OUTPUT_STEPS))
+        self.assertTrue(np.all(np.isnan(tensor[1, 1])))
+        np.testing.assert_allclose(tensor[2, 0], result["obs-2q"][("zz", (2, 0))][1])
+        np.testing.assert_allclose(
+            obs_2q.get_tensor("zz", N_QUBITS, t=TAU), tensor[:, :, 1]
+        )
+        times, values = result["global"].get_series("max_bond_dim")
+        np.testing.assert_allclose(times, [n * TAU for n in range(N_OUTPUT_STEPS)])
+        np.testing.assert_allclose(values, [1.0, 2.0, 3.0, 4.0])
+        self.assertIsNone(result["obs-1q"].get_series("y", (0,)))
+
+    def test_result_store_from_dict(self):
+        """Test creating a result store from a dictionary."""
+        write_output_files(self.s_output_path)
+        obs_1q = LindbladMPOSolver.load_output(self.s_output_path)["obs-1q"]
+        obs_dict = dict(obs_1q)
+        obs_store = ResultStore.from_dict(obs_dict, 1)
+        self.assertEqual(list(obs_store.keys()), list(obs_1q.keys()))
+        self.assertEqual(obs_store, obs_dict)
+
+    def test_prepare_2q_correlation_matrix(self):
+        """Test the connected correlation matrix calculated from the result."""
+        write_output_files(self.s_output_path)
+        result = LindbladMPOSolver.load_output(self.s_output_path)
+        data, _ = prepare_2q_correlation_matrix(result, "zz", TAU, N_QUBITS)
+        for i in range(N_QUBITS):
+            for j in range(N_QUBITS):
+                if i == j:
+                    self.assertTrue(np.isnan(data[i, j]))
+                else:
+                    expected = result["obs-2q"][("zz", (i, j))][1][1] - (
+                        result["obs-1q"][("z", (i,))][1][1]
+                        * result["obs-1q"][("z", (j,))][1][1]
+                    )
+                    self.assertAlmostEqual(data[i, j], expected)
+        dict_result = {s_type: dict(obs) for s_type, obs in result.items()}
+        dict_data, _ = prepare_2q_correlation_matrix(dict_result, "zz", TAU, N_QUBITS)
+        np.testing.assert_allclose(dict_data, data)
+
+
+if __name__ == "__main__":
+    unittest.main()
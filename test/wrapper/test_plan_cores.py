@@ -0,0 +1,67 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of the allocation of the cores to concurrent simulations, with a fake solver executable.
+"""
+
+import os
+import unittest
+from unittest import mock
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from .fake_solver import FakeSolverTestCase
+
+
+class LindbladMPOSolverTestPlanCores(FakeSolverTestCase):
+    """This class tests the core-allocation planner of simulation sweeps."""
+
+    def test_plan_cores(self):
+        """Test the choice of concurrent processes and threads, and its use in a sweep."""
+        self.assertEqual(
+            LindbladMPOSolver._choose_core_plan({1: 8.0, 2: 4.0, 4: 2.0}, 4, 1), 4
+        )
+        self.assertEqual(
+            LindbladMPOSolver._choose_core_plan({1: 1.0, 2: 1.0, 4: 1.0}, 4, 8), 1
+        )
+        self.assertEqual(
+            LindbladMPOSolver._choose_core_plan({1: 4.0, 2: 2.5, 4: 1.75}, 4, 2), 2
+        )
+        parameters_list = [self.get_parameters(2, i_run) for i_run in range(3)]
+        plan = LindbladMPOSolver.plan_cores(parameters_list, 3, "", self.s_solver_path)
+        self.assertEqual(sorted(plan["run_times"].keys()), [1, 2, 3])
+        self.assertLessEqual(plan["max_workers"] * plan["threads_per_job"], 3)
+        solvers = LindbladMPOSolver.solve_many(
+            parameters_list, None, 1, "", self.s_solver_path, b_plan_cores=True
+        )
+        for solver in solvers:
+            self.assertIsNone(solver.error)
+            self.assertEqual(solver.result["global"][("threads", ())][1], [1.0])
+
+    def test_plan_cores_registry(self):
+        """Test that every calibration simulation is run, without using the result registry."""
+        s_registry_dir = os.path.join(self.s_temp_dir, "registry")
+        parameters_list = [
+            dict(self.get_parameters(2, i_run), result_registry_dir=s_registry_dir)
+            for i_run in range(4)
+        ]
+        with mock.patch.object(
+            LindbladMPOSolver,
+            "_start_process",
+            wraps=LindbladMPOSolver._start_process,
+        ) as start_process:
+            plan = LindbladMPOSolver.plan_cores(
+                parameters_list, 4, "", self.s_solver_path
+            )
+        self.assertEqual(sorted(plan["run_times"].keys()), [1, 2, 4])
+        # 4 simulations with 1 thread, 2 with 2 threads and 1 with 4 threads
+        self.assertEqual(start_process.call_count, 7)
+        self.assertFalse(os.path.isdir(s_registry_dir) and os.listdir(s_registry_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of reusing the results of identical simulations through the result registry, with a fake
+solver executable.
+"""
+
+import os
+import unittest
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from lindbladmpo.ResultRegistry import ResultRegistry
+from .fake_solver import FakeSolverTestCase
+
+
+class LindbladMPOSolverTestRegistry(FakeSolverTestCase):
+    """This class tests the result registry."""
+
+    def test_result_registry(self):
+        """Test that identical simulations are loaded from the result registry instead of run."""
+        s_registry_dir = os.path.join(self.s_temp_dir, "registry")
+        parameters = dict(self.get_parameters(2, 0), result_registry_dir=s_registry_dir)
+        solver = LindbladMPOSolver(parameters, "", self.s_solver_path)
+        solver.solve()
+        pid = solver.result["global"][("pid", ())]
+        s_hash = solver.s_parameters_hash
+        self.assertEqual(LindbladMPOSolver.get_parameters_hash(parameters), s_hash)
+        self.assertIsNotNone(ResultRegistry(s_registry_dir).lookup(s_hash))
+
+        parameters = {
+            "output_files_prefix": os.path.join(self.s_temp_dir, "run1"),
+            "tau": 0.1,
+            "result_registry_dir": s_registry_dir,
+            "t_final": 1.0,
+            "N": 2,
+            "b_quiet": True,
+        }
+        solver = LindbladMPOSolver(parameters, "", self.s_solver_path)
+        solver.solve()
+        self.assertEqual(solver.s_parameters_hash, s_hash)
+        self.assertEqual(solver.result["global"][("pid", ())], pid)
+        self.assertTrue(os.path.isfile(solver.s_output_path + ".global.dat"))
+        solvers = LindbladMPOSolver.solve_many(
+            [
+                dict(
+                    parameters,
+                    output_files_prefix=os.path.join(self.s_temp_dir, "run2"),
+                ),
+                dict(
+                    parameters,
+                    output_files_prefix=os.path.join(self.s_temp_dir, "run3"),
+                    tau=0.2,
+                ),
+            ],
+            2,
+            None,
+            "",
+            self.s_solver_path,
+        )
+        self.assertEqual(solvers[0].result["global"][("pid", ())], pid)
+        self.assertNotEqual(solvers[1].result["global"][("pid", ())], pid)
+
+        # An entry whose output files were modified is not used
+        with open(os.path.join(self.s_temp_dir, "run0.global.dat"), "a") as file:
+            file.write("\n")
+        self.assertIsNone(ResultRegistry(s_registry_dir).lookup(s_hash))
+        solver = LindbladMPOSolver(parameters, "", self.s_solver_path)
+        solver.solve()
+        self.assertNotEqual(solver.result["global"][("pid", ())], pid)
+
+        parameters = {
+            "N": 3,
+            "t_final": 1.0,
+            "tau": 0.1,
+            "J": [[0.0, 1.0, 0.0], [0.0, 0.0, 2.0], [0.0, 0.0, 0.0]],
+        }
+        s_hash = LindbladMPOSolver.get_parameters_hash(parameters)
+        self.assertEqual(
+            LindbladMPOSolver.get_parameters_hash(
+                {
+                    "J": [(1, 2, 2.0), (0, 1, 1.0)],
+                    "tau": 0.1,
+                    "N": 3,
+                    "metadata": "sweep",
+                    "t_final": 1.0,
+                }
+            ),
+            s_hash,
+        )
+        self.assertNotEqual(
+            LindbladMPOSolver.get_parameters_hash(dict(parameters, tau=0.05)), s_hash
+        )
+
+    def test_result_registry_copies(self):
+        """Test the conditions under which registered output files are copied and reused."""
+        s_registry_dir = os.path.join(self.s_temp_dir, "registry")
+        parameters = dict(self.get_parameters(2, 0), result_registry_dir=s_registry_dir)
+        solver = LindbladMPOSolver(parameters, "", self.s_solver_path)
+        solver.solve()
+        pid = solver.result["global"][("pid", ())]
+        entry = ResultRegistry(s_registry_dir).lookup(solver.s_parameters_hash)
+        self.assertEqual(entry["output_format"], "text")
+        self.assertEqual(entry["output_compression"], 0)
+        s_source_file = os.path.join(self.s_temp_dir, "run0.global.dat")
+        n_mtime = os.stat(s_source_file).st_mtime_ns
+
+        # An older output file of another format is kept, and the copies are loaded
+        s_output_path = os.path.join(self.s_temp_dir, "run1")
+        s_other_file = s_output_path + ".global.bin"
+        with open(s_other_file, "wb") as file:
+            file.write(b"other")
+        os.utime(s_other_file, ns=(n_mtime - 10**10, n_mtime - 10**10))
+        parameters = dict(parameters, output_files_prefix=s_output_path)
+        solver = LindbladMPOSolver(parameters, "", self.s_solver_path)
+        solver.solve()
+        self.assertEqual(solver.result["global"][("pid", ())], pid)
+        self.assertTrue(os.path.isfile(s_other_file))
+
+        # A newer output file of another format would be loaded instead, so the simulation is run
+        s_output_path = os.path.join(self.s_temp_dir, "run2")
+        s_other_file = s_output_path + ".global.bin"
+        with open(s_other_file, "wb") as file:
+            file.write(b"other")
+        os.utime(s_other_file, ns=(n_mtime, n_mtime))
+        parameters = dict(parameters, output_files_prefix=s_output_path)
+        solver = LindbladMPOSolver(parameters, "", self.s_solver_path)
+        solver.solve()
+        self.assertNotEqual(solver.result["global"][("pid", ())], pid)
+        self.assertTrue(os.path.isfile(s_other_file))
+
+        # A registered file whose content changed (with the same size and time) is not copied
+        entry = ResultRegistry(s_registry_dir).lookup(solver.s_parameters_hash)
+        pid = solver.result["global"][("pid", ())]
+        s_source_file = entry["output_path"] + ".global.dat"
+        n_mtime = os.stat(s_source_file).st_mtime_ns
+        with open(s_source_file, "r+b") as file:
+            s_data = file.read()
+            file.seek(0)
+            file.write(s_data.replace(b"pid", b"PID"))
+        os.utime(s_source_file, ns=(n_mtime, n_mtime))
+        parameters = dict(
+            parameters, output_files_prefix=os.path.join(self.s_temp_dir, "run3")
+        )
+        solver = LindbladMPOSolver(parameters, "", self.s_solver_path)
+        solver.solve()
+        self.assertNotEqual(solver.result["global"][("pid", ())], pid)
+        self.assertEqual(
+            [
+                s_file
+                for s_file in os.listdir(self.s_temp_dir)
+                if s_file.endswith(".tmp")
+            ],
+            [],
+        )
+        pid = solver.result["global"][("pid", ())]
+
+        # Output files in another format are not reused
+        parameters = dict(
+            parameters,
+            output_files_prefix=os.path.join(self.s_temp_dir, "run4"),
+            output_compression=5,
+        )
+        solver = LindbladMPOSolver(parameters, "", self.s_solver_path)
+        solver.solve()
+        self.assertNotEqual(solver.result["global"][("pid", ())], pid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of resuming simulations from their checkpoints, with a fake solver executable.
+"""
+
+import os
+import unittest
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from .fake_solver import FakeSolverTestCase
+
+
+class LindbladMPOSolverTestResume(FakeSolverTestCase):
+    """This class tests resuming and extending simulations."""
+
+    BEHAVIORS = {9: "checkpoint"}
+
+    def test_resume(self):
+        """Test resuming a failed simulation from a checkpoint, and extending it."""
+        parameters = dict(
+            self.get_parameters(9, 0),
+            init_product_state="+x",
+            apply_gates=[(0.2, "X", 0), (0.8, "Z", 1)],
+            checkpoint_step=4,
+        )
+        solver = LindbladMPOSolver(parameters, "", self.s_solver_path)
+        with self.assertRaises(Exception):
+            solver.solve()
+        solver.resume()
+        self.assertEqual(
+            solver.result["global"][("step", ())][1], [float(n) for n in range(11)]
+        )
+        with open(solver.s_output_path + LindbladMPOSolver.RESUME_INPUT_SUFFIX) as file:
+            s_input = file.read()
+        self.assertNotIn("init_product_state", s_input)
+        self.assertIn("apply_gates = 0.8 Z 2\n", s_input)
+        self.assertIn("initial_step = 4\n", s_input)
+        solver = LindbladMPOSolver(None, "", self.s_solver_path)
+        solver.resume(os.path.join(self.s_temp_dir, "run0"), 1.5)
+        times, steps = solver.result["global"][("step", ())]
+        self.assertEqual(steps, [float(n) for n in range(16)])
+        self.assertAlmostEqual(times[-1], 1.5)
+        with self.assertRaises(Exception):
+            solver.resume(t_final=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
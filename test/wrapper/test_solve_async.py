@@ -0,0 +1,62 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of solving simulations asynchronously, with a fake solver executable.
+"""
+
+import asyncio
+import os
+import time
+import unittest
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from .fake_solver import FakeSolverTestCase
+
+
+class LindbladMPOSolverTestSolveAsync(FakeSolverTestCase):
+    """This class tests solving simulations with asyncio."""
+
+    BEHAVIORS = {3: "fail", 6: "hang"}
+
+    def test_solve_async(self):
+        """Test solving asynchronously, with the console output passed to a callback."""
+        solver = LindbladMPOSolver(self.get_parameters(5, 0), "", self.s_solver_path)
+        lines = []
+        asyncio.run(solver.solve_async(lines.append))
+        self.assertEqual(
+            lines, ["Reading parameters from the file " + solver.s_input_file]
+        )
+        self.assertEqual(solver.result["global"][("n", ())][1], [5.0])
+        solver = LindbladMPOSolver(self.get_parameters(3, 1), "", self.s_solver_path)
+        with self.assertRaises(Exception):
+            asyncio.run(solver.solve_async())
+
+    @unittest.skipIf(os.name == "nt", "checks that the process exists with os.kill()")
+    def test_solve_async_cancel(self):
+        """Test that cancelling an asynchronous solution kills the solver process."""
+        solver = LindbladMPOSolver(self.get_parameters(6, 0), "", self.s_solver_path)
+        lines = []
+
+        async def solve_and_cancel():
+            task = asyncio.ensure_future(solver.solve_async(lines.append))
+            while len(lines) < 2:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        f_start_time = time.time()
+        asyncio.run(asyncio.wait_for(solve_and_cancel(), 20))
+        self.assertLess(time.time() - f_start_time, 20)
+        with self.assertRaises(ProcessLookupError):
+            os.kill(int(lines[1].split()[1]), 0)
+        self.assertEqual(solver.result, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
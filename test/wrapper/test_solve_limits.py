@@ -0,0 +1,49 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of stopping the solver when the limits of a run are exceeded, with a fake solver
+executable.
+"""
+
+import os
+import time
+import unittest
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from .fake_solver import FakeSolverTestCase
+
+
+class LindbladMPOSolverTestLimits(FakeSolverTestCase):
+    """This class tests the run limits of the solver."""
+
+    BEHAVIORS = {6: "hang", 7: "trace_drift", 8: "bond_saturation"}
+
+    def test_solve_limits(self):
+        """Test stopping the solver when the run limits are exceeded."""
+        limits = [
+            (7, {"f_max_trace_deviation": 0.15}, "trace"),
+            (8, {"n_max_saturated_steps": 3}, "bond dimension"),
+            (6, {"f_max_wall_time": 0.5}, "wall time"),
+        ]
+        if os.path.isdir("/proc"):
+            limits.append((6, {"f_max_memory_mb": 0.01}, "memory"))
+        for i_run, (n_qubits, kwargs, s_reason) in enumerate(limits):
+            parameters = dict(self.get_parameters(n_qubits, i_run), max_dim_rho=4)
+            solver = LindbladMPOSolver(parameters, "", self.s_solver_path)
+            f_start_time = time.time()
+            solver.solve(f_poll_interval=0.01, **kwargs)
+            self.assertLess(time.time() - f_start_time, 30)
+            self.assertIn(s_reason, solver.result["abort_reason"])
+            if s_reason != "memory" and os.name != "nt":
+                # The memory limit is exceeded before the fake solver handles the signal, and on
+                # Windows the solver is terminated without a signal it could handle
+                self.assertEqual(solver.result["global"][("stopped", ())][1], [1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
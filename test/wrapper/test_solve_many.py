@@ -0,0 +1,47 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of solving sweeps of simulations with concurrent solver processes, with a fake solver
+executable.
+"""
+
+import unittest
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from .fake_solver import FakeSolverTestCase
+
+
+class LindbladMPOSolverTestSolveMany(FakeSolverTestCase):
+    """This class tests solving sweeps of simulations concurrently."""
+
+    BEHAVIORS = {3: "fail", 4: "crash"}
+
+    def test_solve_many(self):
+        """Test solving a sweep with concurrent solver processes and isolated failures."""
+        parameters_list = [
+            self.get_parameters(n_qubits, i_run)
+            for i_run, n_qubits in enumerate([2, 3, 2, 4, 5])
+        ]
+        parameters_list.append(self.get_parameters(2, 0))
+        parameters_list.append({"N": 2})
+        solvers = LindbladMPOSolver.solve_many(
+            parameters_list, 2, 3, "", self.s_solver_path
+        )
+        self.assertEqual(len(solvers), len(parameters_list))
+        for i_run in [0, 2, 4]:
+            self.assertIsNone(solvers[i_run].error)
+            global_result = solvers[i_run].result["global"]
+            self.assertEqual(global_result[("n", ())][1], [parameters_list[i_run]["N"]])
+            self.assertEqual(global_result[("threads", ())][1], [3.0])
+        for i_run in [1, 3, 5, 6]:
+            self.assertIsNotNone(solvers[i_run].error)
+            self.assertEqual(solvers[i_run].result, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of the progress events of the solver, with a fake solver executable.
+"""
+
+import os
+import unittest
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from .fake_solver import FakeSolverTestCase
+
+
+class LindbladMPOSolverTestProgress(FakeSolverTestCase):
+    """This class tests passing the progress events of the solver to a callback."""
+
+    def test_solve_progress(self):
+        """Test that the progress events of the solver are passed to the callback."""
+        solver = LindbladMPOSolver(self.get_parameters(5, 0), "", self.s_solver_path)
+        events = []
+        solver.solve(events.append, 0.001)
+        self.assertEqual(
+            [event["event"] for event in events],
+            ["start", "evolve", "evolve", "evolve", "end"],
+        )
+        self.assertEqual(events[0]["N"], 5)
+        self.assertEqual([event.get("step") for event in events[1:4]], [1, 2, 3])
+        self.assertTrue(
+            os.path.isfile(
+                solver.s_output_path + LindbladMPOSolver.PROGRESS_FILE_SUFFIX
+            )
+        )
+        self.assertEqual(solver.result["global"][("n", ())][1], [5.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of solving simulations without files, through the standard input and the results
+stream of the solver, with a fake solver executable.
+"""
+
+import os
+import unittest
+from lindbladmpo.LindbladMPOSolver import LindbladMPOSolver
+from .fake_solver import FakeSolverTestCase
+
+
+class LindbladMPOSolverTestStream(FakeSolverTestCase):
+    """This class tests solving simulations with the results stream."""
+
+    def test_solve_stream(self):
+        """Test solving without files, with the results decoded from the output stream."""
+        parameters = dict(self.get_parameters(5, 0), output_format="text")
+        solver = LindbladMPOSolver(parameters, "", self.s_solver_path)
+        solver.solve_stream()
+        self.assertEqual(os.listdir(self.s_temp_dir), ["fake_solver.py"])
+        self.assertEqual(solver.result["global"][("n", ())][1], [5.0])
+        times, values = solver.result["obs-1q"][("z", (1,))]
+        self.assertEqual(times, [0.0, 0.1, 0.2])
+        self.assertEqual(values, [0.0, -1.0, -2.0])
+        with self.assertRaises(Exception):
+            LindbladMPOSolver.decode_output_stream(b"LMPOSTR1\x06\x00")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests of the pool of persistent solver processes, with a fake solver executable.
+"""
+
+import unittest
+from lindbladmpo.SolverPool import SolverPool
+from .fake_solver import FakeSolverTestCase
+
+
+class LindbladMPOSolverTestPool(FakeSolverTestCase):
+    """This class tests running simulations with persistent solver processes."""
+
+    BEHAVIORS = {3: "fail", 4: "crash", 5: "invalid"}
+
+    def test_solver_pool_map(self):
+        """Test that simulations are run by the persistent processes of the pool."""
+        with SolverPool(2, "", self.s_solver_path) as pool:
+            solvers = pool.map([self.get_parameters(2, i_run) for i_run in range(6)])
+        self.assertEqual(len(solvers), 6)
+        pids = set()
+        for solver in solvers:
+            self.assertEqual(solver.result["global"][("n", ())][1], [2.0])
+            pids.add(solver.result["global"][("pid", ())][1][0])
+        self.assertLessEqual(len(pids), 2)
+
+    def test_solver_pool_errors(self):
+        """Test that failed simulations raise an exception, and only processes that terminated
+        are replaced."""
+        with SolverPool(1, "", self.s_solver_path) as pool:
+            pid = pool.solve(self.get_parameters(2, 0)).result["global"][("pid", ())]
+            with self.assertRaises(Exception):
+                pool.solve(self.get_parameters(3, 1))
+            self.assertEqual(
+                pool.solve(self.get_parameters(2, 2)).result["global"][("pid", ())],
+                pid,
+            )
+            with self.assertRaises(Exception):
+                pool.solve(self.get_parameters(5, 3))
+            self.assertEqual(
+                pool.solve(self.get_parameters(2, 4)).result["global"][("pid", ())],
+                pid,
+            )
+            with self.assertRaises(Exception):
+                pool.solve(self.get_parameters(4, 5))
+            new_pid = pool.solve(self.get_parameters(2, 6)).result["global"][
+                ("pid", ())
+            ]
+            self.assertNotEqual(new_pid, pid)
+
+
+if __name__ == "__main__":
+    unittest.main()